@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark the memory and cache-serialization cost of FunctionInfo records.
+
+Builds a synthetic 50k-function library (500 modules, a third of the
+functions being methods) and loads it the way the incremental cache does:
+from JSON, so every record starts with its own copies of the module, class
+and parameter name strings. The previous representation (a regular
+dataclass with a dict per parameter) is reproduced here for comparison with
+the slotted FunctionInfo/ParamInfo records, which intern those names.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import pickle
+import random
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from allbemcp.analyzer import APIAnalyzer
+
+
+@dataclass
+class LegacyFunctionInfo:
+    """FunctionInfo as it was: a regular dataclass with dict parameters"""
+    name: str
+    module: str
+    class_name: Optional[str]
+    qualname: str
+    signature: str
+    doc: Optional[str]
+    parameters: List[Dict]
+    return_type: Optional[str]
+    is_async: bool
+    http_method: str
+    path: str
+    returns_object: bool = False
+    object_methods: List[Dict] = None
+    raw_param_annotations: List[Any] = None
+    raw_return_annotation: Any = None
+    target_name: Optional[str] = None
+    is_constructor: bool = False
+    parsed_doc: Any = None
+
+
+SCHEMAS = [{"type": "integer"}, {"type": "string"}, {"type": "number"}, {}, {"type": "array", "items": {"type": "string"}}]
+
+
+def synthetic_payloads(total: int = 50_000, modules: int = 500, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(total):
+        module = f"synthlib.sub{i % modules // 50}.mod{i % modules}"
+        class_name = f"Class{i % 7}" if i % 3 == 0 else None
+        name = f"compute_{i}"
+        params = []
+        for j in range(rng.randrange(0, 7)):
+            param = {
+                "name": rng.choice(["x", "y", "data", "axis", "dtype", "out", "keepdims"]) + str(j),
+                "required": j < 2,
+                "schema": dict(SCHEMAS[rng.randrange(len(SCHEMAS))]),
+                "in": "query",
+            }
+            if j >= 2:
+                param["default"] = j
+            params.append(param)
+        qualname = f"{module}.{class_name}.{name}" if class_name else f"{module}.{name}"
+        payloads.append({
+            "name": name,
+            "module": module,
+            "class_name": class_name,
+            "qualname": qualname,
+            "signature": f"{name}({', '.join(p['name'] for p in params)})",
+            "doc": f"Compute value {i}." if i % 2 else None,
+            "parameters": params,
+            "return_type": "int",
+            "is_async": False,
+            "http_method": "post",
+            "path": f"/{module.replace('.', '/')}/{name}",
+            "object_methods": [],
+            "raw_param_annotations": ["int"] * len(params),
+            "raw_return_annotation": "int",
+            "target_name": name,
+        })
+    # As loaded from the cache: every string is a fresh object
+    return json.loads(json.dumps(payloads))
+
+
+def measure(label: str, build) -> List[Any]:
+    gc.collect()
+    tracemalloc.start()
+    records = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} | {current / 1e6:7.1f} MB | {current / len(records):6.0f} B/function")
+    return records
+
+
+def main():
+    analyzer = APIAnalyzer("json", enable_analysis_cache=False)
+    payloads = synthetic_payloads()
+    print(f"{len(payloads)} functions\n")
+
+    legacy = measure("legacy", lambda: [LegacyFunctionInfo(**p) for p in json.loads(json.dumps(payloads))])
+    compact = measure("compact", lambda: [analyzer._deserialize_function_info_from_cache(p) for p in json.loads(json.dumps(payloads))])
+    print()
+
+    for label, records, serialize in (
+        ("legacy", legacy, asdict),
+        ("compact", compact, analyzer._serialize_function_info_for_cache),
+    ):
+        start = time.perf_counter()
+        for record in records:
+            serialize(record)
+        elapsed = time.perf_counter() - start
+        size = len(pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL))
+        print(f"{label:<10} | cache serialize {elapsed:6.2f}s | pickle {size / 1e6:6.1f} MB")
+
+    assert all(dict(p) == q for f, g in zip(compact, legacy) for p, q in zip(f.parameters, g.parameters))
+
+
+if __name__ == "__main__":
+    main()
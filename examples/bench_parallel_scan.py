@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Benchmark serial vs parallel module scanning in APIAnalyzer.
+
+Generates a synthetic package (many modules, each with documented and
+annotated functions and classes), imports it once so import time is excluded,
+then times APIAnalyzer.analyze() with the serial scan and with the parallel
+scan (thread-pool extraction + worker-process AST indexing) and checks that
+both produce the same specification.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import pkgutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from allbemcp.analyzer import APIAnalyzer
+
+MODULE_TEMPLATE = '''"""Synthetic module {index}."""
+from typing import Dict, List, Optional
+
+'''
+
+FUNCTION_TEMPLATE = '''
+def transform_{index}_{fn}(values: List[float], scale: float = 1.0, label: Optional[str] = None) -> Dict[str, float]:
+    """Transform values for module {index}.
+
+    Args:
+        values: Input values.
+        scale: Multiplier applied to each value.
+        label: Optional label, one of 'raw', 'scaled' or 'normalized'.
+
+    Returns:
+        Summary statistics.
+    """
+    total = sum(v * scale for v in values)
+    if not values:
+        return {{}}
+    return {{"total": total, "mean": total / len(values)}}
+
+
+class Model{index}_{fn}:
+    """Model {fn} of module {index}."""
+
+    def __init__(self, name: str, size: int = 3):
+        """Create the model.
+
+        Args:
+            name: Model name.
+            size: Model size.
+        """
+        self.name = name
+        self.size = size
+
+    @classmethod
+    def default(cls) -> "Model{index}_{fn}":
+        """Create a default model."""
+        return cls("default")
+
+    @staticmethod
+    def validate(size: int) -> bool:
+        """Check a model size.
+
+        Args:
+            size: Size to check.
+        """
+        return size > 0
+'''
+
+
+def build_package(root: Path, name: str, packages: int, modules: int, functions: int) -> None:
+    package = root / name
+    package.mkdir()
+    (package / "__init__.py").write_text('"""Synthetic benchmark package."""\n')
+    for p in range(packages):
+        sub = package / f"pkg{p}"
+        sub.mkdir()
+        (sub / "__init__.py").write_text("")
+        for m in range(modules):
+            index = p * modules + m
+            body = MODULE_TEMPLATE.format(index=index)
+            body += "".join(FUNCTION_TEMPLATE.format(index=index, fn=fn) for fn in range(functions))
+            (sub / f"mod{m}.py").write_text(body)
+
+
+def import_all(name: str) -> None:
+    root = importlib.import_module(name)
+    for info in pkgutil.walk_packages(root.__path__, f"{name}."):
+        importlib.import_module(info.name)
+
+
+def run_analyzer(name: str, parallel: bool, workers: int):
+    analyzer = APIAnalyzer(
+        name,
+        max_depth=3,
+        quality_mode="permissive",
+        enable_analysis_cache=False,
+        enable_parallel_scan=parallel,
+        parallel_scan_workers=workers,
+    )
+    scan_time = {}
+
+    def timed(method):
+        def wrapper(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                scan_time["scan"] = max(scan_time.get("scan", 0.0), time.perf_counter() - t)
+        return wrapper
+
+    # Time only the outermost scan call (the serial scan recurses).
+    if parallel:
+        analyzer._scan_modules_parallel = timed(analyzer._scan_modules_parallel)
+    else:
+        analyzer._scan_module = timed(analyzer._scan_module)
+    analyzer._apply_quality_filtering = timed_filter(analyzer, analyzer._apply_quality_filtering)
+
+    t0 = time.perf_counter()
+    spec = analyzer.analyze()
+    elapsed = time.perf_counter() - t0
+    return elapsed, scan_time.get("scan", 0.0), spec, analyzer.scanned_count
+
+
+def timed_filter(analyzer, method):
+    def wrapper(*args, **kwargs):
+        analyzer.scanned_count = len(analyzer.functions)
+        return method(*args, **kwargs)
+    return wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=8)
+    parser.add_argument("--modules", type=int, default=25)
+    parser.add_argument("--functions", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        name = "allbemcp_bench_scan"
+        build_package(Path(tmp), name, args.packages, args.modules, args.functions)
+        sys.path.insert(0, tmp)
+        import_all(name)
+
+        serial_total, serial_scan, serial_spec, serial_count = run_analyzer(name, parallel=False, workers=1)
+        parallel_total, parallel_scan, parallel_spec, parallel_count = run_analyzer(
+            name, parallel=True, workers=args.workers
+        )
+
+    same = serial_spec["paths"] == parallel_spec["paths"]
+    ratio = serial_scan / parallel_scan if parallel_scan > 0 else float("inf")
+    print(
+        f"modules={args.packages * args.modules} scanned_functions={serial_count}/{parallel_count} "
+        f"identical_spec={same} cpus={os.cpu_count()}"
+    )
+    print(f"scan:  serial={serial_scan:.3f}s | parallel={parallel_scan:.3f}s | speedup={ratio:.2f}x")
+    print(f"total: serial={serial_total:.3f}s | parallel={parallel_total:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
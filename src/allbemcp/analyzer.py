@@ -7,6 +7,7 @@ Supports quality scoring, intelligent filtering, and deduplication, without hard
 import ast
 import inspect
 import importlib
+import os
 import pkgutil
 import re
 import json
@@ -15,17 +16,36 @@ import hashlib
 import heapq
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Union, Tuple, get_type_hints, get_origin, get_args, Sequence, Iterable, Mapping
-from concurrent.futures import ThreadPoolExecutor
-try:
-    import docstring_parser
-except ImportError:
-    docstring_parser = None
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from types import ModuleType
-from dataclasses import asdict, is_dataclass
+from dataclasses import asdict, fields, is_dataclass
 from collections import defaultdict
 
-from allbemcp.analyzer_types import FunctionInfo, QualityMetrics, TypeParser
+from allbemcp.analyzer_types import FunctionInfo, ParamInfo, QualityMetrics, TypeParser
+from allbemcp.analyzer_docstrings import ParsedDocstring, parse_docstring
+from allbemcp.analyzer_scoring import (
+    ScoreBreakdowns,
+    adaptive_select,
+    combine_scores,
+    vectorized_scoring_available,
+)
 from allbemcp.analyzer_cache import AnalysisCache, IncrementalCache
+from allbemcp.analyzer_fingerprint import LibraryFingerprinter
+from allbemcp.analyzer_incremental import (
+    MANIFEST_VERSION,
+    ancestor_names,
+    diff_operations,
+    discover_modules,
+    operation_digests,
+)
+from allbemcp.analyzer_static import (
+    StaticClass,
+    StaticFunction,
+    StaticLibrary,
+    extract_module_source,
+    infer_return_type as _infer_return_type_from_ast_node,
+)
 
 class APIAnalyzer:
     """API Analyzer - Universal Intelligent Version"""
@@ -39,10 +59,20 @@ class APIAnalyzer:
         re.IGNORECASE
     )
 
+    # Below this many source files, spawning AST worker processes costs more than it saves.
+    AST_PROCESS_MIN_FILES = 16
+
     SERIALIZABLE_TYPES = {
         int, float, str, bool, bytes, type(None),
         list, dict, tuple, set,
     }
+
+    # Memoization hints: functions taking and returning only these are pure candidates
+    PURE_PARAM_SCHEMA_TYPES = {'string', 'integer', 'number', 'boolean'}
+    PURE_RETURN_TYPE_NAMES = {'int', 'float', 'str', 'bool'}
+
+    # Weighted score dimensions, in the order they are added up
+    SCORE_DIMENSIONS = ('documentation', 'type_annotations', 'public_api', 'naming', 'hierarchy')
     
     def __init__(self, library_name: str, 
                  max_depth: int = 2, 
@@ -64,8 +94,13 @@ class APIAnalyzer:
                  adaptive_max_keep: int = 30,
                  enable_parallel_scan: bool = True,
                  parallel_scan_workers: int = 4,
+                 enable_parallel_extraction: Optional[bool] = None,
+                 ast_process_workers: int = 0,
                  enable_analysis_cache: bool = True,
-                 cache_dir: str = ".allbemcp_cache"):
+                 cache_dir: str = ".allbemcp_cache",
+                 incremental_rescan: bool = False,
+                 static_analysis: bool = False,
+                 static_import_fallback: bool = False):
         self.library_name = library_name
         self.max_depth = max_depth
         self.skip_non_serializable = skip_non_serializable
@@ -86,10 +121,38 @@ class APIAnalyzer:
         self.adaptive_max_keep = adaptive_max_keep
         self.enable_parallel_scan = enable_parallel_scan
         self.parallel_scan_workers = max(1, parallel_scan_workers)
+        # AST indexing in worker processes is opt-in: spawned workers re-import __main__,
+        # which re-runs any embedding script that lacks an `if __name__ == "__main__"` guard.
+        self.ast_process_workers = max(0, int(ast_process_workers or 0))
+        # Parallel mode: per-module extraction on threads. Extraction itself is GIL-bound
+        # and runs library code (module __getattr__, lazy loaders) concurrently, so by
+        # default it only comes with AST worker processes, where the speedup is.
+        if enable_parallel_extraction is None:
+            enable_parallel_extraction = self.ast_process_workers > 0
+        self.enable_parallel_extraction = (
+            enable_parallel_scan and enable_parallel_extraction and self.parallel_scan_workers > 1
+        )
         self.enable_analysis_cache = enable_analysis_cache
         self.analysis_cache = AnalysisCache(cache_dir) if enable_analysis_cache else None
         self.incremental_cache = IncrementalCache(cache_dir) if enable_analysis_cache else None
         self._analysis_config_signature = ""
+        # Resolved module file -> content hash from the library fingerprint tree
+        self._module_fingerprints: Dict[str, str] = {}
+        # Incremental rescan: discover modules statically and re-extract/re-score only changed ones
+        self.incremental_rescan = incremental_rescan and self.incremental_cache is not None
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._static_modules: Dict[str, Dict[str, Any]] = {}
+        self._reusable_score_features: Dict[str, Dict[str, Any]] = {}
+        # module -> qualname -> score features, recorded in the manifest
+        self._score_features: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self._functions_rescored = 0
+        self.spec_diff: Optional[Dict[str, Any]] = None
+        self.rescan_stats: Dict[str, int] = {}
+        # Static analysis: read sources and .pyi stubs instead of importing the library;
+        # modules with neither (C extensions) are imported only with static_import_fallback
+        self.static_analysis = static_analysis
+        self.static_import_fallback = static_import_fallback
+        self._static_library: Optional[StaticLibrary] = None
         self._import_executor: Optional[ThreadPoolExecutor] = (
             ThreadPoolExecutor(
                 max_workers=self.parallel_scan_workers,
@@ -104,6 +167,8 @@ class APIAnalyzer:
         self._ast_return_index_cache: Dict[str, Dict[int, str]] = {}
         self._ast_name_index_cache: Dict[str, Dict[str, str]] = {}
         self._module_all_cache: Dict[str, Optional[Set[str]]] = {}
+        # module -> (matches the internal module pattern, matches the internal path heuristic)
+        self._module_path_flags: Dict[str, Tuple[bool, bool]] = {}
         self._signature_cache: Dict[int, inspect.Signature] = {}
         
         # Apply quality mode presets
@@ -115,7 +180,8 @@ class APIAnalyzer:
         self.skipped_functions: List[Dict[str, str]] = []
         self.object_returning_functions: List[FunctionInfo] = []
         self.function_scores: Dict[str, float] = {}
-        self.function_score_breakdowns: Dict[str, Dict[str, Any]] = {}
+        # Materialized on first read; see ScoreBreakdowns
+        self.function_score_breakdowns: Mapping[str, Dict[str, Any]] = {}
         self.quality_stats: Dict[str, Any] = {}
     
     def _apply_quality_mode(self):
@@ -153,10 +219,16 @@ class APIAnalyzer:
     
     def analyze(self) -> Dict[str, Any]:
         """Analyze library - Enhanced version with quality filtering."""
-        try:
-            root = importlib.import_module(self.library_name)
-        except ImportError as e:
-            return {"error": f"Cannot import: {e}"}
+        if self.static_analysis:
+            self._static_library = StaticLibrary(self.library_name)
+            root = self._static_library.namespace(self.library_name)
+            if root is None:
+                return {"error": f"Cannot locate: {self.library_name}"}
+        else:
+            try:
+                root = importlib.import_module(self.library_name)
+            except ImportError as e:
+                return {"error": f"Cannot import: {e}"}
 
         cache_key = None
         self._analysis_config_signature = self._build_analysis_config_signature()
@@ -166,13 +238,23 @@ class APIAnalyzer:
             cached = self.analysis_cache.load(cache_key)
             if cached:
                 self.quality_stats = cached.get("x-allbemcp", {}).get("quality_stats", {})
+                if self.incremental_rescan:
+                    self._manifest = self._load_manifest()
+                    self._save_manifest(cached, reuse_modules=True)
                 if self._import_executor is not None:
                     self._import_executor.shutdown(wait=False)
                     self._import_executor = None
                 return cached
         
         # 1. Scan module
-        self._scan_module(root)
+        if self.incremental_rescan:
+            self._manifest = self._load_manifest()
+        if self.incremental_rescan or self.static_analysis:
+            self._scan_discovered_modules(root)
+        elif self.enable_parallel_extraction:
+            self._scan_modules_parallel(root)
+        else:
+            self._scan_module(root)
         
         # 2. If quality filtering is enabled, apply post-processing
         if self.enable_quality_filter:
@@ -184,6 +266,9 @@ class APIAnalyzer:
         if cache_key and self.analysis_cache:
             self.analysis_cache.save(cache_key, spec)
 
+        if self.incremental_rescan:
+            self._save_manifest(spec)
+
         if self._import_executor is not None:
             self._import_executor.shutdown(wait=False)
             self._import_executor = None
@@ -206,7 +291,9 @@ class APIAnalyzer:
             "adaptive_keep_ratio": self.adaptive_keep_ratio,
             "adaptive_min_keep": self.adaptive_min_keep,
             "adaptive_max_keep": self.adaptive_max_keep,
-            "quality_rules_version": "2026-02-quality-filter-v2",
+            "static_analysis": self.static_analysis,
+            "static_import_fallback": self.static_import_fallback,
+            "quality_rules_version": "2026-10-quality-filter-v3",
         }
         return hashlib.blake2b(
             json.dumps(payload, sort_keys=True).encode("utf-8"),
@@ -214,36 +301,23 @@ class APIAnalyzer:
         ).hexdigest()
 
     def _compute_library_fingerprint(self, root_module: ModuleType) -> str:
-        chunks: List[str] = []
+        """Merkle-tree content fingerprint over every module within max_depth.
+
+        Also records per-module leaf hashes for the IncrementalCache and drops
+        cached records of modules that changed since the persisted tree.
+        """
+        cache_dir = str(self.analysis_cache.cache_dir) if self.analysis_cache else None
         try:
-            version = getattr(root_module, "__version__", None)
-            if version:
-                chunks.append(f"version:{version}")
-
-            root_file = getattr(root_module, "__file__", None)
-            if root_file and Path(root_file).exists():
-                p = Path(root_file)
-                st = p.stat()
-                chunks.append(f"{p}:{st.st_mtime_ns}:{st.st_size}")
-
-            root_paths = getattr(root_module, "__path__", None)
-            if root_paths:
-                for root_path in root_paths:
-                    base = Path(root_path)
-                    if not base.exists():
-                        continue
-                    for py in base.glob("*/__init__.py"):
-                        try:
-                            st = py.stat()
-                            chunks.append(f"{py}:{st.st_mtime_ns}:{st.st_size}")
-                        except Exception:
-                            continue
+            fingerprint = LibraryFingerprinter(self.library_name, self.max_depth, cache_dir).compute(root_module)
         except Exception:
-            pass
+            # Unknown state: use a fresh fingerprint so no stale whole-library result is served
+            self._module_fingerprints = {}
+            return os.urandom(16).hex()
 
-        chunks.sort()
-        payload = "|".join(chunks)
-        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+        self._module_fingerprints = fingerprint.module_hashes
+        if fingerprint.changed_modules and self.incremental_cache is not None:
+            self.incremental_cache.invalidate_modules(fingerprint.changed_modules)
+        return fingerprint.root_hash
 
     def _get_signature_cached(self, func_obj: Any) -> Optional[inspect.Signature]:
         key = id(func_obj)
@@ -267,6 +341,11 @@ class APIAnalyzer:
             module_name = func.module
             if module_name in self._module_all_cache:
                 continue
+            static_module = self._static_modules.get(module_name)
+            if static_module is not None:
+                module_all = static_module['module_all']
+                self._module_all_cache[module_name] = set(module_all) if module_all is not None else None
+                continue
             module_obj = sys.modules.get(module_name)
             if module_obj and hasattr(module_obj, '__all__'):
                 try:
@@ -294,24 +373,33 @@ class APIAnalyzer:
 
         score_weights = self._get_adaptive_weights()
 
+        features_list: List[Dict[str, Any]] = []
         for func in self.functions:
-            score, breakdown = self.calculate_function_score_detailed(
-                func,
-                score_weights,
-                module_all=self._module_all_cache.get(func.module),
-            )
-
-            signal = module_all_signal_strength.get(func.module, 0.7)
-            if signal < 0.5 and score > 80:
-                excess = score - 80
-                score = 80 + excess * signal
+            # Features do not depend on the weights, so unchanged modules keep theirs
+            features = self._reusable_score_features.get(func.qualname)
+            if features is None:
+                features = self._score_features_for(func, self._module_all_cache.get(func.module))
+                self._functions_rescored += 1
+            if self.incremental_rescan:
+                self._score_features[func.module][func.qualname] = features
+            features_list.append(features)
+
+        signals = [module_all_signal_strength.get(func.module, 0.7) for func in self.functions]
+        if vectorized_scoring_available():
+            scores = combine_scores(features_list, score_weights, self.SCORE_DIMENSIONS, signals)
+        else:
+            scores = [
+                self._damp_score(self._combine_score_features(features, score_weights)[0], signal)
+                for features, signal in zip(features_list, signals)
+            ]
 
+        breakdowns = ScoreBreakdowns(self._combine_score_features, score_weights)
+        for func, features, score in zip(self.functions, features_list, scores):
             self.function_scores[func.qualname] = score
-            breakdown['final_score'] = score
-            self.function_score_breakdowns[func.qualname] = breakdown
-            
+            breakdowns.add(func.qualname, features, score)
             if score >= self.min_quality_score:
                 scored_functions.append((func, score))
+        self.function_score_breakdowns = breakdowns
         
         # Fallback mechanism: if too few functions found and mode is not permissive, try lowering threshold
         # If we found very few high-quality functions, we should include medium-quality ones too
@@ -350,8 +438,27 @@ class APIAnalyzer:
         # 5. Record statistics
         self._collect_quality_stats(scored_functions)
 
+    @staticmethod
+    def _damp_score(score: float, signal: float) -> float:
+        """Pull very high scores towards 80 when the module's __all__ signal is weak"""
+        if signal < 0.5 and score > 80:
+            excess = score - 80
+            score = 80 + excess * signal
+        return score
+
     def _apply_adaptive_filter(self, scored_functions: List[Tuple[FunctionInfo, float]]) -> List[Tuple[FunctionInfo, float]]:
         """Adaptive filter using minimum guarantee + global weighted heap selection."""
+        if vectorized_scoring_available():
+            kept = adaptive_select(
+                [func.module for func, _ in scored_functions],
+                [score for _, score in scored_functions],
+                self._module_has_all,
+                self.adaptive_keep_ratio,
+                self.adaptive_min_keep,
+                self.adaptive_max_keep,
+            )
+            return [scored_functions[i] for i in kept]
+
         by_module: Dict[str, List[Tuple[FunctionInfo, float]]] = defaultdict(list)
         for func, score in scored_functions:
             by_module[func.module].append((func, score))
@@ -406,11 +513,17 @@ class APIAnalyzer:
         module_weights: Dict[str, float] = {}
         for module, items in by_module.items():
             depth = max(1, len(module.split('.')))
-            module_obj = sys.modules.get(module)
-            has_all = bool(module_obj and hasattr(module_obj, '__all__'))
+            has_all = self._module_has_all(module)
             avg_score = sum(score for _, score in items) / max(len(items), 1)
             module_weights[module] = ((1.0 / depth) * (2.0 if has_all else 1.0)) * (0.5 + avg_score / 200.0)
         return module_weights
+
+    def _module_has_all(self, module: str) -> bool:
+        static_module = self._static_modules.get(module)
+        if static_module is not None:
+            return static_module['module_all'] is not None
+        module_obj = sys.modules.get(module)
+        return bool(module_obj and hasattr(module_obj, '__all__'))
     
     def _get_adaptive_weights(self) -> Dict[str, float]:
         """Get score weights adapted to the current library characteristics."""
@@ -453,61 +566,81 @@ class APIAnalyzer:
         module_all: Optional[Set[str]] = None,
     ) -> Tuple[float, Dict[str, Any]]:
         """Calculate quality score and return per-dimension score breakdown."""
-        score = 0.0
-        weights = weights or self._get_adaptive_weights()
-        breakdown: Dict[str, Any] = {
-            'weights': dict(weights),
-            'metrics': {},
-            'adjustments': {},
-        }
-
-        all_bonus = 0.0
-        if QualityMetrics._INTERNAL_PATTERN.search(func_info.module):
-            breakdown['adjustments']['rejected'] = 'internal_module'
-            return 0.0, breakdown
+        features = self._score_features_for(func_info, module_all)
+        return self._combine_score_features(features, weights or self._get_adaptive_weights())
+
+    def _score_features_for(self, func_info: FunctionInfo, module_all: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Weight-independent inputs of a function's score (JSON-serializable).
+
+        Dimensions are recorded in SCORE_DIMENSIONS order; a rejected function
+        carries the reason and only the dimensions evaluated before rejection.
+        """
+        path_flags = self._module_path_flags.get(func_info.module)
+        if path_flags is None:
+            path_flags = self._module_path_flags[func_info.module] = (
+                bool(QualityMetrics._INTERNAL_PATTERN.search(func_info.module)),
+                bool(re.search(r'(internal|_private|compat|testing)', func_info.module)),
+            )
+        internal_module, internal_path = path_flags
+        if internal_module:
+            return {'rejected': 'internal_module'}
 
         if func_info.name.startswith('_'):
-            breakdown['adjustments']['rejected'] = 'private_name'
-            return 0.0, breakdown
+            return {'rejected': 'private_name'}
 
+        all_bonus = 0.0
         if module_all is not None and not func_info.class_name:
             if func_info.name in module_all:
                 all_bonus = 15.0
 
-        _, doc_score = QualityMetrics.has_good_documentation(func_info)
-        doc_contrib = weights['documentation'] * doc_score
-        score += doc_contrib
-        breakdown['metrics']['documentation'] = {'metric': doc_score, 'contrib': doc_contrib}
-
-        _, type_score = QualityMetrics.has_type_annotations(func_info)
-        type_contrib = weights['type_annotations'] * type_score
-        score += type_contrib
-        breakdown['metrics']['type_annotations'] = {'metric': type_score, 'contrib': type_contrib}
+        features: Dict[str, Any] = {}
+        _, features['documentation'] = QualityMetrics.has_good_documentation(func_info)
+        _, features['type_annotations'] = QualityMetrics.has_type_annotations(func_info)
 
         if module_all is not None and not func_info.class_name:
             public_score = 1.0 if func_info.name in module_all else 0.0
         else:
             module_parts = func_info.module.split('.')
             is_top_level = len(module_parts) <= 2 and not func_info.class_name
-            if re.search(r'(internal|_private|compat|testing)', func_info.module):
-                breakdown['adjustments']['rejected'] = 'internal_path_heuristic'
-                return 0.0, breakdown
+            if internal_path:
+                features['rejected'] = 'internal_path_heuristic'
+                return features
             public_score = 0.9 if is_top_level else 0.7
-        public_contrib = weights['public_api'] * public_score
-        score += public_contrib
-        breakdown['metrics']['public_api'] = {'metric': public_score, 'contrib': public_contrib}
+        features['public_api'] = public_score
+
+        _, features['naming'] = QualityMetrics.naming_quality(func_info)
+        _, features['hierarchy'] = QualityMetrics.hierarchy_quality(func_info, self._static_library)
+        _, features['usability'] = QualityMetrics.api_usability_score(func_info)
+        features['all_bonus'] = all_bonus
+        features['simple_return'] = not func_info.returns_object
+        features['is_constructor'] = bool(func_info.is_constructor)
+        return features
 
-        _, name_score = QualityMetrics.naming_quality(func_info)
-        name_contrib = weights['naming'] * name_score
-        score += name_contrib
-        breakdown['metrics']['naming'] = {'metric': name_score, 'contrib': name_contrib}
+    def _combine_score_features(
+        self,
+        features: Dict[str, Any],
+        weights: Dict[str, float],
+    ) -> Tuple[float, Dict[str, Any]]:
+        """Weigh score features into the final score and its breakdown."""
+        score = 0.0
+        breakdown: Dict[str, Any] = {
+            'weights': dict(weights),
+            'metrics': {},
+            'adjustments': {},
+        }
 
-        _, hierarchy_score = QualityMetrics.hierarchy_quality(func_info)
-        hierarchy_contrib = weights['hierarchy'] * hierarchy_score
-        score += hierarchy_contrib
-        breakdown['metrics']['hierarchy'] = {'metric': hierarchy_score, 'contrib': hierarchy_contrib}
+        for dimension in self.SCORE_DIMENSIONS:
+            if dimension not in features:
+                break
+            contrib = weights[dimension] * features[dimension]
+            score += contrib
+            breakdown['metrics'][dimension] = {'metric': features[dimension], 'contrib': contrib}
 
-        _, usability_score = QualityMetrics.api_usability_score(func_info)
+        if 'rejected' in features:
+            breakdown['adjustments']['rejected'] = features['rejected']
+            return 0.0, breakdown
+
+        usability_score = features['usability']
         if usability_score < 0.5:
             factor = 0.5 + 0.5 * usability_score
             score *= factor
@@ -522,14 +655,15 @@ class APIAnalyzer:
             breakdown['metrics']['usability'] = {'metric': usability_score, 'contrib': usability_bonus}
 
         simple_return_bonus = 0.0
-        if not func_info.returns_object:
+        if features['simple_return']:
             simple_return_bonus = 5.0
             score += simple_return_bonus
 
+        all_bonus = features['all_bonus']
         score += all_bonus
 
         constructor_penalty = 0.0
-        if func_info.is_constructor and doc_score < 0.5:
+        if features['is_constructor'] and features['documentation'] < 0.5:
             constructor_penalty = 10.0
             score -= constructor_penalty
 
@@ -626,44 +760,260 @@ class APIAnalyzer:
     
     def _scan_module(self, module: ModuleType, depth: int = 0):
         """扫描模块"""
-        if depth > self.max_depth or module.__name__ in self.analyzed:
+        if not self._enter_module(module, depth):
             return
-        
+
+        self._prepare_module_ast_cache(module)
+        self._scan_module_contents(module, self)
+
+        for sub in self._import_submodules(module, depth):
+            self._scan_module(sub, depth + 1)
+
+    def _scan_modules_parallel(self, root: ModuleType) -> None:
+        """Parallel variant of _scan_module with identical, deterministic output.
+
+        1. Discover modules depth-first (same order and filters as the serial scan).
+        2. Build AST return-type indexes (in worker processes if ast_process_workers is set).
+        3. Extract each module's functions on a thread pool into per-module buffers;
+           idle workers pull the next module from the shared queue, largest first.
+        4. Merge buffers in discovery order, so results match the serial scan.
+        """
+        modules: List[ModuleType] = []
+        self._discover_modules(root, 0, modules)
+
+        buffers = [_ModuleScanBuffer() for _ in modules]
+        self._extract_modules(modules, buffers)
+        self._merge_buffers(buffers)
+
+    def _extract_modules(self, modules: Sequence[ModuleType], buffers: Sequence["_ModuleScanBuffer"]) -> None:
+        """Extract each module into its buffer, on a thread pool when parallel extraction is on."""
+        self._prepare_ast_caches(modules)
+
+        # Longest modules first keeps the tail of the schedule short.
+        order = sorted(range(len(modules)), key=lambda i: self._estimate_module_cost(modules[i]), reverse=True)
+
+        def scan(index: int) -> None:
+            self._scan_module_contents(modules[index], buffers[index])
+
+        if self.enable_parallel_extraction and len(modules) > 1 and self.parallel_scan_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=self.parallel_scan_workers,
+                thread_name_prefix="allbemcp-scan",
+            ) as executor:
+                list(executor.map(scan, order))
+        else:
+            for index in order:
+                scan(index)
+
+    def _merge_buffers(self, buffers: Sequence["_ModuleScanBuffer"]) -> None:
+        for buffer in buffers:
+            self.functions.extend(buffer.functions)
+            self.object_returning_functions.extend(buffer.object_returning_functions)
+            self.skipped_functions.extend(buffer.skipped_functions)
+
+    def _scan_discovered_modules(self, root: ModuleType) -> None:
+        """Scan modules located on disk, extracting only those without a current cached record.
+
+        Used by the incremental rescan and by static analysis. Modules are
+        discovered without importing them (same order and filters as the
+        import-based scan); modules whose record still matches their fingerprint
+        are loaded from the IncrementalCache. The rest are imported and extracted,
+        or in static mode extracted from source. Score features of functions in
+        modules that, together with their parent packages, are unchanged since the
+        previous run's manifest are kept for _apply_quality_filtering.
+        """
+        previous = (self._manifest or {}).get('modules', {})
+        discovered = discover_modules(root, self.max_depth, self._is_internal_module)
+        buffers = [_ModuleScanBuffer() for _ in discovered]
+        stale: List[int] = []
+
+        for index, entry in enumerate(discovered):
+            self.analyzed.add(entry.name)
+            fingerprint = self._module_fingerprint_for(entry.file)
+            self._static_modules[entry.name] = {'fingerprint': fingerprint, 'module_all': None}
+            record = self._load_module_record(entry.name, entry.file)
+            if record is None or 'module_all' not in record:
+                stale.append(index)
+                continue
+            self._fill_from_module_record(record, buffers[index])
+            self._static_modules[entry.name]['module_all'] = record['module_all']
+
+        if self.static_analysis:
+            rescanned = self._extract_static_modules([discovered[i] for i in stale], [buffers[i] for i in stale])
+        else:
+            stale_modules: List[ModuleType] = []
+            stale_buffers: List[_ModuleScanBuffer] = []
+            for index in stale:
+                entry = discovered[index]
+                previous_entry = previous.get(entry.name)
+                changed = previous_entry is not None and previous_entry.get('fingerprint') != self._static_modules[entry.name]['fingerprint']
+                module = self._import_for_rescan(entry.name, reload=changed)
+                if module is None:
+                    del self._static_modules[entry.name]
+                    self.analyzed.discard(entry.name)
+                    continue
+                self._static_modules[entry.name]['module_all'] = self._module_all_names(module)
+                stale_modules.append(module)
+                stale_buffers.append(buffers[index])
+            self._extract_modules(stale_modules, stale_buffers)
+            rescanned = len(stale_modules)
+        self._merge_buffers(buffers)
+
+        unchanged = {
+            name for name, info in self._static_modules.items()
+            if info['fingerprint'] is not None
+            and previous.get(name, {}).get('fingerprint') == info['fingerprint']
+        }
+        reusable_modules = {
+            name for name in unchanged
+            if all(parent in unchanged for parent in ancestor_names(name) if parent in self._static_modules)
+        }
+        for name in reusable_modules:
+            self._reusable_score_features.update(previous[name].get('features') or {})
+
+        # Parent packages feed the hierarchy score of functions that are scored afresh
+        # (static analysis reads them from placeholder modules instead)
+        if not self.static_analysis:
+            rescored_modules = {f.module for f in self.functions if f.qualname not in self._reusable_score_features}
+            for parent in {p for name in rescored_modules for p in ancestor_names(name)}:
+                if parent not in sys.modules and parent in self._static_modules:
+                    self._safe_import_submodule(parent)
+
+        self.rescan_stats.update({
+            'modules_discovered': len(discovered),
+            'modules_reused': len(discovered) - len(stale),
+            'modules_rescanned': rescanned,
+            'modules_removed': len(set(previous) - set(self._static_modules)),
+        })
+
+    def _extract_static_modules(self, entries: Sequence[Any], buffers: Sequence["_ModuleScanBuffer"]) -> int:
+        """Extract modules from their source and stubs; returns how many were extracted.
+
+        Sources are parsed in AST worker processes when ast_process_workers is
+        set and there are enough of them. Modules with neither source nor stub are imported and scanned
+        normally if static_import_fallback is set, and skipped otherwise.
+        """
+        library = self._static_library
+        jobs = [library.job_for(entry.name) for entry in entries]
+        descriptions = iter(self._map_in_ast_workers(extract_module_source, [job for job in jobs if job is not None]))
+        for entry, job in zip(entries, jobs):
+            library.add(entry.name, next(descriptions) if job is not None else None)
+
+        extracted = imported = skipped = 0
+        for entry, buffer in zip(entries, buffers):
+            description = library.describe(entry.name)
+            if description is not None:
+                self._static_modules[entry.name]['module_all'] = description['all']
+                self._scan_static_module(entry.name, entry.file, buffer)
+                extracted += 1
+                continue
+
+            module = self._safe_import_submodule(entry.name) if self.static_import_fallback else None
+            if module is None:
+                del self._static_modules[entry.name]
+                self.analyzed.discard(entry.name)
+                skipped += 1
+                continue
+            self._static_modules[entry.name]['module_all'] = self._module_all_names(module)
+            self._scan_module_contents(module, buffer)
+            extracted += 1
+            imported += 1
+
+        self.rescan_stats.update({'modules_imported': imported, 'modules_unreadable': skipped})
+        return extracted
+
+    def _import_for_rescan(self, module_name: str, reload: bool) -> Optional[ModuleType]:
+        """Import a module, re-executing it if an outdated version is already loaded."""
+        module = sys.modules.get(module_name)
+        if module is None or not reload:
+            return self._safe_import_submodule(module_name)
+        try:
+            return importlib.reload(module)
+        except Exception:
+            return None
+
+    def _module_fingerprint_for(self, module_file: Optional[str]) -> Optional[str]:
+        if not module_file:
+            return None
+        try:
+            return self._module_fingerprints.get(str(Path(module_file).resolve()))
+        except OSError:
+            return None
+
+    def _module_all_names(self, module: ModuleType) -> Optional[List[str]]:
+        """A module's __all__ as a JSON-serializable list, or None if it has none."""
+        if not hasattr(module, '__all__'):
+            return None
+        try:
+            return list(dict.fromkeys(getattr(module, '__all__', []) or []))
+        except Exception:
+            return None
+
+    def _load_manifest(self) -> Optional[Dict[str, Any]]:
+        manifest = self.incremental_cache.load_manifest(self.library_name, self._analysis_config_signature)
+        if not manifest or manifest.get('version') != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def _save_manifest(self, spec: Dict[str, Any], reuse_modules: bool = False) -> None:
+        """Diff the spec against the previous manifest, then record this run for the next one."""
+        previous = self._manifest or {}
+        operations = operation_digests(spec)
+        self.spec_diff = diff_operations(previous.get('operations'), operations)
+        self.rescan_stats['functions_rescored'] = self._functions_rescored
+
+        if reuse_modules:
+            modules = previous.get('modules', {})
+        else:
+            modules = {
+                name: {'fingerprint': info['fingerprint'], 'features': self._score_features.get(name, {})}
+                for name, info in self._static_modules.items()
+            }
+
+        self.incremental_cache.save_manifest(
+            self.library_name,
+            self._analysis_config_signature,
+            {'version': MANIFEST_VERSION, 'modules': modules, 'operations': operations},
+        )
+
+    def _discover_modules(self, module: ModuleType, depth: int, found: List[ModuleType]) -> None:
+        if not self._enter_module(module, depth):
+            return
+        found.append(module)
+        for sub in self._import_submodules(module, depth):
+            self._discover_modules(sub, depth + 1, found)
+
+    def _enter_module(self, module: ModuleType, depth: int) -> bool:
+        """Apply depth/internal filters and mark the module analyzed. Returns False to skip it."""
+        if depth > self.max_depth or module.__name__ in self.analyzed:
+            return False
+
         # Skip test/internal/experimental modules early to reduce noise and speed up scanning
         if self._is_internal_module(module.__name__, getattr(module, "__file__", None)):
-            return
-        
+            return False
+
         self.analyzed.add(module.__name__)
+        return True
 
-        self._prepare_module_ast_cache(module)
+    def _estimate_module_cost(self, module: ModuleType) -> int:
+        module_file = getattr(module, '__file__', None)
+        if not module_file:
+            return 0
+        try:
+            return Path(module_file).stat().st_size
+        except OSError:
+            return 0
 
-        pre_functions_len = len(self.functions)
-        pre_skipped_len = len(self.skipped_functions)
+    def _scan_module_contents(self, module: ModuleType, out: Any) -> None:
+        """Extract a module's functions and classes into `out` (the analyzer or a _ModuleScanBuffer)."""
+        pre_functions_len = len(out.functions)
+        pre_skipped_len = len(out.skipped_functions)
 
         module_file = getattr(module, '__file__', None)
-        module_cache_hit = False
-        if (
-            self.enable_analysis_cache
-            and self.incremental_cache is not None
-            and module_file
-            and module_file.endswith('.py')
-        ):
-            cached = self.incremental_cache.get_module_cache(
-                module.__name__,
-                module_file,
-                self._analysis_config_signature or self._build_analysis_config_signature(),
-            )
-            if cached:
-                for item in cached.get('functions', []):
-                    func = self._deserialize_function_info_from_cache(item)
-                    if func is not None:
-                        self.functions.append(func)
-                        if func.returns_object:
-                            self.object_returning_functions.append(func)
-                self.skipped_functions.extend(cached.get('skipped', []))
-                module_cache_hit = True
-        
-        if not module_cache_hit:
+        cached = self._load_module_record(module.__name__, module_file)
+        if cached:
+            self._fill_from_module_record(cached, out)
+        else:
             try:
                 # 优先检查 __all__
                 if hasattr(module, '__all__'):
@@ -684,45 +1034,115 @@ class APIAnalyzer:
                             if info:
                                 # Check if returns complex object
                                 self._analyze_return_type(info, obj)
-
-                                # Check if suitable for API
-                                if self._is_suitable_for_api(info, obj):
-                                    self.functions.append(info)
-                                    if info.returns_object:
-                                        self.object_returning_functions.append(info)
-                                elif self.skip_non_serializable:
-                                    # Record skip reason
-                                    reason = self._get_unsuitability_reason(info, obj)
-                                    self.skipped_functions.append({
-                                        'qualname': info.qualname,
-                                        'reason': reason
-                                    })
+                                self._collect_function(info, obj, out)
 
                     elif inspect.isclass(obj) and not name.startswith('_'):
-                        self._scan_class(obj, module)
+                        self._scan_class(obj, module, out)
             except Exception:
                 pass
 
-            if (
-                self.enable_analysis_cache
-                and self.incremental_cache is not None
-                and module_file
-                and module_file.endswith('.py')
-            ):
-                module_funcs = [
-                    self._serialize_function_info_for_cache(f)
-                    for f in self.functions[pre_functions_len:]
-                    if f.module == module.__name__
-                ]
-                module_skipped = list(self.skipped_functions[pre_skipped_len:])
-                self.incremental_cache.save_module_cache(
-                    module.__name__,
-                    module_file,
-                    self._analysis_config_signature or self._build_analysis_config_signature(),
-                    module_funcs,
-                    module_skipped,
-                )
-        
+            self._save_module_record(
+                module.__name__, module_file, out, pre_functions_len, pre_skipped_len, self._module_all_names(module)
+            )
+
+    def _scan_static_module(self, module_name: str, module_file: Optional[str], out: Any) -> None:
+        """Static-analysis counterpart of _scan_module_contents, reading the module's description."""
+        pre_functions_len = len(out.functions)
+        pre_skipped_len = len(out.skipped_functions)
+        library = self._static_library
+        module = library.namespace(module_name)
+
+        try:
+            for name, obj in library.members(module_name):
+                if isinstance(obj, StaticClass):
+                    if not name.startswith('_'):
+                        self._scan_static_class(obj, module, out)
+                elif self._should_include(name, obj, module, is_method=False):
+                    info = self._extract_function(name, obj, module)
+                    if info:
+                        self._analyze_return_type(info, obj)
+                        self._collect_function(info, obj, out)
+        except Exception:
+            pass
+
+        self._save_module_record(
+            module_name, module_file, out, pre_functions_len, pre_skipped_len, library.describe(module_name)['all']
+        )
+
+    def _collect_function(self, info: FunctionInfo, obj: Any, out: Any) -> None:
+        """Add an extracted function to `out` if suitable for the API, else record why it was skipped."""
+        if self._is_suitable_for_api(info, obj):
+            out.functions.append(info)
+            if info.returns_object:
+                out.object_returning_functions.append(info)
+        elif self.skip_non_serializable:
+            # Record skip reason
+            reason = self._get_unsuitability_reason(info, obj)
+            out.skipped_functions.append({
+                'qualname': info.qualname,
+                'reason': reason
+            })
+
+    def _save_module_record(
+        self,
+        module_name: str,
+        module_file: Optional[str],
+        out: Any,
+        pre_functions_len: int,
+        pre_skipped_len: int,
+        module_all: Optional[List[str]],
+    ) -> None:
+        """Store what a module contributed to `out` in the IncrementalCache."""
+        if not (
+            self.enable_analysis_cache
+            and self.incremental_cache is not None
+            and module_file
+            and module_file.endswith('.py')
+        ):
+            return
+        module_funcs = [
+            self._serialize_function_info_for_cache(f)
+            for f in out.functions[pre_functions_len:]
+            if f.module == module_name
+        ]
+        module_skipped = list(out.skipped_functions[pre_skipped_len:])
+        self.incremental_cache.save_module_cache(
+            module_name,
+            module_file,
+            self._analysis_config_signature or self._build_analysis_config_signature(),
+            module_funcs,
+            module_skipped,
+            fingerprint=self._module_fingerprint_for(module_file),
+            module_all=module_all,
+        )
+
+    def _load_module_record(self, module_name: str, module_file: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The IncrementalCache record of a module if it matches the module's current fingerprint."""
+        if not (
+            self.enable_analysis_cache
+            and self.incremental_cache is not None
+            and module_file
+            and module_file.endswith('.py')
+        ):
+            return None
+        return self.incremental_cache.get_module_cache(
+            module_name,
+            module_file,
+            self._analysis_config_signature or self._build_analysis_config_signature(),
+            fingerprint=self._module_fingerprint_for(module_file),
+        )
+
+    def _fill_from_module_record(self, record: Dict[str, Any], out: Any) -> None:
+        for item in record.get('functions', []):
+            func = self._deserialize_function_info_from_cache(item)
+            if func is not None:
+                out.functions.append(func)
+                if func.returns_object:
+                    out.object_returning_functions.append(func)
+        out.skipped_functions.extend(record.get('skipped', []))
+
+    def _import_submodules(self, module: ModuleType, depth: int) -> List[ModuleType]:
+        submodules: List[ModuleType] = []
         if hasattr(module, '__path__'):
             try:
                 submodule_names: List[str] = []
@@ -734,7 +1154,6 @@ class APIAnalyzer:
 
                     submodule_names.append(subname)
 
-                submodules: List[ModuleType] = []
                 use_parallel = (
                     self._import_executor is not None
                     and len(submodule_names) > max(3, self.parallel_scan_workers)
@@ -749,11 +1168,9 @@ class APIAnalyzer:
                         sub = self._safe_import_submodule(subname)
                         if sub is not None:
                             submodules.append(sub)
-
-                for sub in submodules:
-                    self._scan_module(sub, depth + 1)
             except Exception:
                 pass
+        return submodules
 
     def _safe_import_submodule(self, subname: str) -> Optional[ModuleType]:
         try:
@@ -761,81 +1178,76 @@ class APIAnalyzer:
         except Exception:
             return None
 
-    def _prepare_module_ast_cache(self, module: ModuleType) -> None:
+    def _ast_file_key(self, module: ModuleType) -> Optional[str]:
+        """Resolved source path for AST indexing, or None if the module is not eligible."""
         file_path = getattr(module, '__file__', None)
         if not file_path:
-            return
+            return None
 
         p = Path(file_path)
         if p.suffix != '.py':
-            return
+            return None
 
         try:
             if p.stat().st_size > 512 * 1024:
-                return
+                return None
         except OSError:
-            return
+            return None
 
-        file_key = str(p.resolve())
-        if file_key in self._ast_cache:
+        return str(p.resolve())
+
+    def _prepare_module_ast_cache(self, module: ModuleType) -> None:
+        file_key = self._ast_file_key(module)
+        if file_key is None or file_key in self._ast_cache:
             return
 
-        try:
-            source = p.read_text(encoding='utf-8', errors='ignore')
-            tree = ast.parse(source, filename=file_key)
-        except Exception:
-            self._ast_cache[file_key] = True
-            self._ast_return_index_cache[file_key] = {}
-            self._ast_name_index_cache[file_key] = {}
+        self._store_ast_index(file_key, *_build_ast_return_index(file_key))
+
+    def _prepare_ast_caches(self, modules: Sequence[ModuleType]) -> None:
+        """Build AST indexes for many modules, in worker processes when it pays off."""
+        file_keys = list(dict.fromkeys(
+            key for key in (self._ast_file_key(m) for m in modules)
+            if key is not None and key not in self._ast_cache
+        ))
+        if not file_keys:
             return
 
-        self._ast_cache[file_key] = True
-        by_lineno: Dict[int, str] = {}
-        by_name: Dict[str, str] = {}
-
-        for node in tree.body:
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                inferred = self._infer_return_type_from_ast_node(node)
-                if inferred:
-                    by_lineno[node.lineno] = inferred
-                    by_name.setdefault(node.name, inferred)
-            elif isinstance(node, ast.ClassDef):
-                for item in node.body:
-                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        inferred = self._infer_return_type_from_ast_node(item)
-                        if inferred:
-                            by_lineno[item.lineno] = inferred
-                            by_name.setdefault(item.name, inferred)
+        for file_key, index in zip(file_keys, self._map_in_ast_workers(_build_ast_return_index, file_keys)):
+            self._store_ast_index(file_key, *index)
+
+    def _map_in_ast_workers(self, func: Any, items: List[Any]) -> List[Any]:
+        """[func(item) for item in items], in AST worker processes when there are enough items.
 
+        func must be a module-level (picklable) function.
+        """
+        workers = self.ast_process_workers
+        if workers > 0 and len(items) >= self.AST_PROCESS_MIN_FILES:
+            try:
+                # spawn: forking after importing the target library (and with import threads alive) is unsafe
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, len(items)),
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) as executor:
+                    chunksize = max(1, len(items) // (workers * 4))
+                    return list(executor.map(func, items, chunksize=chunksize))
+            except Exception:
+                # Process pool unavailable (sandbox, frozen app, ...): run in-process instead.
+                pass
+        return [func(item) for item in items]
+
+    def _store_ast_index(self, file_key: str, by_lineno: Dict[int, str], by_name: Dict[str, str]) -> None:
+        self._ast_cache[file_key] = True
         self._ast_return_index_cache[file_key] = by_lineno
         self._ast_name_index_cache[file_key] = by_name
 
     def _infer_return_type_from_ast_node(self, func_def: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> Optional[str]:
-        returns: List[str] = []
-        for node in ast.walk(func_def):
-            if isinstance(node, ast.Return):
-                if node.value is None:
-                    returns.append('None')
-                elif isinstance(node.value, ast.Constant):
-                    if node.value.value is None:
-                        returns.append('None')
-                    else:
-                        returns.append(type(node.value.value).__name__)
-                elif isinstance(node.value, ast.Call):
-                    if isinstance(node.value.func, ast.Name):
-                        returns.append(node.value.func.id)
-                    elif isinstance(node.value.func, ast.Attribute):
-                        returns.append(node.value.func.attr)
-
-        if not returns:
-            return 'None'
-        unique = list(dict.fromkeys(returns))
-        if len(unique) == 1:
-            return unique[0]
-        return 'Union[' + ', '.join(unique) + ']'
+        return _infer_return_type_from_ast_node(func_def)
     
-    def _scan_class(self, cls: type, module: ModuleType):
+    def _scan_class(self, cls: type, module: ModuleType, out: Any = None):
         """Scan class and expose constructor factory + static/class methods."""
+        if out is None:
+            out = self
+
         try:
             if not isinstance(cls, type):
                 return
@@ -855,11 +1267,7 @@ class APIAnalyzer:
         except (TypeError, ImportError):
             pass
 
-        cls_name = getattr(cls, '__name__', '')
-        if not cls_name or cls_name.startswith('_'):
-            return
-
-        if cls_name.endswith(('Mixin', 'Base', 'Abstract', 'Meta', 'Interface')) and cls_name not in ('DataFrame', 'DataBase'):
+        if not self._is_exposed_class_name(getattr(cls, '__name__', '')):
             return
 
         public_methods = [
@@ -869,36 +1277,7 @@ class APIAnalyzer:
         if len(public_methods) == 0:
             return
 
-        # Constructor factory: create_<class> that returns object_id through runtime object storage.
-        try:
-            init_obj = getattr(cls, '__init__', None)
-            if callable(init_obj):
-                constructor_name = f"create_{cls.__name__.lower()}"
-                constructor_info = self._extract_function(
-                    constructor_name,
-                    init_obj,
-                    module,
-                    class_name=cls.__name__,
-                    target_name='__init__',
-                    is_constructor=True,
-                )
-                if constructor_info and self._is_suitable_for_api(constructor_info, init_obj):
-                    has_any_doc = bool(constructor_info.doc)
-                    raw_annotations = constructor_info.raw_param_annotations or []
-                    has_any_annotation = any(
-                        ann not in (None, inspect.Parameter.empty)
-                        for ann in raw_annotations
-                    )
-
-                    if not has_any_doc and not has_any_annotation and len(constructor_info.parameters) == 0:
-                        pass
-                    else:
-                        constructor_info.returns_object = True
-                        constructor_info.object_methods = self._extract_object_methods(cls)
-                        self.functions.append(constructor_info)
-                        self.object_returning_functions.append(constructor_info)
-        except Exception:
-            pass
+        self._collect_constructor(cls, getattr(cls, '__init__', None), module, out)
         
         for name, member in inspect.getmembers(cls):
             if name.startswith('_'):
@@ -920,23 +1299,8 @@ class APIAnalyzer:
                 try:
                     sig = self._get_signature_cached(member)
                     if sig is None:
-                        should_extract = False
                         continue
-                    params = list(sig.parameters.keys())
-                    
-                    # Signature introspection filtering
-                    if not params:
-                        # No-param function -> static method -> keep
-                        should_extract = True
-                    elif params[0] == 'self':
-                        # First param is self -> instance method -> filter
-                        should_extract = False
-                    elif params[0] == 'cls':
-                        # First param is cls -> class method (not decorated with @classmethod) -> keep
-                        should_extract = True
-                    else:
-                        # Other cases -> static method -> keep
-                        should_extract = True
+                    should_extract = self._is_class_level_signature(sig)
                 except Exception:
                     # Cannot get signature -> conservatively skip
                     should_extract = False
@@ -947,18 +1311,72 @@ class APIAnalyzer:
                     if info:
                         # Analyze return type
                         self._analyze_return_type(info, member)
-                        
-                        # Check if suitable for API
-                        if self._is_suitable_for_api(info, member):
-                            self.functions.append(info)
-                            if info.returns_object:
-                                self.object_returning_functions.append(info)
-                        elif self.skip_non_serializable:
-                            reason = self._get_unsuitability_reason(info, member)
-                            self.skipped_functions.append({
-                                'qualname': info.qualname,
-                                'reason': reason
-                            })
+                        self._collect_function(info, member, out)
+
+    def _scan_static_class(self, cls: StaticClass, module: ModuleType, out: Any) -> None:
+        """Static-analysis counterpart of _scan_class."""
+        if cls.is_exception() or cls.is_abstract():
+            return
+        if not self._is_exposed_class_name(cls.__name__) or not cls.has_public_callables():
+            return
+
+        # Without an __init__ of its own or from a library base, the class uses object's
+        self._collect_constructor(cls, cls.init_function() or object.__init__, module, out)
+
+        for name, member, bound in cls.callable_members():
+            if not bound:
+                sig = self._get_signature_cached(member)
+                if sig is None or not self._is_class_level_signature(sig):
+                    continue
+            if self._should_include(name, member, module, is_method=True):
+                info = self._extract_function(name, member, module, class_name=cls.__name__)
+                if info:
+                    self._analyze_return_type(info, member)
+                    self._collect_function(info, member, out)
+
+    def _is_exposed_class_name(self, cls_name: str) -> bool:
+        if not cls_name or cls_name.startswith('_'):
+            return False
+        if cls_name.endswith(('Mixin', 'Base', 'Abstract', 'Meta', 'Interface')) and cls_name not in ('DataFrame', 'DataBase'):
+            return False
+        return True
+
+    def _is_class_level_signature(self, sig: inspect.Signature) -> bool:
+        """Signature introspection filtering: a function whose first parameter is self is an instance method."""
+        params = list(sig.parameters.keys())
+        # No params or first param not self (cls, or a static method's own) -> keep
+        return not params or params[0] != 'self'
+
+    def _collect_constructor(self, cls: Any, init_obj: Any, module: ModuleType, out: Any) -> None:
+        """Constructor factory: create_<class> that returns object_id through runtime object storage."""
+        try:
+            if callable(init_obj):
+                constructor_name = f"create_{cls.__name__.lower()}"
+                constructor_info = self._extract_function(
+                    constructor_name,
+                    init_obj,
+                    module,
+                    class_name=cls.__name__,
+                    target_name='__init__',
+                    is_constructor=True,
+                )
+                if constructor_info and self._is_suitable_for_api(constructor_info, init_obj):
+                    has_any_doc = bool(constructor_info.doc)
+                    raw_annotations = constructor_info.raw_param_annotations or []
+                    has_any_annotation = any(
+                        ann not in (None, inspect.Parameter.empty)
+                        for ann in raw_annotations
+                    )
+
+                    if not has_any_doc and not has_any_annotation and len(constructor_info.parameters) == 0:
+                        pass
+                    else:
+                        constructor_info.returns_object = True
+                        constructor_info.object_methods = self._extract_object_methods(cls)
+                        out.functions.append(constructor_info)
+                        out.object_returning_functions.append(constructor_info)
+        except Exception:
+            pass
     
     def _should_include(self, name: str, obj: Any, module: ModuleType = None, is_method: bool = False) -> bool:
         """Determine whether to include - Universal Intelligent Version"""
@@ -1018,6 +1436,8 @@ class APIAnalyzer:
     
     def _infer_return_type_from_ast(self, func_obj: Any) -> Optional[str]:
         """Infer return type via AST analysis (Static analysis, no side effects)"""
+        if isinstance(func_obj, StaticFunction):
+            return func_obj.inferred_return
         try:
             file_path = inspect.getsourcefile(func_obj)
             if file_path:
@@ -1045,12 +1465,16 @@ class APIAnalyzer:
         return None
 
     def _serialize_function_info_for_cache(self, func: FunctionInfo) -> Dict[str, Any]:
-        payload = asdict(func)
-        payload['raw_param_annotations'] = []
-        payload['raw_return_annotation'] = None
+        # Built field by field: asdict would deep-copy every parameter schema
+        payload = {field.name: getattr(func, field.name) for field in fields(func)}
+        payload['parameters'] = [p.to_dict() for p in func.parameters]
+        payload['parsed_doc'] = asdict(func.parsed_doc) if func.parsed_doc is not None else None
+        # Annotations are kept as type names: scoring only checks which ones are present
+        payload['raw_param_annotations'] = [_annotation_marker(a) for a in func.raw_param_annotations or []]
+        payload['raw_return_annotation'] = _annotation_marker(func.raw_return_annotation)
         return_type = payload.get('return_type')
         if not isinstance(return_type, (type(None), bool, int, float, str, list, dict)):
-            payload['return_type'] = str(return_type)
+            payload['return_type'] = _annotation_marker(func.return_type)
         return payload
 
     def _deserialize_function_info_from_cache(self, payload: Dict[str, Any]) -> Optional[FunctionInfo]:
@@ -1069,10 +1493,11 @@ class APIAnalyzer:
                 path=payload.get('path', ''),
                 returns_object=bool(payload.get('returns_object', False)),
                 object_methods=payload.get('object_methods') or [],
-                raw_param_annotations=[],
-                raw_return_annotation=None,
+                raw_param_annotations=payload.get('raw_param_annotations') or [],
+                raw_return_annotation=payload.get('raw_return_annotation'),
                 target_name=payload.get('target_name'),
                 is_constructor=bool(payload.get('is_constructor', False)),
+                parsed_doc=ParsedDocstring.from_dict(payload.get('parsed_doc')),
             )
         except Exception:
             return None
@@ -1110,36 +1535,63 @@ class APIAnalyzer:
         methods = []
         
         try:
-            if isinstance(obj_type, type):
-                for name, method in inspect.getmembers(obj_type, predicate=inspect.isfunction):
-                    if name.startswith('_'):
-                        continue
+            if isinstance(obj_type, StaticClass):
+                members = obj_type.function_members()
+            elif isinstance(obj_type, type):
+                members = inspect.getmembers(obj_type, predicate=inspect.isfunction)
+            else:
+                members = []
+            for name, method in members:
+                if name.startswith('_'):
+                    continue
+                
+                try:
+                    sig = inspect.signature(method)
+                    params = []
                     
-                    try:
-                        sig = inspect.signature(method)
-                        params = []
-                        
-                        for pname, param in sig.parameters.items():
-                            if pname in ('self', 'cls'):
-                                continue
-                            params.append({
-                                'name': pname,
-                                'type': str(param.annotation) if param.annotation != inspect.Parameter.empty else 'Any',
-                                'required': param.default == inspect.Parameter.empty
-                            })
-                        
-                        methods.append({
-                            'name': name,
-                            'params': params,
-                            'doc': inspect.getdoc(method) or ''
+                    for pname, param in sig.parameters.items():
+                        if pname in ('self', 'cls'):
+                            continue
+                        params.append({
+                            'name': pname,
+                            'type': str(param.annotation) if param.annotation != inspect.Parameter.empty else 'Any',
+                            'required': param.default == inspect.Parameter.empty
                         })
-                    except Exception:
-                        pass
+                    
+                    methods.append({
+                        'name': name,
+                        'params': params,
+                        'doc': inspect.getdoc(method) or ''
+                    })
+                except Exception:
+                    pass
         except Exception:
             pass
         
         return methods[:20]  # Limit quantity
     
+    def _is_pure_candidate(self, func: FunctionInfo) -> bool:
+        """
+        Whether a function looks safe to memoize: a module-level, synchronous
+        function with at least one parameter, all parameters and the return
+        annotation primitive. Parameterless functions (clocks, random sources)
+        are never suggested.
+        """
+        if func.class_name or func.is_async or func.returns_object or func.is_constructor:
+            return False
+        if not func.parameters:
+            return False
+        return_type = func.return_type
+        type_name = return_type.__name__ if isinstance(return_type, type) else str(return_type or '')
+        if type_name.startswith("<class '") and type_name.endswith("'>"):
+            type_name = type_name[len("<class '"):-2]  # str(int) from the analysis cache
+        if type_name not in self.PURE_RETURN_TYPE_NAMES:
+            return False
+        return all(
+            (param.get('schema') or {}).get('type') in self.PURE_PARAM_SCHEMA_TYPES
+            for param in func.parameters
+        )
+
     def _is_type_serializable(self, annotation: Any) -> bool:
         """Check if type is serializable - Universal Mechanism"""
         if annotation is None or annotation == inspect.Parameter.empty:
@@ -1409,29 +1861,25 @@ class APIAnalyzer:
         
         return str(annotation)
     
-    def _parse_docstring(self, obj: Any) -> Tuple[Optional[str], Optional[Any], Dict[str, Any]]:
-        """Parse docstring and build param docs map"""
+    def _parse_docstring(self, obj: Any) -> Tuple[Optional[str], Optional[ParsedDocstring], Dict[str, Any]]:
+        """Parse docstring (through the shared docstring cache) and build param docs map"""
         doc_string = inspect.getdoc(obj)
-        parsed_doc = None
+        parsed_doc = parse_docstring(doc_string)
         param_docs: Dict[str, Any] = {}
-        if doc_string and docstring_parser:
-            try:
-                parsed_doc = docstring_parser.parse(doc_string)
-                for p in parsed_doc.params:
-                    param_docs[p.arg_name] = p
-            except Exception:
-                pass
+        if parsed_doc is not None:
+            for p in parsed_doc.params:
+                param_docs[p.arg_name] = p
         return doc_string, parsed_doc, param_docs
 
     def _extract_parameters(
         self,
         sig: inspect.Signature,
         param_docs: Dict[str, Any],
-        parsed_doc: Optional[Any],
+        parsed_doc: Optional[ParsedDocstring],
         func_name: str
-    ) -> Tuple[List[Dict[str, Any]], List[Any]]:
+    ) -> Tuple[List[ParamInfo], List[Any]]:
         """Extract parameters and raw annotations from signature and docstring"""
-        parameters: List[Dict[str, Any]] = []
+        parameters: List[ParamInfo] = []
         raw_param_annotations: List[Any] = []
         existing_param_names = set()
 
@@ -1492,23 +1940,19 @@ class APIAnalyzer:
 
             # Try to extract enum values from description
             if description and "enum" not in schema:
-                enums = self._extract_enums_from_description(description)
+                enums = doc_param.enums
                 if enums:
                     schema["enum"] = enums
                     if "type" not in schema or schema.get("type") == "object":
                         schema["type"] = "string"
 
-            param_info = {
-                "name": pname,
-                "required": not is_optional,
-                "schema": schema,
-                "in": self._classify_param(pname, func_name)
-            }
-
-            if default_value is not None:
-                param_info["default"] = default_value
-
-            parameters.append(param_info)
+            parameters.append(ParamInfo(
+                name=pname,
+                required=not is_optional,
+                schema=schema,
+                location=self._classify_param(pname, func_name),
+                default=default_value,
+            ))
 
         return parameters, raw_param_annotations
 
@@ -1553,49 +1997,24 @@ class APIAnalyzer:
             doc=doc_string,
             parameters=parameters,
             return_type=return_type,
-            is_async=inspect.iscoroutinefunction(obj),
+            is_async=obj.is_async if isinstance(obj, StaticFunction) else inspect.iscoroutinefunction(obj),
             http_method=http_method,
             path=path,
             raw_param_annotations=raw_param_annotations,
             raw_return_annotation=raw_return_annotation,
             target_name=target_name or name,
             is_constructor=is_constructor,
+            parsed_doc=parsed_doc,
         )
 
-    def _extract_enums_from_description(self, description: str) -> Optional[List[str]]:
-        """Extract enum values from description"""
-        if not description:
-            return None
-            
-        # Pattern 1: One of: 'a', 'b', 'c'
-        match = re.search(r'One of:? (.*)', description, re.IGNORECASE)
-        if match:
-            values_str = match.group(1)
-            # Try to extract content in quotes
-            values = re.findall(r"['\"]([^'\"]+)['\"]", values_str)
-            if values:
-                return values
-            # Try comma separated
-            return [v.strip() for v in values_str.split(',') if v.strip()]
-            
-        # Pattern 2: {'a', 'b', 'c'}
-        match = re.search(r'\{([^}]+)\}', description)
-        if match:
-            values_str = match.group(1)
-            values = re.findall(r"['\"]([^'\"]+)['\"]", values_str)
-            if values:
-                return values
-        
-        return None
-
-    def _create_param_from_doc(self, doc_param: Any, func_name: str) -> Dict[str, Any]:
+    def _create_param_from_doc(self, doc_param: Any, func_name: str) -> ParamInfo:
         """Create parameter info from docstring parameter"""
         schema = TypeParser._parse_string_annotation(doc_param.type_name) if doc_param.type_name else {"type": "string"}
         
         description = doc_param.description
         if description:
             schema["description"] = description
-            enums = self._extract_enums_from_description(description)
+            enums = doc_param.enums
             if enums:
                 schema["enum"] = enums
                 if "type" not in schema or schema.get("type") == "object":
@@ -1613,12 +2032,12 @@ class APIAnalyzer:
         is_variadic = 'kwargs' in doc_param.arg_name.lower() or doc_param.arg_name == 'args'
         is_optional = doc_param.is_optional or is_optional_from_desc or is_variadic
         
-        return {
-            "name": doc_param.arg_name,
-            "required": not is_optional,
-            "schema": schema,
-            "in": self._classify_param(doc_param.arg_name, func_name)
-        }
+        return ParamInfo(
+            name=doc_param.arg_name,
+            required=not is_optional,
+            schema=schema,
+            location=self._classify_param(doc_param.arg_name, func_name),
+        )
     
     def _serialize_default(self, value: Any) -> Any:
         """Safely serialize default value"""
@@ -1857,6 +2276,7 @@ class APIAnalyzer:
                 "returns_object": func.returns_object,
                 "object_methods": func.object_methods if func.returns_object else None,
                 "is_constructor": func.is_constructor,
+                "pure_candidate": self._is_pure_candidate(func),
             }
         }
         
@@ -1952,6 +2372,63 @@ class APIAnalyzer:
         return operation
 
 
+def _annotation_marker(annotation: Any) -> Optional[str]:
+    """Source form of an annotation for the cache ('float', 'List[int]'), None when absent.
+
+    TypeParser reads these strings back into the same schemas as the annotations.
+    """
+    if annotation is None or annotation is inspect.Parameter.empty:
+        return None
+    if isinstance(annotation, str):
+        return annotation
+    try:
+        return inspect.formatannotation(annotation)
+    except Exception:
+        return str(annotation)
+
+
+class _ModuleScanBuffer:
+    """Per-module result lists filled by a scan worker and merged in discovery order."""
+
+    __slots__ = ('functions', 'object_returning_functions', 'skipped_functions')
+
+    def __init__(self):
+        self.functions: List[FunctionInfo] = []
+        self.object_returning_functions: List[FunctionInfo] = []
+        self.skipped_functions: List[Dict[str, str]] = []
+
+
+def _build_ast_return_index(file_key: str) -> Tuple[Dict[int, str], Dict[str, str]]:
+    """Parse a source file and index inferred return types by line number and by name.
+
+    Module-level and picklable so it can run in worker processes.
+    """
+    try:
+        source = Path(file_key).read_text(encoding='utf-8', errors='ignore')
+        tree = ast.parse(source, filename=file_key)
+    except Exception:
+        return {}, {}
+
+    by_lineno: Dict[int, str] = {}
+    by_name: Dict[str, str] = {}
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            inferred = _infer_return_type_from_ast_node(node)
+            if inferred:
+                by_lineno[node.lineno] = inferred
+                by_name.setdefault(node.name, inferred)
+        elif isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    inferred = _infer_return_type_from_ast_node(item)
+                    if inferred:
+                        by_lineno[item.lineno] = inferred
+                        by_name.setdefault(item.name, inferred)
+
+    return by_lineno, by_name
+
+
 def _format_python_value(value: Any, indent: int = 0) -> str:
     """Format Python value as code string"""
     if value is None:
@@ -1997,6 +2474,17 @@ def _infer_python_type(schema: Dict) -> str:
     return type_map.get(schema.get("type", "string"), "Any")
 
 
+def _cli_ast_workers(args: Any) -> int:
+    """AST worker processes for a command-line run (this entry point is __main__-guarded)"""
+    if args.serial_scan:
+        return 0
+    if args.ast_workers is not None:
+        return max(0, args.ast_workers)
+    # One AST worker process only adds spawn overhead, so require at least two.
+    workers = min(args.scan_workers, os.cpu_count() or 1)
+    return workers if workers >= 2 else 0
+
+
 def main():
     import argparse
     
@@ -2040,6 +2528,21 @@ def main():
     parser.add_argument('--no-input-complexity-filter', action='store_true',
                        help='Disable input complexity filter (allow functions accepting complex objects)')
 
+    parser.add_argument('--serial-scan', action='store_true',
+                       help='Scan modules serially (disable parallel imports, extraction and AST workers)')
+    parser.add_argument('--scan-workers', type=int, default=4,
+                       help='Worker count for parallel module scanning')
+    parser.add_argument('--ast-workers', type=int, default=None,
+                       help='Processes for parsing module sources during parallel scans '
+                            '(default: min(--scan-workers, CPU count) if that is at least 2, else 0)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Reanalyze only modules changed since the last incremental run and '
+                            'write the spec diff next to the output (<output>.diff.json)')
+    parser.add_argument('--static', action='store_true',
+                       help='Analyze source files and .pyi stubs without importing the library')
+    parser.add_argument('--static-import-fallback', action='store_true',
+                       help='With --static, import modules that have neither source nor stub (C extensions)')
+
     parser.add_argument('--stats', action='store_true', help='Show detailed statistics')
     
     args = parser.parse_args()
@@ -2059,6 +2562,12 @@ def main():
         'enable_deduplication': not args.no_dedup,
         'quality_mode': args.quality_mode,
         'enable_input_complexity_filter': not args.no_input_complexity_filter,
+        'enable_parallel_scan': not args.serial_scan,
+        'parallel_scan_workers': args.scan_workers,
+        'ast_process_workers': _cli_ast_workers(args),
+        'incremental_rescan': args.incremental,
+        'static_analysis': args.static,
+        'static_import_fallback': args.static_import_fallback,
     }
     
     if args.min_score is not None:
@@ -2080,6 +2589,17 @@ def main():
         json.dump(spec, f, indent=2, ensure_ascii=False)
     
     print(f"[SUCCESS] OpenAPI specification generated: {args.output}")
+
+    if analyzer.spec_diff is not None:
+        diff_output = str(Path(args.output).with_suffix('.diff.json'))
+        with open(diff_output, 'w', encoding='utf-8') as f:
+            json.dump(analyzer.spec_diff, f, indent=2, ensure_ascii=False)
+        diff = analyzer.spec_diff
+        print(f"[SUCCESS] Spec diff generated: {diff_output} "
+              f"(+{len(diff['added'])} -{len(diff['removed'])} ~{len(diff['changed'])})")
+        if analyzer.rescan_stats:
+            print(f"          Modules rescanned: {analyzer.rescan_stats.get('modules_rescanned', 0)}"
+                  f"/{analyzer.rescan_stats.get('modules_discovered', 0)}")
     
     # Show statistics
     if args.stats and analyzer.quality_stats:
@@ -2,9 +2,164 @@
 
 import hashlib
 import json
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+
+CACHE_DB_NAME = "analysis.sqlite3"
+
+
+def _encode(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class CacheStore:
+    """Single-file SQLite store shared by every library and analyzer config.
+
+    Records are compact JSON blobs next to indexed key columns, so a lookup
+    reads and decodes only the requested record; reads go through SQLite's
+    memory map. Each write is its own transaction (WAL journal), so readers
+    never observe a partially written record.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS specs (
+            cache_key TEXT PRIMARY KEY,
+            payload BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS modules (
+            module_key TEXT PRIMARY KEY,
+            module_name TEXT NOT NULL,
+            config_signature TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            payload BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS modules_by_name ON modules (module_name);
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            tree_key TEXT PRIMARY KEY,
+            payload BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS manifests (
+            manifest_key TEXT PRIMARY KEY,
+            payload BLOB NOT NULL
+        );
+    """
+
+    _stores: Dict[str, "CacheStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path),
+            timeout=30.0,
+            isolation_level=None,  # autocommit: every statement is an atomic transaction
+            check_same_thread=False,  # shared by the analyzer's scan threads, guarded by _lock
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.executescript(self._SCHEMA)
+
+    @classmethod
+    def open(cls, cache_dir: Path) -> Optional["CacheStore"]:
+        """Return the shared store for a cache directory, or None if SQLite is unavailable."""
+        if sqlite3 is None:
+            return None
+        db_path = (cache_dir / CACHE_DB_NAME).resolve()
+        with cls._stores_lock:
+            store = cls._stores.get(str(db_path))
+            # Reopen if the cache directory was wiped while the process was running
+            if store is None or not db_path.exists():
+                try:
+                    store = cls(db_path)
+                except Exception:
+                    return None
+                cls._stores[str(db_path)] = store
+            return store
+
+    def get_spec(self, cache_key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM specs WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_spec(self, cache_key: str, payload: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO specs (cache_key, payload) VALUES (?, ?)",
+                (cache_key, payload),
+            )
+
+    def get_module(self, module_key: str, fingerprint: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM modules WHERE module_key = ? AND fingerprint = ?",
+                (module_key, fingerprint),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_module(
+        self,
+        module_key: str,
+        module_name: str,
+        config_signature: str,
+        fingerprint: str,
+        payload: bytes,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO modules "
+                "(module_key, module_name, config_signature, fingerprint, payload) VALUES (?, ?, ?, ?, ?)",
+                (module_key, module_name, config_signature, fingerprint, payload),
+            )
+
+    def delete_modules(self, module_names: List[str]) -> int:
+        if not module_names:
+            return 0
+        with self._lock:
+            cursor = self._conn.executemany(
+                "DELETE FROM modules WHERE module_name = ?",
+                [(name,) for name in module_names],
+            )
+        return cursor.rowcount
+
+    def get_tree(self, tree_key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM fingerprints WHERE tree_key = ?", (tree_key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_tree(self, tree_key: str, payload: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (tree_key, payload) VALUES (?, ?)",
+                (tree_key, payload),
+            )
+
+    def get_manifest(self, manifest_key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM manifests WHERE manifest_key = ?", (manifest_key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_manifest(self, manifest_key: str, payload: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO manifests (manifest_key, payload) VALUES (?, ?)",
+                (manifest_key, payload),
+            )
+
 
 class AnalysisCache:
     """Simple incremental analysis cache keyed by library fingerprint and analyzer config."""
@@ -12,6 +167,7 @@ class AnalysisCache:
     def __init__(self, cache_dir: str = ".allbemcp_cache"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.store = CacheStore.open(self.cache_dir)
 
     def _cache_file(self, cache_key: str) -> Path:
         return self.cache_dir / f"{cache_key}.json"
@@ -21,6 +177,13 @@ class AnalysisCache:
         return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
 
     def load(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        if self.store is not None:
+            try:
+                payload = self.store.get_spec(cache_key)
+                return json.loads(payload) if payload is not None else None
+            except Exception:
+                return None
+
         cache_file = self._cache_file(cache_key)
         if not cache_file.exists():
             return None
@@ -30,6 +193,13 @@ class AnalysisCache:
             return None
 
     def save(self, cache_key: str, result: Dict[str, Any]) -> None:
+        if self.store is not None:
+            try:
+                self.store.put_spec(cache_key, _encode(result))
+            except Exception:
+                pass
+            return
+
         cache_file = self._cache_file(cache_key)
         try:
             cache_file.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
@@ -41,8 +211,12 @@ class IncrementalCache:
     """Module-level incremental cache for scanned function metadata."""
 
     def __init__(self, cache_dir: str = ".allbemcp_cache"):
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self.store = CacheStore.open(Path(cache_dir))
         self.cache_dir = Path(cache_dir) / "modules"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if self.store is None:
+            # JSON-file fallback when SQLite is unavailable
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
 
     def _module_key(self, module_name: str, module_file: str, config_signature: str) -> str:
         raw = f"{module_name}|{module_file}|{config_signature}"
@@ -58,12 +232,32 @@ class IncrementalCache:
         except Exception:
             return None
 
-    def get_module_cache(self, module_name: str, module_file: str, config_signature: str) -> Optional[Dict[str, Any]]:
-        fingerprint = self._module_fingerprint(module_file)
+    def get_module_cache(
+        self,
+        module_name: str,
+        module_file: str,
+        config_signature: str,
+        fingerprint: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached record if it matches `fingerprint` (default: the file's mtime/size)."""
+        fingerprint = fingerprint or self._module_fingerprint(module_file)
         if fingerprint is None:
             return None
 
         cache_key = self._module_key(module_name, module_file, config_signature)
+
+        if self.store is not None:
+            # Stale records are filtered by the indexed fingerprint column and never decoded.
+            try:
+                payload = self.store.get_module(cache_key, fingerprint)
+                if payload is None:
+                    return None
+                data = json.loads(payload)
+                data["fingerprint"] = fingerprint
+                return data
+            except Exception:
+                return None
+
         cache_file = self.cache_dir / f"{cache_key}.json"
         if not cache_file.exists():
             return None
@@ -83,19 +277,80 @@ class IncrementalCache:
         config_signature: str,
         functions: List[Dict[str, Any]],
         skipped: List[Dict[str, str]],
+        fingerprint: Optional[str] = None,
+        module_all: Optional[List[str]] = None,
     ) -> None:
-        fingerprint = self._module_fingerprint(module_file)
+        """Store a module's scan result; `module_all` is its __all__ (None if it has none)."""
+        fingerprint = fingerprint or self._module_fingerprint(module_file)
         if fingerprint is None:
             return
 
         cache_key = self._module_key(module_name, module_file, config_signature)
+        record = {"functions": functions, "skipped": skipped, "module_all": module_all}
+
+        if self.store is not None:
+            try:
+                self.store.put_module(
+                    cache_key,
+                    module_name,
+                    config_signature,
+                    fingerprint,
+                    _encode(record),
+                )
+            except Exception:
+                pass
+            return
+
         cache_file = self.cache_dir / f"{cache_key}.json"
-        payload = {
-            "fingerprint": fingerprint,
-            "functions": functions,
-            "skipped": skipped,
-        }
+        payload = {"fingerprint": fingerprint, **record}
         try:
             cache_file.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
         except Exception:
             pass
+
+    def _manifest_key(self, library_name: str, config_signature: str) -> str:
+        return f"{library_name}|{config_signature}"
+
+    def _manifest_file(self, manifest_key: str) -> Path:
+        digest = hashlib.blake2b(manifest_key.encode("utf-8"), digest_size=16).hexdigest()
+        return self.cache_dir.parent / "manifests" / f"{digest}.json"
+
+    def load_manifest(self, library_name: str, config_signature: str) -> Optional[Dict[str, Any]]:
+        """Summary of the previous incremental run for this library and config, if any."""
+        manifest_key = self._manifest_key(library_name, config_signature)
+        try:
+            if self.store is not None:
+                payload = self.store.get_manifest(manifest_key)
+                return json.loads(payload) if payload is not None else None
+            manifest_file = self._manifest_file(manifest_key)
+            if manifest_file.exists():
+                return json.loads(manifest_file.read_text(encoding="utf-8"))
+        except Exception:
+            pass
+        return None
+
+    def save_manifest(self, library_name: str, config_signature: str, manifest: Dict[str, Any]) -> None:
+        manifest_key = self._manifest_key(library_name, config_signature)
+        try:
+            if self.store is not None:
+                self.store.put_manifest(manifest_key, _encode(manifest))
+                return
+            manifest_file = self._manifest_file(manifest_key)
+            manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            manifest_file.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        except Exception:
+            pass
+
+    def invalidate_modules(self, module_names: List[str]) -> None:
+        """Drop cached records of modules known to have changed.
+
+        Stale records are never served anyway (their fingerprint no longer
+        matches); this only reclaims space. The JSON fallback cannot look
+        records up by module name and leaves them in place.
+        """
+        if self.store is None or not module_names:
+            return
+        try:
+            self.store.delete_modules(module_names)
+        except Exception:
+            pass
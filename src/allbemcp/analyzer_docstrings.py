@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Docstring parsing shared by extraction and scoring.
+
+Extraction reads parameter descriptions, types and enum values from a
+function's docstring, and the quality metrics check the same docstring for a
+description, documented parameters and documented returns. Both go through
+``parse_docstring``, which parses each distinct docstring once (keyed by its
+hash) into a ``ParsedDocstring``: a small, JSON-friendly structure that is
+stored on ``FunctionInfo`` and persisted with it in the incremental cache.
+
+Docstrings without any section markup (``Args:``, ``:param``, ``@param``,
+numpydoc underlines) are split into short and long description directly,
+without running ``docstring_parser``.
+"""
+
+import hashlib
+import inspect
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    import docstring_parser
+except ImportError:
+    docstring_parser = None
+
+# Lines that can start a section in one of the styles docstring_parser reads:
+# Google titles ("Args:" alone on a line), reST fields (":param x:"),
+# epydoc fields ("@param x:") and numpydoc underlines ("----------")
+_SECTION_MARKER = re.compile(r'^[ \t]*(?:[A-Za-z][A-Za-z ]*:[ \t]*$|:|@|-{3,})', re.MULTILINE)
+
+_ONE_OF_PATTERN = re.compile(r'One of:? (.*)', re.IGNORECASE)
+_BRACES_PATTERN = re.compile(r'\{([^}]+)\}')
+_QUOTED_PATTERN = re.compile(r"['\"]([^'\"]+)['\"]")
+
+DEFAULT_CACHE_SIZE = 65536
+
+
+@dataclass
+class DocParam:
+    """A parameter documented in a docstring"""
+    arg_name: str
+    type_name: Optional[str] = None
+    description: Optional[str] = None
+    is_optional: Optional[bool] = None
+    enums: Optional[List[str]] = None
+
+
+@dataclass
+class DocReturns:
+    """The documented return value"""
+    type_name: Optional[str] = None
+    description: Optional[str] = None
+
+
+@dataclass
+class ParsedDocstring:
+    """The parts of a parsed docstring that extraction and scoring use"""
+    short_description: Optional[str] = None
+    long_description: Optional[str] = None
+    params: List[DocParam] = field(default_factory=list)
+    returns: Optional[DocReturns] = None
+
+    @classmethod
+    def from_dict(cls, payload: Any) -> Optional["ParsedDocstring"]:
+        """Rebuild from the dict form stored in the incremental cache"""
+        if not isinstance(payload, dict):
+            return None
+        try:
+            returns = payload.get('returns')
+            return cls(
+                short_description=payload.get('short_description'),
+                long_description=payload.get('long_description'),
+                params=[DocParam(**p) for p in payload.get('params') or []],
+                returns=DocReturns(**returns) if isinstance(returns, dict) else None,
+            )
+        except TypeError:
+            return None
+
+
+def extract_enums(description: Optional[str]) -> Optional[List[str]]:
+    """Enum values listed in a parameter description ("One of: 'a', 'b'" or "{'a', 'b'}")"""
+    if not description:
+        return None
+    # Both patterns need one of these; most descriptions have neither
+    if '{' not in description and 'one of' not in description.lower():
+        return None
+
+    # Pattern 1: One of: 'a', 'b', 'c'
+    match = _ONE_OF_PATTERN.search(description)
+    if match:
+        values_str = match.group(1)
+        # Try to extract content in quotes
+        values = _QUOTED_PATTERN.findall(values_str)
+        if values:
+            return values
+        # Try comma separated
+        return [v.strip() for v in values_str.split(',') if v.strip()]
+
+    # Pattern 2: {'a', 'b', 'c'}
+    match = _BRACES_PATTERN.search(description)
+    if match:
+        values = _QUOTED_PATTERN.findall(match.group(1))
+        if values:
+            return values
+
+    return None
+
+
+def has_section_markers(doc: str) -> bool:
+    return _SECTION_MARKER.search(doc) is not None
+
+
+def _parse_plain(doc: str) -> ParsedDocstring:
+    """Split a docstring without sections the way docstring_parser does"""
+    short, _, rest = inspect.cleandoc(doc).partition('\n')
+    return ParsedDocstring(
+        short_description=short or None,
+        long_description=rest.strip() or None,
+    )
+
+
+def _parse_full(doc: str) -> Optional[ParsedDocstring]:
+    try:
+        parsed = docstring_parser.parse(doc)
+    except Exception:
+        return None
+    returns = None
+    if parsed.returns:
+        returns = DocReturns(type_name=parsed.returns.type_name, description=parsed.returns.description)
+    return ParsedDocstring(
+        short_description=parsed.short_description,
+        long_description=parsed.long_description,
+        params=[
+            DocParam(
+                arg_name=p.arg_name,
+                type_name=p.type_name,
+                description=p.description,
+                is_optional=p.is_optional,
+                enums=extract_enums(p.description),
+            )
+            for p in parsed.params
+        ],
+        returns=returns,
+    )
+
+
+class DocstringCache:
+    """Parsed docstrings keyed by docstring hash, evicting the oldest entries past max_entries"""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.plain = 0
+        self._entries: Dict[bytes, Optional[ParsedDocstring]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(doc: str) -> bytes:
+        return hashlib.blake2b(doc.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def parse(self, doc: Optional[str]) -> Optional[ParsedDocstring]:
+        """Parsed form of doc, or None without docstring_parser or if it cannot be parsed"""
+        if not doc or docstring_parser is None:
+            return None
+        key = self.key(doc)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        if has_section_markers(doc):
+            parsed = _parse_full(doc)
+        else:
+            parsed = _parse_plain(doc)
+            with self._lock:
+                self.plain += 1
+        self.store(doc, parsed)
+        return parsed
+
+    def store(self, doc: str, parsed: Optional[ParsedDocstring]) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[self.key(doc)] = parsed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.plain = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'plain': self.plain}
+
+
+_default_cache = DocstringCache()
+
+
+def parse_docstring(doc: Optional[str]) -> Optional[ParsedDocstring]:
+    """Parse doc through the process-wide DocstringCache"""
+    return _default_cache.parse(doc)
+
+
+def docstring_cache() -> DocstringCache:
+    return _default_cache
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Content-hash fingerprints for analyzed libraries.
+
+Every ``.py`` file the analyzer can reach within ``max_depth`` becomes a leaf
+of a Merkle tree (one node per package directory). Leaf hashes come from the
+installed distribution's RECORD when the recorded size still matches, from
+the persisted tree when the file's stat is unchanged, and from hashing the
+file contents otherwise. The root hash fingerprints the whole library; the
+leaf hashes fingerprint individual modules for IncrementalCache, and diffing
+against the persisted tree names exactly the modules that changed.
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+from allbemcp.analyzer_cache import CacheStore
+
+
+def _blake2b(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _normalize_dist_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "_", name).lower()
+
+
+def module_name_from_relpath(relpath: str) -> str:
+    """'pkg/sub/mod.py' -> 'pkg.sub.mod', 'pkg/__init__.py' -> 'pkg'"""
+    parts = relpath[:-3].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+@dataclass
+class LibraryFingerprint:
+    """Merkle tree over a library's source files."""
+    root_hash: str
+    # relpath -> {"stat": "<mtime_ns>:<size>", "hash": leaf hash}
+    files: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    # package directory relpath -> node hash
+    nodes: Dict[str, str] = field(default_factory=dict)
+    # resolved absolute path -> leaf hash (not persisted)
+    module_hashes: Dict[str, str] = field(default_factory=dict)
+    # modules whose leaf differs from the persisted tree; None when there was no previous tree
+    changed_modules: Optional[List[str]] = None
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {"root_hash": self.root_hash, "files": self.files, "nodes": self.nodes}
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "LibraryFingerprint":
+        return cls(
+            root_hash=payload.get("root_hash", ""),
+            files=payload.get("files", {}) or {},
+            nodes=payload.get("nodes", {}) or {},
+        )
+
+
+def diff_fingerprints(old: LibraryFingerprint, new: LibraryFingerprint) -> List[str]:
+    """Relpaths of files added, removed or modified between two trees.
+
+    Only files under package nodes whose hash changed are compared, so
+    unchanged subtrees are skipped wholesale.
+    """
+    if old.root_hash == new.root_hash:
+        return []
+
+    changed_dirs = {
+        d for d in set(old.nodes) | set(new.nodes)
+        if old.nodes.get(d) != new.nodes.get(d)
+    }
+    changed: List[str] = []
+    for relpath in sorted(set(old.files) | set(new.files)):
+        if relpath.rpartition("/")[0] not in changed_dirs and "/" in relpath:
+            continue
+        old_entry = old.files.get(relpath)
+        new_entry = new.files.get(relpath)
+        if old_entry is None or new_entry is None or old_entry.get("hash") != new_entry.get("hash"):
+            changed.append(relpath)
+    return changed
+
+
+class LibraryFingerprinter:
+    """Compute and persist the Merkle fingerprint of a library."""
+
+    def __init__(self, library_name: str, max_depth: int = 2, cache_dir: Optional[str] = None):
+        self.library_name = library_name
+        self.max_depth = max_depth
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.store = None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.store = CacheStore.open(self.cache_dir)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _tree_key(self) -> str:
+        return f"{self.library_name}|depth={self.max_depth}"
+
+    def _tree_file(self) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / "fingerprints" / f"{_blake2b(self._tree_key().encode('utf-8'))}.json"
+
+    def load_previous(self) -> Optional[LibraryFingerprint]:
+        try:
+            if self.store is not None:
+                payload = self.store.get_tree(self._tree_key())
+                return LibraryFingerprint.from_payload(json.loads(payload)) if payload is not None else None
+            tree_file = self._tree_file()
+            if tree_file is not None and tree_file.exists():
+                return LibraryFingerprint.from_payload(json.loads(tree_file.read_text(encoding="utf-8")))
+        except Exception:
+            pass
+        return None
+
+    def save(self, fingerprint: LibraryFingerprint) -> None:
+        payload = json.dumps(fingerprint.to_payload(), separators=(",", ":")).encode("utf-8")
+        try:
+            if self.store is not None:
+                self.store.put_tree(self._tree_key(), payload)
+                return
+            tree_file = self._tree_file()
+            if tree_file is not None:
+                tree_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = tree_file.with_suffix(".tmp")
+                tmp_file.write_bytes(payload)
+                os.replace(tmp_file, tree_file)
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Tree construction
+    # ------------------------------------------------------------------
+
+    def compute(self, root_module: ModuleType) -> LibraryFingerprint:
+        """Build the current tree, diff it against the persisted one, and persist it."""
+        previous = self.load_previous()
+        previous_files = previous.files if previous else {}
+
+        bases = self._source_roots(root_module)
+        records = self._load_record_hashes(bases)
+
+        files: Dict[str, Dict[str, str]] = {}
+        nodes: Dict[str, str] = {}
+        module_hashes: Dict[str, str] = {}
+        root_chunks: List[str] = []
+
+        version = getattr(root_module, "__version__", None)
+        if version:
+            root_chunks.append(f"version:{version}")
+
+        for base, is_package in bases:
+            if is_package:
+                node_hash = self._hash_package(
+                    base, base.name, 0, records, previous_files, files, nodes, module_hashes
+                )
+            else:
+                node_hash = self._hash_file(base, base.name, records, previous_files, files, module_hashes)
+            if node_hash is not None:
+                root_chunks.append(f"{base.name}:{node_hash}")
+
+        fingerprint = LibraryFingerprint(
+            root_hash=_blake2b("|".join(root_chunks).encode("utf-8")),
+            files=files,
+            nodes=nodes,
+            module_hashes=module_hashes,
+        )
+        if previous is not None:
+            fingerprint.changed_modules = [
+                module_name_from_relpath(relpath) for relpath in diff_fingerprints(previous, fingerprint)
+            ]
+        if previous is None or previous.root_hash != fingerprint.root_hash or previous.files != files:
+            self.save(fingerprint)
+        return fingerprint
+
+    def _source_roots(self, root_module: ModuleType) -> List[Tuple[Path, bool]]:
+        roots: List[Tuple[Path, bool]] = []
+        package_paths = getattr(root_module, "__path__", None)
+        if package_paths:
+            for entry in package_paths:
+                base = Path(entry)
+                if base.is_dir():
+                    roots.append((base.resolve(), True))
+        else:
+            root_file = getattr(root_module, "__file__", None)
+            if root_file and root_file.endswith(".py") and Path(root_file).exists():
+                roots.append((Path(root_file).resolve(), False))
+        return roots
+
+    def _hash_package(
+        self,
+        directory: Path,
+        relpath: str,
+        depth: int,
+        records: Dict[str, Tuple[str, int, int]],
+        previous_files: Dict[str, Dict[str, str]],
+        files: Dict[str, Dict[str, str]],
+        nodes: Dict[str, str],
+        module_hashes: Dict[str, str],
+    ) -> Optional[str]:
+        """Hash a package directory. `depth` is the package's module depth (root = 0)."""
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            return None
+
+        children: List[str] = []
+        for entry in entries:
+            name = entry.name
+            if entry.is_file() and name.endswith(".py"):
+                # The package's own __init__ sits at its depth, sibling modules one level deeper.
+                module_depth = depth if name == "__init__.py" else depth + 1
+                if module_depth > self.max_depth:
+                    continue
+                leaf = self._hash_file(
+                    Path(entry.path), f"{relpath}/{name}", records, previous_files, files, module_hashes
+                )
+                if leaf is not None:
+                    children.append(f"{name}:{leaf}")
+            elif (
+                entry.is_dir()
+                and name != "__pycache__"
+                and depth + 1 <= self.max_depth
+                and os.path.exists(os.path.join(entry.path, "__init__.py"))
+            ):
+                child = self._hash_package(
+                    Path(entry.path), f"{relpath}/{name}", depth + 1,
+                    records, previous_files, files, nodes, module_hashes,
+                )
+                if child is not None:
+                    children.append(f"{name}/:{child}")
+
+        node_hash = _blake2b("\n".join(children).encode("utf-8"))
+        nodes[relpath] = node_hash
+        return node_hash
+
+    def _hash_file(
+        self,
+        path: Path,
+        relpath: str,
+        records: Dict[str, Tuple[str, int, int]],
+        previous_files: Dict[str, Dict[str, str]],
+        files: Dict[str, Dict[str, str]],
+        module_hashes: Dict[str, str],
+    ) -> Optional[str]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        stat_key = f"{st.st_mtime_ns}:{st.st_size}"
+        abs_path = str(path)
+
+        record = records.get(abs_path)
+        previous = previous_files.get(relpath)
+        # RECORD describes the file as installed: a file modified after RECORD was
+        # written may have been edited in place (even keeping its size), so hash it.
+        if record is not None and record[1] == st.st_size and st.st_mtime_ns <= record[2]:
+            leaf = f"record:{record[0]}"
+        elif previous is not None and previous.get("stat") == stat_key:
+            leaf = previous["hash"]
+        else:
+            try:
+                leaf = f"blake2b:{self._hash_contents(path)}"
+            except OSError:
+                return None
+
+        files[relpath] = {"stat": stat_key, "hash": leaf}
+        module_hashes[abs_path] = leaf
+        return leaf
+
+    def _hash_contents(self, path: Path) -> str:
+        return _blake2b(path.read_bytes())
+
+    def _load_record_hashes(self, bases: List[Tuple[Path, bool]]) -> Dict[str, Tuple[str, int, int]]:
+        """Map absolute file path -> (RECORD hash, RECORD size, RECORD mtime_ns) for the library's distribution."""
+        records: Dict[str, Tuple[str, int, int]] = {}
+        for base, _ in bases:
+            for info_dir in self._find_distributions(base.parent, base.stem):
+                try:
+                    record_mtime = (info_dir / "RECORD").stat().st_mtime_ns
+                    dist = importlib.metadata.PathDistribution(info_dir)
+                    for entry in dist.files or []:
+                        if entry.hash is None or entry.size is None or entry.suffix != ".py":
+                            continue
+                        located = Path(dist.locate_file(entry)).resolve()
+                        records[str(located)] = (
+                            f"{entry.hash.mode}={entry.hash.value}", int(entry.size), record_mtime,
+                        )
+                except Exception:
+                    continue
+        return records
+
+    def _find_distributions(self, site_dir: Path, top_level: str) -> List[Path]:
+        """Find dist-info directories next to the package that install `top_level`."""
+        try:
+            info_dirs = [p for p in site_dir.iterdir() if p.name.endswith(".dist-info")]
+        except OSError:
+            return []
+
+        wanted = _normalize_dist_name(top_level)
+        # Fast path: distribution name matches the import name (numpy, pandas, requests, ...)
+        matches = [p for p in info_dirs if _normalize_dist_name(p.name[:-len(".dist-info")].split("-")[0]) == wanted]
+        if not matches:
+            for info_dir in info_dirs:
+                top_file = info_dir / "top_level.txt"
+                try:
+                    if top_file.exists() and top_level in top_file.read_text(encoding="utf-8").split():
+                        matches.append(info_dir)
+                except OSError:
+                    continue
+        return matches
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Helpers for the analyzer's incremental rescan mode.
+
+A full scan imports every submodule to find the next one. The incremental
+rescan instead walks the package directories with ``pkgutil`` (which locates
+modules without executing them), applies the same name, depth and internal
+filters as the import-based scan, and yields modules in the same depth-first
+order. Modules whose cached records still match their fingerprint are never
+imported.
+
+The result of each incremental run is summarized in a manifest (per-module
+fingerprints, per-function score features and a digest of every generated
+operation); the next run reuses the features of untouched modules and diffs
+its operations against the manifest to produce the spec diff.
+"""
+
+import hashlib
+import json
+import pkgutil
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional
+
+MANIFEST_VERSION = 1
+
+# Submodule names skipped by the import-based scan as well
+_SKIPPED_SUBMODULE_NAMES = ('tests', 'testing', 'test')
+
+
+@dataclass
+class StaticModule:
+    """A module located on disk without importing it."""
+    name: str
+    file: Optional[str]
+    depth: int
+
+
+def discover_modules(
+    root_module: ModuleType,
+    max_depth: int,
+    is_internal: Callable[[str, Optional[str]], bool],
+) -> List[StaticModule]:
+    """Modules within max_depth, in the order the import-based scan visits them."""
+    found: List[StaticModule] = []
+    seen = set()
+
+    def visit(name: str, file: Optional[str], search_paths: List[str], depth: int) -> None:
+        if depth > max_depth or name in seen or is_internal(name, file):
+            return
+        seen.add(name)
+        found.append(StaticModule(name=name, file=file, depth=depth))
+        if not search_paths:
+            return
+        try:
+            infos = list(pkgutil.iter_modules(search_paths, f"{name}."))
+        except Exception:
+            return
+        for info in infos:
+            last_part = info.name.rsplit('.', 1)[-1]
+            if last_part.startswith('_') or last_part.lower() in _SKIPPED_SUBMODULE_NAMES:
+                continue
+            try:
+                spec = info.module_finder.find_spec(info.name)
+            except Exception:
+                spec = None
+            if spec is None:
+                continue
+            origin = spec.origin if spec.has_location else None
+            visit(info.name, origin, list(spec.submodule_search_locations or []), depth + 1)
+
+    visit(
+        root_module.__name__,
+        getattr(root_module, '__file__', None),
+        list(getattr(root_module, '__path__', None) or []),
+        0,
+    )
+    return found
+
+
+def ancestor_names(module_name: str) -> List[str]:
+    """'a.b.c' -> ['a', 'a.b']"""
+    parts = module_name.split('.')
+    return ['.'.join(parts[:i]) for i in range(1, len(parts))]
+
+
+def operation_digests(spec: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """operationId -> {"method", "path", "digest"} for every operation of a spec."""
+    digests: Dict[str, Dict[str, str]] = {}
+    for path, methods in (spec.get('paths') or {}).items():
+        for method, operation in methods.items():
+            encoded = json.dumps(operation, sort_keys=True, ensure_ascii=False, default=str)
+            operation_id = operation.get('operationId') or f"{method} {path}"
+            digests[operation_id] = {
+                'method': method,
+                'path': path,
+                'digest': hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest(),
+            }
+    return digests
+
+
+def diff_operations(
+    previous: Optional[Dict[str, Dict[str, str]]],
+    current: Dict[str, Dict[str, str]],
+) -> Dict[str, Any]:
+    """Operations added, removed and changed since the previous run.
+
+    Without a previous run every operation counts as added. An operation
+    that moved to another path or method counts as changed.
+    """
+    previous = previous or {}
+
+    def entry(operation_id: str, digest: Dict[str, str]) -> Dict[str, str]:
+        return {'operationId': operation_id, 'method': digest['method'], 'path': digest['path']}
+
+    added = [entry(op_id, current[op_id]) for op_id in sorted(set(current) - set(previous))]
+    removed = [entry(op_id, previous[op_id]) for op_id in sorted(set(previous) - set(current))]
+    changed = [
+        entry(op_id, current[op_id])
+        for op_id in sorted(set(current) & set(previous))
+        if current[op_id] != previous[op_id]
+    ]
+    return {
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+        'unchanged': len(current) - len(added) - len(changed),
+    }
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Vectorized quality scoring.
+
+``APIAnalyzer._score_features_for`` reduces every function to a handful of
+weight-independent numbers (the per-dimension metrics, usability, the
+``__all__`` bonus and a few flags). When NumPy is installed, filtering puts
+those numbers into one column per feature and computes every score, the
+``__all__``-signal damping and the adaptive per-module selection as array
+operations. The arithmetic is done in the same order as the scalar path in
+``APIAnalyzer._combine_score_features``, so both paths produce identical
+scores and select the same functions.
+
+Score breakdowns are only read for the functions shown in reports, so
+``ScoreBreakdowns`` keeps each function's features and materializes its
+breakdown dict on first access.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def vectorized_scoring_available() -> bool:
+    return np is not None
+
+
+class FeatureTable:
+    """Score features of many functions, one NumPy column per feature"""
+
+    def __init__(self, features_list: Sequence[Dict[str, Any]]):
+        self.size = len(features_list)
+        self._features = features_list
+        self.rejected = np.fromiter(('rejected' in f for f in features_list), dtype=bool, count=self.size)
+
+    def column(self, name: str, default: float = 0.0) -> "np.ndarray":
+        # Rejected functions lack some features; their scores are zeroed anyway
+        return np.fromiter(
+            (f.get(name, default) for f in self._features), dtype=np.float64, count=self.size
+        )
+
+
+def combine_scores(
+    features_list: Sequence[Dict[str, Any]],
+    weights: Dict[str, float],
+    dimensions: Sequence[str],
+    signals: Sequence[float],
+) -> List[float]:
+    """Final scores of all functions; the vectorized form of _combine_score_features plus damping"""
+    if not features_list:
+        return []
+    table = FeatureTable(features_list)
+    score = np.zeros(table.size)
+    for dimension in dimensions:
+        score = score + weights[dimension] * table.column(dimension)
+
+    usability = table.column('usability', 1.0)
+    score = np.where(usability < 0.5, score * (0.5 + 0.5 * usability), score + 5.0 * usability)
+    score = np.where(table.column('simple_return') != 0, score + 5.0, score)
+    score = score + table.column('all_bonus')
+    penalized = (table.column('is_constructor') != 0) & (table.column('documentation') < 0.5)
+    score = np.where(penalized, score - 10.0, score)
+    score = np.maximum(0.0, np.minimum(score, 100.0))
+    score[table.rejected] = 0.0
+
+    # A weak __all__ signal pulls very high scores towards 80
+    signal = np.asarray(signals, dtype=np.float64)
+    damped = (signal < 0.5) & (score > 80)
+    score = np.where(damped, 80 + (score - 80) * signal, score)
+    return score.tolist()
+
+
+def adaptive_select(
+    modules: Sequence[str],
+    scores: Sequence[float],
+    module_has_all: Callable[[str], bool],
+    keep_ratio: float,
+    min_keep: int,
+    max_keep: int,
+) -> List[int]:
+    """Indices of the functions _apply_adaptive_filter keeps, in its result order.
+
+    Per module, the best min_keep functions are kept; the rest of the budget
+    goes to the next best (up to max_keep per module) by module-weighted score.
+    Ties are broken by position exactly as the heap-based selection does.
+    """
+    total_items = len(scores)
+    if not total_items:
+        return []
+    score = np.asarray(scores, dtype=np.float64)
+
+    # Modules numbered in order of first appearance
+    codes: Dict[str, int] = {}
+    group = np.fromiter((codes.setdefault(m, len(codes)) for m in modules), dtype=np.int64, count=total_items)
+    module_names = list(codes)
+    counts = np.bincount(group, minlength=len(module_names))
+
+    total_budget = max(1, int(total_items * keep_ratio))
+    min_needed = int(np.minimum(min_keep, counts).sum())
+    total_budget = min(total_items, max(total_budget, min_needed))
+
+    # Each module's functions best first, modules in order of first appearance
+    ranked = np.lexsort((-score, group))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.empty(total_items, dtype=np.int64)
+    rank[ranked] = np.arange(total_items) - starts[group[ranked]]
+
+    allocated = np.minimum(min(min_keep, max_keep), counts)
+    kept = ranked[rank[ranked] < allocated[group[ranked]]]
+
+    remaining_budget = total_budget - len(kept)
+    if remaining_budget > 0:
+        depth = np.array([max(1, len(name.split('.'))) for name in module_names], dtype=np.float64)
+        has_all = np.array([module_has_all(name) for name in module_names], dtype=bool)
+        avg_score = np.bincount(group, weights=score, minlength=len(module_names)) / np.maximum(counts, 1)
+        module_weight = ((1.0 / depth) * np.where(has_all, 2.0, 1.0)) * (0.5 + avg_score / 200.0)
+
+        cap = np.minimum(max_keep, counts)
+        candidate = (rank >= allocated[group]) & (rank < cap[group])
+        candidates = ranked[candidate[ranked]]
+        weighted = score[candidates] * module_weight[group[candidates]]
+        top = candidates[np.argsort(-weighted, kind='stable')][:remaining_budget]
+        kept = np.concatenate((kept, top))
+
+    return kept[np.argsort(-score[kept], kind='stable')][:total_budget].tolist()
+
+
+class ScoreBreakdowns(Mapping):
+    """qualname -> score breakdown, built from the stored features when first read"""
+
+    def __init__(
+        self,
+        combine: Callable[[Dict[str, Any], Dict[str, float]], Tuple[float, Dict[str, Any]]],
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        self._combine = combine
+        self._weights = weights or {}
+        self._entries: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._materialized: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, qualname: str, features: Dict[str, Any], final_score: float) -> None:
+        self._entries[qualname] = (features, final_score)
+        self._materialized.pop(qualname, None)
+
+    def __getitem__(self, qualname: str) -> Dict[str, Any]:
+        breakdown = self._materialized.get(qualname)
+        if breakdown is None:
+            features, final_score = self._entries[qualname]
+            _, breakdown = self._combine(features, self._weights)
+            breakdown['final_score'] = final_score
+            self._materialized[qualname] = breakdown
+        return breakdown
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, qualname: object) -> bool:
+        return qualname in self._entries
@@ -0,0 +1,1120 @@
+#!/usr/bin/env python3
+"""
+Static extraction for the analyzer's AST-only mode.
+
+The import-based scan executes every module of the target library. In static
+mode the analyzer reads each module's source instead, together with its
+``.pyi`` stub when there is one (stub signatures take precedence):
+``extract_module_source`` turns one module into a plain, picklable
+description of its functions, classes, imports and ``__all__``, and runs in
+worker processes for large libraries.
+
+In the analyzer process, ``StaticLibrary`` resolves re-exports and base
+classes across those descriptions and builds stand-ins that the extraction
+code inspects like the real objects:
+
+- ``StaticFunction``: a callable carrying ``__signature__``, ``__doc__``,
+  ``__module__`` and ``__qualname__`` (it cannot be called);
+- ``StaticClass``: a class's own and inherited members;
+- placeholder modules, never registered in ``sys.modules``, carrying
+  ``__file__``, ``__all__`` and the module's top-level names.
+
+Annotations are evaluated like the interpreter evaluates them, but only
+against builtins and a few standard library modules (``typing``,
+``collections.abc``, ``pathlib``, ...): a class the library defines or imports
+from elsewhere becomes an empty stand-in class with the same module and
+qualified name. Quoted annotations, and all annotations of a module with
+``from __future__ import annotations``, stay strings as they do at runtime.
+Definitions created dynamically (decorators that replace functions,
+``setattr``, metaclasses, ...) are not seen.
+"""
+
+import ast
+import builtins
+import importlib
+import importlib.machinery
+import inspect
+from pathlib import Path
+from types import GenericAlias, ModuleType
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# (module name, source file, is package, stub file): the unit of work of extract_module_source
+SourceJob = Tuple[str, Optional[str], bool, Optional[str]]
+
+# Decorators that turn a function into a non-function callable, which the import-based scan skips
+_WRAPPER_DECORATORS = ('lru_cache', 'cache', 'cached_property', 'partial', 'partialmethod')
+_PROPERTY_DECORATORS = ('property', 'cached_property', 'setter', 'getter', 'deleter')
+_ABSTRACT_DECORATORS = ('abstractmethod', 'abstractclassmethod', 'abstractstaticmethod', 'abstractproperty')
+
+# Standard library modules whose names annotations may use for real
+_ANNOTATION_MODULES = {
+    'typing': 'typing',
+    'typing_extensions': 'typing',
+    'collections': 'collections',
+    'collections.abc': 'collections.abc',
+    'datetime': 'datetime',
+    'decimal': 'decimal',
+    'enum': 'enum',
+    'fractions': 'fractions',
+    'io': 'io',
+    'numbers': 'numbers',
+    'os': 'os',
+    'pathlib': 'pathlib',
+    're': 're',
+    'types': 'types',
+    'uuid': 'uuid',
+}
+
+# Node types allowed in an annotation that is evaluated: names, attribute access,
+# subscripts, literals and `X | Y` unions, but no calls or private attributes
+_ANNOTATION_NODES = (
+    ast.Expression, ast.Name, ast.Attribute, ast.Subscript, ast.Tuple, ast.List,
+    ast.Constant, ast.BinOp, ast.BitOr, ast.Load,
+)
+
+_MAX_ALIAS_DEPTH = 8
+
+
+# ---------------------------------------------------------------------------
+# Source extraction (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+def extract_module_source(job: SourceJob) -> Optional[Dict[str, Any]]:
+    """Describe one module from its source file and/or stub.
+
+    Module-level and picklable so it can run in worker processes. Returns None
+    if neither file can be parsed.
+    """
+    module_name, source_path, is_package, stub_path = job
+    package = module_name if is_package else module_name.rpartition('.')[0]
+    source_tree = _parse_file(source_path)
+    stub_tree = _parse_file(stub_path)
+    if source_tree is None and stub_tree is None:
+        return None
+
+    if source_tree is None:
+        return _ModuleReader(module_name, package, is_stub=True).read(stub_tree)
+    description = _ModuleReader(module_name, package).read(source_tree)
+    if stub_tree is not None:
+        _overlay_stub(description, _ModuleReader(module_name, package, is_stub=True).read(stub_tree))
+    return description
+
+
+def infer_return_type(func_def: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> Optional[str]:
+    """Name of what a function's return statements return ('None', 'int', 'Report', 'Union[...]')."""
+    returns: List[str] = []
+    for node in ast.walk(func_def):
+        if isinstance(node, ast.Return):
+            if node.value is None:
+                returns.append('None')
+            elif isinstance(node.value, ast.Constant):
+                if node.value.value is None:
+                    returns.append('None')
+                else:
+                    returns.append(type(node.value.value).__name__)
+            elif isinstance(node.value, ast.Call):
+                if isinstance(node.value.func, ast.Name):
+                    returns.append(node.value.func.id)
+                elif isinstance(node.value.func, ast.Attribute):
+                    returns.append(node.value.func.attr)
+
+    if not returns:
+        return 'None'
+    unique = list(dict.fromkeys(returns))
+    if len(unique) == 1:
+        return unique[0]
+    return 'Union[' + ', '.join(unique) + ']'
+
+
+def _parse_file(path: Optional[str]) -> Optional[ast.Module]:
+    if not path:
+        return None
+    try:
+        return ast.parse(Path(path).read_bytes(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+class _ModuleReader:
+    """Reads the top level of one module's AST into a description dict."""
+
+    def __init__(self, module_name: str, package: str, is_stub: bool = False):
+        self.module_name = module_name
+        self.package = package
+        self.is_stub = is_stub
+        # Insertion-ordered like a module namespace: rebinding a name keeps its position
+        self.bindings: Dict[str, Dict[str, Any]] = {}
+        self.functions: Dict[str, Dict[str, Any]] = {}
+        self.classes: Dict[str, Dict[str, Any]] = {}
+        self.all_names: Optional[List[str]] = None
+        self.all_known = True
+        self.postponed = False
+
+    def read(self, tree: ast.Module) -> Dict[str, Any]:
+        self._read_body(tree.body)
+        return {
+            'name': self.module_name,
+            # A computed __all__ cannot be known statically; treat the module as having none
+            'all': self.all_names if self.all_known else None,
+            'bindings': self.bindings,
+            'functions': self.functions,
+            'classes': self.classes,
+        }
+
+    def _bind(self, name: str, kind: str, **data: Any) -> None:
+        self.bindings[name] = {'kind': kind, **data}
+
+    def _read_body(self, body: List[ast.stmt]) -> None:
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                decorators = [_dotted(d) for d in node.decorator_list]
+                if _is_overload(decorators) and self.bindings.get(node.name, {}).get('kind') == 'function':
+                    continue
+                description = self._read_function(node, node.name, decorators)
+                description['wrapped'] = any(_last(d) in _WRAPPER_DECORATORS for d in decorators)
+                self.functions[node.name] = description
+                self._bind(node.name, 'function')
+            elif isinstance(node, ast.ClassDef):
+                self.classes[node.name] = self._read_class(node)
+                self._bind(node.name, 'class')
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname:
+                        self._bind(alias.asname, 'module', module=alias.name)
+                    else:
+                        root = alias.name.split('.')[0]
+                        self._bind(root, 'module', module=root)
+            elif isinstance(node, ast.ImportFrom):
+                self._read_import_from(node)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                self._read_assignment(node)
+            elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+                self._read_all_call(node.value)
+            elif isinstance(node, ast.If):
+                if not _is_type_checking(node.test):
+                    self._read_body(node.body)
+                self._read_body(node.orelse)
+            elif isinstance(node, (ast.Try, getattr(ast, 'TryStar', ast.Try))):
+                self._read_body(node.body)
+                for handler in node.handlers:
+                    self._read_body(handler.body)
+                self._read_body(node.orelse)
+                self._read_body(node.finalbody)
+            elif isinstance(node, (ast.With, ast.AsyncWith)):
+                self._read_body(node.body)
+
+    def _read_import_from(self, node: ast.ImportFrom) -> None:
+        if node.module == '__future__':
+            if any(alias.name == 'annotations' for alias in node.names):
+                self.postponed = True
+            return
+        target = self._absolute(node.module, node.level)
+        if target is None:
+            return
+        for alias in node.names:
+            if alias.name == '*':
+                self._bind(f"*{target}", 'star', module=target)
+            else:
+                self._bind(alias.asname or alias.name, 'import', module=target, attr=alias.name)
+
+    def _absolute(self, module: Optional[str], level: int) -> Optional[str]:
+        if not level:
+            return module
+        base = self.package
+        for _ in range(level - 1):
+            if not base:
+                return None
+            base = base.rpartition('.')[0]
+        if not base:
+            return None
+        return f"{base}.{module}" if module else base
+
+    def _read_assignment(self, node: Union[ast.Assign, ast.AnnAssign, ast.AugAssign]) -> None:
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        for target in targets:
+            names = target.elts if isinstance(target, (ast.Tuple, ast.List)) else [target]
+            for name_node in names:
+                if not isinstance(name_node, ast.Name):
+                    continue
+                if name_node.id == '__all__':
+                    self._read_all_assignment(node)
+                elif not isinstance(node, ast.AugAssign):
+                    alias = None
+                    if name_node is target and node.value is not None and _is_annotation_expression(node.value):
+                        alias = ast.unparse(node.value)
+                    self._bind(name_node.id, 'value', alias=alias)
+
+    def _read_all_assignment(self, node: Union[ast.Assign, ast.AnnAssign, ast.AugAssign]) -> None:
+        names = _literal_names(node.value) if node.value is not None else None
+        if isinstance(node, ast.AugAssign):
+            if isinstance(node.op, ast.Add) and names is not None and self.all_names is not None:
+                self.all_names.extend(names)
+            else:
+                self.all_known = False
+            return
+        self.all_names = names
+        self.all_known = names is not None
+
+    def _read_all_call(self, call: ast.Call) -> None:
+        func = call.func
+        if not (
+            isinstance(func, ast.Attribute)
+            and isinstance(func.value, ast.Name)
+            and func.value.id == '__all__'
+        ):
+            return
+        if self.all_names is None or len(call.args) != 1:
+            self.all_known = False
+            return
+        if func.attr == 'extend':
+            names = _literal_names(call.args[0])
+        elif func.attr == 'append':
+            names = _literal_names(ast.List(elts=[call.args[0]], ctx=ast.Load()))
+        else:
+            names = None
+        if names is None:
+            self.all_known = False
+        else:
+            self.all_names.extend(names)
+
+    def _read_function(
+        self,
+        node: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+        qualname: str,
+        decorators: List[str],
+    ) -> Dict[str, Any]:
+        returns, returns_quoted = _annotation_source(node.returns)
+        return {
+            'name': node.name,
+            'qualname': qualname,
+            'doc': ast.get_docstring(node, clean=False),
+            'is_async': isinstance(node, ast.AsyncFunctionDef),
+            'params': self._read_parameters(node.args),
+            'returns': returns,
+            'returns_quoted': returns_quoted,
+            'postponed': self.postponed,
+            'decorators': decorators,
+            'inferred_return': None if self.is_stub else infer_return_type(node),
+        }
+
+    def _read_parameters(self, args: ast.arguments) -> List[Dict[str, Any]]:
+        params: List[Dict[str, Any]] = []
+        positional = list(args.posonlyargs) + list(args.args)
+        defaults: List[Optional[ast.expr]] = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+        for index, arg in enumerate(positional):
+            kind = 'POSITIONAL_ONLY' if index < len(args.posonlyargs) else 'POSITIONAL_OR_KEYWORD'
+            params.append(self._parameter(arg, kind, defaults[index]))
+        if args.vararg is not None:
+            params.append(self._parameter(args.vararg, 'VAR_POSITIONAL', None))
+        for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+            params.append(self._parameter(arg, 'KEYWORD_ONLY', default))
+        if args.kwarg is not None:
+            params.append(self._parameter(args.kwarg, 'VAR_KEYWORD', None))
+        return params
+
+    def _parameter(self, arg: ast.arg, kind: str, default: Optional[ast.expr]) -> Dict[str, Any]:
+        annotation, quoted = _annotation_source(arg.annotation)
+        return {
+            'name': arg.arg,
+            'kind': kind,
+            'annotation': annotation,
+            'quoted': quoted,
+            'default': self._default(default),
+        }
+
+    def _default(self, node: Optional[ast.expr]) -> Optional[Tuple[str, Any]]:
+        """('literal', value) or ('source', text); None when the parameter has no default."""
+        if node is None:
+            return None
+        if self.is_stub and isinstance(node, ast.Constant) and node.value is Ellipsis:
+            # Stubs elide default values: optional, with an unknown default
+            return ('literal', None)
+        try:
+            return ('literal', ast.literal_eval(node))
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            return ('source', ast.unparse(node))
+
+    def _read_class(self, node: ast.ClassDef) -> Dict[str, Any]:
+        decorators = [_dotted(d) for d in node.decorator_list]
+        description: Dict[str, Any] = {
+            'name': node.name,
+            'doc': ast.get_docstring(node, clean=False),
+            'bases': [ast.unparse(base) for base in node.bases],
+            'dataclass': any(_last(d) == 'dataclass' for d in decorators),
+            'postponed': self.postponed,
+            'methods': {},
+            'fields': [],
+            'classes': [],
+        }
+        self._read_class_body(node, node.body, description)
+        return description
+
+    def _read_class_body(self, node: ast.ClassDef, body: List[ast.stmt], description: Dict[str, Any]) -> None:
+        methods = description['methods']
+        for item in body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                decorators = [_dotted(d) for d in item.decorator_list]
+                if _is_overload(decorators) and item.name in methods:
+                    continue
+                method = self._read_function(item, f"{node.name}.{item.name}", decorators)
+                method['kind'] = _method_kind(decorators)
+                method['abstract'] = any(_last(d) in _ABSTRACT_DECORATORS for d in decorators)
+                methods[item.name] = method
+            elif isinstance(item, ast.ClassDef):
+                if not item.name.startswith('_'):
+                    description['classes'].append(item.name)
+            elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
+                field = self._read_field(item)
+                if field is not None:
+                    description['fields'].append(field)
+            elif isinstance(item, ast.If):
+                self._read_class_body(node, item.body, description)
+                self._read_class_body(node, item.orelse, description)
+            elif isinstance(item, ast.Try):
+                self._read_class_body(node, item.body, description)
+                for handler in item.handlers:
+                    self._read_class_body(node, handler.body, description)
+
+    def _read_field(self, node: ast.AnnAssign) -> Optional[Dict[str, Any]]:
+        """A dataclass field declaration; None for ClassVar and init=False fields."""
+        annotation, quoted = _annotation_source(node.annotation)
+        if annotation and _last(annotation.split('[')[0]) == 'ClassVar':
+            return None
+        default = self._default(node.value)
+        value = node.value
+        if isinstance(value, ast.Call) and _last(_dotted(value.func)) == 'field':
+            default = None
+            for keyword in value.keywords:
+                if keyword.arg == 'init' and isinstance(keyword.value, ast.Constant) and keyword.value.value is False:
+                    return None
+                if keyword.arg == 'default':
+                    default = self._default(keyword.value)
+                elif keyword.arg == 'default_factory':
+                    default = ('source', '<factory>')
+        return {
+            'name': node.target.id,
+            'annotation': annotation,
+            'quoted': quoted,
+            'default': default,
+        }
+
+
+def _overlay_stub(description: Dict[str, Any], stub: Dict[str, Any]) -> None:
+    """Take signatures from the stub and docstrings and return inference from the source."""
+    for name, stub_function in stub['functions'].items():
+        function = description['functions'].get(name)
+        if function is not None:
+            _overlay_signature(function, stub_function)
+        elif name not in description['bindings']:
+            description['functions'][name] = stub_function
+            description['bindings'][name] = {'kind': 'function'}
+
+    for name, stub_class in stub['classes'].items():
+        cls = description['classes'].get(name)
+        if cls is None:
+            if name not in description['bindings']:
+                description['classes'][name] = stub_class
+                description['bindings'][name] = {'kind': 'class'}
+            continue
+        for method_name, stub_method in stub_class['methods'].items():
+            method = cls['methods'].get(method_name)
+            if method is not None:
+                _overlay_signature(method, stub_method)
+            else:
+                cls['methods'][method_name] = stub_method
+
+    if description['all'] is None:
+        description['all'] = stub['all']
+    # Names the stub's annotations refer to
+    description['stub_bindings'] = {
+        name: binding for name, binding in stub['bindings'].items() if binding['kind'] in ('import', 'module')
+    }
+
+
+def _overlay_signature(function: Dict[str, Any], stub_function: Dict[str, Any]) -> None:
+    for key in ('params', 'returns', 'returns_quoted', 'postponed'):
+        function[key] = stub_function[key]
+    function['stub_signature'] = True
+    if not function['doc']:
+        function['doc'] = stub_function['doc']
+
+
+def _annotation_source(node: Optional[ast.expr]) -> Tuple[Optional[str], bool]:
+    """(source text, quoted) of an annotation."""
+    if node is None:
+        return None, False
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value, True
+    return ast.unparse(node), False
+
+
+def _literal_names(node: ast.expr) -> Optional[List[str]]:
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return None
+    if isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value):
+        return list(value)
+    return None
+
+
+def _dotted(node: ast.expr) -> str:
+    """'functools.lru_cache' for @functools.lru_cache(maxsize=None)."""
+    if isinstance(node, ast.Call):
+        return _dotted(node.func)
+    return ast.unparse(node)
+
+
+def _last(dotted: str) -> str:
+    return dotted.rpartition('.')[2]
+
+
+def _is_overload(decorators: List[str]) -> bool:
+    return any(_last(d) == 'overload' for d in decorators)
+
+
+def _method_kind(decorators: List[str]) -> str:
+    names = [_last(d) for d in decorators]
+    if 'staticmethod' in names:
+        return 'static'
+    if 'classmethod' in names:
+        return 'class'
+    if any(name in _PROPERTY_DECORATORS for name in names):
+        return 'property'
+    if any(name in _WRAPPER_DECORATORS for name in names):
+        return 'wrapped'
+    return 'function'
+
+
+def _is_type_checking(test: ast.expr) -> bool:
+    return (
+        (isinstance(test, ast.Name) and test.id == 'TYPE_CHECKING')
+        or (isinstance(test, ast.Attribute) and test.attr == 'TYPE_CHECKING')
+    )
+
+
+def _is_annotation_expression(node: ast.AST) -> bool:
+    for child in ast.walk(node):
+        if not isinstance(child, _ANNOTATION_NODES):
+            return False
+        if isinstance(child, ast.BinOp) and not isinstance(child.op, ast.BitOr):
+            return False
+        if isinstance(child, ast.Attribute) and child.attr.startswith('_'):
+            return False
+        if isinstance(child, ast.Name) and child.id.startswith('__'):
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Stand-ins (analyzer process)
+# ---------------------------------------------------------------------------
+
+class StaticDefault:
+    """A default value that is not a literal, shown as its source text."""
+
+    __slots__ = ('source',)
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def __repr__(self) -> str:
+        return self.source
+
+    __str__ = __repr__
+
+
+class StaticFunction:
+    """Stand-in for a function known only from source."""
+
+    def __init__(
+        self,
+        name: str,
+        qualname: str,
+        module: str,
+        doc: Optional[str],
+        signature: inspect.Signature,
+        is_async: bool = False,
+        inferred_return: Optional[str] = None,
+    ):
+        self.__name__ = name
+        self.__qualname__ = qualname
+        self.__module__ = module
+        self.__doc__ = doc
+        self.__signature__ = signature
+        self.is_async = is_async
+        self.inferred_return = inferred_return
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f"{self.__module__}.{self.__qualname__} was analyzed statically and cannot be called")
+
+    def __repr__(self) -> str:
+        return f"<static function {self.__module__}.{self.__qualname__}>"
+
+
+class StaticClass:
+    """A class known from source, with members inherited from library base classes."""
+
+    def __init__(self, library: "StaticLibrary", module: str, description: Dict[str, Any]):
+        self.library = library
+        self.module = module
+        self.description = description
+        self.__name__ = description['name']
+        self.__module__ = module
+        self._mro: Optional[List["StaticClass"]] = None
+        self._external_bases: List[str] = []
+
+    def __repr__(self) -> str:
+        return f"<static class {self.module}.{self.__name__}>"
+
+    def mro(self) -> List["StaticClass"]:
+        """Library classes in method resolution order (C3), starting with this class."""
+        if self._mro is None:
+            self._mro = [self]  # guards against cyclic bases while resolving
+            bases: List[StaticClass] = []
+            for base in self.description['bases']:
+                resolved = self.library.class_from_expression(self.module, base)
+                if resolved is None or resolved is self:
+                    self._external_bases.append(base)
+                elif resolved not in bases:
+                    bases.append(resolved)
+            self._mro = [self] + _c3_merge([base.mro() for base in bases] + [bases])
+        return self._mro
+
+    def external_bases(self) -> List[str]:
+        """Bases (of this class and its library bases) defined outside the library."""
+        names: List[str] = []
+        for cls in self.mro():
+            names.extend(cls._external_bases)
+        return names
+
+    def is_exception(self) -> bool:
+        for base in self.external_bases():
+            name = _last(base.split('[')[0])
+            builtin = getattr(builtins, name, None)
+            if isinstance(builtin, type) and issubclass(builtin, BaseException):
+                return True
+            if name.endswith(('Error', 'Exception', 'Warning')):
+                return True
+        return False
+
+    def is_abstract(self) -> bool:
+        """What issubclass(cls, abc.ABC) and cls.__abstractmethods__ would say."""
+        if not any(_last(base) == 'ABC' for base in self.external_bases()):
+            return False
+        return any(method.get('abstract') for _, method in self._resolved_methods().values())
+
+    def has_public_callables(self) -> bool:
+        for cls in self.mro():
+            if cls.description['classes']:
+                return True
+        return any(
+            not name.startswith('_') and method['kind'] != 'property'
+            for name, (_, method) in self._resolved_methods().items()
+        )
+
+    def _resolved_methods(self) -> Dict[str, Tuple["StaticClass", Dict[str, Any]]]:
+        resolved: Dict[str, Tuple[StaticClass, Dict[str, Any]]] = {}
+        for cls in self.mro():
+            for name, method in cls.description['methods'].items():
+                resolved.setdefault(name, (cls, method))
+        return resolved
+
+    def callable_members(self) -> List[Tuple[str, StaticFunction, bool]]:
+        """(name, function, bound to the class) for public methods, sorted by name like inspect.getmembers."""
+        members: List[Tuple[str, StaticFunction, bool]] = []
+        for name, (owner, method) in sorted(self._resolved_methods().items()):
+            if name.startswith('_') or method['kind'] not in ('function', 'static', 'class'):
+                continue
+            function = self.library.method(owner, name)
+            if function is not None:
+                members.append((name, function, method['kind'] == 'class'))
+        return members
+
+    def function_members(self) -> List[Tuple[str, StaticFunction]]:
+        """Public plain and static methods: what inspect.getmembers(cls, inspect.isfunction) lists."""
+        return [(name, function) for name, function, bound in self.callable_members() if not bound]
+
+    def init_function(self) -> Optional[StaticFunction]:
+        """__init__ as found on the class, or None where only object.__init__ applies."""
+        for cls in self.mro():
+            method = cls.description['methods'].get('__init__')
+            if method is not None:
+                return self.library.method(cls, '__init__') if method['kind'] == 'function' else None
+            if cls.description['dataclass']:
+                return self.library.dataclass_init(cls)
+        return None
+
+
+def _c3_merge(sequences: List[List[StaticClass]]) -> List[StaticClass]:
+    sequences = [list(sequence) for sequence in sequences if sequence]
+    merged: List[StaticClass] = []
+    while sequences:
+        for sequence in sequences:
+            head = sequence[0]
+            if not any(head in other[1:] for other in sequences):
+                break
+        else:
+            # Inconsistent hierarchy: fall back to depth-first order
+            for sequence in sequences:
+                merged.extend(cls for cls in sequence if cls not in merged)
+            return merged
+        merged.append(head)
+        sequences = [[cls for cls in sequence if cls is not head] for sequence in sequences]
+        sequences = [sequence for sequence in sequences if sequence]
+    return merged
+
+
+class _AnnotationScope:
+    """Name lookup for evaluating one module's annotations."""
+
+    def __init__(self, library: "StaticLibrary", module: str, depth: int, stub: bool):
+        self.library = library
+        self.module = module
+        self.depth = depth
+        self.stub = stub
+
+    def __getitem__(self, name: str) -> Any:
+        return self.library.annotation_name(self.module, name, self.depth, self.stub)
+
+
+class _StandInModule:
+    """A module referenced by an annotation (`np.ndarray`), resolved attribute by attribute."""
+
+    def __init__(self, library: "StaticLibrary", name: str, depth: int, external: bool):
+        self._library = library
+        self._name = name
+        self._depth = depth
+        self._external = external
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        if self._external:
+            return self._library.stand_in(self._name, attr)
+        return self._library.annotation_name(self._name, attr, self._depth)
+
+
+# ---------------------------------------------------------------------------
+# Library index (analyzer process)
+# ---------------------------------------------------------------------------
+
+class StaticLibrary:
+    """Static descriptions of a library's modules, with resolution across them.
+
+    Modules are located with importlib's path finder, which reads directories
+    only. Descriptions are added in bulk by the analyzer (extracted in worker
+    processes) or, for modules only reached through imports, base classes or
+    parent packages, extracted here on first use.
+    """
+
+    def __init__(self, library_name: str):
+        self.library_name = library_name
+        self._specs: Dict[str, Optional[importlib.machinery.ModuleSpec]] = {}
+        self._descriptions: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._namespaces: Dict[str, Optional[ModuleType]] = {}
+        self._functions: Dict[Tuple[str, str], Optional[StaticFunction]] = {}
+        self._classes: Dict[Tuple[str, str], StaticClass] = {}
+        self._stand_ins: Dict[Tuple[str, str], type] = {}
+
+    # -- locating and describing modules ------------------------------------
+
+    def in_library(self, module_name: Optional[str]) -> bool:
+        return bool(module_name) and (
+            module_name == self.library_name or module_name.startswith(f"{self.library_name}.")
+        )
+
+    def spec(self, module_name: str) -> Optional[importlib.machinery.ModuleSpec]:
+        if module_name not in self._specs:
+            parent, _, _ = module_name.rpartition('.')
+            search_path = None
+            if parent:
+                parent_spec = self.spec(parent)
+                search_path = (
+                    list(parent_spec.submodule_search_locations)
+                    if parent_spec is not None and parent_spec.submodule_search_locations is not None
+                    else None
+                )
+            spec = None
+            if not parent or search_path is not None:
+                try:
+                    spec = importlib.machinery.PathFinder.find_spec(module_name, search_path)
+                except (ImportError, ValueError, OSError):
+                    spec = None
+            self._specs[module_name] = spec
+        return self._specs[module_name]
+
+    def job_for(self, module_name: str) -> Optional[SourceJob]:
+        """Source and stub files of a module; None for modules with neither (C extensions, bytecode)."""
+        spec = self.spec(module_name)
+        if spec is None or not spec.has_location or not spec.origin:
+            return None
+        origin = Path(spec.origin)
+        is_package = spec.submodule_search_locations is not None
+        if origin.name.startswith('__init__.'):
+            stub = origin.with_name('__init__.pyi')
+        else:
+            stub = origin.with_name(f"{module_name.rpartition('.')[2]}.pyi")
+        source = str(origin) if origin.suffix == '.py' else None
+        stub_path = str(stub) if stub.is_file() else None
+        if source is None and stub_path is None:
+            return None
+        return (module_name, source, is_package, stub_path)
+
+    def add(self, module_name: str, description: Optional[Dict[str, Any]]) -> None:
+        self._descriptions[module_name] = description
+
+    def describe(self, module_name: str) -> Optional[Dict[str, Any]]:
+        if module_name not in self._descriptions:
+            description = None
+            if self.in_library(module_name):
+                job = self.job_for(module_name)
+                if job is not None:
+                    description = extract_module_source(job)
+            self._descriptions[module_name] = description
+        return self._descriptions[module_name]
+
+    def namespace(self, module_name: str) -> Optional[ModuleType]:
+        """Placeholder module with the attributes the analyzer's filters read."""
+        if module_name not in self._namespaces:
+            spec = self.spec(module_name)
+            module = None
+            if spec is not None:
+                module = ModuleType(module_name)
+                module.__file__ = spec.origin if spec.has_location else None
+                if spec.submodule_search_locations is not None:
+                    module.__path__ = list(spec.submodule_search_locations)
+                description = self.describe(module_name)
+                if description is not None:
+                    for name in description['bindings']:
+                        if not name.startswith(('__', '*')):
+                            setattr(module, name, None)
+                    if description['all'] is not None:
+                        module.__all__ = list(description['all'])
+            self._namespaces[module_name] = module
+        return self._namespaces[module_name]
+
+    def get(self, module_name: str, default: Any = None) -> Any:
+        """Mapping-style lookup of placeholder modules (in place of sys.modules)."""
+        if not self.in_library(module_name):
+            return default
+        module = self.namespace(module_name)
+        return default if module is None else module
+
+    # -- resolution ---------------------------------------------------------
+
+    def resolve(self, module_name: str, name: str, _seen: Optional[set] = None) -> Optional[Tuple[str, Any]]:
+        """What a top-level name of a module is bound to, following imports within the library.
+
+        Returns ('function' | 'class' | 'value', (defining module, name)),
+        ('module', module name), ('external', (module, attribute or None)),
+        or None if the name is not bound.
+        """
+        seen = _seen if _seen is not None else set()
+        if (module_name, name) in seen:
+            return None
+        seen.add((module_name, name))
+
+        description = self.describe(module_name)
+        if description is None:
+            return None
+        binding = description['bindings'].get(name)
+        if binding is None:
+            for key in reversed(list(description['bindings'])):
+                star = description['bindings'][key]
+                if star['kind'] == 'star' and name in self._star_names(star['module']):
+                    if not self.in_library(star['module']):
+                        return ('external', (star['module'], name))
+                    return self.resolve(star['module'], name, seen)
+            submodule = f"{module_name}.{name}"
+            if self.describe(submodule) is not None or self.spec(submodule) is not None:
+                return ('module', submodule)
+            return None
+
+        return self._resolve_binding(module_name, name, binding, seen)
+
+    def _resolve_binding(self, module_name: str, name: str, binding: Dict[str, Any], seen: set) -> Optional[Tuple[str, Any]]:
+        kind = binding['kind']
+        if kind == 'value':
+            # `body_decode = decode`: an alias of a library function or class is that object
+            alias = binding.get('alias')
+            if alias and all(part.isidentifier() for part in alias.split('.')):
+                target = self._resolve_dotted(module_name, alias, seen)
+                if target is not None and target[0] in ('function', 'class'):
+                    return target
+        if kind in ('function', 'class', 'value'):
+            return (kind, (module_name, name))
+        if kind == 'module':
+            if self.in_library(binding['module']):
+                return ('module', binding['module'])
+            return ('external', (binding['module'], None))
+        if kind == 'import':
+            target, attr = binding['module'], binding['attr']
+            if not self.in_library(target):
+                return ('external', (target, attr))
+            return self.resolve(target, attr, seen)
+        return None
+
+    def _resolve_dotted(self, module_name: str, expression: str, seen: set) -> Optional[Tuple[str, Any]]:
+        """Resolve 'name' or 'module.name' as seen from a module, through library modules only."""
+        head, *rest = expression.split('.')
+        resolved = self.resolve(module_name, head, seen)
+        for part in rest:
+            if resolved is None or resolved[0] != 'module':
+                return None
+            resolved = self.resolve(resolved[1], part, seen)
+        return resolved
+
+    def _star_names(self, module_name: str, _seen: Optional[set] = None) -> List[str]:
+        """Names bound by `from module import *`."""
+        seen = _seen if _seen is not None else set()
+        if module_name in seen:
+            return []
+        seen.add(module_name)
+        description = self.describe(module_name)
+        if description is None:
+            return []
+        if description['all'] is not None:
+            return list(description['all'])
+        names: List[str] = []
+        for key, binding in description['bindings'].items():
+            if binding['kind'] == 'star':
+                names.extend(self._star_names(binding['module'], seen))
+            elif not key.startswith('_'):
+                names.append(key)
+        return names
+
+    def members(self, module_name: str) -> List[Tuple[str, Union[StaticFunction, StaticClass]]]:
+        """Functions and classes a module exposes, in the order the import-based scan sees them
+        (its __all__, else its namespace)."""
+        description = self.describe(module_name)
+        if description is None:
+            return []
+        if description['all'] is not None:
+            names = list(description['all'])
+        else:
+            names = []
+            for key, binding in description['bindings'].items():
+                if binding['kind'] == 'star':
+                    names.extend(n for n in self._star_names(binding['module']) if n not in description['bindings'])
+                else:
+                    names.append(key)
+            names = list(dict.fromkeys(names))
+
+        members: List[Tuple[str, Union[StaticFunction, StaticClass]]] = []
+        for name in names:
+            resolved = self.resolve(module_name, name)
+            if resolved is None:
+                continue
+            kind, where = resolved
+            if kind == 'function':
+                function = self.function(*where)
+                if function is not None:
+                    members.append((name, function))
+            elif kind == 'class':
+                members.append((name, self.klass(*where)))
+        return members
+
+    def klass(self, module_name: str, name: str) -> StaticClass:
+        key = (module_name, name)
+        if key not in self._classes:
+            self._classes[key] = StaticClass(self, module_name, self.describe(module_name)['classes'][name])
+        return self._classes[key]
+
+    def class_from_expression(self, module_name: str, expression: str) -> Optional[StaticClass]:
+        """The library class a base-class expression ('Base', 'mod.Base') refers to."""
+        parts = expression.split('.')
+        if not all(part.isidentifier() for part in parts):
+            return None
+        resolved = self.resolve(module_name, parts[0])
+        for part in parts[1:]:
+            if resolved is None or resolved[0] != 'module':
+                return None
+            resolved = self.resolve(resolved[1], part)
+        if resolved is None or resolved[0] != 'class':
+            return None
+        return self.klass(*resolved[1])
+
+    # -- stand-in functions -------------------------------------------------
+
+    def function(self, module_name: str, name: str) -> Optional[StaticFunction]:
+        """A module-level function; None for wrapped functions and unusable signatures."""
+        key = (module_name, name)
+        if key not in self._functions:
+            description = self.describe(module_name)['functions'][name]
+            function = None
+            if not description.get('wrapped'):
+                function = self._build_function(module_name, description, description['doc'])
+            self._functions[key] = function
+        return self._functions[key]
+
+    def method(self, owner: StaticClass, name: str) -> Optional[StaticFunction]:
+        """A method as looked up on its defining class (docstrings inherited like inspect.getdoc)."""
+        key = (owner.module, f"{owner.__name__}.{name}")
+        if key not in self._functions:
+            description = owner.description['methods'][name]
+            doc = self._method_doc(owner, name)
+            self._functions[key] = self._build_function(
+                owner.module, description, doc, drop_first=description['kind'] == 'class'
+            )
+        return self._functions[key]
+
+    def dataclass_init(self, cls: StaticClass) -> Optional[StaticFunction]:
+        """The __init__ @dataclass generates from the fields of cls and its dataclass bases."""
+        key = (cls.module, f"{cls.__name__}.__init__")
+        if key not in self._functions:
+            fields: Dict[str, Tuple[StaticClass, Dict[str, Any]]] = {}
+            for base in reversed(cls.mro()):
+                if base.description['dataclass']:
+                    for field in base.description['fields']:
+                        fields[field['name']] = (base, field)
+            params = [inspect.Parameter('self', inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+            function = None
+            try:
+                for owner, field in fields.values():
+                    params.append(inspect.Parameter(
+                        field['name'],
+                        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                        default=self._default_value(field['default']),
+                        annotation=self._annotation(
+                            owner.module, field['annotation'], field['quoted'] or owner.description['postponed']
+                        ),
+                    ))
+                signature = inspect.Signature(params, return_annotation=None)
+                function = StaticFunction(
+                    '__init__', f"{cls.__name__}.__init__", cls.module, self._method_doc(cls, '__init__'), signature
+                )
+            except (TypeError, ValueError):
+                function = None
+            self._functions[key] = function
+        return self._functions[key]
+
+    def _method_doc(self, owner: StaticClass, name: str) -> Optional[str]:
+        for cls in owner.mro():
+            method = cls.description['methods'].get(name)
+            if method is not None and method['doc']:
+                return method['doc']
+        if name == '__init__':
+            return object.__init__.__doc__
+        return None
+
+    def _build_function(
+        self,
+        module_name: str,
+        description: Dict[str, Any],
+        doc: Optional[str],
+        drop_first: bool = False,
+    ) -> Optional[StaticFunction]:
+        params = description['params'][1:] if drop_first else description['params']
+        stub = description.get('stub_signature', False)
+        try:
+            signature = inspect.Signature(
+                [
+                    inspect.Parameter(
+                        param['name'],
+                        getattr(inspect.Parameter, param['kind']),
+                        default=self._default_value(param['default']),
+                        annotation=self._annotation(
+                            module_name, param['annotation'], param['quoted'] or description['postponed'], stub
+                        ),
+                    )
+                    for param in params
+                ],
+                return_annotation=self._annotation(
+                    module_name, description['returns'], description['returns_quoted'] or description['postponed'], stub
+                ),
+            )
+        except (TypeError, ValueError):
+            return None
+        return StaticFunction(
+            description['name'],
+            description['qualname'],
+            module_name,
+            doc,
+            signature,
+            is_async=description['is_async'],
+            inferred_return=description['inferred_return'],
+        )
+
+    def _default_value(self, default: Optional[Tuple[str, Any]]) -> Any:
+        if default is None:
+            return inspect.Parameter.empty
+        kind, value = default
+        return value if kind == 'literal' else StaticDefault(value)
+
+    # -- annotations --------------------------------------------------------
+
+    def _annotation(self, module_name: str, source: Optional[str], as_string: bool, stub: bool = False) -> Any:
+        if source is None:
+            return inspect.Parameter.empty
+        if as_string:
+            return source
+        return self.evaluate_annotation(module_name, source, stub=stub)
+
+    def evaluate_annotation(self, module_name: str, source: str, depth: int = 0, stub: bool = False) -> Any:
+        """The value an annotation would have at runtime; its source text if it cannot be evaluated."""
+        try:
+            tree = ast.parse(source, mode='eval')
+        except SyntaxError:
+            return source
+        if not _is_annotation_expression(tree):
+            return source
+        try:
+            scope = _AnnotationScope(self, module_name, depth, stub)
+            return eval(compile(tree, '<annotation>', 'eval'), {'__builtins__': {}}, scope)
+        except Exception:
+            return source
+
+    def annotation_name(self, module_name: str, name: str, depth: int = 0, stub: bool = False) -> Any:
+        """Value of a name in an annotation; stub signatures see the stub's imports first."""
+        stub_binding = (self.describe(module_name) or {}).get('stub_bindings', {}).get(name) if stub else None
+        if stub_binding is not None:
+            resolved = self._resolve_binding(module_name, name, stub_binding, set())
+        else:
+            resolved = self.resolve(module_name, name)
+        if resolved is None:
+            builtin = getattr(builtins, name, None)
+            if isinstance(builtin, type):
+                return builtin
+            return self.stand_in(module_name, name)
+
+        kind, where = resolved
+        if kind == 'module':
+            return _StandInModule(self, where, depth, external=False)
+        if kind == 'external':
+            target, attr = where
+            real_module = _annotation_module(target)
+            if real_module is not None:
+                if attr is None:
+                    return real_module
+                if hasattr(real_module, attr):
+                    return getattr(real_module, attr)
+            if attr is None:
+                return _StandInModule(self, target, depth, external=True)
+            return self.stand_in(target, attr)
+        if kind == 'value' and depth < _MAX_ALIAS_DEPTH:
+            alias = self.describe(where[0])['bindings'].get(where[1], {}).get('alias')
+            if alias:
+                return self.evaluate_annotation(where[0], alias, depth + 1)
+        return self.stand_in(*where)
+
+    def stand_in(self, module_name: str, qualname: str) -> type:
+        """Empty class standing in for a class that is not imported."""
+        key = (module_name, qualname)
+        if key not in self._stand_ins:
+            self._stand_ins[key] = type(qualname.rpartition('.')[2], (), {
+                '__module__': module_name,
+                '__qualname__': qualname,
+                '__class_getitem__': classmethod(GenericAlias),
+            })
+        return self._stand_ins[key]
+
+
+def _annotation_module(module_name: str) -> Optional[ModuleType]:
+    real_name = _ANNOTATION_MODULES.get(module_name)
+    if real_name is None:
+        return None
+    try:
+        return importlib.import_module(real_name)
+    except ImportError:
+        return None
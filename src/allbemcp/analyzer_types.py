@@ -5,34 +5,132 @@ import os
 import re
 import sys
 from dataclasses import dataclass, fields, is_dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, get_args, get_origin
-
-try:
-    import docstring_parser
-except ImportError:
-    docstring_parser = None
-
-
-@dataclass
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union, get_args, get_origin
+
+from allbemcp.analyzer_docstrings import ParsedDocstring, parse_docstring
+
+
+_NO_DEFAULT = object()
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if type(value) is str else value
+
+
+class ParamInfo(Mapping):
+    """One parameter of a FunctionInfo.
+
+    Read like the dict it replaces: keys 'name', 'required', 'schema', 'in'
+    and, when the parameter has a serializable default, 'default'.
+    """
+
+    __slots__ = ('name', 'required', 'schema', 'location', '_default')
+
+    def __init__(
+        self,
+        name: str,
+        required: bool = True,
+        schema: Optional[Dict[str, Any]] = None,
+        location: str = 'query',
+        default: Any = _NO_DEFAULT,
+    ):
+        self.name = _intern(name)
+        self.required = required
+        self.schema = {} if schema is None else schema
+        self.location = _intern(location)
+        self._default = _NO_DEFAULT if default is None else default
+
+    @classmethod
+    def from_dict(cls, payload: Mapping) -> "ParamInfo":
+        if isinstance(payload, ParamInfo):
+            return payload
+        return cls(
+            payload.get('name', ''),
+            payload.get('required', True),
+            payload.get('schema'),
+            payload.get('in', 'query'),
+            payload.get('default', _NO_DEFAULT),
+        )
+
+    @property
+    def default(self) -> Any:
+        return None if self._default is _NO_DEFAULT else self._default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __reduce__(self):
+        # Through the constructor, so the no-default marker stays the module's own
+        return (ParamInfo, (self.name, self.required, self.schema, self.location, self.default))
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'name':
+            return self.name
+        if key == 'required':
+            return self.required
+        if key == 'schema':
+            return self.schema
+        if key == 'in':
+            return self.location
+        if key == 'default' and self._default is not _NO_DEFAULT:
+            return self._default
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from ('name', 'required', 'schema', 'in')
+        if self._default is not _NO_DEFAULT:
+            yield 'default'
+
+    def __len__(self) -> int:
+        return 4 if self._default is _NO_DEFAULT else 5
+
+    def __repr__(self) -> str:
+        return f"ParamInfo({self.to_dict()!r})"
+
+
+@dataclass(slots=True)
 class FunctionInfo:
-    """Function Information"""
+    """Function Information
+
+    Slotted, with module, class and parameter names interned: large libraries
+    produce tens of thousands of these.
+    """
     name: str
     module: str
     class_name: Optional[str]
     qualname: str
     signature: str
     doc: Optional[str]
-    parameters: List[Dict]
+    parameters: Tuple[ParamInfo, ...]
     return_type: Optional[str]
     is_async: bool
     http_method: str
     path: str
     returns_object: bool = False
     object_methods: List[Dict] = None
-    raw_param_annotations: List[Any] = None
+    raw_param_annotations: Tuple[Any, ...] = None
     raw_return_annotation: Any = None
     target_name: Optional[str] = None
     is_constructor: bool = False
+    parsed_doc: Optional[ParsedDocstring] = None
+
+    def __post_init__(self):
+        self.name = _intern(self.name)
+        self.module = _intern(self.module)
+        self.class_name = _intern(self.class_name)
+        self.http_method = _intern(self.http_method)
+        self.target_name = _intern(self.target_name)
+        self.parameters = tuple(ParamInfo.from_dict(p) for p in self.parameters or ())
+        if self.raw_param_annotations is not None:
+            self.raw_param_annotations = tuple(self.raw_param_annotations)
+
+
+def parsed_docstring(func_info: FunctionInfo) -> Optional[ParsedDocstring]:
+    """The function's parsed docstring, parsing (and storing) it on first use"""
+    if func_info.parsed_doc is None and func_info.doc:
+        func_info.parsed_doc = parse_docstring(func_info.doc)
+    return func_info.parsed_doc
 
 
 class QualityMetrics:
@@ -54,21 +152,18 @@ class QualityMetrics:
 
         doc_len = len(func_info.doc.strip())
 
-        if docstring_parser:
-            try:
-                parsed = docstring_parser.parse(func_info.doc)
-                has_desc = bool(parsed.short_description or parsed.long_description)
-                has_params = len(parsed.params) > 0
-                has_returns = bool(parsed.returns)
+        parsed = parsed_docstring(func_info)
+        if parsed is not None:
+            has_desc = bool(parsed.short_description or parsed.long_description)
+            has_params = len(parsed.params) > 0
+            has_returns = bool(parsed.returns)
 
-                if has_desc and (has_params or has_returns):
-                    return True, 1.0
-                if has_desc:
-                    if func_info.name in ('make', 'create', 'run', 'build', 'generate'):
-                        return True, 0.9
-                    return True, 0.8
-            except Exception:
-                pass
+            if has_desc and (has_params or has_returns):
+                return True, 1.0
+            if has_desc:
+                if func_info.name in ('make', 'create', 'run', 'build', 'generate'):
+                    return True, 0.9
+                return True, 0.8
 
         if doc_len > 200:
             return True, 1.0
@@ -99,12 +194,9 @@ class QualityMetrics:
     @staticmethod
     def has_type_annotations(func_info: FunctionInfo) -> Tuple[bool, float]:
         doc_has_types = False
-        if docstring_parser and func_info.doc:
-            try:
-                parsed = docstring_parser.parse(func_info.doc)
-                doc_has_types = any(p.type_name for p in parsed.params) or bool(parsed.returns and parsed.returns.type_name)
-            except Exception:
-                doc_has_types = False
+        parsed = parsed_docstring(func_info)
+        if parsed is not None:
+            doc_has_types = any(p.type_name for p in parsed.params) or bool(parsed.returns and parsed.returns.type_name)
 
         has_defaults = any(not p.get('required', True) for p in (func_info.parameters or []))
 
@@ -204,7 +296,9 @@ class QualityMetrics:
         return True, 0.6
 
     @staticmethod
-    def hierarchy_quality(func_info: FunctionInfo) -> Tuple[bool, float]:
+    def hierarchy_quality(func_info: FunctionInfo, modules: Optional[Any] = None) -> Tuple[bool, float]:
+        """modules: where parent packages are looked up (anything with .get, default sys.modules)"""
+        modules = sys.modules if modules is None else modules
         module_parts = func_info.module.split('.')
 
         if any(part.lower() in ('utils', 'util', 'helpers', 'helper', 'cache') for part in module_parts[1:]):
@@ -223,7 +317,7 @@ class QualityMetrics:
             exposure_hits = 0
             for i in range(1, len(module_parts)):
                 parent_name = '.'.join(module_parts[:i])
-                parent_module = sys.modules.get(parent_name)
+                parent_module = modules.get(parent_name)
                 if parent_module is None:
                     continue
 
@@ -164,6 +164,11 @@ def start(
         "--use-fastmcp3",
         help="Include fastmcp>=3.0.0 in generated requirements (default: enabled)",
     ),
+    lazy: bool = typer.Option(False, "--lazy", help="Import tool modules on first call instead of at startup"),
+    workers: Optional[int] = typer.Option(None, "--workers", help="Thread pool size for sync tools"),
+    process_workers: Optional[int] = typer.Option(
+        None, "--process-workers", help="Process pool size for picklable pure tools (0 disables it)"
+    ),
 ):
     """
     One-click start: Install, Generate, and Run the MCP server.
@@ -206,6 +211,12 @@ def start(
             "--host", host,
             "--port", str(port)
         ])
+    if lazy:
+        cmd.append("--lazy")
+    if workers is not None:
+        cmd.extend(["--workers", str(workers)])
+    if process_workers is not None:
+        cmd.extend(["--process-workers", str(process_workers)])
     
     try:
         # Use subprocess to run the server
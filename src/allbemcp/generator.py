@@ -83,6 +83,7 @@ def generate_mcp_server(openapi_spec: Dict[str, Any], output: str = "mcp_server.
                 "is_async": func_meta.get("is_async", False),
                 "returns_object": func_meta.get("returns_object", False),
                 "is_constructor": func_meta.get("is_constructor", False),
+                "pure_candidate": func_meta.get("pure_candidate", False),
                 "http_method": method,
                 "http_path": path
             }
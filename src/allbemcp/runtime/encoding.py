@@ -0,0 +1,187 @@
+"""
+JSON encoding of tool responses.
+
+Responses are encoded compactly (no indentation, no spaces after separators),
+which keeps tabular payloads 20-40% smaller than pretty-printed JSON. When
+orjson is installed it is used as a faster backend; any payload it rejects
+(e.g. integers beyond 64 bits) is encoded by the json module instead. Both
+produce the same text: NaN and infinities become null, enums their value, and
+datetimes, dataclasses and other unknown objects their str(). msgspec can be
+selected explicitly; it writes datetimes in ISO format and dataclasses as
+objects.
+
+The serializer sometimes has the JSON text of a result already, produced to
+check its size. Such text is registered with ``remember()`` and spliced into
+the response verbatim instead of encoding the same data a second time.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Dict, Mapping, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+ENCODER_BACKENDS = ("auto", "json", "orjson", "msgspec")
+
+# Pre-encoded texts kept for splicing; results are encoded right after they are produced.
+_MAX_REMEMBERED = 64
+
+
+def _json_default(value: Any) -> Any:
+    # orjson encodes enums natively as their value
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _finite(value: Any) -> Any:
+    """Copy of value with NaN and infinities replaced by None, as orjson writes them"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _json_backend(indent: Optional[int]) -> Callable[[Any], str]:
+    if indent:
+        options = dict(ensure_ascii=False, indent=indent, default=_json_default, allow_nan=False)
+    else:
+        options = dict(ensure_ascii=False, separators=(",", ":"), default=_json_default, allow_nan=False)
+
+    def encode(payload: Any) -> str:
+        try:
+            return json.dumps(payload, **options)
+        except ValueError as exc:
+            if "Out of range float" not in str(exc):
+                raise
+            return json.dumps(_finite(payload), **options)
+
+    return encode
+
+
+def _orjson_backend(indent: Optional[int]) -> Callable[[Any], str]:
+    # Datetimes and dataclasses go through default=str like they do with the json module
+    option = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | (orjson.OPT_INDENT_2 if indent else 0)
+    )
+    return lambda payload: orjson.dumps(payload, default=str, option=option).decode("utf-8")
+
+
+def _msgspec_backend(indent: Optional[int]) -> Callable[[Any], str]:
+    encoder = msgspec.json.Encoder(enc_hook=str)
+    if indent:
+        return lambda payload: msgspec.json.format(encoder.encode(payload), indent=indent).decode("utf-8")
+    return lambda payload: encoder.encode(payload).decode("utf-8")
+
+
+def _resolve_backend(backend: str) -> str:
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown JSON encoder: {backend!r} (expected one of {', '.join(ENCODER_BACKENDS)})")
+    if backend == "auto":
+        # msgspec formats datetimes differently, so it is only used when asked for
+        return "orjson" if orjson is not None else "json"
+    if backend == "orjson" and orjson is None:
+        raise ValueError("JSON encoder 'orjson' requested but orjson is not installed")
+    if backend == "msgspec" and msgspec is None:
+        raise ValueError("JSON encoder 'msgspec' requested but msgspec is not installed")
+    return backend
+
+
+class ResponseEncoder:
+    """Compact JSON encoder for tool responses with a pluggable backend"""
+
+    def __init__(self, backend: str = "auto", indent: Optional[int] = None):
+        self.backend = _resolve_backend(backend)
+        self.indent = indent or None
+        self._fallback = _json_backend(self.indent)
+        if self.backend == "orjson":
+            self._encode = _orjson_backend(self.indent)
+        elif self.backend == "msgspec":
+            self._encode = _msgspec_backend(self.indent)
+        else:
+            self._encode = self._fallback
+        self._remembered: "OrderedDict[int, tuple[Any, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "ResponseEncoder":
+        """
+        Build an encoder from environment variables:
+        - ALLBEMCP_JSON_ENCODER: auto | json | orjson | msgspec (default auto)
+        - ALLBEMCP_JSON_INDENT: indent width for human-readable output (default compact)
+        """
+        env = os.environ if environ is None else environ
+        indent = env.get("ALLBEMCP_JSON_INDENT", "").strip()
+        return cls(
+            backend=env.get("ALLBEMCP_JSON_ENCODER", "auto").strip() or "auto",
+            indent=int(indent) if indent else None,
+        )
+
+    def remember(self, data: Any, text: Optional[str]) -> None:
+        """Register JSON text already produced for data (a list or dict)"""
+        if text is None or not isinstance(data, (list, dict)) or self.indent:
+            return
+        # json.dumps writes NaN/Infinity where responses have null; encode those again
+        if "NaN" in text or "Infinity" in text:
+            return
+        with self._lock:
+            self._remembered[id(data)] = (data, text)
+            self._remembered.move_to_end(id(data))
+            while len(self._remembered) > _MAX_REMEMBERED:
+                self._remembered.popitem(last=False)
+
+    def _recall(self, value: Any) -> Optional[str]:
+        if not isinstance(value, (list, dict)):
+            return None
+        with self._lock:
+            entry = self._remembered.get(id(value))
+        # Holding the object keeps its id from being reused, but check identity anyway
+        if entry is not None and entry[0] is value:
+            return entry[1]
+        return None
+
+    def encode(self, payload: Any) -> str:
+        """Encode payload as JSON text, splicing in remembered texts of its values"""
+        text = self._recall(payload)
+        if text is not None:
+            return text
+        if isinstance(payload, dict) and self._remembered:
+            spliced = [(key, self._recall(value)) for key, value in payload.items()]
+            if any(text is not None for _, text in spliced):
+                return self._encode_spliced(payload, spliced)
+        return self._dumps(payload)
+
+    def _encode_spliced(self, payload: Dict[Any, Any], spliced: list) -> str:
+        parts = []
+        for key, text in spliced:
+            value_text = text if text is not None else self._dumps(payload[key])
+            parts.append(f"{self._dumps(str(key))}:{value_text}")
+        return "{" + ",".join(parts) + "}"
+
+    def _dumps(self, payload: Any) -> str:
+        if self._encode is self._fallback:
+            return self._fallback(payload)
+        try:
+            return self._encode(payload)
+        except Exception:
+            return self._fallback(payload)
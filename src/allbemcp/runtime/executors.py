@@ -0,0 +1,387 @@
+"""
+Tool execution layer for the MCP runtime.
+
+Synchronous tools run on one of three executors, selected per tool:
+
+- thread:  shared thread pool (I/O-bound tools, stored-object methods)
+- process: process pool for picklable, pure module-level functions
+- inline:  directly on the event loop, for trivially fast calls
+
+Tools run on the thread pool unless configured otherwise. The opt-in "auto"
+mode starts a tool on the thread pool and moves it inline once its observed
+execution time stays below ``inline_threshold_ms``; a slow call moves it back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+from allbemcp.runtime.instances import DEFAULT_CHECKOUT_TIMEOUT, validate_policy
+from allbemcp.runtime.stats import CallStats
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_MODES = ("auto", "thread", "process", "inline")
+
+# Weight of the newest sample in the per-tool moving average used by "auto".
+_EMA_ALPHA = 0.2
+
+# Marker returned by a process-pool call whose result could not be pickled.
+_UNPICKLABLE = object()
+
+
+def _validate_mode(mode: Any) -> str:
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode: {mode!r} (expected one of {', '.join(EXECUTION_MODES)})")
+    return mode
+
+
+def _run_pickled_call(payload: bytes) -> Optional[bytes]:
+    """Process-pool entry point: run a pickled (func, kwargs) call and pickle the result.
+
+    Returns None when the result cannot be pickled; the caller fails that call
+    and sends later calls of the tool to the thread pool.
+    """
+    func, kwargs = pickle.loads(payload)
+    result = func(**kwargs)
+    try:
+        return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+
+class ExecutionConfig:
+    """Execution pool configuration"""
+
+    def __init__(self, config_dict: Optional[Dict] = None):
+        """
+        Configuration parameters:
+        - thread_workers: Thread pool size (default min(32, cpu_count + 4))
+        - process_workers: Process pool size, 0 disables the pool (default cpu_count)
+        - default_mode: Executor for tools without an explicit mode (default "thread")
+        - tool_modes: Per-tool executor, {tool_name: "auto" | "thread" | "process" | "inline"}
+        - inline_threshold_ms: "auto" runs a tool inline below this average time (default 1.0)
+        - inline_min_samples: Calls observed before "auto" may go inline (default 5)
+        - instance_policy: Instances behind class-method tools, "shared" | "per-thread" |
+          "pooled" | "fresh" (default "shared")
+        - instance_pool_size: Instances per class under the "pooled" policy (default thread_workers)
+        - class_instance_policies: Per-class policy, {class_full_name: policy}
+        - instance_checkout_timeout: Seconds to wait for a pooled instance (default 30),
+          None waits forever
+        """
+        config = config_dict or {}
+        cpu_count = os.cpu_count() or 1
+
+        self.thread_workers = max(1, int(config.get('thread_workers', min(32, cpu_count + 4))))
+        self.process_workers = max(0, int(config.get('process_workers', cpu_count)))
+        self.default_mode = _validate_mode(config.get('default_mode', 'thread'))
+        self.tool_modes = {
+            name: _validate_mode(mode) for name, mode in config.get('tool_modes', {}).items()
+        }
+        self.inline_threshold_ms = float(config.get('inline_threshold_ms', 1.0))
+        self.inline_min_samples = max(1, int(config.get('inline_min_samples', 5)))
+        self.instance_policy = validate_policy(config.get('instance_policy', 'shared'))
+        self.instance_pool_size = max(1, int(config.get('instance_pool_size') or self.thread_workers))
+        self.class_instance_policies = {
+            name: validate_policy(policy) for name, policy in config.get('class_instance_policies', {}).items()
+        }
+        self.instance_checkout_timeout = config.get('instance_checkout_timeout', DEFAULT_CHECKOUT_TIMEOUT)
+
+    @classmethod
+    def from_file(cls, config_path: str):
+        """Load configuration from JSON file"""
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config_dict = json.load(f)
+        return cls(config_dict)
+
+    @classmethod
+    def from_env(cls, config_dict: Optional[Dict] = None, environ: Optional[Mapping[str, str]] = None):
+        """
+        Overlay environment variables on a configuration dict:
+        - ALLBEMCP_WORKERS: thread_workers
+        - ALLBEMCP_PROCESS_WORKERS: process_workers
+        - ALLBEMCP_EXECUTOR: default_mode
+        - ALLBEMCP_INSTANCE_POLICY: instance_policy
+        - ALLBEMCP_INSTANCE_POOL_SIZE: instance_pool_size
+        - ALLBEMCP_PROCESS_TOOLS / ALLBEMCP_INLINE_TOOLS / ALLBEMCP_THREAD_TOOLS:
+          comma-separated tool names forced to that executor
+        """
+        env = os.environ if environ is None else environ
+        config = dict(config_dict or {})
+
+        if env.get('ALLBEMCP_WORKERS'):
+            config['thread_workers'] = int(env['ALLBEMCP_WORKERS'])
+        if env.get('ALLBEMCP_PROCESS_WORKERS'):
+            config['process_workers'] = int(env['ALLBEMCP_PROCESS_WORKERS'])
+        if env.get('ALLBEMCP_EXECUTOR'):
+            config['default_mode'] = env['ALLBEMCP_EXECUTOR']
+        if env.get('ALLBEMCP_INSTANCE_POLICY'):
+            config['instance_policy'] = env['ALLBEMCP_INSTANCE_POLICY']
+        if env.get('ALLBEMCP_INSTANCE_POOL_SIZE'):
+            config['instance_pool_size'] = int(env['ALLBEMCP_INSTANCE_POOL_SIZE'])
+
+        tool_modes = dict(config.get('tool_modes', {}))
+        for mode in ("process", "inline", "thread"):
+            for name in env.get(f'ALLBEMCP_{mode.upper()}_TOOLS', '').split(','):
+                if name.strip():
+                    tool_modes[name.strip()] = mode
+        config['tool_modes'] = tool_modes
+
+        return cls(config)
+
+
+class _QueueMetrics:
+    """Queue-depth counters for one executor"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.submitted = 0
+        self.completed = 0
+        self.running = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self.submitted - self.completed
+
+    def queue_depth(self, track_running: bool) -> int:
+        if track_running:
+            return self.in_flight - self.running
+        return max(0, self.in_flight - self.workers)
+
+    def snapshot(self, track_running: bool) -> Dict[str, Any]:
+        started = self.completed + self.running
+        return {
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth(track_running),
+            "max_queue_depth": self.max_queue_depth,
+            "avg_queue_wait": (self.total_wait / started) if track_running and started > 0 else 0.0,
+        }
+
+
+class ToolExecutionPool:
+    """Dispatches synchronous tool calls to a thread pool, a process pool or inline execution."""
+
+    def __init__(self, config: Optional[ExecutionConfig] = None, call_stats: Optional[CallStats] = None):
+        self.config = config or ExecutionConfig()
+        # Receives queue_wait/execution samples of tool calls (see runtime.stats)
+        self.call_stats = call_stats
+
+        self._thread_pool = ThreadPoolExecutor(
+            max_workers=self.config.thread_workers, thread_name_prefix="mcp-tool-"
+        )
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self._thread_metrics = _QueueMetrics(self.config.thread_workers)
+        self._process_metrics = _QueueMetrics(self.config.process_workers)
+        self._inline_calls = 0
+
+        # Per-tool moving average of execution time (seconds) and sample count.
+        self._avg_time: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        # Tools whose function or results turned out not to be picklable.
+        self._process_unsafe: set[str] = set()
+        self._last_mode: Dict[str, str] = {}
+
+    def mode_for(self, tool_name: str, process_eligible: bool = False, may_block: bool = False) -> str:
+        """Resolve the executor a tool call will use right now.
+
+        Calls that may block waiting on another call (may_block) never run
+        inline, whatever the tool's mode: that wait would stall the event loop.
+        """
+        mode = self.config.tool_modes.get(tool_name, self.config.default_mode)
+        if may_block and mode in ("inline", "auto"):
+            return "thread"
+
+        if mode == "process":
+            if process_eligible and self.config.process_workers > 0 and tool_name not in self._process_unsafe:
+                return "process"
+            return "thread"
+
+        if mode == "auto":
+            samples = self._samples.get(tool_name, 0)
+            avg = self._avg_time.get(tool_name)
+            if (
+                samples >= self.config.inline_min_samples
+                and avg is not None
+                and avg * 1000.0 < self.config.inline_threshold_ms
+            ):
+                return "inline"
+            return "thread"
+
+        return mode
+
+    async def run_tool(
+        self,
+        tool_name: str,
+        func: Callable[..., Any],
+        kwargs: Dict[str, Any],
+        process_eligible: bool = False,
+        may_block: bool = False,
+    ) -> Any:
+        """Run a synchronous tool call on the executor selected for it."""
+        mode = self.mode_for(tool_name, process_eligible, may_block)
+
+        if mode == "process":
+            payload = self._pickle_call(tool_name, func, kwargs)
+            if payload is not None:
+                self._last_mode[tool_name] = "process"
+                started = time.perf_counter()
+                result = await self._run_in_process(payload)
+                if self.call_stats is not None:
+                    # Round trip: worker queueing and (un)pickling are included
+                    self.call_stats.record(tool_name, "execution", time.perf_counter() - started)
+                if result is not _UNPICKLABLE:
+                    return result
+                # The tool already ran; running it again on a thread would repeat its work
+                # (and any side effects), so only later calls go to the thread pool.
+                logger.info("Result of %s is not picklable; using thread pool from now on", tool_name)
+                self._process_unsafe.add(tool_name)
+                raise TypeError(
+                    f"The result of {tool_name} cannot be sent back from the process pool; "
+                    "retry the call, it will run on the thread pool"
+                )
+            mode = "thread"
+
+        self._last_mode[tool_name] = mode
+        if mode == "inline":
+            return self._run_inline(tool_name, func, kwargs)
+        return await self.run_in_thread(func, kwargs=kwargs, tool_name=tool_name)
+
+    async def run_in_thread(
+        self,
+        func: Callable[..., Any],
+        args: Sequence[Any] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        tool_name: Optional[str] = None,
+    ) -> Any:
+        """Run a callable on the thread pool, tracking queue depth and (optionally) tool timing."""
+        kwargs = kwargs or {}
+        metrics = self._thread_metrics
+        submitted_at = time.perf_counter()
+
+        def call() -> Any:
+            started = time.perf_counter()
+            with self._lock:
+                metrics.running += 1
+                metrics.total_wait += started - submitted_at
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    metrics.running -= 1
+                    metrics.completed += 1
+                    if tool_name is not None:
+                        self._record_time(tool_name, elapsed)
+                if tool_name is not None and self.call_stats is not None:
+                    self.call_stats.record(tool_name, "queue_wait", started - submitted_at)
+                    self.call_stats.record(tool_name, "execution", elapsed)
+
+        with self._lock:
+            metrics.submitted += 1
+            depth = metrics.queue_depth(track_running=True)
+            metrics.max_queue_depth = max(metrics.max_queue_depth, depth)
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._thread_pool, call)
+        except RuntimeError:
+            # Pool already shut down; the call was never queued.
+            with self._lock:
+                metrics.completed += 1
+            raise
+        return await future
+
+    def _run_inline(self, tool_name: str, func: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(**kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._inline_calls += 1
+                self._record_time(tool_name, elapsed)
+            if self.call_stats is not None:
+                self.call_stats.record(tool_name, "execution", elapsed)
+
+    def _record_time(self, tool_name: str, elapsed: float) -> None:
+        previous = self._avg_time.get(tool_name)
+        self._avg_time[tool_name] = elapsed if previous is None else previous + _EMA_ALPHA * (elapsed - previous)
+        self._samples[tool_name] = self._samples.get(tool_name, 0) + 1
+
+    def _pickle_call(self, tool_name: str, func: Callable[..., Any], kwargs: Dict[str, Any]) -> Optional[bytes]:
+        """Pickle (func, kwargs) once for the worker; None if that is not possible."""
+        try:
+            return pickle.dumps((func, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            try:
+                pickle.dumps(func, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                logger.info("Tool %s is not picklable; using thread pool", tool_name)
+                self._process_unsafe.add(tool_name)
+            return None
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            with self._lock:
+                if self._process_pool is None:
+                    # spawn avoids forking a process that holds the event loop and tool threads
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.config.process_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._process_pool
+
+    async def _run_in_process(self, payload: bytes) -> Any:
+        metrics = self._process_metrics
+        with self._lock:
+            metrics.submitted += 1
+            depth = metrics.queue_depth(track_running=False)
+            metrics.max_queue_depth = max(metrics.max_queue_depth, depth)
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._get_process_pool(), _run_pickled_call, payload)
+        finally:
+            with self._lock:
+                metrics.completed += 1
+
+        if result is None:
+            return _UNPICKLABLE
+        return pickle.loads(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue-depth metrics for each executor and the current per-tool mode."""
+        with self._lock:
+            return {
+                "thread": self._thread_metrics.snapshot(track_running=True),
+                "process": {
+                    **self._process_metrics.snapshot(track_running=False),
+                    "started": self._process_pool is not None,
+                },
+                "inline": {"calls": self._inline_calls},
+                "default_mode": self.config.default_mode,
+                "tool_modes": dict(self._last_mode),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._thread_pool.shutdown(wait=wait)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
+
@@ -0,0 +1,211 @@
+"""
+Instances behind class-method tools.
+
+A tool that exposes ``SomeClass.method`` needs an instance to call it on. The
+instance manager creates those instances implicitly (with no constructor
+arguments) and hands one out per call, under a reuse policy chosen per class:
+
+- shared:     one instance for all calls and threads (cheapest; the class has
+              to be thread-safe)
+- per-thread: one instance per executor thread
+- pooled:     up to ``pool_size`` instances, each checked out by one call at a
+              time; further calls wait (``checkout_timeout`` seconds at most)
+              for an instance to be returned
+- fresh:      a new instance for every call
+
+Instances are kept per class, not per tool, so every tool on the same class
+draws from the same instances. Coroutine methods hold their instance until
+the coroutine finishes (see ``InstanceManager.async_instance``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+INSTANCE_POLICIES = ("shared", "per-thread", "pooled", "fresh")
+
+# Seconds a call waits for a pooled instance before giving up.
+DEFAULT_CHECKOUT_TIMEOUT = 30.0
+
+
+def validate_policy(policy: Any) -> str:
+    if policy not in INSTANCE_POLICIES:
+        raise ValueError(f"Unknown instance policy: {policy!r} (expected one of {', '.join(INSTANCE_POLICIES)})")
+    return policy
+
+
+def class_key(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+class _ClassInstances:
+    """Instances of one class under one policy"""
+
+    def __init__(self, cls: type, policy: str, pool_size: int, checkout_timeout: Optional[float]):
+        self.cls = cls
+        self.policy = policy
+        self.pool_size = max(1, pool_size)
+        self.checkout_timeout = checkout_timeout
+        self.created = 0
+        self.checkouts = 0
+        self.waits = 0
+        self._condition = threading.Condition()
+        self._shared: Any = None
+        self._shared_lock = threading.Lock()
+        self._local = threading.local()
+        self._idle: List[Any] = []
+        self._in_use = 0
+
+    def _create(self) -> Any:
+        try:
+            instance = self.cls()
+        except Exception as exc:
+            raise RuntimeError(
+                f"Cannot create instance of {self.cls.__name__}: {exc}. "
+                "This class may require constructor arguments; use constructor tool first."
+            ) from exc
+        with self._condition:
+            self.created += 1
+        return instance
+
+    def acquire(self) -> Any:
+        with self._condition:
+            self.checkouts += 1
+        if self.policy == "fresh":
+            return self._create()
+        if self.policy == "per-thread":
+            instance = getattr(self._local, "instance", None)
+            if instance is None:
+                instance = self._local.instance = self._create()
+            return instance
+        if self.policy == "shared":
+            instance = self._shared
+            if instance is None:
+                with self._shared_lock:
+                    if self._shared is None:
+                        self._shared = self._create()
+                    instance = self._shared
+            return instance
+        return self._acquire_pooled()
+
+    def _acquire_pooled(self) -> Any:
+        with self._condition:
+            waited = False
+            while not self._idle and self._in_use >= self.pool_size:
+                if not waited:
+                    self.waits += 1
+                    waited = True
+                if not self._condition.wait(self.checkout_timeout):
+                    raise TimeoutError(
+                        f"No instance of {self.cls.__name__} became available within {self.checkout_timeout}s"
+                    )
+            self._in_use += 1
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._create()
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, instance: Any) -> None:
+        if self.policy != "pooled":
+            return
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append(instance)
+            self._condition.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            stats = {
+                "policy": self.policy,
+                "created": self.created,
+                "checkouts": self.checkouts,
+            }
+            if self.policy == "pooled":
+                stats.update(pool_size=self.pool_size, in_use=self._in_use, idle=len(self._idle), waits=self.waits)
+            return stats
+
+
+class InstanceManager:
+    """Implicit instances for class-method tools, shared per class"""
+
+    def __init__(
+        self,
+        default_policy: str = "shared",
+        pool_size: int = 4,
+        class_policies: Optional[Dict[str, str]] = None,
+        checkout_timeout: Optional[float] = DEFAULT_CHECKOUT_TIMEOUT,
+    ):
+        self.default_policy = validate_policy(default_policy)
+        self.pool_size = max(1, int(pool_size))
+        self.class_policies = {name: validate_policy(policy) for name, policy in (class_policies or {}).items()}
+        self.checkout_timeout = checkout_timeout
+        self._classes: Dict[type, _ClassInstances] = {}
+        self._lock = threading.Lock()
+
+    def policy_for(self, cls: type) -> str:
+        return self.class_policies.get(class_key(cls), self.default_policy)
+
+    def may_block(self, cls: type) -> bool:
+        """True when checking out an instance of cls can wait for another call"""
+        return self.policy_for(cls) == "pooled"
+
+    def _instances(self, cls: type) -> _ClassInstances:
+        holder = self._classes.get(cls)
+        if holder is None:
+            with self._lock:
+                holder = self._classes.get(cls)
+                if holder is None:
+                    holder = self._classes[cls] = _ClassInstances(
+                        cls, self.policy_for(cls), self.pool_size, self.checkout_timeout
+                    )
+        return holder
+
+    @contextmanager
+    def instance(self, cls: type) -> Iterator[Any]:
+        """Check out an instance of cls for the duration of one call"""
+        holder = self._instances(cls)
+        instance = holder.acquire()
+        try:
+            yield instance
+        finally:
+            holder.release(instance)
+
+    @asynccontextmanager
+    async def async_instance(self, cls: type) -> AsyncIterator[Any]:
+        """Check out an instance of cls for the duration of one awaited call
+
+        A pooled checkout can wait for another call, so it is made on the
+        loop's default executor rather than on the event loop thread.
+        """
+        holder = self._instances(cls)
+        if holder.policy == "pooled":
+            checkout = asyncio.get_running_loop().run_in_executor(None, holder.acquire)
+            try:
+                instance = await asyncio.shield(checkout)
+            except asyncio.CancelledError:
+                # The checkout still completes; hand that instance straight back
+                def give_back(done: "asyncio.Future[Any]") -> None:
+                    if not done.cancelled() and done.exception() is None:
+                        holder.release(done.result())
+
+                checkout.add_done_callback(give_back)
+                raise
+        else:
+            instance = holder.acquire()
+        try:
+            yield instance
+        finally:
+            holder.release(instance)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            holders = list(self._classes.values())
+        return {class_key(holder.cls): holder.stats() for holder in holders}
@@ -0,0 +1,208 @@
+"""
+Result memoization for pure tools.
+
+A memoized tool returns the stored response for a repeated call instead of
+running and serializing the function again. Entries are keyed on the tool name
+and a canonical encoding of the coerced arguments; only calls whose arguments
+are plain values (str/int/float/bool/None, paths, and lists/tuples/dicts of
+those) are memoized, so results that depend on a stored object are never
+reused. Responses that refer to stored objects, resources or cursors are not
+cached either, because those can expire or change.
+
+Entries are evicted least-recently-used first, when they are older than the
+TTL, or when the entry count or total byte budget is exceeded.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import PurePath
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+# Response keys that point at state living outside the cached payload.
+_STATEFUL_KEYS = ("object_id", "resource_id", "cursor_id", "uri")
+
+
+class MemoConfig:
+    """Memoization configuration"""
+
+    def __init__(self, config_dict: Optional[Dict] = None):
+        """
+        Configuration parameters:
+        - tools: Tool names to memoize (default none)
+        - use_analyzer_hints: Also memoize tools the analyzer marked as pure_candidate (default False)
+        - exclude_tools: Tools never memoized, even when hinted
+        - ttl_seconds: Lifetime of an entry, 0 disables expiry (default 300)
+        - max_entries: Max number of cached results (default 1024)
+        - max_bytes: Byte budget of cached results, by encoded size (default 16MB)
+        - max_entry_bytes: Larger results are not cached (default 1MB)
+        """
+        config = config_dict or {}
+
+        self.tools = set(config.get('tools', []))
+        self.use_analyzer_hints = bool(config.get('use_analyzer_hints', False))
+        self.exclude_tools = set(config.get('exclude_tools', []))
+        self.ttl_seconds = float(config.get('ttl_seconds', 300))
+        self.max_entries = max(1, int(config.get('max_entries', 1024)))
+        self.max_bytes = max(0, int(config.get('max_bytes', 16 * 1024 * 1024)))
+        self.max_entry_bytes = max(0, int(config.get('max_entry_bytes', 1024 * 1024)))
+
+    @classmethod
+    def from_file(cls, config_path: str):
+        """Load configuration from JSON file"""
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config_dict = json.load(f)
+        return cls(config_dict)
+
+    @classmethod
+    def from_env(cls, config_dict: Optional[Dict] = None, environ: Optional[Mapping[str, str]] = None):
+        """
+        Overlay environment variables on a configuration dict:
+        - ALLBEMCP_MEMO_TOOLS: comma-separated tool names to memoize
+        - ALLBEMCP_MEMO_PURE: memoize analyzer-suggested pure tools ("1"/"true")
+        """
+        env = os.environ if environ is None else environ
+        config = dict(config_dict or {})
+
+        tools = list(config.get('tools', []))
+        tools.extend(name.strip() for name in env.get('ALLBEMCP_MEMO_TOOLS', '').split(',') if name.strip())
+        config['tools'] = tools
+        if env.get('ALLBEMCP_MEMO_PURE', '').strip().lower() in ('1', 'true', 'yes', 'on'):
+            config['use_analyzer_hints'] = True
+
+        return cls(config)
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-compatible form of a plain argument value; raises TypeError otherwise"""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, PurePath):
+        return {'$path': str(value)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("non-string key")
+        return {key: _canonical(item) for key, item in value.items()}
+    raise TypeError(type(value).__name__)
+
+
+def canonical_arguments(arguments: Mapping[str, Any]) -> Optional[str]:
+    """
+    Canonical string for a set of coerced arguments, or None when an argument
+    is not a plain value. Keys are sorted, and 1, 1.0 and True stay distinct.
+    """
+    try:
+        return json.dumps(
+            {name: _canonical(value) for name, value in arguments.items()},
+            sort_keys=True,
+            separators=(',', ':'),
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def is_cacheable_response(response: Any) -> bool:
+    """False if the response refers to a stored object, resource or cursor"""
+    if isinstance(response, dict):
+        if any(key in response for key in _STATEFUL_KEYS):
+            return False
+        return all(is_cacheable_response(value) for value in response.values())
+    if isinstance(response, list):
+        return all(is_cacheable_response(item) for item in response)
+    return True
+
+
+class MemoCache:
+    """LRU + TTL cache of tool responses with an entry count and byte budget"""
+
+    def __init__(self, config: Optional[MemoConfig] = None, pure_tools: Iterable[str] = ()):
+        self.config = config or MemoConfig()
+        self._tools = set(self.config.tools)
+        if self.config.use_analyzer_hints:
+            self._tools.update(pure_tools)
+        self._tools -= self.config.exclude_tools
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def tools(self) -> frozenset:
+        return frozenset(self._tools)
+
+    def enabled_for(self, tool_name: str) -> bool:
+        return tool_name in self._tools
+
+    def get(self, tool_name: str, key: str) -> Optional[Any]:
+        """Cached response for a call, or None on a miss"""
+        entry_key = (tool_name, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                expires_at, size, response = entry
+                if expires_at and expires_at < time.monotonic():
+                    self._remove_locked(entry_key)
+                    self.expirations += 1
+                else:
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    return response
+            self.misses += 1
+            return None
+
+    def put(self, tool_name: str, key: str, response: Any) -> bool:
+        """Cache a response; returns False if it is stateful or too large"""
+        if not is_cacheable_response(response):
+            return False
+        try:
+            size = len(json.dumps(response, ensure_ascii=False, default=str))
+        except (TypeError, ValueError):
+            return False
+        if size > self.config.max_entry_bytes or (self.config.max_bytes and size > self.config.max_bytes):
+            return False
+
+        ttl = self.config.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl > 0 else 0.0
+        entry_key = (tool_name, key)
+        with self._lock:
+            self._remove_locked(entry_key)
+            self._entries[entry_key] = (expires_at, size, response)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.config.max_entries
+                or (self.config.max_bytes and self._bytes > self.config.max_bytes)
+            ):
+                self._remove_locked(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def _remove_locked(self, entry_key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self, tool_name: Optional[str] = None) -> None:
+        with self._lock:
+            for entry_key in [k for k in self._entries if tool_name is None or k[0] == tool_name]:
+                self._remove_locked(entry_key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'tools': sorted(self._tools),
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
@@ -7,16 +7,17 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import atexit
 import base64
 import importlib
 import inspect
 import json
 import logging
+import os
 import threading
 import time
 import types as py_types
-from concurrent.futures import ThreadPoolExecutor
-from collections import defaultdict
+import weakref
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Union, get_args, get_origin, get_type_hints
 
@@ -25,8 +26,15 @@ from fastmcp import Context, FastMCP
 from fastmcp.server.dependencies import transform_context_annotations
 from fastmcp.tools.function_tool import FunctionTool
 
+from allbemcp.runtime.executors import EXECUTION_MODES, ExecutionConfig, ToolExecutionPool
+from allbemcp.runtime.encoding import ResponseEncoder
+from allbemcp.runtime.instances import InstanceManager
+from allbemcp.runtime.memo import MemoCache, MemoConfig, canonical_arguments
+from allbemcp.runtime.stats import CallStats
+
 try:
     from allbemcp.serialization.engine import SerializationConfig, SmartSerializer
+    from allbemcp.serialization.resources import ResourceEntry
 
     SERIALIZATION_ENGINE_AVAILABLE = True
 except ImportError:
@@ -38,6 +46,9 @@ except ImportError:
     class SerializationConfig:  # type: ignore[no-redef]
         pass
 
+    class ResourceEntry:  # type: ignore[no-redef]
+        pass
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -45,11 +56,95 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_CALLS = 100
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _batch_references(value: Any) -> List[str]:
+    """Call ids referenced through {"$ref": id} anywhere in a batch call's arguments"""
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            return [str(value["$ref"])]
+        return [ref for item in value.values() for ref in _batch_references(item)]
+    if isinstance(value, list):
+        return [ref for item in value for ref in _batch_references(item)]
+    return []
+
+
+def _resolve_batch_references(value: Any, results: Dict[str, Dict[str, Any]]) -> Any:
+    """Replace {"$ref": id} by the object_id (or data) of an earlier batch result"""
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            result = results[str(value["$ref"])]
+            data = result.get("data")
+            if "object_id" in result:
+                return result["object_id"]
+            if isinstance(data, dict) and "object_id" in data:
+                return data["object_id"]
+            return data
+        return {key: _resolve_batch_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_batch_references(item, results) for item in value]
+    return value
+
+
+def _type_attribute(obj: Any, name: str) -> Any:
+    """obj.name as provided by its type (None if that fails), ignoring the instance __dict__"""
+    try:
+        attr = inspect.getattr_static(type(obj), name)
+        bind = getattr(type(attr), "__get__", None)
+        return attr if bind is None else bind(attr, obj, type(obj))
+    except Exception:
+        return None
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+# Minimum seconds between writes of the persisted call counts.
+_USAGE_SAVE_INTERVAL = 10.0
+
+# Lazy servers whose call counts are saved at exit. Weak, so that the exit
+# hook does not keep discarded servers alive.
+_LAZY_SERVERS: "weakref.WeakSet[MCPServer]" = weakref.WeakSet()
+
+
+@atexit.register
+def _save_lazy_server_usage() -> None:
+    for server in list(_LAZY_SERVERS):
+        server._save_usage_counts()
+
 
 class MCPServer:
     """Generic MCP Server Runtime powered by FastMCP 3.x."""
 
-    def __init__(self, title: str, tools: List[Dict], function_map: Dict, library_name: str):
+    def __init__(
+        self,
+        title: str,
+        tools: List[Dict],
+        function_map: Dict,
+        library_name: str,
+        execution_config: Optional[ExecutionConfig] = None,
+        lazy: Optional[bool] = None,
+        warmup_tools: Optional[int] = None,
+        memo_config: Optional[MemoConfig] = None,
+        response_encoder: Optional[ResponseEncoder] = None,
+    ):
+        """
+        lazy: Register tools from their schema only and import each tool's
+            module on its first call (default: ALLBEMCP_LAZY).
+        warmup_tools: In lazy mode, preload this many of the most-called tools
+            (from {library}_call_stats.json) on a background thread
+            (default: ALLBEMCP_WARMUP_TOOLS or 20; 0 disables warm-up).
+        memo_config: Tools whose results are memoized (default:
+            {library}_memo_config.json and ALLBEMCP_MEMO_* env vars).
+        response_encoder: JSON encoder for tool responses (default: compact,
+            orjson when installed, see ALLBEMCP_JSON_ENCODER).
+        """
         self.title = title
         self.tools = tools
         self.function_map = function_map
@@ -64,12 +159,30 @@ class MCPServer:
         )
 
         self._func_cache: Dict[str, Callable[..., Any]] = {}
+        # Class tools whose instance checkout can wait (pooled policy); never run inline
+        self._blocking_tools: set[str] = set()
+        self._coercion_plans: Dict[Any, Optional[Dict[str, Callable[[Any], Any]]]] = {}
         self._object_store: Dict[str, Any] = {}
         self._object_methods: Dict[str, set[str]] = {}
-        self._class_instance_cache: Dict[str, Any] = {}
-        self._class_instance_lock = threading.Lock()
-        self._call_stats = defaultdict(lambda: {"count": 0, "total_time": 0.0, "errors": 0})
-        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mcp-tool-")
+        self._method_name_cache: Dict[type, tuple[str, ...]] = {}
+        self._call_stats = CallStats()
+        self._encoder = response_encoder or ResponseEncoder.from_env()
+
+        if execution_config is None:
+            execution_config = self._load_execution_config(library_name)
+        self._execution_pool = ToolExecutionPool(execution_config, call_stats=self._call_stats)
+        self._instances = InstanceManager(
+            default_policy=execution_config.instance_policy,
+            pool_size=execution_config.instance_pool_size,
+            class_policies=execution_config.class_instance_policies,
+            checkout_timeout=execution_config.instance_checkout_timeout,
+        )
+        if memo_config is None:
+            memo_config = self._load_memo_config(library_name)
+        self._memo = MemoCache(
+            memo_config,
+            pure_tools=[name for name, meta in function_map.items() if meta.get("pure_candidate")],
+        )
 
         if SERIALIZATION_ENGINE_AVAILABLE:
             config_file = Path(f"{library_name}_serialization_config.json")
@@ -84,20 +197,125 @@ class MCPServer:
             self.serializer = None
             logger.warning("Serialization engine not available, using fallback")
 
-        self._preload_functions()
+        self.lazy = _env_flag("ALLBEMCP_LAZY") if lazy is None else lazy
+        if warmup_tools is None:
+            warmup_tools = int(os.environ.get("ALLBEMCP_WARMUP_TOOLS", "20") or 0)
+        self.warmup_tools = max(0, warmup_tools)
+        self._usage_file = Path(f"{library_name}_call_stats.json").absolute()
+        self._usage_counts: Dict[str, int] = {}
+        self._usage_dirty = False
+        self._usage_saved_at = time.monotonic()
+        self._usage_write_lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+
+        if self.lazy:
+            self._usage_counts = self._load_usage_counts()
+            _LAZY_SERVERS.add(self)
+            self._start_warmup()
+        else:
+            self._preload_functions()
         self._register_tools()
         self._register_special_tools()
         self._register_primitives()
 
+    @staticmethod
+    def _load_execution_config(library_name: str, overrides: Optional[Dict[str, Any]] = None) -> ExecutionConfig:
+        """Build execution config from {library}_execution_config.json, ALLBEMCP_* env vars and overrides."""
+        config_dict: Dict[str, Any] = {}
+        config_file = Path(f"{library_name}_execution_config.json")
+        if config_file.exists():
+            with open(config_file, "r", encoding="utf-8") as f:
+                config_dict = json.load(f)
+            logger.info("Loaded execution config from %s", config_file)
+        config_dict = vars(ExecutionConfig.from_env(config_dict))
+        config_dict.update(overrides or {})
+        return ExecutionConfig(config_dict)
+
+    @staticmethod
+    def _load_memo_config(library_name: str) -> MemoConfig:
+        """Build memoization config from {library}_memo_config.json and ALLBEMCP_MEMO_* env vars."""
+        config_dict: Dict[str, Any] = {}
+        config_file = Path(f"{library_name}_memo_config.json")
+        if config_file.exists():
+            with open(config_file, "r", encoding="utf-8") as f:
+                config_dict = json.load(f)
+            logger.info("Loaded memoization config from %s", config_file)
+        return MemoConfig.from_env(config_dict)
+
     def _preload_functions(self) -> None:
         for tool_name in self.function_map.keys():
             if tool_name == "call-object-method":
                 continue
             try:
-                self._get_function(tool_name)
+                self._get_coercion_plan(self._get_function(tool_name))
             except Exception as exc:
                 logger.warning("Failed to preload %s: %s", tool_name, exc)
 
+    def _load_usage_counts(self) -> Dict[str, int]:
+        if not self._usage_file.exists():
+            return {}
+        try:
+            with open(self._usage_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {str(k): int(v) for k, v in data.items() if isinstance(v, (int, float))}
+        except Exception as exc:
+            logger.warning("Ignoring unreadable call stats %s: %s", self._usage_file, exc)
+            return {}
+
+    def _record_usage(self, tool_name: str) -> None:
+        """Count a call for warm-up ranking; persisted in lazy mode only."""
+        if not self.lazy:
+            return
+        self._usage_counts[tool_name] = self._usage_counts.get(tool_name, 0) + 1
+        self._usage_dirty = True
+        if time.monotonic() - self._usage_saved_at >= _USAGE_SAVE_INTERVAL:
+            self._usage_saved_at = time.monotonic()
+            self._usage_dirty = False
+            counts = dict(self._usage_counts)
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._write_usage_counts(counts)
+            else:
+                # Called from tool execution: keep the file write off the event loop
+                loop.run_in_executor(None, self._write_usage_counts, counts)
+
+    def _save_usage_counts(self) -> None:
+        if not self._usage_dirty:
+            return
+        self._usage_saved_at = time.monotonic()
+        self._usage_dirty = False
+        self._write_usage_counts(dict(self._usage_counts))
+
+    def _write_usage_counts(self, counts: Dict[str, int]) -> None:
+        tmp_file = self._usage_file.with_name(self._usage_file.name + ".tmp")
+        with self._usage_write_lock:
+            try:
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(counts, f, ensure_ascii=False, sort_keys=True)
+                os.replace(tmp_file, self._usage_file)
+            except Exception as exc:
+                logger.warning("Failed to save call stats to %s: %s", self._usage_file, exc)
+
+    def _start_warmup(self) -> None:
+        ranked = sorted(
+            (name for name in self._usage_counts if name in self.function_map and name != "call-object-method"),
+            key=lambda name: (-self._usage_counts[name], name),
+        )[: self.warmup_tools]
+        if not ranked:
+            return
+
+        def warm_up() -> None:
+            for tool_name in ranked:
+                try:
+                    self._get_coercion_plan(self._get_function(tool_name))
+                except Exception as exc:
+                    logger.debug("Warm-up of %s failed: %s", tool_name, exc)
+            logger.info("Warmed up %d most-used tools", len(ranked))
+
+        self._warmup_thread = threading.Thread(target=warm_up, name="mcp-warmup", daemon=True)
+        self._warmup_thread.start()
+
     def _register_tools(self) -> None:
         for tool in self.tools:
             tool_name = tool.get("name")
@@ -112,7 +330,7 @@ class MCPServer:
             async def wrapper(ctx: Context, _tool_name: str = tool_name, **kwargs: Any):
                 try:
                     result = await self._execute_tool(_tool_name, kwargs)
-                    return self._to_mcp_content(result)
+                    return self._encode_content(_tool_name, result)
                 except Exception as exc:
                     logger.error("Tool execution error (%s): %s", _tool_name, exc, exc_info=True)
                     await ctx.error(str(exc))
@@ -166,7 +384,7 @@ class MCPServer:
                 }
             )
             await ctx.info(f"Called {selected_method} on {object_id}")
-            return self._to_mcp_content(result)
+            return self._encode_content("call-object-method", result)
 
         @self.mcp.tool(name="list-objects", description="List currently stored stateful objects.")
         async def list_objects(_: Context):
@@ -178,12 +396,52 @@ class MCPServer:
 
         @self.mcp.tool(
             name="read-resource",
-            description="Read a cached resource by resource_id or resource URI.",
+            description=(
+                "Read a cached resource by resource_id or resource URI. "
+                "Use offset/length to read large resources in chunks."
+            ),
+        )
+        async def read_resource(
+            _: Context,
+            resource: str,
+            as_base64: bool = False,
+            offset: int = 0,
+            length: Optional[int] = None,
+        ):
+            # Off the event loop: spilled resources are read from disk, and the first
+            # read of an array's .npy resource writes the export
+            return await self._execution_pool.run_in_thread(
+                self._read_resource,
+                (resource,),
+                {"as_base64": as_base64, "offset": offset, "length": length},
+            )
+
+        @self.mcp.tool(
+            name="next-page",
+            description=(
+                "Fetch the next page of a generator/iterator result by cursor_id. "
+                "Responses include has_more and, while items remain, the cursor_id to continue with."
+            ),
+        )
+        async def next_page(_: Context, cursor_id: str, max_items: Optional[int] = None):
+            return await self._next_page(cursor_id, max_items)
+
+        @self.mcp.tool(
+            name="batch-call",
+            description=(
+                "Run several tool calls in one request. Each call is "
+                '{"id": ..., "tool": ..., "arguments": {...}, "depends_on": [...]}; '
+                'an argument value {"$ref": "<id>"} is replaced by the object_id (or data) '
+                "of that earlier call. Independent calls run concurrently; results come back in order."
+            ),
         )
-        async def read_resource(_: Context, resource: str, as_base64: bool = False):
-            return self._read_resource(resource, as_base64=as_base64)
+        async def batch_call(_: Context, calls: list[dict[str, Any]], fail_fast: bool = False):
+            return self._encode_content("batch-call", await self._execute_batch(calls, fail_fast=fail_fast))
 
-        @self.mcp.tool(name="get-call-stats", description="Get per-tool runtime call statistics.")
+        @self.mcp.tool(
+            name="get-call-stats",
+            description="Get per-tool call statistics with p50/p95/p99/max latency per phase.",
+        )
         async def get_call_stats(_: Context):
             return self.get_call_stats()
 
@@ -195,7 +453,7 @@ class MCPServer:
             mime_type="application/json",
         )
         def objects_resource() -> str:
-            return json.dumps(self._list_objects(), ensure_ascii=False, indent=2, default=str)
+            return self._encoder.encode(self._list_objects())
 
         @self.mcp.resource(
             "allbemcp://resources",
@@ -204,16 +462,16 @@ class MCPServer:
             mime_type="application/json",
         )
         def resources_resource() -> str:
-            return json.dumps(self._list_resources(), ensure_ascii=False, indent=2, default=str)
+            return self._encoder.encode(self._list_resources())
 
         @self.mcp.resource(
             "allbemcp://call-stats",
             name="allbemcp-call-stats",
-            description="Per-tool runtime statistics (count, errors, latency).",
+            description="Per-tool runtime statistics (count, errors, latency percentiles per phase).",
             mime_type="application/json",
         )
         def call_stats_resource() -> str:
-            return json.dumps(self.get_call_stats(), ensure_ascii=False, indent=2, default=str)
+            return self._encoder.encode(self.get_call_stats())
 
         @self.mcp.resource(
             "mcp://resources/{resource_id}",
@@ -221,12 +479,17 @@ class MCPServer:
             description="Read a cached runtime resource by resource ID.",
         )
         def cached_resource(resource_id: str):
+            _, entry = self._get_resource(resource_id)
+            if isinstance(entry, ResourceEntry) and not entry.is_text:
+                data = self.serializer.resources.read(entry.resource_id)
+                if data is not None:
+                    return data
             payload = self._read_resource(resource_id, as_base64=False)
             if "content" in payload:
                 return payload["content"]
             if "content_base64" in payload:
                 return base64.b64decode(payload["content_base64"])
-            return json.dumps(payload, ensure_ascii=False, indent=2, default=str)
+            return self._encoder.encode(payload)
 
         @self.mcp.prompt(
             name="allbemcp-tool-usage",
@@ -305,7 +568,7 @@ class MCPServer:
             return normalized[len("mcp://resources/") :]
         return normalized
 
-    def _get_resource(self, resource: str) -> tuple[str, Optional[Dict[str, Any]]]:
+    def _get_resource(self, resource: str) -> tuple[str, Any]:
         resource_id = self._extract_resource_id(resource)
         if not resource_id:
             return "", None
@@ -318,29 +581,102 @@ class MCPServer:
 
         return resource_id, None
 
+    async def _next_page(self, cursor_id: str, max_items: Optional[int] = None) -> Any:
+        if not (self.serializer and SERIALIZATION_ENGINE_AVAILABLE):
+            raise ValueError(f"Cursor '{cursor_id}' not found")
+
+        # Advancing a generator may block (I/O, heavy computation): keep it off the event loop.
+        result = await self._execution_pool.run_in_thread(
+            self.serializer.next_page, (cursor_id.strip(), max_items)
+        )
+        if result is None:
+            raise ValueError(f"Cursor '{cursor_id}' not found or expired")
+        return result.data
+
+    async def _execute_batch(self, calls: List[Dict[str, Any]], fail_fast: bool = False) -> Dict[str, Any]:
+        """
+        Execute a batch of tool calls in one round trip.
+
+        A call waits only for the calls it depends on, either listed in
+        ``depends_on`` or referenced through ``{"$ref": id}`` arguments; all
+        others start immediately. Dependencies must name earlier calls, so a
+        batch can never deadlock. A failed call fails its dependents; with
+        ``fail_fast`` it also cancels every call that has not started yet.
+        """
+        if not isinstance(calls, list) or not calls:
+            raise ValueError("calls must be a non-empty list")
+        if len(calls) > MAX_BATCH_CALLS:
+            raise ValueError(f"A batch holds at most {MAX_BATCH_CALLS} calls")
+
+        plans: List[tuple[str, str, Dict[str, Any], List[str]]] = []
+        seen: set[str] = set()
+        for index, call in enumerate(calls):
+            if not isinstance(call, dict) or not isinstance(call.get("tool"), str):
+                raise ValueError(f"Call {index} must be an object with a 'tool' name")
+            call_id = str(call.get("id", index))
+            if call_id in seen:
+                raise ValueError(f"Duplicate call id '{call_id}'")
+            if call["tool"] == "batch-call":
+                raise ValueError("batch-call cannot be nested")
+            arguments = call.get("arguments") or {}
+            if not isinstance(arguments, dict):
+                raise ValueError(f"Arguments of call '{call_id}' must be an object")
+            depends_on = [str(dep) for dep in call.get("depends_on") or []]
+            depends_on.extend(dep for dep in _batch_references(arguments) if dep not in depends_on)
+            for dep in depends_on:
+                if dep not in seen:
+                    raise ValueError(f"Call '{call_id}' depends on '{dep}', which is not an earlier call")
+            seen.add(call_id)
+            plans.append((call_id, call["tool"], arguments, depends_on))
+
+        tasks: Dict[str, asyncio.Task] = {}
+        aborted = asyncio.Event()
+
+        async def run(tool_name: str, arguments: Dict[str, Any], depends_on: List[str]) -> Dict[str, Any]:
+            results = {dep: await tasks[dep] for dep in depends_on}
+            for dep, result in results.items():
+                if not result.get("success"):
+                    return {"success": False, "error": f"Dependency '{dep}' failed"}
+            if aborted.is_set():
+                return {"success": False, "error": "Skipped after an earlier failure"}
+            try:
+                resolved = _resolve_batch_references(arguments, results)
+                if tool_name == "call-object-method":
+                    resolved = {
+                        "object_id": resolved.get("object_id"),
+                        "method": resolved.get("method_name") or resolved.get("method"),
+                        "args": resolved.get("args") or [],
+                        "kwargs": resolved.get("kwargs") or {},
+                    }
+                return await self._execute_tool(tool_name, resolved)
+            except Exception as exc:
+                logger.error("Batch call error (%s): %s", tool_name, exc)
+                if fail_fast:
+                    aborted.set()
+                return {"success": False, "error": str(exc)}
+
+        for call_id, tool_name, arguments, depends_on in plans:
+            tasks[call_id] = asyncio.ensure_future(run(tool_name, arguments, depends_on))
+
+        outcomes = await asyncio.gather(*tasks.values())
+        results = [{"id": call_id, **outcome} for call_id, outcome in zip(tasks, outcomes)]
+        return {"success": all(result.get("success") for result in results), "results": results}
+
     def _list_resources(self) -> List[Dict[str, Any]]:
         if not (self.serializer and SERIALIZATION_ENGINE_AVAILABLE):
             return []
 
         resources: List[Dict[str, Any]] = []
         try:
-            resource_store = getattr(self.serializer, "resource_store", {})
             base_url = self._resource_base_url()
-            for resource_id, item in resource_store.items():
-                content = item.get("content") if isinstance(item, dict) else None
-                size = 0
-                if isinstance(content, bytes):
-                    size = len(content)
-                elif isinstance(content, str):
-                    size = len(content.encode("utf-8"))
-
+            for entry in self.serializer.resources.list():
                 resources.append(
                     {
-                        "resource_id": resource_id,
-                        "uri": f"{base_url}/{resource_id}",
-                        "content_type": (item.get("content_type") if isinstance(item, dict) else None)
-                        or "application/octet-stream",
-                        "size": size,
+                        "resource_id": entry.resource_id,
+                        "uri": f"{base_url}/{entry.resource_id}",
+                        "content_type": entry.content_type,
+                        "size": entry.size,
+                        "spilled": entry.spilled,
                     }
                 )
         except Exception as exc:
@@ -349,59 +685,98 @@ class MCPServer:
 
         return resources
 
-    def _read_resource(self, resource: str, as_base64: bool = False) -> Dict[str, Any]:
+    def _read_resource(
+        self,
+        resource: str,
+        as_base64: bool = False,
+        offset: int = 0,
+        length: Optional[int] = None,
+    ) -> Dict[str, Any]:
         resource_id, data = self._get_resource(resource)
-        if not resource_id or not isinstance(data, dict):
+        if not resource_id or not isinstance(data, ResourceEntry):
             raise ValueError(f"Resource '{resource}' not found")
-
-        base_url = self._resource_base_url()
-        content_type = data.get("content_type") or "application/octet-stream"
-        content = data.get("content")
+        return self._read_stored_resource(data, as_base64, offset, length)
+
+    def _read_stored_resource(
+        self,
+        entry: "ResourceEntry",
+        as_base64: bool,
+        offset: int,
+        length: Optional[int],
+    ) -> Dict[str, Any]:
+        """Read a (possibly ranged) chunk of a ResourceStore entry."""
+        store = self.serializer.resources
+        start = min(max(0, int(offset or 0)), entry.size)
+        end = entry.size if length is None else min(entry.size, start + max(0, int(length)))
 
         response: Dict[str, Any] = {
             "success": True,
-            "resource_id": resource_id,
-            "uri": f"{base_url}/{resource_id}",
-            "content_type": content_type,
+            "resource_id": entry.resource_id,
+            "uri": f"{self._resource_base_url()}/{entry.resource_id}",
+            "content_type": entry.content_type,
+            "size": entry.size,
         }
-
-        if isinstance(content, str):
-            response["content"] = content
-            response["size"] = len(content.encode("utf-8"))
-            return response
-
-        if isinstance(content, bytes):
-            response["size"] = len(content)
-            if as_base64 or not content_type.startswith("text/"):
-                response["content_base64"] = base64.b64encode(content).decode("ascii")
-                return response
-
-            response["content"] = content.decode("utf-8", errors="replace")
+        if start != 0 or end != entry.size:
+            response.update({"offset": start, "length": end - start, "has_more": end < entry.size})
+            if end < entry.size:
+                response["next_offset"] = end
+
+        if entry.is_text or (not as_base64 and entry.content_type.startswith("text/")):
+            chunk = store.read(entry.resource_id, start, end - start)
+            if chunk is None:
+                raise ValueError(f"Resource '{entry.resource_id}' not found")
+            response["content"] = chunk.decode("utf-8", errors="replace")
             return response
 
-        response["content"] = self._fallback_serialize(content)
+        encoded = store.read_base64(entry.resource_id, start, end - start)
+        if encoded is None:
+            raise ValueError(f"Resource '{entry.resource_id}' not found")
+        response["content_base64"] = encoded
         return response
 
     async def _execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         start = time.perf_counter()
-        stats = self._call_stats[tool_name]
         try:
             result = await self._do_execute(tool_name, arguments)
             return result
         except Exception:
-            stats["errors"] += 1
+            self._call_stats.increment(tool_name, "errors")
             raise
         finally:
-            elapsed = time.perf_counter() - start
-            stats["count"] += 1
-            stats["total_time"] += elapsed
-
-    async def _do_execute_tool_call(self, func: Callable[..., Any], coerced_arguments: Dict[str, Any], is_async: bool) -> Any:
-        if is_async:
-            return await func(**coerced_arguments)
+            self._call_stats.record(tool_name, "total", time.perf_counter() - start)
+            self._record_usage(tool_name)
 
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(self._executor, lambda: func(**coerced_arguments))
+    def _encode_content(self, tool_name: str, payload: Any) -> List[types.ContentBlock]:
+        start = time.perf_counter()
+        try:
+            return self._to_mcp_content(payload)
+        finally:
+            self._call_stats.record(tool_name, "encoding", time.perf_counter() - start)
+
+    async def _do_execute_tool_call(
+        self,
+        tool_name: str,
+        func: Callable[..., Any],
+        coerced_arguments: Dict[str, Any],
+        meta: Dict[str, Any],
+    ) -> Any:
+        if meta.get("is_async") or inspect.iscoroutinefunction(func):
+            start = time.perf_counter()
+            try:
+                return await func(**coerced_arguments)
+            finally:
+                self._call_stats.record(tool_name, "execution", time.perf_counter() - start)
+
+        # Only plain module-level functions are candidates for the process pool:
+        # class tools hold per-server instances and object results must stay local.
+        process_eligible = not meta.get("class") and not meta.get("returns_object")
+        return await self._execution_pool.run_tool(
+            tool_name,
+            func,
+            coerced_arguments,
+            process_eligible=process_eligible,
+            may_block=tool_name in self._blocking_tools,
+        )
 
     async def _do_execute(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         if tool_name == "call-object-method":
@@ -411,110 +786,207 @@ class MCPServer:
             raise ValueError(f"Unknown tool: {tool_name}")
 
         meta = self.function_map[tool_name]
-        func = self._get_function(tool_name)
+        func = self._func_cache.get(tool_name)
+        if func is None:
+            if self.lazy:
+                # First call in lazy mode: import the tool's module off the event loop.
+                func = await self._execution_pool.run_in_thread(self._get_function, (tool_name,))
+            else:
+                func = self._get_function(tool_name)
 
         filtered_arguments = {k: v for k, v in arguments.items() if v not in ("", None)}
         coerced_arguments = self._coerce_types(func, filtered_arguments)
 
-        result = await self._do_execute_tool_call(func, coerced_arguments, bool(meta.get("is_async")))
+        memo_key = None
+        if self._memo.enabled_for(tool_name):
+            # None when an argument resolved to a stored object: such calls are not memoized
+            memo_key = canonical_arguments(coerced_arguments)
+            if memo_key is not None:
+                cached = self._memo.get(tool_name, memo_key)
+                if cached is not None:
+                    self._call_stats.increment(tool_name, "memo_hits")
+                    return cached
+                self._call_stats.increment(tool_name, "memo_misses")
 
-        if meta.get("returns_object") and not self._is_json_serializable(result):
-            obj_info = self._store_object(result)
-            return {
-                "success": True,
-                "object_id": obj_info["object_id"],
-                "object_type": obj_info["object_type"],
-                "available_methods": obj_info["available_methods"],
-                "note": "Object stored. Use call-object-method tool to invoke methods.",
-            }
+        result = await self._do_execute_tool_call(tool_name, func, coerced_arguments, meta)
 
-        serialized = self._serialize_result(result)
-        return {"success": True, "data": serialized}
-
-    def get_call_stats(self) -> Dict[str, Dict[str, float]]:
-        snapshot: Dict[str, Dict[str, float]] = {}
-        for tool_name, stats in self._call_stats.items():
-            count = max(0, int(stats.get("count", 0)))
-            total_time = float(stats.get("total_time", 0.0))
-            errors = int(stats.get("errors", 0))
-            snapshot[tool_name] = {
-                "count": count,
-                "errors": errors,
-                "total_time": total_time,
-                "avg_time": (total_time / count) if count > 0 else 0.0,
-            }
+        start = time.perf_counter()
+        try:
+            if meta.get("returns_object") and not self._is_json_serializable(result):
+                obj_info = self._store_object(result)
+                return {
+                    "success": True,
+                    "object_id": obj_info["object_id"],
+                    "object_type": obj_info["object_type"],
+                    "available_methods": obj_info["available_methods"],
+                    "note": "Object stored. Use call-object-method tool to invoke methods.",
+                }
+
+            serialized = self._serialize_result(result)
+            response = {"success": True, "data": serialized}
+            if memo_key is not None:
+                self._memo.put(tool_name, memo_key, response)
+            return response
+        finally:
+            self._call_stats.record(tool_name, "serialization", time.perf_counter() - start)
+
+    def get_call_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tool counts and latency percentiles (queue_wait/execution/serialization/encoding/total)."""
+        snapshot = self._call_stats.snapshot()
+        snapshot["_executor"] = self._execution_pool.stats()
+        instance_stats = self._instances.stats()
+        if instance_stats:
+            snapshot["_instances"] = instance_stats
+        if self.serializer and SERIALIZATION_ENGINE_AVAILABLE:
+            snapshot["_object_store"] = self.serializer.object_store_stats()
+        if self._memo.tools:
+            snapshot["_memo"] = self._memo.stats()
         return snapshot
 
     def _coerce_types(self, func: Callable[..., Any], kwargs: Dict[str, Any]) -> Dict[str, Any]:
-        """Coerce incoming kwargs based on callable type hints."""
+        """Coerce incoming kwargs using the callable's precompiled coercion plan."""
         if not kwargs:
             return kwargs
 
+        plan = self._get_coercion_plan(func)
+        if plan is None:
+            return kwargs
+
+        coerced = dict(kwargs)
+        for name, value in kwargs.items():
+            converter = plan.get(name)
+            if converter is not None:
+                coerced[name] = converter(value)
+
+        return coerced
+
+    def _get_coercion_plan(self, func: Callable[..., Any]) -> Optional[Dict[str, Callable[[Any], Any]]]:
+        try:
+            return self._coercion_plans[func]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable callable: compile without caching.
+            return self._compile_coercion_plan(func)
+
+        plan = self._compile_coercion_plan(func)
+        self._coercion_plans[func] = plan
+        return plan
+
+    def _compile_coercion_plan(self, func: Callable[..., Any]) -> Optional[Dict[str, Callable[[Any], Any]]]:
+        """Build ``{param_name: converter}`` once so calls never reflect on the signature."""
         try:
             signature = inspect.signature(func)
         except (TypeError, ValueError):
-            return kwargs
+            return None
 
         try:
             resolved_hints = get_type_hints(func)
         except Exception:
             resolved_hints = {}
 
-        coerced = dict(kwargs)
-        for name, value in kwargs.items():
-            param = signature.parameters.get(name)
-            if param is None:
-                continue
-
+        plan: Dict[str, Callable[[Any], Any]] = {}
+        for name, param in signature.parameters.items():
             annotation = resolved_hints.get(name, param.annotation)
-            coerced[name] = self._coerce_value(annotation, value)
+            converter = self._compile_converter(annotation)
+            if converter is not None:
+                plan[name] = converter
+        return plan
 
-        return coerced
+    def _compile_converter(self, annotation: Any) -> Optional[Callable[[Any], Any]]:
+        """Compile an annotation into a converter closure (``None`` means pass-through)."""
+        if annotation is inspect.Parameter.empty:
+            return None
 
-    def _coerce_value(self, annotation: Any, value: Any) -> Any:
-        if (
-            isinstance(value, str)
-            and annotation not in (inspect.Parameter.empty, str)
-            and self._has_stored_object(value)
-        ):
-            resolved_obj = self._get_stored_object(value)
-            if resolved_obj is not None:
-                return resolved_obj
+        structural = self._compile_structural_converter(annotation)
+        if annotation is str:
+            return structural
 
-        if annotation is inspect.Parameter.empty:
-            return value
+        resolve_reference = self._resolve_object_reference
+        if structural is None:
+            return resolve_reference
 
+        def convert(value: Any) -> Any:
+            if isinstance(value, str):
+                resolved = resolve_reference(value)
+                if resolved is not value:
+                    return resolved
+            return structural(value)
+
+        return convert
+
+    def _compile_structural_converter(self, annotation: Any) -> Optional[Callable[[Any], Any]]:
         origin = get_origin(annotation)
         if origin is None:
-            if isinstance(annotation, type) and issubclass(annotation, Path) and isinstance(value, str):
-                return annotation(value)
-            return value
+            if isinstance(annotation, type) and issubclass(annotation, Path):
+                path_type = annotation
+
+                def convert_path(value: Any) -> Any:
+                    return path_type(value) if isinstance(value, str) else value
+
+                return convert_path
+            return None
 
         if origin in (list, List):
             args = get_args(annotation)
-            if isinstance(value, list) and args:
-                return [self._coerce_value(args[0], item) for item in value]
-            return value
+            item_converter = self._compile_converter(args[0]) if args else None
+            if item_converter is None:
+                return None
+
+            def convert_list(value: Any) -> Any:
+                if isinstance(value, list):
+                    return [item_converter(item) for item in value]
+                return value
+
+            return convert_list
 
         if origin in (dict, Dict):
             args = get_args(annotation)
-            if isinstance(value, dict) and len(args) == 2:
-                key_type, value_type = args
-                return {
-                    self._coerce_value(key_type, key): self._coerce_value(value_type, item)
-                    for key, item in value.items()
-                }
-            return value
+            if len(args) != 2:
+                return None
+            key_converter = self._compile_converter(args[0])
+            value_converter = self._compile_converter(args[1])
+            if key_converter is None and value_converter is None:
+                return None
+            key_converter = key_converter or _identity
+            value_converter = value_converter or _identity
+
+            def convert_dict(value: Any) -> Any:
+                if isinstance(value, dict):
+                    return {key_converter(key): value_converter(item) for key, item in value.items()}
+                return value
+
+            return convert_dict
 
         if origin in (py_types.UnionType, Union):
-            for candidate in get_args(annotation):
-                if candidate is type(None):
-                    continue
-                converted = self._coerce_value(candidate, value)
-                if converted is not value:
-                    return converted
-            return value
+            candidates = [
+                converter
+                for converter in (
+                    self._compile_converter(candidate)
+                    for candidate in get_args(annotation)
+                    if candidate is not type(None)
+                )
+                if converter is not None
+            ]
+            if not candidates:
+                return None
+
+            def convert_union(value: Any) -> Any:
+                for converter in candidates:
+                    converted = converter(value)
+                    if converted is not value:
+                        return converted
+                return value
+
+            return convert_union
+
+        return None
 
+    def _resolve_object_reference(self, value: Any) -> Any:
+        if isinstance(value, str):
+            resolved_obj = self._get_stored_object(value)
+            if resolved_obj is not None:
+                return resolved_obj
         return value
 
     async def _call_stored_method(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -544,11 +1016,10 @@ class MCPServer:
             if allowed is not None and method_name not in allowed:
                 raise ValueError(f"Method '{method_name}' is not allowed on object")
 
-            loop = asyncio.get_running_loop()
             if inspect.iscoroutinefunction(attr):
                 result = await attr(*args, **kwargs)
             else:
-                result = await loop.run_in_executor(self._executor, lambda: attr(*args, **kwargs))
+                result = await self._execution_pool.run_in_thread(attr, args, kwargs)
         else:
             result = attr
 
@@ -577,6 +1048,8 @@ class MCPServer:
                 self._object_methods[obj_id] = {
                     m.get("name") for m in available if isinstance(m, dict) and m.get("name")
                 }
+            # Text produced by the serializer's size check is reused when encoding the response
+            self._encoder.remember(serialization_result.data, getattr(serialization_result, "encoded", None))
             return serialization_result.data
         return self._fallback_serialize(result)
 
@@ -614,8 +1087,7 @@ class MCPServer:
                     )
                 ]
 
-        text = json.dumps(payload, ensure_ascii=False, indent=2, default=str)
-        return [types.TextContent(type="text", text=text)]
+        return [types.TextContent(type="text", text=self._encoder.encode(payload))]
 
     def _get_function(self, tool_name: str) -> Callable[..., Any]:
         if tool_name in self._func_cache:
@@ -647,22 +1119,21 @@ class MCPServer:
             method = getattr(cls, method_name)
             method_signature = inspect.signature(method)
 
-            def wrapper(**kwargs: Any):
-                instance = self._class_instance_cache.get(tool_name)
-                if instance is None:
-                    with self._class_instance_lock:
-                        instance = self._class_instance_cache.get(tool_name)
-                        if instance is None:
-                            try:
-                                instance = cls()
-                            except Exception as exc:
-                                raise RuntimeError(
-                                    f"Cannot create instance of {cls.__name__}: {exc}. "
-                                    "This class may require constructor arguments; use constructor tool first."
-                                ) from exc
-                            self._class_instance_cache[tool_name] = instance
-                method = getattr(instance, method_name)
-                return method(**kwargs)
+            instances = self._instances
+
+            if inspect.iscoroutinefunction(method):
+
+                async def wrapper(**kwargs: Any):
+                    # The instance stays checked out until the coroutine has finished
+                    async with instances.async_instance(cls) as instance:
+                        return await getattr(instance, method_name)(**kwargs)
+
+            else:
+
+                def wrapper(**kwargs: Any):
+                    # Checked out per call under the class's reuse policy (see runtime.instances)
+                    with instances.instance(cls) as instance:
+                        return getattr(instance, method_name)(**kwargs)
 
             parameters = [
                 parameter
@@ -672,6 +1143,8 @@ class MCPServer:
             wrapper.__signature__ = method_signature.replace(parameters=parameters)
             wrapper.__annotations__ = dict(getattr(method, "__annotations__", {}))
 
+            if instances.may_block(cls):
+                self._blocking_tools.add(tool_name)
             self._func_cache[tool_name] = wrapper
             return wrapper
 
@@ -691,13 +1164,7 @@ class MCPServer:
                 return serialized.data
 
         object_id = f"obj_{id(obj)}"
-        methods = []
-        for name in dir(obj):
-            if name.startswith("_"):
-                continue
-            attr = getattr(obj, name, None)
-            if callable(attr):
-                methods.append({"name": name, "params": []})
+        methods = [{"name": name, "params": []} for name in self._public_method_names(obj)]
 
         self._object_store[object_id] = obj
         self._object_methods[object_id] = {m["name"] for m in methods}
@@ -707,6 +1174,36 @@ class MCPServer:
             "available_methods": methods,
         }
 
+    def _public_method_names(self, obj: Any) -> List[str]:
+        """Public callable names of obj; class-level names are cached per type."""
+        if isinstance(obj, type):
+            return [name for name in dir(obj) if not name.startswith("_") and callable(getattr(obj, name, None))]
+
+        try:
+            instance_attrs = {
+                name for name in object.__getattribute__(obj, "__dict__") if not str(name).startswith("_")
+            }
+        except Exception:
+            instance_attrs = set()
+
+        obj_type = type(obj)
+        type_names = self._method_name_cache.get(obj_type)
+        if type_names is None:
+            # Looked up on the type only: this object's own attributes must not leak into the cache
+            type_names = tuple(
+                name
+                for name in dir(obj_type)
+                if not name.startswith("_") and callable(_type_attribute(obj, name))
+            )
+            self._method_name_cache[obj_type] = type_names
+
+        if not instance_attrs:
+            return list(type_names)
+
+        names = {name for name in type_names if name not in instance_attrs}
+        names.update(name for name in instance_attrs if callable(getattr(obj, name, None)))
+        return sorted(names)
+
     def _is_json_serializable(self, obj: Any) -> bool:
         if obj is None or isinstance(obj, (bool, int, float, str)):
             return True
@@ -755,6 +1252,21 @@ def serve(title: str, tools: List[Dict], function_map: Dict, library_name: str):
     parser.add_argument("--path", default="/mcp", help="HTTP mount path")
     parser.add_argument("--stateless", action="store_true", help="Use stateless HTTP mode")
     parser.add_argument("--log-level", default="INFO", help="Log level")
+    parser.add_argument("--lazy", action="store_true", help="Import tool modules on first call instead of at startup")
+    parser.add_argument(
+        "--warmup-tools",
+        type=int,
+        default=None,
+        help="In lazy mode, preload this many most-called tools in the background",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Thread pool size for sync tools")
+    parser.add_argument("--process-workers", type=int, default=None, help="Process pool size (0 disables it)")
+    parser.add_argument(
+        "--executor",
+        choices=list(EXECUTION_MODES),
+        default=None,
+        help="Default executor for sync tools",
+    )
 
     args = parser.parse_args()
 
@@ -764,7 +1276,23 @@ def serve(title: str, tools: List[Dict], function_map: Dict, library_name: str):
     )
 
     transport = "streamable-http" if args.http else args.transport
-    server = MCPServer(title, tools, function_map, library_name)
+    overrides: Dict[str, Any] = {}
+    if args.workers is not None:
+        overrides["thread_workers"] = args.workers
+    if args.process_workers is not None:
+        overrides["process_workers"] = args.process_workers
+    if args.executor is not None:
+        overrides["default_mode"] = args.executor
+    execution_config = MCPServer._load_execution_config(library_name, overrides)
+    server = MCPServer(
+        title,
+        tools,
+        function_map,
+        library_name,
+        execution_config=execution_config,
+        lazy=True if args.lazy else None,
+        warmup_tools=args.warmup_tools,
+    )
 
     run_kwargs: Dict[str, Any] = {}
     if transport == "streamable-http":
@@ -0,0 +1,191 @@
+"""
+Call statistics for the MCP runtime.
+
+Every thread that records a sample (the event loop, each tool worker thread)
+writes into its own shard, so the hot path takes no lock and concurrent
+updates are never lost; shards are merged only when statistics are read.
+
+Latencies go into log-bucketed histograms: each power of two is split into
+``SUB_BUCKETS`` linear sub-buckets, which bounds the relative error of a
+reported percentile to ``1 / SUB_BUCKETS`` at any magnitude. Samples are kept
+per tool and per phase:
+
+- queue_wait:    time between submitting a call and a worker picking it up
+- execution:     time spent in the tool function itself
+- serialization: converting the result into a JSON-compatible payload
+- encoding:      turning the payload into MCP content blocks
+- total:         end-to-end time of the call (also the call count)
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+PHASES = ("queue_wait", "execution", "serialization", "encoding", "total")
+
+SUB_BUCKETS = 32
+# Samples are bucketed in microseconds; everything below 1us shares bucket 0.
+_UNIT = 1e-6
+
+
+def _bucket_index(seconds: float) -> int:
+    value = seconds / _UNIT
+    if value < 1.0:
+        return 0
+    mantissa, exponent = math.frexp(value)  # value = mantissa * 2**exponent, mantissa in [0.5, 1)
+    return exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+
+def _bucket_midpoint(index: int) -> float:
+    if index == 0:
+        return 0.5 * _UNIT
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    low = math.ldexp(0.5 + sub / (2 * SUB_BUCKETS), exponent)
+    high = math.ldexp(0.5 + (sub + 1) / (2 * SUB_BUCKETS), exponent)
+    return (low + high) / 2 * _UNIT
+
+
+class LatencyHistogram:
+    """Sparse log-bucketed histogram of durations in seconds"""
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        index = _bucket_index(seconds)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        # Copy first: the owning thread may insert new buckets while we read.
+        for index, count in list(other.buckets.items()):
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(_bucket_midpoint(index), self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class _Shard:
+    """Samples recorded by one thread"""
+
+    __slots__ = ("histograms", "counters")
+
+    def __init__(self) -> None:
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.counters: Dict[Tuple[str, str], int] = {}
+
+
+class CallStats:
+    """Per-tool counters and latency histograms, sharded per recording thread"""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, tool_name: str, phase: str, seconds: float) -> None:
+        """Add a latency sample for one phase of a tool call"""
+        histograms = self._shard().histograms
+        key = (tool_name, phase)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def increment(self, tool_name: str, counter: str, amount: int = 1) -> None:
+        counters = self._shard().counters
+        key = (tool_name, counter)
+        counters[key] = counters.get(key, 0) + amount
+
+    def _merged(self) -> Tuple[Dict[Tuple[str, str], LatencyHistogram], Dict[Tuple[str, str], int]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        counters: Dict[Tuple[str, str], int] = {}
+        for shard in shards:
+            for key, histogram in list(shard.histograms.items()):
+                merged = histograms.get(key)
+                if merged is None:
+                    merged = histograms[key] = LatencyHistogram()
+                merged.merge(histogram)
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0) + value
+        return histograms, counters
+
+    def snapshot(self, tool_name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Merged statistics per tool: count, errors, total/avg time, any other
+        counters (e.g. memo_hits) and, per phase, count/mean/p50/p95/p99/max
+        latency in seconds.
+        """
+        histograms, counters = self._merged()
+        tools = {name for name, _ in histograms} | {name for name, _ in counters}
+        if tool_name is not None:
+            tools &= {tool_name}
+
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        for name in sorted(tools):
+            total = histograms.get((name, "total"))
+            count = total.count if total is not None else 0
+            total_time = total.total if total is not None else 0.0
+            entry = snapshot[name] = {
+                "count": count,
+                "errors": counters.get((name, "errors"), 0),
+                "total_time": total_time,
+                "avg_time": (total_time / count) if count > 0 else 0.0,
+            }
+            for (counter_tool, counter), value in counters.items():
+                if counter_tool == name and counter != "errors":
+                    entry[counter] = value
+            entry["latency"] = {
+                phase: histograms[(name, phase)].summary()
+                for phase in PHASES
+                if (name, phase) in histograms
+            }
+        return snapshot
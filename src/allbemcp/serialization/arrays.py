@@ -0,0 +1,153 @@
+"""
+Summaries and raw exports of numpy arrays too large to serialize directly.
+
+Instead of an opaque ``str(obj)[:200]`` preview, an oversized ndarray is
+described by vectorized statistics (min/max/mean/std/percentiles, NaN and
+infinity counts) and a strided sample spread across the whole array. The
+statistics are reductions over the array itself, without flattened or masked
+copies; percentiles of arrays larger than ``PERCENTILE_SAMPLE_SIZE`` are
+estimated from a strided sample of that many elements. The raw
+data can be exported as ``.npy`` bytes when a client asks for it: the header
+is built here and the payload is handed over as a memoryview of the array's
+own buffer, so no Python-level copy is made for contiguous arrays.
+"""
+
+import struct
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NPY_CONTENT_TYPE = 'application/x-npy'
+PERCENTILES = (5, 25, 50, 75, 95)
+# Percentiles of larger arrays are estimated from a strided sample of this size
+PERCENTILE_SAMPLE_SIZE = 10_000
+
+
+def is_ndarray(obj: Any) -> bool:
+    return np is not None and isinstance(obj, np.ndarray)
+
+
+def _round(value: Any, float_precision: Optional[int]) -> Any:
+    value = value.item() if hasattr(value, 'item') else value
+    if float_precision is not None and isinstance(value, float):
+        return round(value, float_precision)
+    return value
+
+
+def _strided_sample(arr: Any, count: int) -> tuple:
+    """(stride, elements) of an evenly strided sample over the flattened array"""
+    count = min(max(1, int(count)), arr.size)
+    stride = max(1, arr.size // count)
+    # Fancy indexing of .flat reads only the sampled elements
+    return stride, arr.flat[np.arange(0, stride * count, stride)]
+
+
+def summarize_ndarray(arr: Any, sample_size: int = 20, float_precision: Optional[int] = 4) -> Dict[str, Any]:
+    """Shape, dtype, vectorized statistics and a strided sample of an array"""
+    summary: Dict[str, Any] = {
+        'shape': list(arr.shape),
+        'dtype': str(arr.dtype),
+        'size': int(arr.size),
+        'nbytes': int(arr.nbytes),
+    }
+    if arr.size == 0:
+        return summary
+
+    kind = arr.dtype.kind
+    if kind == 'b':
+        summary['true_count'] = int(np.count_nonzero(arr))
+    elif kind in 'iuf':
+        finite = None
+        finite_count = arr.size
+        if kind == 'f':
+            finite = np.isfinite(arr)
+            finite_count = int(np.count_nonzero(finite))
+            nan_count = int(np.count_nonzero(np.isnan(arr))) if finite_count < arr.size else 0
+            summary['nan_count'] = nan_count
+            summary['inf_count'] = int(arr.size - finite_count - nan_count)
+            if finite_count == arr.size:
+                finite = None
+        if finite_count:
+            # Non-finite values are excluded through where= instead of a masked copy
+            if finite is None:
+                stats = {'min': arr.min(), 'max': arr.max()}
+            else:
+                stats = {'min': arr.min(where=finite, initial=np.inf), 'max': arr.max(where=finite, initial=-np.inf)}
+            where = True if finite is None else finite
+            stats['mean'] = arr.mean(dtype=np.float64, where=where)
+            stats['std'] = arr.std(dtype=np.float64, where=where)
+
+            percentile_stride, sampled = _strided_sample(arr, PERCENTILE_SAMPLE_SIZE)
+            if finite is not None:
+                sampled = sampled[np.isfinite(sampled)]
+            if sampled.size:
+                for q, value in zip(PERCENTILES, np.percentile(sampled, PERCENTILES)):
+                    stats[f'p{q}'] = value
+                if percentile_stride > 1:
+                    summary['percentile_sample_stride'] = int(percentile_stride)
+            summary['stats'] = {key: _round(value, float_precision) for key, value in stats.items()}
+
+    stride, sample = _strided_sample(arr, sample_size)
+    summary['sample_stride'] = int(stride)
+    if kind == 'f' and float_precision is not None:
+        sample = np.round(sample, float_precision)
+    if kind in 'biufc' or kind == 'U':
+        summary['sample'] = [_json_scalar(v) for v in sample.tolist()]
+    else:
+        summary['sample'] = [str(v) for v in sample.tolist()]
+    return summary
+
+
+def _json_scalar(value: Any) -> Any:
+    if isinstance(value, complex):
+        return [value.real, value.imag]
+    return value
+
+
+def _fortran_order(arr: Any) -> bool:
+    return bool(arr.flags.f_contiguous and not arr.flags.c_contiguous)
+
+
+def npy_header(arr: Any) -> Optional[bytes]:
+    """`.npy` (format 1.0) header of arr, None for object arrays"""
+    if arr.dtype.hasobject:
+        return None
+    fortran_order = _fortran_order(arr)
+    header_dict = {
+        'descr': np.lib.format.dtype_to_descr(arr.dtype),
+        'fortran_order': fortran_order,
+        'shape': tuple(arr.shape),
+    }
+    header = "{" + "".join(f"'{key}': {value!r}, " for key, value in header_dict.items()) + "}"
+    # Pad so that magic (6) + version (2) + length (2) + header + newline is 64-byte aligned
+    header += " " * ((64 - (10 + len(header) + 1) % 64) % 64) + "\n"
+
+    return np.lib.format.magic(1, 0) + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+def npy_size(arr: Any) -> Optional[int]:
+    """Size of the .npy export of arr, computed without touching its data"""
+    header = npy_header(arr)
+    return None if header is None else len(header) + int(arr.nbytes)
+
+
+def npy_buffers(arr: Any) -> Optional[List[Any]]:
+    """
+    `.npy` (format 1.0) header plus a zero-copy view of the array's data.
+
+    Returns None for object arrays, which .npy can only store pickled.
+    """
+    prefix = npy_header(arr)
+    if prefix is None:
+        return None
+
+    if _fortran_order(arr):
+        data = arr.T
+    else:
+        # Non-contiguous views have to be compacted once
+        data = np.ascontiguousarray(arr)
+    # A byte view works for every dtype (datetimes, structured) without copying
+    return [prefix, memoryview(data.reshape(-1).view(np.uint8)) if data.size else b'']
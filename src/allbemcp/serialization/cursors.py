@@ -0,0 +1,132 @@
+"""
+Resumable cursors over live iterators.
+
+When a tool returns a generator or iterator, the serializer sends back only the
+first page and parks the iterator here under a cursor id; later ``next-page``
+calls pull further batches lazily. Items pulled to detect "has more" are kept
+for the next page, so nothing read from the iterator is lost. Cursors expire
+after ``ttl_seconds`` without access and the registry holds at most
+``max_cursors`` (least recently used cursors are dropped first).
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Iterator, List, Optional
+
+EXHAUSTED = object()
+
+
+class IteratorCursor:
+    """A live iterator with push-back support and a page counter"""
+
+    def __init__(self, iterable: Any, original_type: str):
+        self.cursor_id = f"cursor_{uuid.uuid4().hex[:12]}"
+        self.original_type = original_type
+        self.pages_served = 0
+        self.items_served = 0
+        self.last_access = time.time()
+        self.exhausted = False
+        self.lock = threading.Lock()  # generators cannot be advanced concurrently
+        self._iterator: Iterator[Any] = iter(iterable)
+        self._pending: List[Any] = []
+
+    def next_item(self) -> Any:
+        """Next item, or the EXHAUSTED sentinel"""
+        if self._pending:
+            return self._pending.pop()
+        if self.exhausted:
+            return EXHAUSTED
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self.exhausted = True
+            return EXHAUSTED
+
+    def push_back(self, item: Any) -> None:
+        self._pending.append(item)
+
+    def has_more(self) -> bool:
+        """Peek one item ahead; the peeked item is kept for the next page"""
+        item = self.next_item()
+        if item is EXHAUSTED:
+            return False
+        self.push_back(item)
+        return True
+
+    def close(self) -> None:
+        self._pending.clear()
+        self.exhausted = True
+        close = getattr(self._iterator, 'close', None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+
+class CursorRegistry:
+    """TTL- and size-bounded registry of open iterator cursors"""
+
+    def __init__(self, ttl_seconds: float = 600, max_cursors: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_cursors = max(1, int(max_cursors))
+        self._cursors: "OrderedDict[str, IteratorCursor]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, cursor: IteratorCursor) -> str:
+        with self._lock:
+            self._cursors[cursor.cursor_id] = cursor
+            while len(self._cursors) > self.max_cursors:
+                _, dropped = self._cursors.popitem(last=False)
+                dropped.close()
+        return cursor.cursor_id
+
+    def get(self, cursor_id: str) -> Optional[IteratorCursor]:
+        """Return a live cursor (refreshing its TTL), or None if unknown or expired"""
+        now = time.time()
+        with self._lock:
+            cursor = self._cursors.get(cursor_id)
+            if cursor is None:
+                return None
+            if now - cursor.last_access > self.ttl_seconds:
+                self._cursors.pop(cursor_id, None)
+                cursor.close()
+                return None
+            cursor.last_access = now
+            self._cursors.move_to_end(cursor_id)
+            return cursor
+
+    def remove(self, cursor_id: str) -> None:
+        with self._lock:
+            cursor = self._cursors.pop(cursor_id, None)
+        if cursor is not None:
+            cursor.close()
+
+    def expire(self) -> int:
+        """Close cursors idle for longer than the TTL"""
+        now = time.time()
+        with self._lock:
+            expired = [cid for cid, c in self._cursors.items() if now - c.last_access > self.ttl_seconds]
+            cursors = [self._cursors.pop(cid) for cid in expired]
+        for cursor in cursors:
+            cursor.close()
+        return len(cursors)
+
+    def list(self) -> List[IteratorCursor]:
+        with self._lock:
+            return list(self._cursors.values())
+
+    def __contains__(self, cursor_id: str) -> bool:
+        return cursor_id in self._cursors
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def close(self) -> None:
+        with self._lock:
+            cursors = list(self._cursors.values())
+            self._cursors.clear()
+        for cursor in cursors:
+            cursor.close()
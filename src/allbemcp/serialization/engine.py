@@ -9,19 +9,24 @@ Supports:
 """
 
 import json
-import sys
 import io
 import uuid
 import importlib
 import threading
 import time
 import atexit
-from typing import Any, Dict, Optional, Tuple, List
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, List
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import inspect
 from collections import OrderedDict
 
+from allbemcp.serialization.arrays import NPY_CONTENT_TYPE, is_ndarray, npy_buffers, npy_size, summarize_ndarray
+from allbemcp.serialization.cursors import EXHAUSTED, CursorRegistry, IteratorCursor
+from allbemcp.serialization.memory import GreedyDualSize, SizerRegistry
+from allbemcp.serialization.resources import ResourceEntry, ResourceStore
+from allbemcp.serialization.tiers import DiskObjectTier
+
 
 @dataclass
 class SerializationResult:
@@ -29,6 +34,7 @@ class SerializationResult:
     type: str  # 'direct', 'object_ref', 'resource'
     data: Any
     metadata: Optional[Dict[str, Any]] = None
+    encoded: Optional[str] = None  # Compact JSON text of data, when produced for a size check
 
 
 @dataclass
@@ -47,6 +53,37 @@ class ObjectMetadata:
             self.created_at = datetime.now().isoformat()
 
 
+# Resource ids of .npy exports: the prefix followed by the array's object id
+_NPY_EXPORT_PREFIX = 'npy_'
+
+
+def _json_size(value: Any) -> int:
+    """UTF-8 size of value in the compact JSON encoding used for payloads"""
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def _type_attribute(obj: Any, name: str) -> Any:
+    """obj.name as provided by its type, ignoring anything set on the instance"""
+    attr = inspect.getattr_static(type(obj), name)
+    bind = getattr(type(attr), '__get__', None)
+    return attr if bind is None else bind(attr, obj, type(obj))
+
+
+def _public_instance_attributes(obj: Any) -> Dict[str, Any]:
+    """Public attributes stored on the instance itself (not on its type)"""
+    try:
+        attrs = object.__getattribute__(obj, '__dict__')
+    except Exception:
+        return {}
+    try:
+        return {
+            name: value for name, value in attrs.items()
+            if isinstance(name, str) and not name.startswith('_')
+        }
+    except Exception:
+        return {}
+
+
 class SerializationConfig:
     """Serialization configuration"""
     
@@ -56,22 +93,66 @@ class SerializationConfig:
         - max_direct_size: Max bytes for direct serialization (default 10KB)
         - max_preview_length: Max length for preview text (default 200)
         - max_iterator_items: Max items to consume from iterator (default 1000)
+        - enable_iterator_cursors: Keep unfinished iterators behind a cursor for next-page calls (default True)
+        - cursor_ttl_seconds: Idle time after which an iterator cursor expires (default 600)
+        - max_cursors: Max number of open iterator cursors (default 256)
+        - array_summary: Attach statistics and a strided sample to oversized ndarray references (default True)
+        - array_sample_size: Number of elements in the strided sample (default 20)
+        - array_export_max_bytes: Offer oversized ndarrays up to this size as .npy resources, written when
+          first read, 0 disables (default 64MB)
         - enable_resources: Whether to enable Resource URI (default True)
         - resource_base_url: Base URL for Resource service
+        - max_resource_bytes: Total byte budget of stored resources, LRU-evicted (default 256MB)
+        - resource_spill_threshold: Resources larger than this are spilled to disk and mmap-served (default 1MB)
+        - resource_spill_dir: Directory for spill files (default: system temp dir)
+        - max_stored_objects: Max number of stored objects (default 10000)
+        - max_stored_bytes: Byte budget of stored objects, by deep size (default 1GB, 0 disables)
+        - object_eviction_policy: 'gds' (GreedyDual-Size: large and stale objects first) or 'lru' (default 'gds')
+        - object_sizers: Extra deep sizers, {type_full_name: 'module:function'}
+        - max_object_age_seconds: Stored objects unused for this long are dropped (default 3600)
+        - object_spill: Spill evicted and idle objects to a disk tier in the temp dir (default False)
+        - object_spill_dir: Directory of the disk tier; setting it enables spilling
+        - object_idle_seconds: Idle time after which an object is spilled (default 900)
+        - persist_objects: Keep object_spill_dir on close and reload its objects on start (default False)
+        - cache_method_descriptors: Cache method descriptors per type (default True)
         - type_handlers: Custom type handlers
+        - library_specific: Per-library handler overrides keyed by namespace,
+          e.g. {"pandas": {"orient": "split", "float_precision": 3}}
         """
         config = config_dict or {}
         
         self.max_direct_size = config.get('max_direct_size', 10 * 1024)  # 10KB
         self.max_preview_length = config.get('max_preview_length', 200)
         self.max_iterator_items = config.get('max_iterator_items', 1000)  # Max 1000 items
+        self.enable_iterator_cursors = config.get('enable_iterator_cursors', True)
+        self.cursor_ttl_seconds = config.get('cursor_ttl_seconds', 600)
+        self.max_cursors = config.get('max_cursors', 256)
+        self.array_summary = config.get('array_summary', True)
+        self.array_sample_size = config.get('array_sample_size', 20)
+        self.array_export_max_bytes = config.get('array_export_max_bytes', 64 * 1024 * 1024)
         self.enable_resources = config.get('enable_resources', True)
         self.resource_base_url = config.get('resource_base_url', 'mcp://resources')
+        self.max_resource_bytes = config.get('max_resource_bytes', 256 * 1024 * 1024)
+        self.resource_spill_threshold = config.get('resource_spill_threshold', 1024 * 1024)
+        self.resource_spill_dir = config.get('resource_spill_dir')
         self.max_stored_objects = config.get('max_stored_objects', 10000)
+        self.max_stored_bytes = config.get('max_stored_bytes', 1024 * 1024 * 1024)
+        self.object_eviction_policy = config.get('object_eviction_policy', 'gds')
+        self.object_sizers = config.get('object_sizers', {})
+        self.max_object_age_seconds = config.get('max_object_age_seconds', 3600)
+        # Disk tier: enabled by object_spill or by giving a directory
+        self.object_spill = config.get('object_spill', False)
+        self.object_spill_dir = config.get('object_spill_dir')
+        self.object_idle_seconds = config.get('object_idle_seconds', 900)
+        self.persist_objects = config.get('persist_objects', False)
+        self.cache_method_descriptors = config.get('cache_method_descriptors', True)
         
         # Custom type handlers: type_pattern -> handler_function_name
         self.type_handlers = config.get('type_handlers', {})
         
+        # Library handler overrides: config_namespace -> {key: value}
+        self.library_specific = config.get('library_specific', {})
+        
         # File type detection patterns
         self.file_like_patterns = config.get('file_like_patterns', [
             'BufferedReader', 'BufferedWriter', 'TextIOWrapper',
@@ -100,21 +181,53 @@ class SmartSerializer:
         self._object_store: "OrderedDict[str, Any]" = OrderedDict()
         self.object_store = self._object_store
         self.metadata_store: Dict[str, ObjectMetadata] = {}
-        self.resource_store: Dict[str, Any] = {}  # resource_id -> data
-        self._resource_timestamps: Dict[str, float] = {}
+        self.resources = ResourceStore(
+            max_bytes=self.config.max_resource_bytes,
+            spill_threshold=self.config.resource_spill_threshold,
+            spill_dir=self.config.resource_spill_dir,
+        )
+        self.cursors = CursorRegistry(
+            ttl_seconds=self.config.cursor_ttl_seconds,
+            max_cursors=self.config.max_cursors,
+        )
         self._ref_timestamps: Dict[str, float] = {}
         self._type_dispatch: Dict[type, Any] = {}
         self._dispatch_cache: Dict[type, Tuple[Optional[Any], bool]] = {}
         self._cleanup_interval = 300
-        self._max_object_age = 3600
+        self._max_object_age = self.config.max_object_age_seconds
         self._cleanup_thread: Optional[threading.Thread] = None
         self._stop_cleanup = threading.Event()
         self._cleanup_started = False
         self._max_objects = max(1, int(self.config.max_stored_objects))
+        self._max_bytes = max(0, int(self.config.max_stored_bytes or 0))
+        self.sizers = SizerRegistry(self.config.object_sizers)
+        self._object_sizes: Dict[str, int] = {}
+        self._stored_bytes = 0
+        self._gds = GreedyDualSize() if self.config.object_eviction_policy == 'gds' else None
+        self._evictions = 0
+        self._evicted_bytes = 0
+        self._tier: Optional[DiskObjectTier] = None
+        if self.config.object_spill or self.config.object_spill_dir:
+            self._tier = DiskObjectTier(
+                self.config.object_spill_dir,
+                persistent=bool(self.config.persist_objects and self.config.object_spill_dir),
+            )
+        self._spilling: Dict[str, Any] = {}  # evicted, not yet on disk
+        self._spilled: Dict[str, int] = {}  # on disk: object_id -> bytes
+        self._unspillable: set = set()
+        self._spills = 0
+        self._rehydrations = 0
+        self._rehydrate_lock = threading.Lock()
         self._read_lock = threading.RLock()
         self._write_lock = threading.Lock()
         self._id_lock = threading.Lock()
         self._id_counter = 0
+        self._method_cache: "OrderedDict[type, List[Dict[str, Any]]]" = OrderedDict()
+        self._method_cache_lock = threading.Lock()
+        self._max_method_cache_types = 1024
+        self._export_lock = threading.Lock()
+        if self._tier is not None and self._tier.persistent:
+            self._restore_spilled_objects()
         
         # Automatically load library-specific handlers
         self._load_library_handlers()
@@ -131,7 +244,7 @@ class SmartSerializer:
             from allbemcp.serialization.handlers import create_handler_registry
             
             # Create handler registry
-            handler_registry = create_handler_registry({'library_specific': {}})
+            handler_registry = create_handler_registry({'library_specific': self.config.library_specific})
             
             # Register handlers into configuration
             for full_type_name, handler_func in handler_registry.items():
@@ -214,6 +327,9 @@ class SmartSerializer:
             worker.join(timeout=1.0)
         self._cleanup_thread = None
         self._cleanup_started = False
+        self._close_tier()
+        self.resources.close()
+        self.cursors.close()
         try:
             atexit.unregister(self.close)
         except Exception:
@@ -232,8 +348,8 @@ class SmartSerializer:
         Decision tree:
         1. None/Basic types -> Return directly
         2. Directly JSON serializable -> Try serialize, check size
-        3. Generator/Iterator -> Consume and serialize content
-        4. File-like object -> Resource URI
+        3. File-like object -> Resource URI
+        4. Generator/Iterator -> Consume and serialize content
         5. Large data container -> Check size, decide direct serialization or object reference
         6. Other complex objects -> Object reference
         """
@@ -254,16 +370,18 @@ class SmartSerializer:
         # If a dedicated handler exists but chooses not to serialize directly
         # (typically due to configured size limits), fallback to object reference.
         if matched_custom_handler:
+            if self.config.array_summary and is_ndarray(obj):
+                return self._handle_large_array(obj, context)
             return self._store_object(obj, preview=str(obj)[:self.config.max_preview_length])
         
-        # 3. Generator and Iterator -> Consume and serialize content
-        if self._is_iterator_or_generator(obj):
-            return self._handle_iterator(obj, context)
-        
-        # 4. File-like object -> Resource
+        # 3. File-like object -> Resource (checked first: file objects are also iterators)
         if self._is_file_like(obj):
             return self._handle_file_like(obj, context)
         
+        # 4. Generator and Iterator -> Consume and serialize content
+        if self._is_iterator_or_generator(obj):
+            return self._handle_iterator(obj, context)
+        
         # 5. List and Tuple - Recursive serialization
         if isinstance(obj, (list, tuple)):
             return self._handle_sequence(obj, context)
@@ -278,7 +396,7 @@ class SmartSerializer:
         
         # 7. Try direct JSON serialization
         try:
-            serialized = json.dumps(obj)
+            serialized = json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
             size = len(serialized.encode('utf-8'))
             
             if size <= self.config.max_direct_size:
@@ -286,7 +404,8 @@ class SmartSerializer:
                 return SerializationResult(
                     type='direct',
                     data=json.loads(serialized),  # Deserialize back to Python object
-                    metadata={'size_bytes': size}
+                    metadata={'size_bytes': size},
+                    encoded=serialized,
                 )
             else:
                 # Large object, store and return reference
@@ -330,102 +449,11 @@ class SmartSerializer:
                 callable(getattr(obj, '__next__', None)))
     
     def _handle_iterator(self, obj: Any, context: Dict) -> SerializationResult:
-        """Handle iterator and generator - consume them and serialize content"""
-        max_items = context.get('max_iterator_items', self.config.max_direct_size // 100)  # Default max 100 items
-        
+        """Handle iterator and generator - serialize the first page, keep the rest behind a cursor"""
+        cursor = IteratorCursor(obj, f"{type(obj).__module__}.{type(obj).__name__}")
         try:
-            # Consume iterator, collect all items
-            items = []
-            total_size = 0
-            is_truncated = False
-            is_bytes_content = False
-            
-            for i, item in enumerate(obj):
-                # Check if max items exceeded
-                if i >= max_items:
-                    is_truncated = True
-                    break
-                
-                # Check if bytes content (e.g. iter_content returns)
-                if isinstance(item, bytes):
-                    is_bytes_content = True
-                    items.append(item)
-                    total_size += len(item)
-                else:
-                    items.append(item)
-                    # Estimate size
-                    try:
-                        total_size += len(json.dumps(item).encode('utf-8'))
-                    except:
-                        total_size += 100  # Rough estimate
-                
-                # Check if total size exceeded
-                if total_size > self.config.max_direct_size:
-                    is_truncated = True
-                    break
-            
-            # If bytes content (e.g. HTTP response body), combine into single bytes object
-            if is_bytes_content:
-                combined_bytes = b''.join(items)
-                
-                # Try decode as text
-                try:
-                    text_content = combined_bytes.decode('utf-8')
-                    return SerializationResult(
-                        type='direct',
-                        data={
-                            '_type': 'consumed_iterator',
-                            'content_type': 'text',
-                            'content': text_content,
-                            'size_bytes': len(combined_bytes),
-                            'is_truncated': is_truncated
-                        },
-                        metadata={
-                            'original_type': f"{type(obj).__module__}.{type(obj).__name__}",
-                            'note': 'Iterator consumed and content decoded as text'
-                        }
-                    )
-                except UnicodeDecodeError:
-                    # Cannot decode, return base64 encoded
-                    import base64
-                    encoded_content = base64.b64encode(combined_bytes).decode('ascii')
-                    return SerializationResult(
-                        type='direct',
-                        data={
-                            '_type': 'consumed_iterator',
-                            'content_type': 'binary',
-                            'content_base64': encoded_content,
-                            'size_bytes': len(combined_bytes),
-                            'is_truncated': is_truncated
-                        },
-                        metadata={
-                            'original_type': f"{type(obj).__module__}.{type(obj).__name__}",
-                            'note': 'Iterator consumed and content base64-encoded'
-                        }
-                    )
-            
-            # If not bytes content, recursively serialize each item
-            serialized_items = []
-            for item in items:
-                result = self.serialize(item, context)
-                serialized_items.append(result.data)
-            
-            return SerializationResult(
-                type='direct',
-                data={
-                    '_type': 'consumed_iterator',
-                    'content_type': 'list',
-                    'items': serialized_items,
-                    'item_count': len(serialized_items),
-                    'is_truncated': is_truncated,
-                    'size_bytes': total_size
-                },
-                metadata={
-                    'original_type': f"{type(obj).__module__}.{type(obj).__name__}",
-                    'note': f'Iterator consumed with {len(serialized_items)} items'
-                }
-            )
-            
+            with cursor.lock:
+                return self._iterator_page(cursor, context)
         except Exception as e:
             # Failed to consume iterator, store original object
             return self._store_object(
@@ -434,6 +462,112 @@ class SmartSerializer:
                 error=f"Failed to consume iterator: {str(e)}"
             )
     
+    def next_page(self, cursor_id: str, max_items: Optional[int] = None) -> Optional[SerializationResult]:
+        """Pull the next page from an iterator cursor; None if the cursor is unknown or expired"""
+        cursor = self.cursors.get(cursor_id)
+        if cursor is None:
+            return None
+        context = {} if max_items is None else {'max_iterator_items': max(1, int(max_items))}
+        try:
+            with cursor.lock:
+                return self._iterator_page(cursor, context)
+        except Exception:
+            self.cursors.remove(cursor_id)
+            raise
+    
+    def _iterator_page(self, cursor: IteratorCursor, context: Dict) -> SerializationResult:
+        """
+        Pull one page from a cursor.
+
+        Items are serialized as they are pulled (sizes come from _serialize_child,
+        so nothing is encoded twice) until max_iterator_items or max_direct_size
+        is reached. If the iterator has more, the cursor is registered and its id
+        returned; otherwise it is dropped.
+        """
+        max_items = context.get('max_iterator_items', self.config.max_direct_size // 100)  # Default max 100 items
+        max_size = self.config.max_direct_size
+        
+        items = []
+        total_size = 0
+        is_bytes_content = None
+        
+        while len(items) < max_items and total_size <= max_size:
+            item = cursor.next_item()
+            if item is EXHAUSTED:
+                break
+            
+            # The first item decides the page kind (e.g. iter_content returns bytes chunks)
+            if is_bytes_content is None:
+                is_bytes_content = isinstance(item, bytes)
+            
+            if is_bytes_content:
+                if not isinstance(item, bytes):
+                    cursor.push_back(item)
+                    break
+                items.append(item)
+                total_size += len(item)
+            else:
+                data, size, _ = self._serialize_child(item, context)
+                items.append(data)
+                total_size += size
+        
+        has_more = cursor.has_more()
+        page = cursor.pages_served
+        cursor.pages_served += 1
+        cursor.items_served += len(items)
+        
+        page_fields: Dict[str, Any] = {'is_truncated': has_more}
+        if has_more and self.config.enable_iterator_cursors:
+            if cursor.cursor_id not in self.cursors:
+                self.cursors.register(cursor)
+            page_fields.update({'has_more': True, 'cursor_id': cursor.cursor_id, 'page': page})
+        else:
+            if cursor.cursor_id in self.cursors:
+                self.cursors.remove(cursor.cursor_id)
+            if page:
+                page_fields.update({'has_more': False, 'page': page})
+        
+        metadata = {'original_type': cursor.original_type}
+        
+        # If bytes content (e.g. HTTP response body), combine into single bytes object
+        if is_bytes_content:
+            combined_bytes = b''.join(items)
+            
+            # Try decode as text
+            try:
+                text_content = combined_bytes.decode('utf-8')
+                data = {
+                    '_type': 'consumed_iterator',
+                    'content_type': 'text',
+                    'content': text_content,
+                    'size_bytes': len(combined_bytes),
+                }
+                metadata['note'] = 'Iterator consumed and content decoded as text'
+            except UnicodeDecodeError:
+                # Cannot decode, return base64 encoded
+                import base64
+                data = {
+                    '_type': 'consumed_iterator',
+                    'content_type': 'binary',
+                    'content_base64': base64.b64encode(combined_bytes).decode('ascii'),
+                    'size_bytes': len(combined_bytes),
+                }
+                metadata['note'] = 'Iterator consumed and content base64-encoded'
+        else:
+            data = {
+                '_type': 'consumed_iterator',
+                'content_type': 'list',
+                'items': items,
+                'item_count': len(items),
+                'size_bytes': total_size,
+            }
+            metadata['note'] = f'Iterator consumed with {len(items)} items'
+        
+        data.update(page_fields)
+        if 'cursor_id' in data:
+            metadata['note'] += '; call next-page with cursor_id for more'
+        return SerializationResult(type='direct', data=data, metadata=metadata)
+    
     def _handle_file_like(self, obj: Any, context: Dict) -> SerializationResult:
         """Handle file-like object -> Resource URI"""
         if not self.config.enable_resources:
@@ -443,45 +577,23 @@ class SmartSerializer:
         # Generate resource_id
         resource_id = f"file_{uuid.uuid4().hex[:12]}"
         
-        # Try read content
-        content = None
-        content_type = 'application/octet-stream'
-        
+        # Stream content into the resource store (spilled to disk when large)
         try:
-            if hasattr(obj, 'read'):
-                # Save current position
-                current_pos = obj.tell() if hasattr(obj, 'tell') else None
-                
-                content = obj.read()
-                
-                # Restore position
-                if current_pos is not None and hasattr(obj, 'seek'):
-                    obj.seek(current_pos)
-                
-                # Determine content type
-                if isinstance(content, str):
-                    content_type = 'text/plain'
-                elif isinstance(content, bytes):
-                    # Try determine file type
-                    if content.startswith(b'\x89PNG'):
-                        content_type = 'image/png'
-                    elif content.startswith(b'\xff\xd8\xff'):
-                        content_type = 'image/jpeg'
-                    elif content.startswith(b'%PDF'):
-                        content_type = 'application/pdf'
+            if not hasattr(obj, 'read'):
+                return self._store_object(obj)
+
+            # Save current position
+            current_pos = obj.tell() if hasattr(obj, 'tell') else None
+
+            entry = self.resources.put_stream(resource_id, obj)
+
+            # Restore position
+            if current_pos is not None and hasattr(obj, 'seek'):
+                obj.seek(current_pos)
         except Exception as e:
             # Read failed, store object itself
             return self._store_object(obj, error=str(e))
         
-        # Store to resource store
-        with self._write_lock:
-            self.resource_store[resource_id] = {
-                'content': content,
-                'content_type': content_type,
-                'original_object': obj
-            }
-            self._resource_timestamps[resource_id] = time.time()
-        
         # Return Resource URI
         uri = f"{self.config.resource_base_url}/{resource_id}"
         
@@ -489,38 +601,59 @@ class SmartSerializer:
             type='resource',
             data={
                 'uri': uri,
-                'content_type': content_type,
-                'size': len(content) if content else 0
+                'content_type': entry.content_type,
+                'size': entry.size
             },
             metadata={
                 'resource_id': resource_id,
+                'spilled': entry.spilled,
                 'note': 'File-like object stored as resource'
             }
         )
     
+    def _serialize_child(self, item: Any, context: Dict) -> Tuple[Any, int, bool]:
+        """
+        Serialize a container element and report its JSON size.
+
+        Returns (data, size_bytes, is_direct). Sizes of nested lists/dicts come
+        from their own single-pass walk, so no subtree is encoded twice.
+        """
+        if item is None or isinstance(item, (bool, int, float, str)):
+            return item, _json_size(item), True
+
+        result = self.serialize(item, context)
+        is_direct = result.type == 'direct'
+        size = None
+        if is_direct and type(item) in (list, tuple, dict) and result.metadata:
+            size = result.metadata.get('size_bytes')
+        if size is None:
+            size = _json_size(result.data)
+        return result.data, size, is_direct
+
     def _handle_sequence(self, obj: Any, context: Dict) -> SerializationResult:
-        """Handle list and tuple"""
-        # Recursively serialize each item
+        """Handle list and tuple in a single pass with a running byte budget"""
+        max_size = self.config.max_direct_size
+        many_items = len(obj) > 100
         serialized_items = []
+        # Brackets plus "," separators between items (compact encoding)
+        total_size = 2 + max(len(obj) - 1, 0)
         has_complex = False
-        
+
         for item in obj:
-            result = self.serialize(item, context)
-            serialized_items.append(result.data)
-            
-            if result.type != 'direct':
+            try:
+                data, size, is_direct = self._serialize_child(item, context)
+            except (TypeError, ValueError):
+                return self._store_object(obj, preview=str(obj)[:self.config.max_preview_length])
+
+            serialized_items.append(data)
+            total_size += size
+            if not is_direct:
                 has_complex = True
 
-        try:
-            total_json = json.dumps(serialized_items)
-            total_size = len(total_json.encode('utf-8'))
-        except Exception:
-            return self._store_object(obj, preview=str(obj)[:self.config.max_preview_length])
-        
-        # If total size is too large or contains complex objects, consider storing
-        if total_size > self.config.max_direct_size or (has_complex and len(obj) > 100):
-            return self._store_object(obj, preview=str(obj)[:self.config.max_preview_length])
-        
+            # Stop as soon as the outcome is known instead of building the rest
+            if total_size > max_size or (has_complex and many_items):
+                return self._store_object(obj, preview=str(obj)[:self.config.max_preview_length])
+
         return SerializationResult(
             type='direct',
             data=serialized_items,
@@ -528,30 +661,32 @@ class SmartSerializer:
         )
     
     def _handle_dict(self, obj: Dict, context: Dict) -> SerializationResult:
-        """Handle dictionary"""
+        """Handle dictionary in a single pass with a running byte budget"""
+        max_size = self.config.max_direct_size
+        many_items = len(obj) > 50
         serialized_dict = {}
+        # Braces plus "," separators between entries (compact encoding)
+        total_size = 2 + max(len(obj) - 1, 0)
         has_complex = False
-        
+
         for key, value in obj.items():
             # Key must be string
             str_key = str(key)
-            
-            result = self.serialize(value, context)
-            serialized_dict[str_key] = result.data
-            
-            if result.type != 'direct':
+
+            try:
+                data, size, is_direct = self._serialize_child(value, context)
+            except (TypeError, ValueError):
+                return self._store_object(obj, preview=str(obj)[:self.config.max_preview_length])
+
+            serialized_dict[str_key] = data
+            # "key":value
+            total_size += _json_size(str_key) + 1 + size
+            if not is_direct:
                 has_complex = True
 
-        try:
-            total_json = json.dumps(serialized_dict)
-            total_size = len(total_json.encode('utf-8'))
-        except Exception:
-            return self._store_object(obj, preview=str(obj)[:self.config.max_preview_length])
-        
-        # Check total size
-        if total_size > self.config.max_direct_size or (has_complex and len(obj) > 50):
-            return self._store_object(obj, preview=str(obj)[:self.config.max_preview_length])
-        
+            if total_size > max_size or (has_complex and many_items):
+                return self._store_object(obj, preview=str(obj)[:self.config.max_preview_length])
+
         return SerializationResult(
             type='direct',
             data=serialized_dict,
@@ -575,10 +710,12 @@ class SmartSerializer:
                     '_type': f"{type(obj).__module__}.{type_name}",
                     'data': as_dict,
                 }
-                serialized = json.dumps(payload)
+                serialized = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
                 size = len(serialized.encode('utf-8'))
                 if size <= self.config.max_direct_size:
-                    return SerializationResult(type='direct', data=payload, metadata={'size_bytes': size})
+                    return SerializationResult(
+                        type='direct', data=payload, metadata={'size_bytes': size}, encoded=serialized
+                    )
 
             return self._store_object(obj, preview=f"{type_name}({str(obj)[:80]})")
                 
@@ -586,6 +723,44 @@ class SmartSerializer:
             # Conversion failed, store object
             return self._store_object(obj, error=str(e))
     
+    def _handle_large_array(self, obj: Any, context: Dict) -> SerializationResult:
+        """Oversized ndarray -> object reference with statistics, strided sample and a lazy .npy resource"""
+        try:
+            float_precision = self.config.library_specific.get('numpy', {}).get('float_precision', 4)
+            summary = summarize_ndarray(obj, self.config.array_sample_size, float_precision)
+        except Exception as e:
+            return self._store_object(obj, error=f"Failed to summarize array: {e}")
+        
+        result = self._store_object(obj, preview=f"ndarray(shape={tuple(obj.shape)}, dtype={obj.dtype})")
+        result.data['summary'] = summary
+        
+        if self.config.enable_resources and 0 < obj.nbytes <= self.config.array_export_max_bytes:
+            size = npy_size(obj)
+            if size is not None:
+                # Only advertised here; the export is written from the stored array when first read
+                resource_id = f"{_NPY_EXPORT_PREFIX}{result.data['object_id']}"
+                result.data['resource'] = {
+                    'uri': f"{self.config.resource_base_url}/{resource_id}",
+                    'content_type': NPY_CONTENT_TYPE,
+                    'size': size,
+                }
+        
+        return result
+
+    def _export_array(self, resource_id: str) -> Optional[ResourceEntry]:
+        """Write the .npy resource of a stored array on its first read"""
+        obj = self.get_object(resource_id[len(_NPY_EXPORT_PREFIX):])
+        if not is_ndarray(obj) or not 0 < obj.nbytes <= self.config.array_export_max_bytes:
+            return None
+        with self._export_lock:
+            entry = self.resources.get(resource_id)
+            if entry is None:
+                buffers = npy_buffers(obj)
+                if buffers is None:
+                    return None
+                entry = self.resources.put_buffers(resource_id, buffers, NPY_CONTENT_TYPE)
+            return entry
+    
     def _store_object(self, obj: Any, preview: Optional[str] = None, error: Optional[str] = None) -> SerializationResult:
         """Store object and return reference"""
         object_id = self._generate_object_id()
@@ -594,12 +769,8 @@ class SmartSerializer:
         obj_type = type(obj)
         type_name = f"{obj_type.__module__}.{obj_type.__name__}"
         
-        # Estimate size
-        size_estimate = 0
-        try:
-            size_estimate = sys.getsizeof(obj)
-        except:
-            pass
+        # Deep size (sys.getsizeof only sees the object header)
+        size_estimate = self.sizers.size_of(obj)
         
         # Extract available methods
         available_methods = self._extract_methods(obj)
@@ -622,14 +793,11 @@ class SmartSerializer:
         
         # Store
         with self._write_lock:
-            if len(self._object_store) >= self._max_objects:
-                oldest_id, _ = self._object_store.popitem(last=False)
-                self.metadata_store.pop(oldest_id, None)
-                self._ref_timestamps.pop(oldest_id, None)
-
-            self._object_store[object_id] = obj
             self.metadata_store[object_id] = metadata
-            self._ref_timestamps[object_id] = time.time()
+            self._object_sizes[object_id] = size_estimate
+            self._insert_object_locked(object_id, obj)
+            victims = self._evict_objects_locked(keep=object_id)
+        self._spill_objects(victims, drop_on_failure=True)
         
         # Return result
         result_data = {
@@ -649,21 +817,239 @@ class SmartSerializer:
             metadata=asdict(metadata)
         )
 
+    def _insert_object_locked(self, object_id: str, obj: Any) -> None:
+        self._object_store[object_id] = obj
+        self._ref_timestamps[object_id] = time.time()
+        size = self._object_sizes.get(object_id, 0)
+        self._stored_bytes += size
+        if self._gds is not None:
+            self._gds.touch(object_id, size)
+
+    def _unload_object_locked(self, object_id: str) -> Any:
+        """Take an object out of memory for spilling; its metadata stays"""
+        obj = self._object_store.pop(object_id)
+        self._stored_bytes -= self._object_sizes.get(object_id, 0)
+        if self._gds is not None:
+            self._gds.remove(object_id)
+        self._spilling[object_id] = obj
+        return obj
+
+    def _evict_objects_locked(self, keep: str) -> List[str]:
+        """
+        Evict until count and byte budget hold; the newest object is always kept.
+
+        With a disk tier, victims are moved to the pending-spill set and their
+        ids returned, to be written by _spill_objects outside the lock.
+        """
+        victims: List[str] = []
+        while len(self._object_store) > 1 and (
+            len(self._object_store) > self._max_objects
+            or (self._max_bytes and self._stored_bytes > self._max_bytes)
+        ):
+            if self._gds is not None:
+                victim = self._gds.pop_victim(exclude=keep)
+            else:
+                victim = next(iter(self._object_store))
+                if victim == keep:
+                    break
+            if victim is None:
+                break
+            self._evicted_bytes += self._object_sizes.get(victim, 0)
+            self._evictions += 1
+            if self._tier is not None and victim not in self._unspillable:
+                self._unload_object_locked(victim)
+                victims.append(victim)
+            else:
+                self._drop_object_locked(victim)
+        return victims
+
+    def _spill_objects(self, object_ids: List[str], drop_on_failure: bool) -> None:
+        """
+        Write pending objects to the disk tier. An object that was used again
+        (or dropped) while being written stays in memory and its file is
+        discarded. Objects that cannot be serialized are dropped when evicted
+        and kept in memory when merely idle.
+        """
+        tier = self._tier
+        for object_id in object_ids:
+            with self._write_lock:
+                obj = self._spilling.get(object_id, None)
+                metadata = self.metadata_store.get(object_id)
+                last_access = self._ref_timestamps.get(object_id)
+            if metadata is None or object_id not in self._spilling:
+                continue
+            written = tier.spill(object_id, obj, asdict(metadata), last_access) if tier is not None else None
+            with self._write_lock:
+                if object_id not in self._spilling:
+                    # Rehydrated or dropped in the meantime
+                    if written is not None and object_id not in self._spilled and tier is not None:
+                        tier.discard(object_id)
+                    continue
+                del self._spilling[object_id]
+                if written is not None:
+                    self._spilled[object_id] = written
+                    self._spills += 1
+                elif drop_on_failure:
+                    self._drop_object_locked(object_id)
+                else:
+                    self._unspillable.add(object_id)
+                    self._insert_object_locked(object_id, obj)
+
+    def _drop_object_locked(self, object_id: str) -> None:
+        if object_id in self._object_store:
+            del self._object_store[object_id]
+            self._stored_bytes -= self._object_sizes.get(object_id, 0)
+        self._object_sizes.pop(object_id, None)
+        self.metadata_store.pop(object_id, None)
+        self._ref_timestamps.pop(object_id, None)
+        self._spilling.pop(object_id, None)
+        self._unspillable.discard(object_id)
+        if self._gds is not None:
+            self._gds.remove(object_id)
+        self._spilled.pop(object_id, None)
+        if self._tier is not None:
+            # A persistent tier may still hold a copy of a rehydrated object
+            self._tier.discard(object_id)
+
+    def spill_idle_objects(self, idle_seconds: float) -> int:
+        """Move objects not used for idle_seconds to the disk tier"""
+        if self._tier is None:
+            return 0
+        now = time.time()
+        with self._write_lock:
+            idle = [
+                object_id for object_id in self._object_store
+                if now - self._ref_timestamps.get(object_id, now) > idle_seconds
+                and object_id not in self._unspillable
+            ]
+            for object_id in idle:
+                self._unload_object_locked(object_id)
+        self._spill_objects(idle, drop_on_failure=False)
+        return len(idle)
+
+    def _rehydrate_object(self, object_id: str) -> Optional[Any]:
+        """Load a spilled object back into memory"""
+        with self._rehydrate_lock:
+            with self._write_lock:
+                if object_id in self._object_store:
+                    return self._object_store[object_id]
+                if object_id not in self._spilled or self._tier is None:
+                    return None
+            try:
+                obj = self._tier.load(object_id)
+            except Exception:
+                return None
+            with self._write_lock:
+                if self._spilled.pop(object_id, None) is None:
+                    return None
+                self._rehydrations += 1
+                self._insert_object_locked(object_id, obj)
+                victims = self._evict_objects_locked(keep=object_id)
+            # A persistent tier keeps the (possibly stale) copy until it is rewritten
+            if not self._tier.persistent:
+                self._tier.discard(object_id)
+        self._spill_objects(victims, drop_on_failure=True)
+        return obj
+
+    def _restore_spilled_objects(self) -> None:
+        """Register the objects a previous run left in the persistent tier"""
+        for object_id, record in self._tier.restore().items():
+            try:
+                metadata = ObjectMetadata(**record['metadata'])
+            except (KeyError, TypeError):
+                continue
+            self.metadata_store[object_id] = metadata
+            self._object_sizes[object_id] = metadata.size_estimate
+            self._ref_timestamps[object_id] = float(record.get('last_access') or time.time())
+            self._spilled[object_id] = int(record.get('bytes', 0))
+            if object_id.startswith('obj_'):
+                try:
+                    self._id_counter = max(self._id_counter, int(object_id[4:], 16))
+                except ValueError:
+                    pass
+
+    def _close_tier(self) -> None:
+        tier, self._tier = self._tier, None
+        if tier is None:
+            return
+        if tier.persistent:
+            with self._write_lock:
+                resident = list(self._object_store.items()) + list(self._spilling.items())
+                metadata = {object_id: self.metadata_store.get(object_id) for object_id, _ in resident}
+                timestamps = dict(self._ref_timestamps)
+            for object_id, obj in resident:
+                if metadata[object_id] is not None:
+                    tier.spill(object_id, obj, asdict(metadata[object_id]), timestamps.get(object_id))
+        tier.close()
+
+    def object_store_stats(self) -> Dict[str, Any]:
+        """Object count, accounted bytes and evictions of the object store"""
+        with self._write_lock:
+            return {
+                'objects': len(self._object_store),
+                'bytes': self._stored_bytes,
+                'max_objects': self._max_objects,
+                'max_bytes': self._max_bytes,
+                'policy': 'gds' if self._gds is not None else 'lru',
+                'evictions': self._evictions,
+                'evicted_bytes': self._evicted_bytes,
+                'spilled': len(self._spilled),
+                'spilled_bytes': sum(self._spilled.values()),
+                'spills': self._spills,
+                'rehydrations': self._rehydrations,
+            }
+
     def _generate_object_id(self) -> str:
         with self._id_lock:
             self._id_counter += 1
             return f"obj_{self._id_counter:016x}"
     
     def _extract_methods(self, obj: Any) -> List[Dict[str, Any]]:
-        """Extract available methods of object"""
+        """
+        Extract available methods of object.
+
+        Class-level method descriptors are introspected once per type, from
+        the type alone, and cached; only public attributes set on the
+        instance itself are looked at per object, since they can add or
+        shadow methods.
+        """
+        obj_type = type(obj)
+        instance_attrs = _public_instance_attributes(obj)
+
+        if not self.config.cache_method_descriptors or isinstance(obj, type):
+            return self._introspect_methods(obj, [name for name in dir(obj) if not name.startswith('_')])
+
+        with self._method_cache_lock:
+            type_methods = self._method_cache.get(obj_type)
+            if type_methods is not None:
+                self._method_cache.move_to_end(obj_type)
+
+        if type_methods is None:
+            # Instance attributes are left out here: they belong to this object only
+            names = [name for name in dir(obj_type) if not name.startswith('_')]
+            type_methods = self._introspect_methods(obj, names, getter=_type_attribute)
+            with self._method_cache_lock:
+                self._method_cache[obj_type] = type_methods
+                while len(self._method_cache) > self._max_method_cache_types:
+                    self._method_cache.popitem(last=False)
+
+        if not instance_attrs:
+            return list(type_methods)
+
+        methods = [m for m in type_methods if m['name'] not in instance_attrs]
+        methods.extend(self._introspect_methods(obj, instance_attrs))
+        methods.sort(key=lambda m: m['name'])
+        return methods
+
+    def _introspect_methods(
+        self, obj: Any, names: Iterable[str], getter: Callable[[Any, str], Any] = getattr
+    ) -> List[Dict[str, Any]]:
+        """Build method descriptors for the given attribute names of obj"""
         available_methods = []
         
-        for name in dir(obj):
-            if name.startswith('_'):
-                continue
-            
+        for name in names:
             try:
-                attr = getattr(obj, name)
+                attr = getter(obj, name)
                 if callable(attr):
                     # Extract parameter info
                     try:
@@ -693,53 +1079,59 @@ class SmartSerializer:
         return available_methods
     
     def get_object(self, object_id: str) -> Optional[Any]:
-        """Get stored object"""
+        """Get stored object, loading it back from the disk tier if it was spilled"""
         with self._write_lock:
             obj = self._object_store.get(object_id)
             if obj is not None:
                 self._object_store.move_to_end(object_id)
                 self._ref_timestamps[object_id] = time.time()
-            return obj
+                if self._gds is not None:
+                    self._gds.touch(object_id, self._object_sizes.get(object_id, 0))
+                return obj
+            if object_id in self._spilling:
+                # Still being written: cancel the spill
+                obj = self._spilling.pop(object_id)
+                self._insert_object_locked(object_id, obj)
+                return obj
+            if object_id not in self._spilled:
+                return None
+        return self._rehydrate_object(object_id)
     
     def get_metadata(self, object_id: str) -> Optional[ObjectMetadata]:
         """Get object metadata"""
         with self._read_lock:
             return self.metadata_store.get(object_id)
     
-    def get_resource(self, resource_id: str) -> Optional[Dict]:
-        """Get Resource data"""
-        with self._read_lock:
-            return self.resource_store.get(resource_id)
+    def get_resource(self, resource_id: str) -> Optional[ResourceEntry]:
+        """Get Resource entry (read its bytes via self.resources.read)"""
+        entry = self.resources.get(resource_id)
+        if entry is None and resource_id.startswith(_NPY_EXPORT_PREFIX):
+            entry = self._export_array(resource_id)
+        return entry
     
     def cleanup_objects(self, max_age_seconds: int = 3600):
         """Cleanup old objects"""
         now = time.time()
         with self._write_lock:
             object_ts_snapshot = list(self._ref_timestamps.items())
-            resource_ts_snapshot = list(self._resource_timestamps.items())
 
         expired_object_ids = [
             object_id for object_id, ts in object_ts_snapshot
             if now - ts > max_age_seconds
         ]
-        expired_resource_ids = [
-            resource_id for resource_id, ts in resource_ts_snapshot
-            if now - ts > max_age_seconds
-        ]
+        expired_resources = self.resources.expire(max_age_seconds)
+        self.cursors.expire()
 
-        if not expired_object_ids and not expired_resource_ids:
-            return 0
+        if expired_object_ids:
+            with self._write_lock:
+                for object_id in expired_object_ids:
+                    self._drop_object_locked(object_id)
 
-        with self._write_lock:
-            for object_id in expired_object_ids:
-                self._object_store.pop(object_id, None)
-                self.metadata_store.pop(object_id, None)
-                self._ref_timestamps.pop(object_id, None)
-            for resource_id in expired_resource_ids:
-                self.resource_store.pop(resource_id, None)
-                self._resource_timestamps.pop(resource_id, None)
-
-        return len(expired_object_ids) + len(expired_resource_ids)
+        idle_seconds = self.config.object_idle_seconds
+        if idle_seconds is not None and idle_seconds < max_age_seconds:
+            self.spill_idle_objects(idle_seconds)
+
+        return len(expired_object_ids) + expired_resources
 
 
 # Global serializer instance (can be used in MCP server)
@@ -3,13 +3,74 @@
 Library-specific serialization handlers - Fully Configuration-driven version
 These handlers are completely driven by JSON configuration for maximum extensibility.
 No code changes needed to add new type handlers - just modify handlers_config.json
+
+Each handler spec is compiled once into a native closure when the registry is
+created, so serialization does not interpret the configuration per object.
 """
 
-from typing import Any, Dict, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from allbemcp.serialization.engine import SerializationResult
 import json
+import logging
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+
+def _base64_encode(value: Any) -> Any:
+    import base64
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    return value
+
+
+_TRANSFORMS: Dict[str, Callable[[Any], Any]] = {
+    "str": lambda value: str(value) if value is not None else "",
+    "dict": lambda value: dict(value) if value is not None else {},
+    "list": lambda value: list(value) if value is not None else [],
+    "tuple": lambda value: tuple(value) if value is not None else (),
+    "base64_encode": _base64_encode,
+    "int": lambda value: int(value) if value is not None else 0,
+    "float": lambda value: float(value) if value is not None else 0.0,
+}
+
+
+DATAFRAME_ORIENTS = ("records", "split", "list")
+
+
+def _dataframe_column_values(df: Any, float_precision: Optional[int]) -> List[list]:
+    """
+    One Python list per column, rounding float columns vectorized per column.
+
+    Replaces df.round(...).to_dict(...): only float columns are rounded (one new
+    array each, already needed for the output) and the frame itself is never copied.
+    """
+    import numpy as np
+
+    values: List[list] = []
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        # Extension dtypes (strings, nullable types, categoricals) are exported as-is
+        if float_precision is not None and isinstance(column.dtype, np.dtype) and column.dtype.kind == "f":
+            values.append(np.round(column.to_numpy(), float_precision).tolist())
+        else:
+            values.append(column.tolist())
+    return values
+
+
+def _dataframe_payload(df: Any, columns: List[Any], orient: str, float_precision: Optional[int]) -> Any:
+    """Encode a DataFrame as records, split (columns + index + row arrays) or list (column arrays)"""
+    column_values = _dataframe_column_values(df, float_precision)
+    if orient == "list":
+        return dict(zip(columns, column_values))
+    if orient == "split":
+        return {
+            "columns": columns,
+            "index": df.index.tolist(),
+            "data": [list(row) for row in zip(*column_values)],
+        }
+    return [dict(zip(columns, row)) for row in zip(*column_values)]
+
 
 class ConfigDrivenHandlers:
     """
@@ -29,6 +90,7 @@ class ConfigDrivenHandlers:
         self.config = config
         self.handlers_config = handlers_config or self._load_handlers_config()
         self._resolved_configs = {}  # Cache for resolved handler configs
+        self._compiled_handlers: Dict[str, Optional[Callable[[Any, Dict], Optional[SerializationResult]]]] = {}
     
     def _load_handlers_config(self) -> Dict[str, Any]:
         """Load handlers configuration from JSON file"""
@@ -79,29 +141,6 @@ class ConfigDrivenHandlers:
         _stack.discard(type_name)
         return resolved
 
-    def _handle_processing(self, obj: Any, data: Dict[str, Any], handler_config: Dict[str, Any],
-                           lib_config: Dict[str, Any], context: Dict[str, Any]) -> None:
-        """Handle post-extraction processing configured by handler processing block."""
-        processing = handler_config.get("processing", {})
-        if not processing:
-            return
-
-        proc_type = processing.get("type")
-        if proc_type == "image_thumbnail":
-            try:
-                import io
-                import base64
-                thumb_size = lib_config.get(processing.get("size_config", "thumbnail_size"), [200, 200])
-                img_format = lib_config.get(processing.get("format_config", "image_format"), "PNG")
-
-                thumb = obj.copy()
-                thumb.thumbnail(tuple(thumb_size))
-                buf = io.BytesIO()
-                thumb.save(buf, format=img_format)
-                data["thumbnail_base64"] = base64.b64encode(buf.getvalue()).decode('ascii')
-            except Exception:
-                data["thumbnail_base64"] = None
-    
     def _deep_merge(self, base: Dict, override: Dict) -> Dict:
         """Deep merge two dictionaries"""
         result = base.copy()
@@ -111,462 +150,614 @@ class ConfigDrivenHandlers:
             else:
                 result[key] = value
         return result
-    
+
     def _get_lib_config(self, handler_config: Dict[str, Any]) -> Dict[str, Any]:
         """Get library-specific config with defaults"""
         namespace = handler_config.get("config_namespace", "")
         defaults = handler_config.get("config_defaults", {})
-        
+
         # Get runtime config and merge with defaults
         runtime_config = self.config.get(namespace, {})
-        return {**defaults, **runtime_config}
-    
+        lib_config = {**defaults, **runtime_config}
+
+        # Unsupported values of options with fixed choices fall back to the default
+        for key, choices in handler_config.get("config_choices", {}).items():
+            if key in lib_config and lib_config[key] not in choices:
+                logger.warning(
+                    "Unsupported %s.%s value %r (expected one of %s); using %r",
+                    namespace, key, lib_config[key], ", ".join(map(str, choices)), defaults.get(key),
+                )
+                lib_config[key] = defaults.get(key)
+        return lib_config
+
     def _get_attribute(self, obj: Any, attr_path: str, default: Any = None) -> Any:
         """Get attribute from object by path (supports dot notation and index)"""
+        return self._compile_attribute_getter(attr_path, default)(obj)
+
+    # ------------------------------------------------------------------
+    # Compilation: each stage turns a piece of handler configuration into a
+    # closure once, so serializing an object never re-reads the JSON spec.
+    # ------------------------------------------------------------------
+
+    def _compile_attribute_getter(self, attr_path: str, default: Any = None) -> Callable[[Any], Any]:
+        """Pre-split an attribute path like "index.name" or "shape[0]" into a getter"""
+        steps = []
         try:
-            parts = attr_path.split('.')
-            value = obj
-            for part in parts:
+            for part in attr_path.split('.'):
                 # Handle index notation like "shape[0]"
                 if '[' in part:
                     attr, idx = part.split('[')
-                    idx = int(idx.rstrip(']'))
-                    if attr:
-                        value = getattr(value, attr, None)
-                    if value is not None:
-                        value = value[idx]
-                elif hasattr(value, part):
-                    value = getattr(value, part)
+                    steps.append((attr, int(idx.rstrip(']'))))
                 else:
-                    return default
-            return value
+                    steps.append((part, None))
         except Exception:
-            return default
-    
-    def _apply_transform(self, value: Any, transform: str) -> Any:
-        """Apply a transform to a value"""
-        if transform == "str":
-            return str(value) if value is not None else ""
-        elif transform == "dict":
-            return dict(value) if value is not None else {}
-        elif transform == "list":
-            return list(value) if value is not None else []
-        elif transform == "tuple":
-            return tuple(value) if value is not None else ()
-        elif transform == "base64_encode":
-            import base64
-            if isinstance(value, bytes):
-                return base64.b64encode(value).decode('ascii')
-            return value
-        elif transform == "int":
-            return int(value) if value is not None else 0
-        elif transform == "float":
-            return float(value) if value is not None else 0.0
-        return value
-    
-    def _extract_base_fields(self, obj: Any, handler_config: Dict[str, Any], 
-                             lib_config: Dict[str, Any], context: Dict) -> Dict[str, Any]:
-        """Extract base fields from object based on configuration"""
-        data = {}
-        base_fields = handler_config.get("base_fields", {})
-        
-        for field_name, field_spec in base_fields.items():
-            field_type = field_spec.get("type")
-            
-            if field_type == "literal":
-                data[field_name] = field_spec.get("value")
-            
-            elif field_type == "attribute":
-                attr = field_spec.get("attr")
-                default = field_spec.get("default")
-                value = self._get_attribute(obj, attr, default)
-                
-                # Apply transform if specified
-                if "transform" in field_spec:
-                    value = self._apply_transform(value, field_spec["transform"])
-                
-                data[field_name] = value
-            
-            elif field_type == "computed":
-                expression = field_spec.get("expression")
-                data[field_name] = self._compute_expression(
-                    expression, obj, handler_config, lib_config, context
-                )
-            
-            elif field_type == "config":
-                key = field_spec.get("key")
-                data[field_name] = lib_config.get(key)
-        
-        return data
-    
-    def _compute_expression(self, expression: str, obj: Any, handler_config: Dict[str, Any],
-                            lib_config: Dict[str, Any], context: Dict) -> Any:
+            return lambda obj: default
+
+        if len(steps) == 1 and steps[0][1] is None:
+            name = steps[0][0]
+
+            def get_single(obj: Any) -> Any:
+                try:
+                    return getattr(obj, name, default)
+                except Exception:
+                    return default
+
+            return get_single
+
+        def get_path(obj: Any) -> Any:
+            try:
+                value = obj
+                for attr, idx in steps:
+                    if idx is not None:
+                        if attr:
+                            value = getattr(value, attr, None)
+                        if value is not None:
+                            value = value[idx]
+                    elif hasattr(value, attr):
+                        value = getattr(value, attr)
+                    else:
+                        return default
+                return value
+            except Exception:
+                return default
+
+        return get_path
+
+    def _compile_transform(self, transform: Optional[str]) -> Optional[Callable[[Any], Any]]:
+        """Resolve a transform name to a function (None for unknown/absent)"""
+        if transform is None:
+            return None
+        return _TRANSFORMS.get(transform)
+
+    def _compile_expression(self, expression: str, lib_config: Dict[str, Any]) -> Callable[[Any, Dict], Any]:
         """
-        Compute a named expression.
-        
+        Compile a named expression into a closure taking (obj, context).
+
         Expressions are defined in configuration and mapped to computation logic here.
-        This allows adding new expressions without changing the core handler logic.
+        Config lookups and string parsing happen once, at compile time.
         """
+        expression = expression or ""
+
         # Type expressions
         if expression == "type_full_name":
-            return f'{type(obj).__module__}.{type(obj).__name__}'
-        
+            return lambda obj, context: f'{type(obj).__module__}.{type(obj).__name__}'
+
         # Size expressions
         elif expression == "json_size":
-            return context.get("_json_size", 0)
-        
+            return lambda obj, context: context.get("_json_size", 0)
+
         # Resource expressions
         elif expression == "resource_uri":
-            resource_id = context.get("_resource_id", "")
             base_url = lib_config.get("resource_base_url", "mcp://resources")
-            return f'{base_url}/{resource_id}'
-        
+            return lambda obj, context: f'{base_url}/{context.get("_resource_id", "")}'
+
         elif expression == "resource_id":
-            return context.get("_resource_id", "")
-        
+            return lambda obj, context: context.get("_resource_id", "")
+
         # Image expressions
         elif expression == "image_content_type":
-            image_format = lib_config.get("image_format", "PNG")
-            return f'image/{image_format.lower()}'
-        
+            content_type = f'image/{lib_config.get("image_format", "PNG").lower()}'
+            return lambda obj, context: content_type
+
         elif expression == "image_original_size":
-            return (getattr(obj, 'width', 0), getattr(obj, 'height', 0))
-        
+            return lambda obj, context: (getattr(obj, 'width', 0), getattr(obj, 'height', 0))
+
         # DataFrame expressions
         elif expression == "dataframe_columns":
-            return obj.columns.tolist()
-        
+            return lambda obj, context: obj.columns.tolist()
+
         elif expression == "dataframe_dtypes":
-            dtypes_dict = {}
-            for col, dtype in obj.dtypes.items():
-                key = str(col) if isinstance(col, tuple) else col
-                dtypes_dict[key] = str(dtype)
-            return dtypes_dict
-        
+            def dataframe_dtypes(obj: Any, context: Dict) -> Dict[Any, str]:
+                dtypes_dict = {}
+                for col, dtype in obj.dtypes.items():
+                    key = str(col) if isinstance(col, tuple) else col
+                    dtypes_dict[key] = str(dtype)
+                return dtypes_dict
+            return dataframe_dtypes
+
         elif expression == "dataframe_shape":
-            return list(obj.shape)
-        
-        elif expression == "dataframe_records":
+            return lambda obj, context: list(obj.shape)
+
+        elif expression in ("dataframe_records", "dataframe_data"):
             float_precision = lib_config.get("float_precision")
-            export_df = context.get("_export_df", obj)
-            if float_precision is not None:
-                return export_df.round(float_precision).to_dict(orient='records')
-            return export_df.to_dict(orient='records')
-        
+            orient = "records"
+            if expression == "dataframe_data":
+                orient = lib_config.get("orient", "records")
+                if orient not in DATAFRAME_ORIENTS:
+                    logger.warning("Unsupported DataFrame orient %r; using 'records'", orient)
+                    orient = "records"
+
+            def dataframe_data(obj: Any, context: Dict) -> Any:
+                columns = context.get("_export_columns")
+                if columns is None:
+                    columns = obj.columns.tolist()
+                return _dataframe_payload(obj, columns, orient, float_precision)
+            return dataframe_data
+
         # Numpy expressions
         elif expression == "numpy_tolist":
-            import numpy as np
             float_precision = lib_config.get("float_precision", 4)
-            if np.issubdtype(obj.dtype, np.floating):
-                return np.round(obj, float_precision).tolist()
-            return obj.tolist()
-        
+
+            def numpy_tolist(obj: Any, context: Dict) -> Any:
+                import numpy as np
+                if np.issubdtype(obj.dtype, np.floating):
+                    return np.round(obj, float_precision).tolist()
+                return obj.tolist()
+            return numpy_tolist
+
         # Generic expressions - can be extended via configuration
         elif expression.startswith("attr:"):
             # Expression format: "attr:attribute_path"
-            attr_path = expression[5:]
-            return self._get_attribute(obj, attr_path)
-        
+            getter = self._compile_attribute_getter(expression[5:])
+            return lambda obj, context: getter(obj)
+
         elif expression.startswith("format:"):
             # Expression format: "format:template_string"
             # Template can use {attr_name} placeholders
-            template = expression[7:]
-            # Simple template substitution
-            result = template
             import re
-            for match in re.finditer(r'\{(\w+(?:\.\w+)*)\}', template):
-                attr_path = match.group(1)
-                value = self._get_attribute(obj, attr_path, "")
-                result = result.replace(match.group(0), str(value))
-            return result
-        
-        return None
-    
-    def _check_size_limits(self, obj: Any, handler_config: Dict[str, Any], 
-                           lib_config: Dict[str, Any]) -> bool:
-        """Check if object exceeds size limits. Returns True if within limits."""
+            template = expression[7:]
+            parts: List[Tuple[str, Callable[[Any], Any]]] = [
+                (match.group(0), self._compile_attribute_getter(match.group(1), ""))
+                for match in re.finditer(r'\{(\w+(?:\.\w+)*)\}', template)
+            ]
+
+            def format_template(obj: Any, context: Dict) -> str:
+                result = template
+                for placeholder, getter in parts:
+                    result = result.replace(placeholder, str(getter(obj)))
+                return result
+            return format_template
+
+        return lambda obj, context: None
+
+    def _compile_size_check(self, handler_config: Dict[str, Any],
+                            lib_config: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+        """Compile size limits into a predicate. Returns None when no check applies."""
         size_check = handler_config.get("size_check", {})
         if not size_check.get("enabled", False):
-            return True
-        
+            return None
+
+        limits: List[Tuple[Callable[[Any], Any], Any]] = []
+
         # Check dimensions (for DataFrame)
-        dimensions = size_check.get("dimensions", {})
-        for dim_name, dim_spec in dimensions.items():
-            getter = dim_spec.get("getter", "")
-            max_config = dim_spec.get("max_config", "")
-            max_value = lib_config.get(max_config, float('inf'))
-            
-            actual_value = self._get_attribute(obj, getter, 0)
-            if actual_value > max_value:
-                return False
-        
+        for dim_spec in size_check.get("dimensions", {}).values():
+            max_value = lib_config.get(dim_spec.get("max_config", ""), float('inf'))
+            limits.append((self._compile_attribute_getter(dim_spec.get("getter", ""), 0), max_value))
+
         # Check element count (for numpy array)
         element_count = size_check.get("element_count", {})
         if element_count:
-            getter = element_count.get("getter", "size")
-            max_config = element_count.get("max_config", "")
-            max_value = lib_config.get(max_config, float('inf'))
-            actual_value = self._get_attribute(obj, getter, 0)
-            
-            if actual_value > max_value:
-                return False
-        
-        return True
-    
-    def _handle_content_extraction(self, obj: Any, data: Dict[str, Any],
-                                   handler_config: Dict[str, Any], 
-                                   lib_config: Dict[str, Any]) -> None:
-        """Handle content extraction for HTTP responses and similar objects"""
+            max_value = lib_config.get(element_count.get("max_config", ""), float('inf'))
+            limits.append((self._compile_attribute_getter(element_count.get("getter", "size"), 0), max_value))
+
+        if not limits:
+            return None
+
+        def within_limits(obj: Any) -> bool:
+            for getter, max_value in limits:
+                if getter(obj) > max_value:
+                    return False
+            return True
+
+        return within_limits
+
+    def _compile_preprocessing(self, handler_config: Dict[str, Any]) -> Optional[Callable[[Any, Dict], None]]:
+        """Compile preprocessing steps"""
+        preprocessing = handler_config.get("preprocessing", {})
+        if not preprocessing:
+            return None
+
+        if preprocessing.get("type") == "dataframe_columns":
+            def dataframe_columns(obj: Any, context: Dict) -> None:
+                # Handle DataFrame MultiIndex columns (renamed for export, frame not copied)
+                columns_list = obj.columns.tolist()
+                if len(columns_list) > 0 and isinstance(columns_list[0], tuple):
+                    columns_list = [str(col) for col in columns_list]
+                context["_export_columns"] = columns_list
+            return dataframe_columns
+
+        return None
+
+    def _compile_resource_generation(self, handler_config: Dict[str, Any]) -> Optional[Callable[[], str]]:
+        """Compile resource ID generation"""
+        resource_gen = handler_config.get("resource_generation", {})
+        if not resource_gen:
+            return None
+
+        import uuid
+        prefix = resource_gen.get("id_prefix", "res_")
+        length = resource_gen.get("id_length", 12)
+        return lambda: f"{prefix}{uuid.uuid4().hex[:length]}"
+
+    def _compile_base_fields(self, handler_config: Dict[str, Any],
+                             lib_config: Dict[str, Any]) -> List[Tuple[str, Callable[[Any, Dict], Any]]]:
+        """Compile base field specs into (field_name, extractor) pairs"""
+        extractors: List[Tuple[str, Callable[[Any, Dict], Any]]] = []
+
+        for field_name, field_spec in handler_config.get("base_fields", {}).items():
+            field_type = field_spec.get("type")
+
+            if field_type == "literal":
+                value = field_spec.get("value")
+                extractors.append((field_name, lambda obj, context, v=value: v))
+
+            elif field_type == "attribute":
+                getter = self._compile_attribute_getter(field_spec.get("attr"), field_spec.get("default"))
+                transform = self._compile_transform(field_spec.get("transform"))
+                if transform is None:
+                    extractors.append((field_name, lambda obj, context, g=getter: g(obj)))
+                else:
+                    extractors.append((field_name, lambda obj, context, g=getter, t=transform: t(g(obj))))
+
+            elif field_type == "computed":
+                extractors.append((field_name, self._compile_expression(field_spec.get("expression"), lib_config)))
+
+            elif field_type == "config":
+                value = lib_config.get(field_spec.get("key"))
+                # Settings left at their default need not appear in every payload
+                if "omit_if" in field_spec and value == field_spec["omit_if"]:
+                    continue
+                extractors.append((field_name, lambda obj, context, v=value: v))
+
+        return extractors
+
+    def _compile_content_extraction(self, handler_config: Dict[str, Any],
+                                    lib_config: Dict[str, Any]) -> List[Callable[[Any, Dict[str, Any]], None]]:
+        """Compile content extraction strategies for HTTP responses and similar objects"""
         content_config = handler_config.get("content_extraction", {})
         if not content_config:
-            return
-        
-        priority = content_config.get("priority", [])
+            return []
+
         strategies = content_config.get("strategies", {})
         max_text_length = lib_config.get("response_max_text_length", 10000)
-        
-        for strategy_name in priority:
-            if "content" in data:
-                break
-                
+        compiled: List[Callable[[Any, Dict[str, Any]], None]] = []
+
+        for strategy_name in content_config.get("priority", []):
             strategy = strategies.get(strategy_name, {})
-            
+
             if strategy_name == "json":
-                # Try JSON extraction
-                method = strategy.get("method", "json")
-                if hasattr(obj, method) and callable(getattr(obj, method)):
-                    try:
-                        json_data = getattr(obj, method)()
-                        on_success = strategy.get("on_success", {})
-                        for key, value in on_success.items():
-                            if value == "@result":
-                                data[key] = json_data
-                            else:
-                                data[key] = value
-                    except Exception:
-                        pass
-            
+                compiled.append(self._compile_json_strategy(strategy))
             elif strategy_name == "text":
-                # Try text extraction
-                attr = strategy.get("attribute", "text")
-                if hasattr(obj, attr):
-                    text = getattr(obj, attr)
-                    if text:
-                        on_success = strategy.get("on_success", {})
-                        if len(text) > max_text_length:
-                            data["content"] = text[:max_text_length]
-                            on_truncate = strategy.get("on_truncate", {})
-                            for key, value in on_truncate.items():
-                                if value == "@original_length":
-                                    data[key] = len(text)
-                                else:
-                                    data[key] = value
-                            data["content_type"] = on_success.get("content_type", "text")
-                        else:
-                            for key, value in on_success.items():
-                                if value == "@result":
-                                    data[key] = text
-                                else:
-                                    data[key] = value
-            
+                compiled.append(self._compile_text_strategy(strategy, max_text_length))
             elif strategy_name == "binary":
-                # Try binary extraction
-                attr = strategy.get("attribute", "content")
-                if hasattr(obj, attr):
-                    content_bytes = getattr(obj, attr)
-                    if content_bytes:
-                        encoding = getattr(obj, strategy.get("decode_with", "encoding"), None)
-                        encoding = encoding or strategy.get("fallback_encoding", "utf-8")
-                        
-                        try:
-                            text = content_bytes.decode(encoding)
-                            on_success = strategy.get("on_decode_success", {})
-                            if len(text) > max_text_length:
-                                data["content"] = text[:max_text_length]
-                                data["text_truncated"] = True
-                                data["text_full_length"] = len(text)
-                            else:
-                                data["content"] = text
-                            data["content_type"] = on_success.get("content_type", "text")
-                        except UnicodeDecodeError:
-                            import base64
-                            on_failure = strategy.get("on_decode_failure", {})
-                            data["content"] = base64.b64encode(
-                                content_bytes[:max_text_length]
-                            ).decode('ascii')
-                            data["content_type"] = on_failure.get("content_type", "binary")
-                            data["content_encoding"] = on_failure.get("content_encoding", "base64")
-                            if len(content_bytes) > max_text_length:
-                                data["text_truncated"] = True
-    
-    def _handle_conditional_fields(self, obj: Any, data: Dict[str, Any],
-                                   handler_config: Dict[str, Any],
-                                   lib_config: Dict[str, Any]) -> None:
-        """Handle conditional fields"""
-        conditional_fields = handler_config.get("conditional_fields", [])
-        
-        for field_spec in conditional_fields:
+                compiled.append(self._compile_binary_strategy(strategy, max_text_length))
+
+        return compiled
+
+    def _compile_json_strategy(self, strategy: Dict[str, Any]) -> Callable[[Any, Dict[str, Any]], None]:
+        method = strategy.get("method", "json")
+        on_success = list(strategy.get("on_success", {}).items())
+
+        def extract_json(obj: Any, data: Dict[str, Any]) -> None:
+            func = getattr(obj, method, None)
+            if func is None or not callable(func):
+                return
+            try:
+                json_data = func()
+                for key, value in on_success:
+                    data[key] = json_data if value == "@result" else value
+            except Exception:
+                pass
+
+        return extract_json
+
+    def _compile_text_strategy(self, strategy: Dict[str, Any],
+                               max_text_length: int) -> Callable[[Any, Dict[str, Any]], None]:
+        attr = strategy.get("attribute", "text")
+        on_success_config = strategy.get("on_success", {})
+        on_success = list(on_success_config.items())
+        on_truncate = list(strategy.get("on_truncate", {}).items())
+        truncated_content_type = on_success_config.get("content_type", "text")
+
+        def extract_text(obj: Any, data: Dict[str, Any]) -> None:
+            if not hasattr(obj, attr):
+                return
+            text = getattr(obj, attr)
+            if not text:
+                return
+            if len(text) > max_text_length:
+                data["content"] = text[:max_text_length]
+                for key, value in on_truncate:
+                    data[key] = len(text) if value == "@original_length" else value
+                data["content_type"] = truncated_content_type
+            else:
+                for key, value in on_success:
+                    data[key] = text if value == "@result" else value
+
+        return extract_text
+
+    def _compile_binary_strategy(self, strategy: Dict[str, Any],
+                                 max_text_length: int) -> Callable[[Any, Dict[str, Any]], None]:
+        import base64
+        attr = strategy.get("attribute", "content")
+        decode_with = strategy.get("decode_with", "encoding")
+        fallback_encoding = strategy.get("fallback_encoding", "utf-8")
+        success_content_type = strategy.get("on_decode_success", {}).get("content_type", "text")
+        on_failure = strategy.get("on_decode_failure", {})
+        failure_content_type = on_failure.get("content_type", "binary")
+        failure_encoding = on_failure.get("content_encoding", "base64")
+
+        def extract_binary(obj: Any, data: Dict[str, Any]) -> None:
+            if not hasattr(obj, attr):
+                return
+            content_bytes = getattr(obj, attr)
+            if not content_bytes:
+                return
+            encoding = getattr(obj, decode_with, None) or fallback_encoding
+            try:
+                text = content_bytes.decode(encoding)
+                if len(text) > max_text_length:
+                    data["content"] = text[:max_text_length]
+                    data["text_truncated"] = True
+                    data["text_full_length"] = len(text)
+                else:
+                    data["content"] = text
+                data["content_type"] = success_content_type
+            except UnicodeDecodeError:
+                data["content"] = base64.b64encode(content_bytes[:max_text_length]).decode('ascii')
+                data["content_type"] = failure_content_type
+                data["content_encoding"] = failure_encoding
+                if len(content_bytes) > max_text_length:
+                    data["text_truncated"] = True
+
+        return extract_binary
+
+    def _compile_conditional_fields(self, handler_config: Dict[str, Any],
+                                    lib_config: Dict[str, Any]) -> List[Callable[[Any, Dict[str, Any]], None]]:
+        """Compile conditional fields; config-based conditions are decided at compile time"""
+        compiled: List[Callable[[Any, Dict[str, Any]], None]] = []
+
+        for field_spec in handler_config.get("conditional_fields", []):
             condition = field_spec.get("condition", {})
-            
-            # Check condition
-            should_include = False
-            
+            required_attr = None
+
             if "config_key" in condition:
-                config_key = condition.get("config_key")
-                expected_value = condition.get("value")
-                should_include = lib_config.get(config_key) == expected_value
+                if lib_config.get(condition.get("config_key")) != condition.get("value"):
+                    continue
             elif "has_attr" in condition:
-                attr_name = condition.get("has_attr")
-                should_include = hasattr(obj, attr_name)
-            
-            if should_include:
-                field_name = field_spec.get("field")
-                field_type = field_spec.get("type", "attribute")
-                
-                if field_type == "attribute":
-                    attr = field_spec.get("attr")
+                required_attr = condition.get("has_attr")
+            else:
+                continue
+
+            field_name = field_spec.get("field")
+            field_type = field_spec.get("type", "attribute")
+
+            if field_type == "attribute":
+                attr = field_spec.get("attr")
+                transform = self._compile_transform(field_spec.get("transform"))
+
+                def add_attribute(obj: Any, data: Dict[str, Any], attr=attr, transform=transform,
+                                  field_name=field_name, required_attr=required_attr) -> None:
+                    if required_attr is not None and not hasattr(obj, required_attr):
+                        return
                     if hasattr(obj, attr):
                         value = getattr(obj, attr)
-                        if "transform" in field_spec:
-                            value = self._apply_transform(value, field_spec["transform"])
-                        data[field_name] = value
-                elif field_type == "literal":
-                    data[field_name] = field_spec.get("value")
-    
-    def _handle_preprocessing(self, obj: Any, handler_config: Dict[str, Any],
-                              lib_config: Dict[str, Any], context: Dict) -> None:
-        """Handle preprocessing steps"""
-        preprocessing = handler_config.get("preprocessing", {})
-        if not preprocessing:
-            return
-        
-        prep_type = preprocessing.get("type")
-        
-        if prep_type == "dataframe_columns":
-            # Handle DataFrame MultiIndex columns
-            columns_list = obj.columns.tolist()
-            if len(columns_list) > 0 and isinstance(columns_list[0], tuple):
-                export_df = obj.copy()
-                export_df.columns = [str(col) for col in export_df.columns]
-                context["_export_df"] = export_df
-            else:
-                context["_export_df"] = obj
-    
-    def _build_metadata(self, obj: Any, data: Dict[str, Any], handler_config: Dict[str, Any],
-                        lib_config: Dict[str, Any], context: Dict) -> Dict[str, Any]:
-        """Build metadata for the result"""
-        metadata_config = handler_config.get("metadata", {})
-        metadata = {}
-        
-        for key, spec in metadata_config.items():
+                        data[field_name] = transform(value) if transform is not None else value
+
+                compiled.append(add_attribute)
+            elif field_type == "literal":
+                value = field_spec.get("value")
+
+                def add_literal(obj: Any, data: Dict[str, Any], value=value,
+                                field_name=field_name, required_attr=required_attr) -> None:
+                    if required_attr is not None and not hasattr(obj, required_attr):
+                        return
+                    data[field_name] = value
+
+                compiled.append(add_literal)
+
+        return compiled
+
+    def _compile_processing(self, handler_config: Dict[str, Any],
+                            lib_config: Dict[str, Any]) -> Optional[Callable[[Any, Dict[str, Any]], None]]:
+        """Compile post-extraction processing configured by handler processing block."""
+        processing = handler_config.get("processing", {})
+        if not processing:
+            return None
+
+        if processing.get("type") == "image_thumbnail":
+            import io
+            import base64
+            thumb_size = tuple(lib_config.get(processing.get("size_config", "thumbnail_size"), [200, 200]))
+            img_format = lib_config.get(processing.get("format_config", "image_format"), "PNG")
+
+            def image_thumbnail(obj: Any, data: Dict[str, Any]) -> None:
+                try:
+                    thumb = obj.copy()
+                    thumb.thumbnail(thumb_size)
+                    buf = io.BytesIO()
+                    thumb.save(buf, format=img_format)
+                    data["thumbnail_base64"] = base64.b64encode(buf.getvalue()).decode('ascii')
+                except Exception:
+                    data["thumbnail_base64"] = None
+            return image_thumbnail
+
+        return None
+
+    def _compile_metadata(self, handler_config: Dict[str, Any],
+                          lib_config: Dict[str, Any]) -> Callable[[Any, Dict[str, Any], Dict], Dict[str, Any]]:
+        """
+        Compile the metadata block for the result.
+
+        "json_size" entries are not built here: the handler encodes the data
+        once, fills them in and keeps the text on the result for reuse. Their
+        keys are listed on the returned function as ``json_size_keys``.
+        """
+        builders: List[Tuple[str, Callable[[Any, Dict[str, Any], Dict], Any]]] = []
+        json_size_keys: List[str] = []
+
+        for key, spec in handler_config.get("metadata", {}).items():
             if isinstance(spec, str):
                 # Simple literal value
-                metadata[key] = spec
+                builders.append((key, lambda obj, data, context, v=spec: v))
             elif isinstance(spec, dict):
                 spec_type = spec.get("type")
                 if spec_type == "computed":
                     expression = spec.get("expression")
                     if expression == "json_size":
-                        metadata[key] = len(json.dumps(data).encode('utf-8'))
+                        json_size_keys.append(key)
+                        builders.append((key, lambda obj, data, context: None))  # keeps key order
                     else:
-                        metadata[key] = self._compute_expression(
-                            expression, obj, handler_config, lib_config, context
-                        )
+                        compute = self._compile_expression(expression, lib_config)
+                        builders.append((key, lambda obj, data, context, c=compute: c(obj, context)))
                 elif spec_type == "config":
-                    config_key = spec.get("key")
-                    value = lib_config.get(config_key)
+                    value = lib_config.get(spec.get("key"))
                     # Convert list to tuple for certain fields
                     if isinstance(value, list):
                         value = tuple(value)
-                    metadata[key] = value
+                    builders.append((key, lambda obj, data, context, v=value: v))
                 elif spec_type == "literal":
-                    metadata[key] = spec.get("value")
-        
-        return metadata
-    
+                    value = spec.get("value")
+                    builders.append((key, lambda obj, data, context, v=value: v))
+
+        def build_metadata(obj: Any, data: Dict[str, Any], context: Dict) -> Dict[str, Any]:
+            return {key: build(obj, data, context) for key, build in builders}
+
+        build_metadata.json_size_keys = tuple(json_size_keys)
+        return build_metadata
+
+    def compile_handler(self, type_name: str) -> Optional[Callable[[Any, Dict], Optional[SerializationResult]]]:
+        """
+        Compile the handler configuration of a type into a native closure.
+
+        Config resolution, lib_config merging, attribute path parsing and
+        expression/transform dispatch all happen here, once per type. The
+        returned closure only performs the attribute reads and computations.
+        Returns None if the type is not registered.
+        """
+        if type_name in self._compiled_handlers:
+            return self._compiled_handlers[type_name]
+
+        handler_config = self._get_handler_config(type_name)
+        if handler_config is None:
+            self._compiled_handlers[type_name] = None
+            return None
+
+        lib_config = self._get_lib_config(handler_config)
+        result_type = handler_config.get("result_type", "direct")
+
+        within_limits = self._compile_size_check(handler_config, lib_config)
+        preprocess = self._compile_preprocessing(handler_config)
+        make_resource_id = self._compile_resource_generation(handler_config)
+        field_extractors = self._compile_base_fields(handler_config, lib_config)
+        content_strategies = self._compile_content_extraction(handler_config, lib_config)
+        conditional_fields = self._compile_conditional_fields(handler_config, lib_config)
+        process = self._compile_processing(handler_config, lib_config)
+        build_metadata = self._compile_metadata(handler_config, lib_config)
+        json_size_keys = build_metadata.json_size_keys
+        # Only copy the caller's context when this handler writes into it
+        writes_context = preprocess is not None or make_resource_id is not None
+
+        def handler(obj: Any, context: Dict) -> Optional[SerializationResult]:
+            try:
+                # Check size limits
+                if within_limits is not None and not within_limits(obj):
+                    return None
+
+                local_context = dict(context) if writes_context else context
+                if preprocess is not None:
+                    preprocess(obj, local_context)
+                if make_resource_id is not None:
+                    local_context["_resource_id"] = make_resource_id()
+
+                data = {name: extract(obj, local_context) for name, extract in field_extractors}
+
+                # Content extraction (for HTTP responses): first successful strategy wins
+                for strategy in content_strategies:
+                    if "content" in data:
+                        break
+                    strategy(obj, data)
+
+                for add_field in conditional_fields:
+                    add_field(obj, data)
+
+                # Post-processing (e.g. image thumbnails)
+                if process is not None:
+                    process(obj, data)
+
+                metadata = build_metadata(obj, data, local_context)
+                encoded = None
+                if json_size_keys:
+                    encoded = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+                    size = len(encoded.encode('utf-8'))
+                    for key in json_size_keys:
+                        metadata[key] = size
+
+                return SerializationResult(
+                    type=result_type,
+                    data=data,
+                    metadata=metadata,
+                    encoded=encoded,
+                )
+            except Exception:
+                # Fallback to default handling
+                return None
+
+        handler.__doc__ = f"Handle {type_name} objects"
+        handler.__name__ = f"handle_{type_name.replace('.', '_')}"
+        self._compiled_handlers[type_name] = handler
+        return handler
+
     def handle(self, obj: Any, context: Dict, type_name: Optional[str] = None) -> Optional[SerializationResult]:
         """
         Universal handler function that processes objects based on JSON configuration.
-        
-        This is the core generic handler that reads configuration and applies
-        the appropriate serialization logic for any registered type.
-        
+
+        Looks up (compiling on first use) the native handler for the type and
+        applies it.
+
         Args:
             obj: The object to serialize
             context: Additional context for serialization
             type_name: Optional explicit type name. If not provided, will be inferred from obj.
-            
+
         Returns:
             SerializationResult if handled, None if type not registered or error occurred.
         """
         # Determine type name
         if type_name is None:
             type_name = f'{type(obj).__module__}.{type(obj).__name__}'
-        
-        handler_config = self._get_handler_config(type_name)
-        if handler_config is None:
-            return None
-        
-        lib_config = self._get_lib_config(handler_config)
-        result_type = handler_config.get("result_type", "direct")
-        
-        try:
-            # Check size limits
-            if not self._check_size_limits(obj, handler_config, lib_config):
-                return None
-            
-            # Initialize context for computed values
-            local_context = dict(context)
-            
-            # Handle preprocessing
-            self._handle_preprocessing(obj, handler_config, lib_config, local_context)
-            
-            # Generate resource ID if needed
-            resource_gen = handler_config.get("resource_generation", {})
-            if resource_gen:
-                import uuid
-                prefix = resource_gen.get("id_prefix", "res_")
-                length = resource_gen.get("id_length", 12)
-                resource_id = f"{prefix}{uuid.uuid4().hex[:length]}"
-                local_context["_resource_id"] = resource_id
-            
-            # Extract base fields
-            data = self._extract_base_fields(obj, handler_config, lib_config, local_context)
-            
-            # Handle content extraction (for HTTP responses)
-            self._handle_content_extraction(obj, data, handler_config, lib_config)
-            
-            # Handle conditional fields
-            self._handle_conditional_fields(obj, data, handler_config, lib_config)
-
-            # Handle post-processing (e.g. image thumbnails)
-            self._handle_processing(obj, data, handler_config, lib_config, local_context)
-            
-            # Build metadata
-            metadata = self._build_metadata(obj, data, handler_config, lib_config, local_context)
-            
-            return SerializationResult(
-                type=result_type,
-                data=data,
-                metadata=metadata
-            )
-        
-        except Exception as e:
-            # Fallback to default handling
+
+        handler = self.compile_handler(type_name)
+        if handler is None:
             return None
-    
+        return handler(obj, context)
+
     def create_type_handler(self, type_name: str) -> Callable[[Any, Dict], Optional[SerializationResult]]:
         """
         Create a handler function for a specific type.
-        
-        This allows creating handler functions dynamically based on configuration.
+
+        The handler is compiled from configuration immediately.
         """
+        compiled = self.compile_handler(type_name)
+        if compiled is not None:
+            return compiled
+
         def handler(obj: Any, context: Dict) -> Optional[SerializationResult]:
-            return self.handle(obj, context, type_name)
-        
+            return None
+
         handler.__doc__ = f"Handle {type_name} objects"
         handler.__name__ = f"handle_{type_name.replace('.', '_')}"
-        
+
         return handler
 
 
@@ -581,7 +772,8 @@ def create_handler_registry(config: Dict[str, Any]) -> Dict[str, Callable]:
     Create handler registry from configuration.
     
     This function automatically creates handlers for all types defined in
-    handlers_config.json. No code changes needed to add new types.
+    handlers_config.json and compiles each of them once, up front.
+    No code changes needed to add new types.
     
     Returns: {full_type_name: handler_function}
     """
@@ -0,0 +1,204 @@
+"""
+Memory accounting for the serializer's object store.
+
+``sys.getsizeof`` reports the size of an object's header only (about 100
+bytes for a multi-gigabyte DataFrame), so stored objects are sized with
+type-specific sizers instead: ``DataFrame.memory_usage(deep=True)``,
+``ndarray.nbytes`` and friends, a generic ``nbytes`` attribute, and finally a
+bounded walk over containers and instance attributes. Sizers are looked up by
+fully qualified type name along the MRO, so no optional library has to be
+imported, and more can be registered at runtime or through configuration.
+
+``GreedyDualSize`` implements the GreedyDual-Size replacement policy: every
+object gets the priority ``L + 1 / size`` when stored or accessed, the object
+with the lowest priority is evicted first, and ``L`` is raised to the evicted
+priority. Large objects therefore go first, and among objects of equal size
+the least recently used one does.
+"""
+
+import heapq
+import importlib
+import itertools
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+Sizer = Callable[[Any], int]
+
+# Bounds of the generic walk: containers longer than this are extrapolated
+# from a prefix, deeper nesting is counted shallowly.
+_MAX_WALK_ITEMS = 1000
+_MAX_WALK_DEPTH = 4
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+
+
+def _pandas_memory_usage(obj: Any) -> int:
+    usage = obj.memory_usage(deep=True)
+    return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+
+
+def _ndarray_nbytes(obj: Any) -> int:
+    # getsizeof includes the buffer only when the array owns its data
+    return max(sys.getsizeof(obj), int(obj.nbytes))
+
+
+def _tensor_nbytes(obj: Any) -> int:
+    return int(obj.element_size() * obj.nelement())
+
+
+def _image_nbytes(obj: Any) -> int:
+    return int(obj.width * obj.height * len(obj.getbands()))
+
+
+# pandas >= 3 reports its public classes under the top-level module ("pandas.DataFrame")
+DEFAULT_SIZERS: Dict[str, Sizer] = {
+    'pandas.core.frame.DataFrame': _pandas_memory_usage,
+    'pandas.core.series.Series': _pandas_memory_usage,
+    'pandas.core.indexes.base.Index': _pandas_memory_usage,
+    'pandas.DataFrame': _pandas_memory_usage,
+    'pandas.Series': _pandas_memory_usage,
+    'pandas.Index': _pandas_memory_usage,
+    'numpy.ndarray': _ndarray_nbytes,
+    'torch.Tensor': _tensor_nbytes,
+    'PIL.Image.Image': _image_nbytes,
+}
+
+
+def _load_sizer(spec: Union[str, Sizer]) -> Sizer:
+    """Resolve 'package.module:function' (or a callable) into a sizer"""
+    if callable(spec):
+        return spec
+    module_name, _, attr = spec.partition(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class SizerRegistry:
+    """Per-type deep sizers, resolved along the MRO and cached per type"""
+
+    def __init__(self, sizers: Optional[Dict[str, Union[str, Sizer]]] = None):
+        self._sizers: Dict[str, Sizer] = dict(DEFAULT_SIZERS)
+        self._cache: Dict[type, Optional[Sizer]] = {}
+        self._lock = threading.Lock()
+        for type_name, spec in (sizers or {}).items():
+            self.register(type_name, spec)
+
+    def register(self, type_or_name: Union[type, str], sizer: Union[str, Sizer]) -> None:
+        """Register a sizer for a type (or fully qualified type name) and its subclasses"""
+        if isinstance(type_or_name, type):
+            type_or_name = f"{type_or_name.__module__}.{type_or_name.__qualname__}"
+        with self._lock:
+            self._sizers[type_or_name] = _load_sizer(sizer)
+            self._cache.clear()
+
+    def _resolve(self, obj_type: type) -> Optional[Sizer]:
+        try:
+            return self._cache[obj_type]
+        except KeyError:
+            pass
+        sizer = None
+        for klass in getattr(obj_type, '__mro__', (obj_type,)):
+            sizer = self._sizers.get(f"{klass.__module__}.{klass.__qualname__}")
+            if sizer is not None:
+                break
+        self._cache[obj_type] = sizer
+        return sizer
+
+    def size_of(self, obj: Any) -> int:
+        """Deep size estimate of obj in bytes"""
+        try:
+            return self._walk(obj, 0, set())
+        except Exception:
+            try:
+                return sys.getsizeof(obj)
+            except Exception:
+                return 0
+
+    def _walk(self, obj: Any, depth: int, seen: set) -> int:
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+
+        sizer = self._resolve(type(obj))
+        if sizer is not None:
+            return int(sizer(obj))
+
+        size = sys.getsizeof(obj, 0)
+        if isinstance(obj, _ATOMIC_TYPES):
+            return size
+
+        nbytes = getattr(obj, 'nbytes', None)
+        if isinstance(nbytes, int) and not isinstance(nbytes, bool):
+            return max(size, nbytes)
+
+        if depth >= _MAX_WALK_DEPTH:
+            return size
+
+        if isinstance(obj, dict):
+            children: Iterable[Any] = itertools.chain.from_iterable(obj.items())
+            total = 2 * len(obj)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            children = obj
+            total = len(obj)
+        else:
+            try:
+                attrs = object.__getattribute__(obj, '__dict__')
+            except Exception:
+                return size
+            return size + self._walk(attrs, depth + 1, seen)
+
+        walked = 0
+        child_size = 0
+        for child in itertools.islice(children, 2 * _MAX_WALK_ITEMS):
+            child_size += self._walk(child, depth + 1, seen)
+            walked += 1
+        if walked and walked < total:
+            child_size = child_size * total // walked
+        return size + child_size
+
+
+class GreedyDualSize:
+    """GreedyDual-Size priorities (cost 1) over a set of keys, with lazy heap deletion"""
+
+    def __init__(self):
+        self._inflation = 0.0
+        self._priority: Dict[str, float] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+
+    def touch(self, key: str, size: int) -> None:
+        """Insert or refresh a key after it was stored or accessed"""
+        priority = self._inflation + 1.0 / max(1, size)
+        self._priority[key] = priority
+        heapq.heappush(self._heap, (priority, next(self._counter), key))
+        if len(self._heap) > 2 * len(self._priority) + 64:
+            self._compact()
+
+    def remove(self, key: str) -> None:
+        self._priority.pop(key, None)
+
+    def pop_victim(self, exclude: Optional[str] = None) -> Optional[str]:
+        """Remove and return the key with the lowest priority"""
+        skipped = []
+        victim = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            priority, _, key = entry
+            if self._priority.get(key) != priority:
+                continue  # stale entry
+            if key == exclude:
+                skipped.append(entry)
+                continue
+            del self._priority[key]
+            self._inflation = priority
+            victim = key
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return victim
+
+    def _compact(self) -> None:
+        self._heap = [entry for entry in self._heap if self._priority.get(entry[2]) == entry[0]]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._priority)
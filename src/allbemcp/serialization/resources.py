@@ -0,0 +1,372 @@
+"""
+Size-bounded resource store for the serialization engine.
+
+Resources (file-like results, exported buffers) are kept in memory while small
+and streamed to spill files in a temporary directory once they exceed
+``spill_threshold``; spilled payloads are served through ``mmap`` so reads do
+not load the whole file. The store enforces a total byte budget (payloads plus
+cached base64 encodings) with least-recently-used eviction, supports ranged
+reads, and caches each resource's base64 encoding after the first request.
+"""
+
+import base64
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Chunk size used when streaming a file-like object into the store (multiple of 3
+# so base64 of consecutive chunks concatenates cleanly).
+READ_CHUNK_SIZE = 3 * 64 * 1024
+
+
+def detect_content_type(head: bytes, is_text: bool) -> str:
+    """Guess a content type from the first bytes of a payload"""
+    if is_text:
+        return 'text/plain'
+    if head.startswith(b'\x89PNG'):
+        return 'image/png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head.startswith(b'%PDF'):
+        return 'application/pdf'
+    return 'application/octet-stream'
+
+
+@dataclass
+class ResourceEntry:
+    """A stored resource: in-memory bytes or a spill file mapped on demand"""
+    resource_id: str
+    content_type: str
+    size: int
+    is_text: bool = False
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    base64_size: int = 0
+    _base64: Optional[str] = field(default=None, repr=False)
+    _base64_path: Optional[str] = field(default=None, repr=False)
+    _mmaps: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def spilled(self) -> bool:
+        return self.path is not None
+
+    @property
+    def cost(self) -> int:
+        """Bytes charged against the store budget"""
+        return self.size + self.base64_size
+
+    def _map(self, path: str) -> Any:
+        mapped = self._mmaps.get(path)
+        if mapped is None:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmaps[path] = mapped
+        return mapped
+
+    def view(self) -> memoryview:
+        """Zero-copy view of the payload"""
+        if self.data is not None:
+            return memoryview(self.data)
+        if self.path is None or self.size == 0:
+            return memoryview(b'')
+        return memoryview(self._map(self.path))
+
+    @property
+    def has_base64(self) -> bool:
+        return self._base64 is not None or self._base64_path is not None
+
+    def base64_slice(self, b64_start: int, b64_end: int) -> str:
+        """Part of the cached encoding; the cached string itself when it is all of it"""
+        if self._base64 is not None:
+            if b64_start == 0 and b64_end >= len(self._base64):
+                return self._base64
+            return self._base64[b64_start:b64_end]
+        if self._base64_path is None or b64_start >= b64_end:
+            return ''
+        with memoryview(self._map(self._base64_path)) as cached:
+            return str(cached[b64_start:b64_end], 'ascii')
+
+    def release(self) -> None:
+        for mapped in self._mmaps.values():
+            try:
+                mapped.close()
+            except Exception:
+                pass
+        self._mmaps.clear()
+        for path in (self.path, self._base64_path):
+            if path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        self.data = None
+        self._base64 = None
+
+
+class ResourceStore:
+    """Byte-budgeted LRU store of resources with spill-to-disk and cached base64"""
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        spill_threshold: int = 1024 * 1024,
+        spill_dir: Optional[str] = None,
+    ):
+        self.max_bytes = max(0, int(max_bytes))
+        self.spill_threshold = max(0, int(spill_threshold))
+        self._spill_root = spill_dir
+        self._spill_dir: Optional[str] = None
+        self._entries: "OrderedDict[str, ResourceEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _get_spill_dir(self) -> str:
+        if self._spill_dir is None:
+            if self._spill_root:
+                os.makedirs(self._spill_root, exist_ok=True)
+            self._spill_dir = tempfile.mkdtemp(prefix='allbemcp-resources-', dir=self._spill_root)
+        return self._spill_dir
+
+    def put_stream(self, resource_id: str, stream: Any) -> ResourceEntry:
+        """Read a file-like object chunk by chunk; spill to disk past the threshold."""
+        chunks: List[bytes] = []
+        buffered = 0
+        spill_file = None
+        spill_path = None
+        is_text = False
+        head = b''
+
+        try:
+            while True:
+                chunk = stream.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if isinstance(chunk, str):
+                    is_text = True
+                    chunk = chunk.encode('utf-8')
+                if not head:
+                    head = chunk[:16]
+
+                if spill_file is not None:
+                    spill_file.write(chunk)
+                    buffered += len(chunk)
+                    continue
+
+                chunks.append(chunk)
+                buffered += len(chunk)
+                if self.spill_threshold and buffered > self.spill_threshold:
+                    fd, spill_path = tempfile.mkstemp(prefix=f'{resource_id}-', dir=self._get_spill_dir())
+                    spill_file = os.fdopen(fd, 'wb')
+                    for pending in chunks:
+                        spill_file.write(pending)
+                    chunks = []
+        except Exception:
+            if spill_file is not None:
+                spill_file.close()
+                os.remove(spill_path)
+            raise
+
+        if spill_file is not None:
+            spill_file.close()
+            entry = ResourceEntry(
+                resource_id=resource_id,
+                content_type=detect_content_type(head, is_text),
+                size=buffered,
+                is_text=is_text,
+                path=spill_path,
+            )
+        else:
+            entry = ResourceEntry(
+                resource_id=resource_id,
+                content_type=detect_content_type(head, is_text),
+                size=buffered,
+                is_text=is_text,
+                data=b''.join(chunks),
+            )
+        self._add(entry)
+        return entry
+
+    def put_bytes(self, resource_id: str, data: bytes, content_type: str, is_text: bool = False) -> ResourceEntry:
+        """Store an in-memory payload (spilled if larger than the threshold)."""
+        if self.spill_threshold and len(data) > self.spill_threshold:
+            fd, spill_path = tempfile.mkstemp(prefix=f'{resource_id}-', dir=self._get_spill_dir())
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            entry = ResourceEntry(resource_id, content_type, len(data), is_text=is_text, path=spill_path)
+        else:
+            entry = ResourceEntry(resource_id, content_type, len(data), is_text=is_text, data=bytes(data))
+        self._add(entry)
+        return entry
+
+    def put_buffers(self, resource_id: str, buffers: List[Any], content_type: str) -> ResourceEntry:
+        """Store the concatenation of buffer-protocol objects, writing large ones straight to a spill file."""
+        size = sum(memoryview(buf).nbytes for buf in buffers)
+        if not (self.spill_threshold and size > self.spill_threshold):
+            return self.put_bytes(resource_id, b''.join(buffers), content_type)
+
+        fd, spill_path = tempfile.mkstemp(prefix=f'{resource_id}-', dir=self._get_spill_dir())
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for buf in buffers:
+                    f.write(buf)
+        except Exception:
+            os.remove(spill_path)
+            raise
+        entry = ResourceEntry(resource_id, content_type, size, path=spill_path)
+        self._add(entry)
+        return entry
+
+    def _add(self, entry: ResourceEntry) -> None:
+        with self._lock:
+            previous = self._entries.pop(entry.resource_id, None)
+            if previous is not None:
+                self._total_bytes -= previous.cost
+                previous.release()
+            self._entries[entry.resource_id] = entry
+            self._total_bytes += entry.cost
+            self._evict_locked(keep=entry.resource_id)
+
+    def _evict_locked(self, keep: Optional[str] = None) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest_id = next(iter(self._entries))
+            if oldest_id == keep:
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(oldest_id)
+                continue
+            self._remove_locked(oldest_id)
+            self.evictions += 1
+
+    def _remove_locked(self, resource_id: str) -> bool:
+        entry = self._entries.pop(resource_id, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry.cost
+        entry.release()
+        return True
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get(self, resource_id: str) -> Optional[ResourceEntry]:
+        with self._lock:
+            entry = self._entries.get(resource_id)
+            if entry is not None:
+                self._entries.move_to_end(resource_id)
+            return entry
+
+    def _clamp(self, entry: ResourceEntry, offset: int, length: Optional[int]) -> tuple:
+        start = min(max(0, int(offset)), entry.size)
+        end = entry.size if length is None else min(entry.size, start + max(0, int(length)))
+        return start, end
+
+    def read(self, resource_id: str, offset: int = 0, length: Optional[int] = None) -> Optional[bytes]:
+        """Read a byte range of a resource (whole payload by default)."""
+        with self._lock:
+            entry = self.get(resource_id)
+            if entry is None:
+                return None
+            start, end = self._clamp(entry, offset, length)
+            view = entry.view()
+            try:
+                return bytes(view[start:end])
+            finally:
+                view.release()
+
+    def read_base64(self, resource_id: str, offset: int = 0, length: Optional[int] = None) -> Optional[str]:
+        """Base64 of a byte range, served from the per-resource encoding cache when aligned."""
+        with self._lock:
+            entry = self.get(resource_id)
+            if entry is None:
+                return None
+            start, end = self._clamp(entry, offset, length)
+            # Ranges starting on a 3-byte boundary (and ending on one, or at EOF) map
+            # directly onto the cached encoding; anything else is encoded on its own.
+            if start % 3 == 0 and (end % 3 == 0 or end == entry.size) and self._ensure_base64_locked(entry):
+                return entry.base64_slice(start // 3 * 4, -(-end // 3) * 4)
+            view = entry.view()
+            try:
+                return base64.b64encode(view[start:end]).decode('ascii')
+            finally:
+                view.release()
+
+    def _ensure_base64_locked(self, entry: ResourceEntry) -> bool:
+        """Build the entry's encoding cache if it fits the budget; True when it is available"""
+        if entry.has_base64:
+            return True
+
+        encoded_size = -(-entry.size // 3) * 4
+        # Never let a cached encoding push everything else out of the store.
+        if entry.cost + encoded_size > self.max_bytes:
+            return False
+
+        if entry.spilled:
+            fd, b64_path = tempfile.mkstemp(prefix=f'{entry.resource_id}-', suffix='.b64', dir=self._get_spill_dir())
+            view = entry.view()
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for pos in range(0, entry.size, READ_CHUNK_SIZE):
+                        f.write(base64.b64encode(view[pos:pos + READ_CHUNK_SIZE]))
+            finally:
+                view.release()
+            entry._base64_path = b64_path
+        else:
+            entry._base64 = base64.b64encode(entry.data or b'').decode('ascii')
+
+        entry.base64_size = encoded_size
+        self._total_bytes += encoded_size
+        self._evict_locked(keep=entry.resource_id)
+        return True
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def list(self) -> List[ResourceEntry]:
+        with self._lock:
+            return list(self._entries.values())
+
+    def remove(self, resource_id: str) -> bool:
+        with self._lock:
+            return self._remove_locked(resource_id)
+
+    def expire(self, max_age_seconds: float) -> int:
+        """Remove resources older than max_age_seconds"""
+        now = time.time()
+        with self._lock:
+            expired = [rid for rid, entry in self._entries.items() if now - entry.created_at > max_age_seconds]
+            for resource_id in expired:
+                self._remove_locked(resource_id)
+        return len(expired)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __contains__(self, resource_id: str) -> bool:
+        return resource_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        """Drop all resources and delete the spill directory"""
+        with self._lock:
+            for resource_id in list(self._entries):
+                self._remove_locked(resource_id)
+            if self._spill_dir is not None:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
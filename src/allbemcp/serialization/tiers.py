@@ -0,0 +1,200 @@
+"""
+Disk tier of the serializer's object store.
+
+Objects that are evicted from memory or sit idle are written here and loaded
+back transparently the next time they are used. Each object is stored as one
+data file plus a small JSON record holding its codec and metadata; the record
+is written last, so a directory scan only ever sees complete entries. Codecs:
+
+- npy:     numpy arrays without Python objects (header plus raw buffer)
+- parquet: pandas DataFrames, when pyarrow is installed
+- pickle:  everything else (highest protocol)
+
+A type-specific codec that fails falls back to pickle; an object that cannot
+be pickled either is reported back to the caller as not spillable.
+
+With ``persistent=True`` the directory is kept on close and ``restore()``
+returns the records found there, so object ids survive a restart.
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from allbemcp.serialization.arrays import is_ndarray, npy_buffers
+
+RECORD_SUFFIX = '.json'
+CODEC_SUFFIXES = {'npy': '.npy', 'parquet': '.parquet', 'pickle': '.pkl'}
+
+
+def _is_dataframe(obj: Any) -> bool:
+    obj_type = type(obj)
+    return obj_type.__name__ == 'DataFrame' and obj_type.__module__.split('.', 1)[0] == 'pandas'
+
+
+class DiskObjectTier:
+    """Spilled objects on local disk, keyed by object id"""
+
+    def __init__(self, directory: Optional[str] = None, persistent: bool = False):
+        self.persistent = persistent
+        self._configured_dir = directory
+        self._dir: Optional[str] = None
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._parquet = importlib.util.find_spec('pyarrow') is not None
+
+    def _directory(self) -> str:
+        if self._dir is None:
+            if self._configured_dir:
+                os.makedirs(self._configured_dir, exist_ok=True)
+                self._dir = self._configured_dir
+            else:
+                self._dir = tempfile.mkdtemp(prefix='allbemcp-objects-')
+        return self._dir
+
+    def _path(self, object_id: str, suffix: str) -> str:
+        return os.path.join(self._directory(), f"{object_id}{suffix}")
+
+    def _write_data(self, path: str, obj: Any) -> str:
+        """Write obj with the best codec for its type and return the codec name"""
+        if is_ndarray(obj):
+            buffers = npy_buffers(obj)
+            if buffers is not None:
+                with open(path + CODEC_SUFFIXES['npy'], 'wb') as handle:
+                    for buffer in buffers:
+                        handle.write(buffer)
+                return 'npy'
+        if self._parquet and _is_dataframe(obj):
+            try:
+                obj.to_parquet(path + CODEC_SUFFIXES['parquet'])
+                return 'parquet'
+            except Exception:
+                # e.g. non-string column labels; pickle keeps them
+                self._unlink(path + CODEC_SUFFIXES['parquet'])
+        with open(path + CODEC_SUFFIXES['pickle'], 'wb') as handle:
+            pickle.dump(obj, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        return 'pickle'
+
+    def spill(self, object_id: str, obj: Any, metadata: Dict[str, Any], last_access: Optional[float] = None) -> Optional[int]:
+        """
+        Write obj to disk and return the number of bytes written, or None if it
+        cannot be serialized (nothing is left behind in that case).
+        """
+        base = self._path(object_id, '')
+        try:
+            codec = self._write_data(base, obj)
+        except Exception:
+            for suffix in CODEC_SUFFIXES.values():
+                self._unlink(base + suffix)
+            return None
+
+        data_path = base + CODEC_SUFFIXES[codec]
+        record = {
+            'object_id': object_id,
+            'codec': codec,
+            'file': os.path.basename(data_path),
+            'bytes': os.path.getsize(data_path),
+            'spilled_at': time.time(),
+            'last_access': last_access if last_access is not None else time.time(),
+            'metadata': metadata,
+        }
+        record_path = self._path(object_id, RECORD_SUFFIX)
+        tmp_path = record_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(record, handle, default=str)
+        os.replace(tmp_path, record_path)
+
+        with self._lock:
+            previous = self._records.get(object_id)
+            self._records[object_id] = record
+        if previous is not None and previous['file'] != record['file']:
+            self._unlink(os.path.join(self._directory(), previous['file']))
+        return record['bytes']
+
+    def load(self, object_id: str) -> Any:
+        """Read a spilled object back; raises KeyError if it is not on disk"""
+        with self._lock:
+            record = self._records[object_id]
+        path = os.path.join(self._directory(), record['file'])
+        codec = record['codec']
+        if codec == 'npy':
+            return importlib.import_module('numpy').load(path, allow_pickle=False)
+        if codec == 'parquet':
+            return importlib.import_module('pandas').read_parquet(path)
+        with open(path, 'rb') as handle:
+            return pickle.load(handle)
+
+    def discard(self, object_id: str) -> bool:
+        with self._lock:
+            record = self._records.pop(object_id, None)
+        if record is None:
+            return False
+        self._unlink(self._path(object_id, RECORD_SUFFIX))
+        self._unlink(os.path.join(self._directory(), record['file']))
+        return True
+
+    def restore(self) -> Dict[str, Dict[str, Any]]:
+        """Load the records of a persistent directory left by a previous run"""
+        directory = self._configured_dir
+        if not directory or not os.path.isdir(directory):
+            return {}
+        restored: Dict[str, Dict[str, Any]] = {}
+        for name in os.listdir(directory):
+            if not name.endswith(RECORD_SUFFIX):
+                continue
+            try:
+                with open(os.path.join(directory, name), encoding='utf-8') as handle:
+                    record = json.load(handle)
+                if os.path.exists(os.path.join(directory, record['file'])):
+                    restored[record['object_id']] = record
+            except (OSError, ValueError, KeyError):
+                continue
+        with self._lock:
+            self._records.update(restored)
+        return restored
+
+    def records(self) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            return list(self._records.items())
+
+    def __contains__(self, object_id: str) -> bool:
+        with self._lock:
+            return object_id in self._records
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(record['bytes'] for record in self._records.values())
+
+    def close(self) -> None:
+        """Delete everything written by this tier unless it is persistent"""
+        if self.persistent:
+            return
+        with self._lock:
+            object_ids = list(self._records)
+        if self._configured_dir:
+            for object_id in object_ids:
+                self.discard(object_id)
+        elif self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            with self._lock:
+                self._records.clear()
+            self._dir = None
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -0,0 +1,57 @@
+import os
+
+from allbemcp import analyzer_cache
+from allbemcp.analyzer_cache import CACHE_DB_NAME, AnalysisCache, IncrementalCache
+
+
+def _touch_module(path, source="def f():\n    return 1\n"):
+    path.write_text(source)
+    return str(path)
+
+
+def test_caches_share_one_sqlite_file_across_libraries(tmp_path):
+    cache_dir = tmp_path / "cache"
+    specs = AnalysisCache(str(cache_dir))
+    modules = IncrementalCache(str(cache_dir))
+
+    key_a = specs.make_cache_key("liba", "sig", "fp")
+    key_b = specs.make_cache_key("libb", "sig", "fp")
+    specs.save(key_a, {"info": {"title": "a"}})
+    specs.save(key_b, {"info": {"title": "é"}})
+
+    module_file = _touch_module(tmp_path / "mod.py")
+    modules.save_module_cache("liba.mod", module_file, "sig", [{"name": "f"}], [])
+    modules.save_module_cache("liba.mod", module_file, "other-sig", [{"name": "g"}], [])
+
+    assert specs.load(key_a) == {"info": {"title": "a"}}
+    assert specs.load(key_b) == {"info": {"title": "é"}}
+    assert specs.load("missing") is None
+    assert modules.get_module_cache("liba.mod", module_file, "sig")["functions"] == [{"name": "f"}]
+    assert modules.get_module_cache("liba.mod", module_file, "other-sig")["functions"] == [{"name": "g"}]
+    assert sorted(p.name for p in cache_dir.iterdir() if not p.name.startswith(CACHE_DB_NAME + "-")) == [CACHE_DB_NAME]
+
+
+def test_module_record_is_invalidated_when_source_changes(tmp_path):
+    cache = IncrementalCache(str(tmp_path / "cache"))
+    module_file = _touch_module(tmp_path / "mod.py")
+    cache.save_module_cache("pkg.mod", module_file, "sig", [{"name": "f"}], [{"qualname": "x", "reason": "y"}])
+
+    cached = cache.get_module_cache("pkg.mod", module_file, "sig")
+    assert cached["skipped"] == [{"qualname": "x", "reason": "y"}]
+
+    _touch_module(tmp_path / "mod.py", "def f():\n    return 22\n")
+    stat = os.stat(module_file)
+    os.utime(module_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get_module_cache("pkg.mod", module_file, "sig") is None
+
+
+def test_json_files_are_used_without_sqlite(tmp_path, monkeypatch):
+    monkeypatch.setattr(analyzer_cache, "sqlite3", None)
+    cache = IncrementalCache(str(tmp_path / "cache"))
+    module_file = _touch_module(tmp_path / "mod.py")
+
+    cache.save_module_cache("pkg.mod", module_file, "sig", [{"name": "f"}], [])
+
+    assert cache.store is None
+    assert cache.get_module_cache("pkg.mod", module_file, "sig")["functions"] == [{"name": "f"}]
+    assert len(list((tmp_path / "cache" / "modules").glob("*.json"))) == 1
@@ -0,0 +1,87 @@
+import pytest
+
+from allbemcp import analyzer_docstrings
+from allbemcp.analyzer import APIAnalyzer
+from allbemcp.analyzer_docstrings import DocstringCache, ParsedDocstring, has_section_markers
+from allbemcp.analyzer_types import QualityMetrics
+
+docstring_parser = pytest.importorskip("docstring_parser")
+
+GOOGLE_DOC = """Resize an image.
+
+Longer explanation
+over two lines.
+
+Args:
+    image (str): Path of the image.
+    mode: Resampling filter. One of: 'nearest', 'bilinear'
+    scale (float, optional): Factor {'half', 'double'}
+
+Returns:
+    bytes: The encoded image.
+"""
+
+NUMPY_DOC = """Sum of values.
+
+Parameters
+----------
+values : list of float
+    The values.
+"""
+
+
+@pytest.mark.parametrize("doc", [
+    "Single line ",
+    "Summary.\n\n    Indented details\n    on two lines.\n",
+    "Summary\nno blank line\n\nthen a paragraph. Note: inline colon.",
+    GOOGLE_DOC,
+    NUMPY_DOC,
+    "Compute it.\n\n:param x: the input\n:returns: the output",
+])
+def test_parse_matches_docstring_parser(doc):
+    expected = docstring_parser.parse(doc)
+    parsed = DocstringCache().parse(doc)
+
+    assert parsed.short_description == expected.short_description
+    assert parsed.long_description == expected.long_description
+    assert [(p.arg_name, p.type_name, p.description, p.is_optional) for p in parsed.params] == [
+        (p.arg_name, p.type_name, p.description, p.is_optional) for p in expected.params
+    ]
+    assert bool(parsed.returns) == bool(expected.returns)
+
+
+def test_plain_docstrings_skip_the_parser_and_repeats_hit_the_cache(monkeypatch):
+    calls = []
+    real_parse = docstring_parser.parse
+    monkeypatch.setattr(analyzer_docstrings.docstring_parser, "parse", lambda doc: calls.append(doc) or real_parse(doc))
+    cache = DocstringCache()
+
+    assert not has_section_markers("Summary.\n\nDetails: none.")
+    assert has_section_markers(GOOGLE_DOC) and has_section_markers(NUMPY_DOC)
+
+    cache.parse("Summary.\n\nDetails: none.")
+    first = cache.parse(GOOGLE_DOC)
+    assert cache.parse(GOOGLE_DOC) is first
+    assert calls == [GOOGLE_DOC]
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 2, "plain": 1}
+    assert [p.enums for p in first.params] == [None, ["nearest", "bilinear"], ["half", "double"]]
+
+
+def test_parsed_docstring_is_shared_with_scoring_and_survives_the_cache_round_trip(monkeypatch):
+    def resize(image: str, mode: str = "nearest", scale: float = 1.0) -> bytes:
+        return b""
+
+    resize.__doc__ = GOOGLE_DOC
+    analyzer = APIAnalyzer("json", enable_analysis_cache=False)
+    info = analyzer._extract_function("resize", resize, __import__("json"))
+
+    assert info.parsed_doc is not None
+    assert info.parameters[1]["schema"]["enum"] == ["nearest", "bilinear"]
+
+    monkeypatch.setattr(analyzer_docstrings.docstring_parser, "parse", None)
+    assert QualityMetrics.has_good_documentation(info) == (True, 1.0)
+
+    restored = analyzer._deserialize_function_info_from_cache(analyzer._serialize_function_info_for_cache(info))
+    assert isinstance(restored.parsed_doc, ParsedDocstring)
+    assert restored.parsed_doc == info.parsed_doc
+    assert QualityMetrics.has_good_documentation(restored) == (True, 1.0)
@@ -0,0 +1,94 @@
+import os
+import types
+
+from allbemcp.analyzer_fingerprint import LibraryFingerprinter
+
+
+def _package(tmp_path, name="fppkg"):
+    root = tmp_path / name
+    (root / "sub" / "deep").mkdir(parents=True)
+    files = {
+        "__init__.py": "",
+        "a.py": "def a():\n    return 1\n",
+        "sub/__init__.py": "",
+        "sub/leaf.py": "def leaf():\n    return 1\n",
+        "sub/deep/__init__.py": "",
+        "sub/deep/x.py": "def x():\n    return 1\n",
+    }
+    for relpath, source in files.items():
+        (root / relpath).write_text(source)
+    module = types.ModuleType(name)
+    module.__path__ = [str(root)]
+    return root, module
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000))
+
+
+def test_merkle_fingerprint_tracks_leaf_changes_within_depth(tmp_path):
+    root, module = _package(tmp_path)
+    fingerprinter = LibraryFingerprinter("fppkg", max_depth=2, cache_dir=str(tmp_path / "cache"))
+
+    first = fingerprinter.compute(module)
+    assert first.changed_modules is None
+    assert sorted(first.files) == [
+        "fppkg/__init__.py", "fppkg/a.py", "fppkg/sub/__init__.py", "fppkg/sub/deep/__init__.py", "fppkg/sub/leaf.py",
+    ]
+
+    (root / "sub" / "leaf.py").write_text("def leaf():\n    return 2\n")
+    _bump_mtime(root / "sub" / "leaf.py")
+    second = fingerprinter.compute(module)
+    assert second.root_hash != first.root_hash
+    assert second.changed_modules == ["fppkg.sub.leaf"]
+    assert second.nodes["fppkg/sub"] != first.nodes["fppkg/sub"]
+    assert second.module_hashes[str((root / "a.py").resolve())] == first.module_hashes[str((root / "a.py").resolve())]
+
+    # A touched-but-identical file and a module beyond max_depth leave the fingerprint alone.
+    _bump_mtime(root / "a.py")
+    (root / "sub" / "deep" / "x.py").write_text("def x():\n    return 3\n")
+    third = LibraryFingerprinter("fppkg", max_depth=2, cache_dir=str(tmp_path / "cache")).compute(module)
+    assert third.root_hash == second.root_hash
+    assert third.changed_modules == []
+
+
+def test_dist_record_hashes_are_used_when_sizes_match(tmp_path, monkeypatch):
+    root, module = _package(tmp_path, "recpkg")
+    dist_info = tmp_path / "recpkg-1.0.dist-info"
+    dist_info.mkdir()
+    size = (root / "a.py").stat().st_size
+    (dist_info / "RECORD").write_text(
+        f"recpkg/a.py,sha256=abc,{size}\nrecpkg/sub/leaf.py,sha256=stale,1\n"
+    )
+    hashed = []
+    fingerprinter = LibraryFingerprinter("recpkg", max_depth=2)
+    original = fingerprinter._hash_contents
+    monkeypatch.setattr(fingerprinter, "_hash_contents", lambda path: hashed.append(path.name) or original(path))
+
+    fingerprint = fingerprinter.compute(module)
+
+    assert fingerprint.files["recpkg/a.py"]["hash"] == "record:sha256=abc"
+    assert fingerprint.files["recpkg/sub/leaf.py"]["hash"].startswith("blake2b:")
+    assert "a.py" not in hashed and "leaf.py" in hashed
+
+
+def test_same_size_edits_after_install_are_not_hidden_by_dist_records(tmp_path):
+    root, module = _package(tmp_path, "editpkg")
+    dist_info = tmp_path / "editpkg-1.0.dist-info"
+    dist_info.mkdir()
+    size = (root / "a.py").stat().st_size
+    (dist_info / "RECORD").write_text(f"editpkg/a.py,sha256=abc,{size}\n")
+    fingerprinter = LibraryFingerprinter("editpkg", max_depth=2, cache_dir=str(tmp_path / "cache"))
+    first = fingerprinter.compute(module)
+    assert first.files["editpkg/a.py"]["hash"] == "record:sha256=abc"
+
+    # Flip a constant: same size, newer than RECORD
+    (root / "a.py").write_text("def a():\n    return 2\n")
+    assert (root / "a.py").stat().st_size == size
+    _bump_mtime(root / "a.py")
+    second = fingerprinter.compute(module)
+
+    assert second.files["editpkg/a.py"]["hash"].startswith("blake2b:")
+    assert second.root_hash != first.root_hash
+    assert second.changed_modules == ["editpkg.a"]
@@ -0,0 +1,239 @@
+import os
+import py_compile
+import sys
+import textwrap
+
+from allbemcp import analyzer as analyzer_module
+from allbemcp.analyzer import APIAnalyzer
+
+_MODULE_TEMPLATE = '''
+"""Synthetic module {index}."""
+
+
+def scale_{index}(value: float, factor: float = 2.0) -> float:
+    """Scale a value.
+
+    Args:
+        value: Input value.
+        factor: Multiplier.
+
+    Returns:
+        The scaled value.
+    """
+    return value * factor
+
+
+def describe_{index}(name: str) -> "Report{index}":
+    """Build a report object for a name.
+
+    Args:
+        name: Report name.
+    """
+    return Report{index}(name)
+
+
+class Report{index}:
+    """A report."""
+
+    def __init__(self, name: str):
+        """Create a report.
+
+        Args:
+            name: Report name.
+        """
+        self.name = name
+
+    @classmethod
+    def empty(cls) -> "Report{index}":
+        """Create an empty report."""
+        return cls("")
+'''
+
+
+def _write_package(root, name):
+    package = root / name
+    (package / "sub").mkdir(parents=True)
+    (package / "__init__.py").write_text('"""Synthetic package."""\n')
+    (package / "sub" / "__init__.py").write_text("")
+    for index in range(4):
+        (package / f"mod{index}.py").write_text(textwrap.dedent(_MODULE_TEMPLATE.format(index=index)))
+        (package / "sub" / f"leaf{index}.py").write_text(textwrap.dedent(_MODULE_TEMPLATE.format(index=index + 10)))
+
+
+def _scan(name, **kwargs):
+    analyzer = APIAnalyzer(name, enable_analysis_cache=False, enable_quality_filter=False, **kwargs)
+    try:
+        analyzer.analyze()
+    finally:
+        if analyzer._import_executor is not None:
+            analyzer._import_executor.shutdown(wait=False)
+    return analyzer
+
+
+def test_parallel_scan_matches_serial_scan(tmp_path, monkeypatch):
+    _write_package(tmp_path, "synthpkg_scan")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # Force the worker-process AST path even for this small package.
+    monkeypatch.setattr(APIAnalyzer, "AST_PROCESS_MIN_FILES", 1)
+
+    serial = _scan("synthpkg_scan", enable_parallel_scan=False)
+    parallel = _scan("synthpkg_scan", parallel_scan_workers=3, ast_process_workers=2)
+
+    assert parallel.enable_parallel_extraction and not serial.enable_parallel_extraction
+    assert [f.qualname for f in serial.functions]
+    assert [f.qualname for f in parallel.functions] == [f.qualname for f in serial.functions]
+    assert [f.returns_object for f in parallel.functions] == [f.returns_object for f in serial.functions]
+    assert parallel.analyzed == serial.analyzed
+    assert parallel._ast_return_index_cache == serial._ast_return_index_cache
+
+
+def test_ast_worker_processes_are_opt_in(monkeypatch):
+    pools = []
+    monkeypatch.setattr(APIAnalyzer, "AST_PROCESS_MIN_FILES", 1)
+    monkeypatch.setattr(analyzer_module, "ProcessPoolExecutor", lambda *args, **kwargs: pools.append(kwargs))
+    analyzer = APIAnalyzer("json", enable_analysis_cache=False)
+
+    assert analyzer.ast_process_workers == 0
+    # Threaded extraction only pays off together with the AST workers
+    assert not analyzer.enable_parallel_extraction
+    assert APIAnalyzer("json", ast_process_workers=2, enable_analysis_cache=False).enable_parallel_extraction
+    assert analyzer._map_in_ast_workers(abs, [1, -2, 3]) == [1, 2, 3]
+    assert pools == []
+
+
+def test_primitive_functions_are_marked_as_memoization_candidates(tmp_path, monkeypatch):
+    _write_package(tmp_path, "synthpkg_pure")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    analyzer = _scan("synthpkg_pure", enable_parallel_scan=False)
+    hints = {f.qualname: analyzer._build_operation(f)["x-function"]["pure_candidate"] for f in analyzer.functions}
+
+    assert hints["synthpkg_pure.mod0.scale_0"] is True
+    assert hints["synthpkg_pure.mod0.describe_0"] is False
+    assert not any(pure for qualname, pure in hints.items() if ".Report" in qualname)
+
+
+def _forget_package(name):
+    for module_name in [m for m in sys.modules if m == name or m.startswith(name + ".")]:
+        del sys.modules[module_name]
+
+
+def test_incremental_rescan_reimports_only_changed_modules(tmp_path, monkeypatch):
+    _write_package(tmp_path, "synthpkg_inc")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cache_dir = str(tmp_path / "cache")
+
+    def run():
+        analyzer = APIAnalyzer(
+            "synthpkg_inc", cache_dir=cache_dir, incremental_rescan=True, enable_parallel_scan=False
+        )
+        return analyzer, analyzer.analyze()
+
+    def full_scan():
+        return APIAnalyzer("synthpkg_inc", enable_analysis_cache=False, enable_parallel_scan=False).analyze()
+
+    first, first_spec = run()
+    assert first.rescan_stats["modules_rescanned"] == first.rescan_stats["modules_discovered"] == 10
+    assert len(first.spec_diff["added"]) == len(first_spec["paths"]) and not first.spec_diff["removed"]
+
+    changed = tmp_path / "synthpkg_inc" / "sub" / "leaf1.py"
+    changed.write_text(
+        changed.read_text().replace("def describe_11", "def summarize_11(text: str, limit: int = 3) -> str:\n"
+                                    "    \"\"\"Summarize a text.\n\n    Args:\n        text: Input text.\n"
+                                    "        limit: Max sentences.\n\n    Returns:\n        The summary.\n    \"\"\"\n"
+                                    "    return text\n\n\ndef describe_11")
+    )
+    stat = os.stat(changed)
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000))
+    _forget_package("synthpkg_inc")
+
+    second, second_spec = run()
+    assert second.rescan_stats["modules_rescanned"] == 1
+    assert second.rescan_stats["functions_rescored"] < len(second.function_scores)
+    assert "synthpkg_inc.sub.leaf1" in sys.modules and "synthpkg_inc.mod0" not in sys.modules
+    assert [d["operationId"] for d in second.spec_diff["added"]] == ["synthpkg_inc_sub_leaf1_summarize_11"]
+
+    # Same spec and scores as a from-scratch analysis of the edited package
+    full_spec = full_scan()
+    assert second_spec["paths"] == full_spec["paths"]
+    assert second_spec["x-allbemcp"] == full_spec["x-allbemcp"]
+
+    third, _ = run()
+    assert third.spec_diff == {"added": [], "removed": [], "changed": [], "unchanged": len(second_spec["paths"])}
+
+
+def test_static_analysis_matches_import_scan_without_importing(tmp_path, monkeypatch):
+    _write_package(tmp_path, "synthpkg_static")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # Parse sources in worker processes even for this small package.
+    monkeypatch.setattr(APIAnalyzer, "AST_PROCESS_MIN_FILES", 1)
+
+    static = _scan("synthpkg_static", static_analysis=True, ast_process_workers=2)
+    assert not [name for name in sys.modules if name.startswith("synthpkg_static")]
+
+    imported = _scan("synthpkg_static", enable_parallel_scan=False)
+
+    def summary(analyzer):
+        return [
+            (f.qualname, f.signature, f.doc, f.parameters, f.returns_object, f.object_methods)
+            for f in analyzer.functions
+        ]
+
+    assert summary(static)
+    assert summary(static) == summary(imported)
+
+
+def test_static_analysis_resolves_module_level_aliases(tmp_path, monkeypatch):
+    _write_package(tmp_path, "synthpkg_alias")
+    (tmp_path / "synthpkg_alias" / "aliases.py").write_text(
+        "from . import mod0\n"
+        "from .mod1 import scale_1\n\n"
+        "rescale = scale_1\n"
+        "scale_zero = mod0.scale_0\n"
+        "Report = mod0.Report0\n"
+        "LIMIT = 10\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    static = _scan("synthpkg_alias", static_analysis=True)
+    try:
+        imported = _scan("synthpkg_alias", enable_parallel_scan=False)
+    finally:
+        _forget_package("synthpkg_alias")
+
+    def summary(analyzer):
+        return sorted((f.qualname, f.signature) for f in analyzer.functions if ".aliases." in f.qualname)
+
+    assert ("synthpkg_alias.aliases.rescale", "rescale(value: float, factor: float = 2.0) -> float") in summary(static)
+    assert "synthpkg_alias.aliases.scale_zero" in dict(summary(static))
+    assert summary(static) == summary(imported)
+
+
+def test_static_analysis_reads_stubs_and_imports_only_as_fallback(tmp_path, monkeypatch):
+    package = tmp_path / "synthpkg_stub"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "fast.py").write_text('def blend(a, b=None):\n    """Blend two values."""\n    return a\n')
+    (package / "fast.pyi").write_text(
+        "from typing import Optional\n\ndef blend(a: float, b: Optional[float] = ...) -> float: ...\n"
+    )
+    # A module without source or stub, like a C extension
+    source = tmp_path / "native_src.py"
+    source.write_text('def native_sum(a: int, b: int) -> int:\n    """Add natively."""\n    return a + b\n')
+    py_compile.compile(str(source), cfile=str(package / "native.pyc"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    static = _scan("synthpkg_stub", static_analysis=True)
+    blend = next(f for f in static.functions if f.name == "blend")
+    assert blend.signature == "blend(a: float, b: Optional[float] = None) -> float"
+    assert [p["schema"]["type"] for p in blend.parameters] == ["number", "number"]
+    assert not any(f.name == "native_sum" for f in static.functions)
+    assert static.rescan_stats["modules_unreadable"] == 1
+    assert "synthpkg_stub" not in sys.modules
+
+    try:
+        fallback = _scan("synthpkg_stub", static_analysis=True, static_import_fallback=True)
+        assert any(f.qualname == "synthpkg_stub.native.native_sum" for f in fallback.functions)
+        assert fallback.rescan_stats["modules_imported"] == 1
+    finally:
+        _forget_package("synthpkg_stub")
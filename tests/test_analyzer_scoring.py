@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from allbemcp import analyzer_scoring
+from allbemcp.analyzer import APIAnalyzer
+from allbemcp.analyzer_scoring import ScoreBreakdowns, adaptive_select, combine_scores
+
+pytest.importorskip("numpy")
+
+
+class _Func:
+    def __init__(self, module):
+        self.module = module
+
+
+def _random_features(rng, count):
+    features = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            features.append({"rejected": "private_name", "documentation": 0.4} if rng.random() < 0.5 else {"rejected": "internal_module"})
+            continue
+        features.append({
+            "documentation": rng.choice([0.0, 0.2, 0.4, 0.8, 1.0]),
+            "type_annotations": rng.choice([0.1, 0.7, 1.0]),
+            "public_api": rng.choice([0.0, 0.7, 0.9, 1.0]),
+            "naming": rng.choice([0.5, 1.0, rng.random()]),
+            "hierarchy": rng.choice([0.6, 1.0, rng.random()]),
+            "usability": rng.choice([0.2, 0.49, 0.5, 1.0]),
+            "all_bonus": rng.choice([0.0, 15.0]),
+            "simple_return": rng.random() < 0.8,
+            "is_constructor": rng.random() < 0.2,
+        })
+    return features
+
+
+def test_vectorized_scores_equal_scalar_scores():
+    rng = random.Random(7)
+    analyzer = APIAnalyzer("json", enable_analysis_cache=False)
+    weights = analyzer._get_adaptive_weights()
+    features = _random_features(rng, 2000)
+    signals = [rng.choice([0.3, 0.6, 0.7, 1.0]) for _ in features]
+
+    expected = [
+        analyzer._damp_score(analyzer._combine_score_features(f, weights)[0], signal)
+        for f, signal in zip(features, signals)
+    ]
+    assert combine_scores(features, weights, analyzer.SCORE_DIMENSIONS, signals) == expected
+
+
+@pytest.mark.parametrize("min_keep, max_keep, keep_ratio", [(3, 40, 0.5), (0, 5, 0.3), (10, 10, 0.9), (2, 100, 0.01)])
+def test_vectorized_adaptive_selection_equals_heap_selection(monkeypatch, min_keep, max_keep, keep_ratio):
+    rng = random.Random(min_keep * 100 + max_keep)
+    analyzer = APIAnalyzer(
+        "json",
+        enable_analysis_cache=False,
+        adaptive_keep_ratio=keep_ratio,
+        adaptive_min_keep=min_keep,
+        adaptive_max_keep=max_keep,
+    )
+    # Coarse scores so that ties, within and across modules, are common
+    scored = [
+        (_Func(f"json.{rng.choice(['a', 'b', 'c.d', 'c.d.e', 'f'])}"), float(rng.randrange(40, 100, 5)))
+        for _ in range(500)
+    ]
+
+    vectorized = analyzer._apply_adaptive_filter(scored)
+    monkeypatch.setattr(analyzer_scoring, "np", None)
+    assert [id(f) for f, _ in vectorized] == [id(f) for f, _ in analyzer._apply_adaptive_filter(scored)]
+    assert adaptive_select([], [], lambda name: False, keep_ratio, min_keep, max_keep) == []
+
+
+def test_quality_filtering_is_identical_without_numpy(monkeypatch):
+    def run():
+        analyzer = APIAnalyzer("email", max_depth=1, enable_analysis_cache=False)
+        analyzer.analyze()
+        return analyzer
+
+    vectorized = run()
+    monkeypatch.setattr(analyzer_scoring, "np", None)
+    scalar = run()
+
+    assert vectorized.function_scores == scalar.function_scores
+    assert [f.qualname for f in vectorized.functions] == [f.qualname for f in scalar.functions]
+    assert vectorized.quality_stats == scalar.quality_stats
+    assert dict(vectorized.function_score_breakdowns) == dict(scalar.function_score_breakdowns)
+
+
+def test_breakdowns_are_built_on_first_read():
+    calls = []
+
+    def combine(features, weights):
+        calls.append(features["name"])
+        return 50.0, {"weights": weights}
+
+    breakdowns = ScoreBreakdowns(combine, {"documentation": 1.0})
+    breakdowns.add("m.a", {"name": "a"}, 50.0)
+    breakdowns.add("m.b", {"name": "b"}, 42.0)
+
+    assert len(breakdowns) == 2 and "m.b" in breakdowns and calls == []
+    assert breakdowns["m.b"] == {"weights": {"documentation": 1.0}, "final_score": 42.0}
+    assert breakdowns.get("m.b") is breakdowns["m.b"]
+    assert breakdowns.get("m.missing", {}) == {}
+    assert calls == ["b"]
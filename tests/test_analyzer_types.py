@@ -0,0 +1,61 @@
+import json
+import pickle
+
+from allbemcp.analyzer import APIAnalyzer
+from allbemcp.analyzer_types import FunctionInfo, ParamInfo
+
+
+def _function_info(module, parameters):
+    return FunctionInfo(
+        name="resize",
+        module=module,
+        class_name="Image",
+        qualname=f"{module}.Image.resize",
+        signature="resize(width, mode='nearest')",
+        doc=None,
+        parameters=parameters,
+        return_type=None,
+        is_async=False,
+        http_method="post",
+        path="/image/resize",
+        raw_param_annotations=[int, str],
+    )
+
+
+def test_param_info_reads_like_the_parameter_dict():
+    with_default = {"name": "mode", "required": False, "schema": {"type": "string"}, "in": "query", "default": "nearest"}
+    without_default = {"name": "width", "required": True, "schema": {"type": "integer"}, "in": "path"}
+
+    for payload in (with_default, without_default):
+        param = ParamInfo.from_dict(payload)
+        assert param == payload and dict(param) == payload
+        assert list(param) == list(payload)
+        assert param["in"] == payload["in"] and param.get("schema", {}) is param.schema
+        assert ("default" in param) == ("default" in payload)
+        assert pickle.loads(pickle.dumps(param)) == payload
+
+    assert ParamInfo("x", default=None).get("default") is None and "default" not in ParamInfo("x", default=None)
+
+
+def test_function_info_is_slotted_interned_and_round_trips_through_the_cache():
+    params = [
+        {"name": "width", "required": True, "schema": {"type": "integer"}, "in": "query"},
+        {"name": "mode", "required": False, "schema": {"type": "string"}, "in": "query", "default": "nearest"},
+    ]
+    # Separately built strings, as loaded from JSON
+    first = _function_info("".join(["imaging.", "core"]), params)
+    second = _function_info("".join(["imaging", ".core"]), params)
+
+    assert not hasattr(first, "__dict__")
+    assert first.module is second.module
+    assert first.parameters[0].name is second.parameters[0].name
+    assert isinstance(first.parameters, tuple) and all(isinstance(p, ParamInfo) for p in first.parameters)
+    assert first.parameters == tuple(params)
+
+    analyzer = APIAnalyzer("json", enable_analysis_cache=False)
+    payload = json.loads(json.dumps(analyzer._serialize_function_info_for_cache(first)))
+    assert payload["parameters"] == params
+    restored = analyzer._deserialize_function_info_from_cache(payload)
+    assert restored.parameters == first.parameters
+    assert restored.module is first.module
+    assert pickle.loads(pickle.dumps(first)) == first
@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+from enum import Enum
+
+import pytest
+
+from allbemcp.runtime import encoding as encoding_module
+from allbemcp.runtime.encoding import ResponseEncoder
+from allbemcp.runtime.server import MCPServer
+from allbemcp.serialization.engine import SerializationConfig, SmartSerializer
+
+
+class _Frame:
+    """Data container without a dedicated handler ("DataFrame" name pattern)"""
+
+    def to_dict(self, orient="records"):
+        return [{"city": "Zürich", "value": 1.5}, {"city": "Oslo", "value": 2}]
+
+
+_Frame.__name__ = "DataFrame"
+
+
+def test_json_backend_is_compact_and_falls_back_for_oversized_integers():
+    payload = {"rows": [{"a": 1, "b": "ü"}], "big": 2**70, "when": object}
+    encoder = ResponseEncoder(backend="json")
+    text = encoder.encode(payload)
+    assert text.startswith('{"rows":[{"a":1,"b":"ü"}]')
+    assert json.loads(text)["big"] == 2**70
+
+    if encoding_module.orjson is not None:
+        fast = ResponseEncoder(backend="orjson")
+        assert json.loads(fast.encode(payload)) == json.loads(text)
+    with pytest.raises(ValueError, match="Unknown JSON encoder"):
+        ResponseEncoder(backend="yaml")
+    assert ResponseEncoder.from_env({"ALLBEMCP_JSON_INDENT": "2", "ALLBEMCP_JSON_ENCODER": "json"}).encode([1]) == "[\n  1\n]"
+
+
+def test_backends_write_datetimes_and_nan_the_same_way():
+    class Color(Enum):
+        RED = "red"
+
+    payload = {"t": datetime(2024, 1, 2, 3, 4, 5), "x": float("nan"), "rows": [(1, float("inf"))], "c": Color.RED}
+    text = ResponseEncoder(backend="json").encode(payload)
+    assert text == '{"t":"2024-01-02 03:04:05","x":null,"rows":[[1,null]],"c":"red"}'
+    if encoding_module.orjson is not None:
+        assert ResponseEncoder(backend="orjson").encode(payload) == text
+        assert ResponseEncoder(backend="auto").backend == "orjson"
+
+    encoder = ResponseEncoder(backend="json")
+    data = [{"x": float("nan")}]
+    encoder.remember(data, json.dumps(data))
+    assert encoder.encode({"data": data}) == '{"data":[{"x":null}]}'
+
+
+def test_remembered_text_is_spliced_into_the_response():
+    encoder = ResponseEncoder(backend="json")
+    data = {"value": 1}
+    encoder.remember(data, '{"value":1, "from":"cache"}')
+
+    assert encoder.encode({"success": True, "data": data}) == '{"success":true,"data":{"value":1, "from":"cache"}}'
+    assert encoder.encode({"success": True, "data": {"value": 1}}) == '{"success":true,"data":{"value":1}}'
+
+
+def test_server_reuses_serializer_json_for_data_containers():
+    server = MCPServer(
+        title="Test",
+        tools=[],
+        function_map={},
+        library_name="testlib",
+        response_encoder=ResponseEncoder(backend="json"),
+    )
+    serializer = SmartSerializer(SerializationConfig())
+    server.serializer = serializer
+    try:
+        result = serializer.serialize(_Frame())
+        assert result.type == "direct" and json.loads(result.encoded) == result.data
+
+        data = server._serialize_result(_Frame())
+        content = server._to_mcp_content({"success": True, "data": data})
+        assert json.loads(content[0].text) == {"success": True, "data": data}
+        assert server._encoder._recall(data) is not None
+    finally:
+        serializer.close()
+        server._execution_pool.shutdown(wait=True)
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from allbemcp.runtime.executors import ExecutionConfig
+from allbemcp.runtime.instances import InstanceManager
+from allbemcp.runtime.server import MCPServer
+
+
+class _Session:
+    created = 0
+
+    def __init__(self):
+        type(self).created += 1
+        self.active = 0
+        self.max_active = 0
+
+    def get(self, url: str) -> str:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        self.active -= 1
+        return f"{url}:{id(self)}"
+
+    def name(self) -> str:
+        return "session"
+
+    async def fetch(self, url: str) -> str:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        return f"{url}:{self.max_active}"
+
+
+def _run_concurrently(func, count):
+    threads = [threading.Thread(target=func) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_pooled_policy_checks_out_each_instance_to_one_call_at_a_time():
+    manager = InstanceManager(default_policy="pooled", pool_size=2)
+    seen = {}
+
+    def call():
+        with manager.instance(_Session) as session:
+            session.get("x")
+            seen[id(session)] = session
+
+    _run_concurrently(call, 8)
+
+    stats = manager.stats()[f"{__name__}._Session"]
+    assert len(seen) <= 2 and stats["created"] == len(seen)
+    assert all(session.max_active == 1 for session in seen.values())
+    assert stats["checkouts"] == 8 and stats["in_use"] == 0
+
+
+def test_policies_control_instance_reuse():
+    manager = InstanceManager(
+        default_policy="shared",
+        class_policies={f"{__name__}._Session": "fresh"},
+    )
+    with manager.instance(_Session) as first, manager.instance(_Session) as second:
+        assert first is not second
+
+    per_thread = InstanceManager(default_policy="per-thread")
+    ids = []
+
+    def call():
+        with per_thread.instance(_Session) as session:
+            with per_thread.instance(_Session) as again:
+                assert again is session
+            ids.append(id(session))
+
+    _run_concurrently(call, 3)
+    assert len(set(ids)) == 3
+
+    with pytest.raises(ValueError, match="Unknown instance policy"):
+        InstanceManager(default_policy="sometimes")
+
+
+def test_pooled_checkout_times_out_instead_of_waiting_forever():
+    manager = InstanceManager(default_policy="pooled", pool_size=1, checkout_timeout=0.05)
+    with manager.instance(_Session):
+        with pytest.raises(TimeoutError, match="_Session"):
+            with manager.instance(_Session):
+                pass
+    assert ExecutionConfig().instance_checkout_timeout == 30.0
+
+
+@pytest.mark.asyncio
+async def test_tools_on_the_same_class_share_instances():
+    function_map = {
+        "session-get": {"module": __name__, "class": "_Session", "function": "get"},
+        "session-name": {"module": __name__, "class": "_Session", "function": "name"},
+    }
+    config = ExecutionConfig({
+        "instance_policy": "pooled",
+        "instance_pool_size": 1,
+        "tool_modes": {"session-name": "inline", "session-get": "auto"},
+    })
+    server = MCPServer("Test", [], function_map, "testlib", execution_config=config)
+    _Session.created = 0
+    try:
+        first = await server._execute_tool("session-get", {"url": "a"})
+        await server._execute_tool("session-name", {})
+        second = await server._execute_tool("session-get", {"url": "b"})
+
+        assert first["data"].split(":")[1] == second["data"].split(":")[1]
+        assert _Session.created == 1
+        assert server.get_call_stats()["_instances"][f"{__name__}._Session"]["checkouts"] == 3
+        # Pooled checkouts can wait, so these tools stay off the event loop thread
+        assert server._execution_pool.mode_for("session-name", may_block=True) == "thread"
+        assert server._execution_pool.stats()["inline"]["calls"] == 0
+    finally:
+        server._execution_pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_async_methods_keep_their_pooled_instance_until_they_finish():
+    function_map = {"session-fetch": {"module": __name__, "class": "_Session", "function": "fetch", "is_async": True}}
+    config = ExecutionConfig({"instance_policy": "pooled", "instance_pool_size": 1})
+    server = MCPServer("Test", [], function_map, "testlib", execution_config=config)
+    _Session.created = 0
+    try:
+        first, second = await asyncio.gather(
+            server._execute_tool("session-fetch", {"url": "a"}),
+            server._execute_tool("session-fetch", {"url": "b"}),
+        )
+
+        # One call at a time on the single instance: the second waited for the first
+        assert (first["data"], second["data"]) == ("a:1", "b:1")
+        stats = server.get_call_stats()["_instances"][f"{__name__}._Session"]
+        assert _Session.created == 1
+        assert stats["waits"] == 1 and stats["in_use"] == 0
+    finally:
+        server._execution_pool.shutdown(wait=True)
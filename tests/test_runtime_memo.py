@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+
+from allbemcp.runtime.memo import MemoCache, MemoConfig, canonical_arguments
+from allbemcp.runtime.server import MCPServer
+
+
+def test_canonical_arguments_are_order_independent_and_typed():
+    assert canonical_arguments({"a": 1, "b": [1.5, "x"]}) == canonical_arguments({"b": [1.5, "x"], "a": 1})
+    assert len({canonical_arguments({"a": v}) for v in (1, 1.0, True, "1")}) == 4
+    assert canonical_arguments({"p": Path("a.txt")}) != canonical_arguments({"p": "a.txt"})
+    assert canonical_arguments({"obj": object()}) is None
+
+
+def test_cache_evicts_by_lru_budget_and_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("allbemcp.runtime.memo.time.monotonic", lambda: now[0])
+    cache = MemoCache(MemoConfig({"tools": ["t"], "max_entries": 2, "ttl_seconds": 10}))
+
+    cache.put("t", "a", {"success": True, "data": 1})
+    cache.put("t", "b", {"success": True, "data": 2})
+    assert cache.get("t", "a")["data"] == 1  # "b" is now least recently used
+    cache.put("t", "c", {"success": True, "data": 3})
+    assert cache.get("t", "b") is None
+    assert cache.stats()["evictions"] == 1
+
+    # Stateful responses are never cached.
+    assert cache.put("t", "d", {"success": True, "object_id": "obj_1"}) is False
+
+    now[0] += 11
+    assert cache.get("t", "a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1 and stats["hits"] == 1 and stats["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_memoized_tool_runs_once_per_distinct_arguments():
+    function_map = {
+        "square": {"module": "dummy", "function": "square", "pure_candidate": True},
+        "plain": {"module": "dummy", "function": "plain"},
+    }
+    server = MCPServer(
+        title="Test",
+        tools=[],
+        function_map=function_map,
+        library_name="testlib",
+        memo_config=MemoConfig({"use_analyzer_hints": True}),
+    )
+    calls = []
+
+    def square(value: int) -> int:
+        calls.append(value)
+        return value * value
+
+    server._func_cache["square"] = square
+    server._func_cache["plain"] = lambda value: value
+    try:
+        for value in (3, 3, 4, 3):
+            assert (await server._execute_tool("square", {"value": value}))["data"] == value * value
+        await server._execute_tool("plain", {"value": 1})
+
+        assert calls == [3, 4]
+        stats = server.get_call_stats()
+        assert stats["square"]["memo_hits"] == 2 and stats["square"]["memo_misses"] == 2
+        assert stats["square"]["count"] == 4
+        assert "memo_hits" not in stats["plain"]
+        assert stats["_memo"]["tools"] == ["square"] and stats["_memo"]["entries"] == 2
+    finally:
+        server._execution_pool.shutdown(wait=True)
@@ -1,6 +1,15 @@
+import base64
+import io
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
 import pytest
 
+from allbemcp.runtime import server as server_module
+from allbemcp.runtime.executors import ExecutionConfig
 from allbemcp.runtime.server import MCPServer
+from allbemcp.serialization.engine import SerializationConfig, SmartSerializer
+from allbemcp.serialization.resources import ResourceStore
 
 
 class _SampleObject:
@@ -52,6 +61,9 @@ async def test_execute_tool_stats_count_success_and_error(monkeypatch):
     assert stats["ok-tool"]["errors"] == 0
     assert stats["bad-tool"]["count"] == 1
     assert stats["bad-tool"]["errors"] == 1
+    latency = stats["ok-tool"]["latency"]
+    assert {"queue_wait", "execution", "serialization", "total"} <= set(latency)
+    assert latency["total"]["p99"] <= latency["total"]["max"]
 
 
 @pytest.mark.asyncio
@@ -70,6 +82,16 @@ async def test_call_stored_method_blocks_private_methods():
         )
 
 
+def test_method_names_cached_per_type_ignore_the_first_instances_own_attributes():
+    server = MCPServer(title="Test", tools=[], function_map={}, library_name="testlib")
+    shadowing = _SampleObject()
+    shadowing.public = 5
+    shadowing.extra = lambda: "extra"
+
+    assert server._public_method_names(shadowing) == ["extra"]
+    assert server._public_method_names(_SampleObject()) == ["public"]
+
+
 def test_coerce_types_resolves_object_reference_from_annotations():
     server = MCPServer(title="Test", tools=[], function_map={}, library_name="testlib")
     obj = _SampleObject()
@@ -82,6 +104,42 @@ def test_coerce_types_resolves_object_reference_from_annotations():
     assert coerced["item"] is obj
 
 
+def test_coerce_types_uses_cached_plan_for_nested_annotations(monkeypatch):
+    server = MCPServer(title="Test", tools=[], function_map={}, library_name="testlib")
+    obj = _SampleObject()
+    server._object_store["obj_ref"] = obj
+
+    def consume(
+        paths: List[Path],
+        mapping: Dict[str, Path],
+        maybe: Optional[Path] = None,
+        item: Union[_SampleObject, int] = 0,
+        name: str = "",
+    ):
+        return paths
+
+    arguments = {
+        "paths": ["a.txt", "b.txt"],
+        "mapping": {"k": "c.txt"},
+        "maybe": "d.txt",
+        "item": "obj_ref",
+        "name": "obj_ref",
+    }
+    coerced = server._coerce_types(consume, arguments)
+    assert coerced["paths"] == [Path("a.txt"), Path("b.txt")]
+    assert coerced["mapping"] == {"k": Path("c.txt")}
+    assert coerced["maybe"] == Path("d.txt")
+    assert coerced["item"] is obj
+    assert coerced["name"] == "obj_ref"
+
+    def fail_reflection(*_args, **_kwargs):
+        raise AssertionError("signature reflected on a warm call")
+
+    monkeypatch.setattr(server_module.inspect, "signature", fail_reflection)
+    monkeypatch.setattr(server_module, "get_type_hints", fail_reflection)
+    assert server._coerce_types(consume, arguments)["paths"] == [Path("a.txt"), Path("b.txt")]
+
+
 class _DummySerializerConfig:
     resource_base_url = "mcp://resources"
 
@@ -89,15 +147,11 @@ class _DummySerializerConfig:
 class _DummySerializer:
     def __init__(self):
         self.config = _DummySerializerConfig()
-        self.resource_store = {
-            "res_1": {
-                "content": "hello",
-                "content_type": "text/plain",
-            }
-        }
+        self.resources = ResourceStore()
+        self.resources.put_bytes("res_1", b"hello", "text/plain", is_text=True)
 
     def get_resource(self, resource_id: str):
-        return self.resource_store.get(resource_id)
+        return self.resources.get(resource_id)
 
 
 def test_list_resources_returns_resource_entries_from_serializer():
@@ -158,3 +212,237 @@ async def test_native_resources_and_prompts_registered_and_working():
         {"user_goal": "analyze dataset"},
     )
     assert any("analyze dataset" in str(message.content) for message in prompt_result.messages)
+
+
+@pytest.mark.asyncio
+async def test_execution_pool_selects_executor_per_tool_and_reports_queue_stats():
+    config = ExecutionConfig(
+        {
+            "thread_workers": 2,
+            "process_workers": 1,
+            "tool_modes": {"shorten": "process", "local": "process", "fast": "auto"},
+            "inline_min_samples": 2,
+            "inline_threshold_ms": 50.0,
+        }
+    )
+    server = MCPServer(title="Test", tools=[], function_map={}, library_name="testlib", execution_config=config)
+    server.function_map["shorten"] = {"module": "textwrap", "function": "shorten"}
+    server.function_map["local"] = {"module": "dummy", "function": "local"}
+    server.function_map["fast"] = {"module": "dummy", "function": "fast"}
+    try:
+        result = await server._execute_tool("shorten", {"text": "hello big world", "width": 12})
+        assert result["data"] == "hello [...]"
+
+        # Closures cannot be pickled, so a process-mode tool falls back to the thread pool.
+        server._func_cache["local"] = lambda value: value * 2
+        assert (await server._execute_tool("local", {"value": 3}))["data"] == 6
+
+        server._func_cache["fast"] = lambda: "ok"
+        for _ in range(3):
+            await server._execute_tool("fast", {})
+
+        executor_stats = server.get_call_stats()["_executor"]
+        assert executor_stats["tool_modes"] == {"shorten": "process", "local": "thread", "fast": "inline"}
+        assert executor_stats["process"]["completed"] == 1
+        assert executor_stats["thread"]["completed"] == 3
+        assert executor_stats["thread"]["queue_depth"] == 0
+        assert executor_stats["inline"]["calls"] == 1
+    finally:
+        server._execution_pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_process_result_fails_the_call_instead_of_running_it_again():
+    import threading
+
+    from allbemcp.runtime.executors import ToolExecutionPool
+
+    pool = ToolExecutionPool(ExecutionConfig({"process_workers": 1, "tool_modes": {"lock": "process"}}))
+    try:
+        assert ExecutionConfig().default_mode == "thread"
+        with pytest.raises(TypeError, match="cannot be sent back"):
+            await pool.run_tool("lock", threading.Lock, {}, process_eligible=True)
+        stats = pool.stats()
+        assert stats["process"]["completed"] == 1 and stats["thread"]["completed"] == 0
+
+        # Later calls go to the thread pool
+        assert hasattr(await pool.run_tool("lock", threading.Lock, {}, process_eligible=True), "acquire")
+        assert pool.stats()["tool_modes"] == {"lock": "thread"}
+    finally:
+        pool.shutdown(wait=True)
+
+
+def test_execution_config_reads_environment_overrides():
+    config = ExecutionConfig.from_env(
+        {"tool_modes": {"a": "inline"}},
+        environ={"ALLBEMCP_WORKERS": "16", "ALLBEMCP_PROCESS_TOOLS": "b, c", "ALLBEMCP_EXECUTOR": "thread"},
+    )
+
+    assert config.thread_workers == 16
+    assert config.default_mode == "thread"
+    assert config.tool_modes == {"a": "inline", "b": "process", "c": "process"}
+    with pytest.raises(ValueError, match="Unknown execution mode"):
+        ExecutionConfig({"default_mode": "fibers"})
+
+
+@pytest.mark.asyncio
+async def test_lazy_mode_imports_on_first_call_and_warms_up_most_used_tools(tmp_path, monkeypatch):
+    import json
+    import sys
+
+    for name in ("lazy_tools_a", "lazy_tools_b"):
+        (tmp_path / f"{name}.py").write_text("def double(value: int) -> int:\n    return value * 2\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    for name in ("lazy_tools_a", "lazy_tools_b"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    function_map = {
+        "double-a": {"module": "lazy_tools_a", "function": "double"},
+        "double-b": {"module": "lazy_tools_b", "function": "double"},
+    }
+    tools = [{"name": name, "inputSchema": {"type": "object", "properties": {}}} for name in function_map]
+
+    server = MCPServer("Test", tools, function_map, "lazylib", lazy=True, warmup_tools=0)
+    assert "lazy_tools_a" not in sys.modules and "lazy_tools_b" not in sys.modules
+
+    result = await server._execute_tool("double-b", {"value": 4})
+    assert result["data"] == 8
+    assert "lazy_tools_b" in sys.modules and "lazy_tools_a" not in sys.modules
+
+    server._save_usage_counts()
+    assert json.loads((tmp_path / "lazylib_call_stats.json").read_text()) == {"double-b": 1}
+    server._execution_pool.shutdown(wait=True)
+
+    monkeypatch.delitem(sys.modules, "lazy_tools_b")
+    warm = MCPServer("Test", tools, function_map, "lazylib", lazy=True, warmup_tools=1)
+    warm._warmup_thread.join(timeout=10)
+    assert "double-b" in warm._func_cache and "double-a" not in warm._func_cache
+    assert "lazy_tools_a" not in sys.modules
+    warm._execution_pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_lazy_usage_is_saved_off_the_event_loop_without_per_server_exit_hooks(tmp_path, monkeypatch):
+    import asyncio
+    import json
+    import threading
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(server_module, "_USAGE_SAVE_INTERVAL", 0.0)
+    registered = []
+    monkeypatch.setattr(server_module.atexit, "register", registered.append)
+    server = MCPServer("Test", [], {}, "usagelib", lazy=True, warmup_tools=0)
+    assert not any(getattr(hook, "__self__", None) is server for hook in registered)
+    assert server in server_module._LAZY_SERVERS
+
+    writers = []
+    write = server._write_usage_counts
+    server._write_usage_counts = lambda counts: writers.append(threading.current_thread()) or write(counts)
+
+    server._record_usage("tool")
+    usage_file = tmp_path / "usagelib_call_stats.json"
+    for _ in range(200):
+        if usage_file.exists():
+            break
+        await asyncio.sleep(0.01)
+    assert json.loads(usage_file.read_text()) == {"tool": 1}
+    assert writers and threading.main_thread() not in writers
+
+    # At exit, pending counts of every live lazy server are written
+    monkeypatch.setattr(server_module, "_USAGE_SAVE_INTERVAL", 3600.0)
+    server._record_usage("tool")
+    server_module._save_lazy_server_usage()
+    assert json.loads(usage_file.read_text()) == {"tool": 2}
+    server._execution_pool.shutdown(wait=True)
+    server_module._LAZY_SERVERS.discard(server)
+
+
+def test_read_resource_supports_ranged_reads_from_resource_store():
+    server = MCPServer(title="Test", tools=[], function_map={}, library_name="testlib")
+    serializer = SmartSerializer(SerializationConfig({"resource_spill_threshold": 16}))
+    server.serializer = serializer
+    try:
+        payload = bytes(range(256)) * 4
+        result = serializer.serialize(io.BytesIO(payload))
+        uri = result.data["uri"]
+
+        listed = server._list_resources()
+        assert listed[0]["size"] == len(payload) and listed[0]["spilled"] is True
+
+        first = server._read_resource(uri, offset=0, length=300)
+        assert base64.b64decode(first["content_base64"]) == payload[:300]
+        assert first["has_more"] is True and first["next_offset"] == 300
+
+        rest = server._read_resource(uri, offset=first["next_offset"])
+        assert base64.b64decode(rest["content_base64"]) == payload[300:]
+        assert rest["has_more"] is False
+
+        full = server._read_resource(uri)
+        assert full["size"] == len(payload) and "has_more" not in full
+    finally:
+        serializer.close()
+
+
+@pytest.mark.asyncio
+async def test_next_page_tool_continues_generator_results():
+    server = MCPServer(title="Test", tools=[], function_map={}, library_name="testlib")
+    serializer = SmartSerializer(SerializationConfig({"max_direct_size": 1000}))
+    server.serializer = serializer
+    try:
+        first = server._serialize_result(iter(range(25)))
+        assert first["items"] == list(range(10)) and first["has_more"] is True
+
+        second = await server._next_page(first["cursor_id"], max_items=20)
+        assert second["items"] == list(range(10, 25)) and second["has_more"] is False
+
+        with pytest.raises(ValueError, match="not found"):
+            await server._next_page(first["cursor_id"])
+    finally:
+        serializer.close()
+
+
+class _Counter:
+    def __init__(self, start=0):
+        self.value = start
+
+    def add(self, amount):
+        self.value += amount
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_batch_call_resolves_references_and_reports_failures():
+    server = MCPServer(title="Test", tools=[], function_map={}, library_name="testlib")
+    server.function_map["make-counter"] = {"module": "dummy", "function": "make", "returns_object": True}
+    server.function_map["double"] = {"module": "dummy", "function": "double"}
+    server._func_cache["make-counter"] = lambda start: _Counter(start)
+    server._func_cache["double"] = lambda value: value * 2
+    try:
+        result = await server._execute_batch(
+            [
+                {"id": "counter", "tool": "make-counter", "arguments": {"start": 10}},
+                {"id": "twice", "tool": "double", "arguments": {"value": 21}},
+                {
+                    "id": "add",
+                    "tool": "call-object-method",
+                    "arguments": {"object_id": {"$ref": "counter"}, "method_name": "add", "args": [5]},
+                },
+                {"id": "missing", "tool": "no-such-tool"},
+                {"id": "after", "tool": "double", "arguments": {"value": 1}, "depends_on": ["missing"]},
+            ]
+        )
+
+        by_id = {item["id"]: item for item in result["results"]}
+        assert [item["id"] for item in result["results"]] == ["counter", "twice", "add", "missing", "after"]
+        assert by_id["twice"]["data"] == 42
+        assert by_id["add"]["data"] == 15
+        assert server._get_stored_object(by_id["counter"]["object_id"]).value == 15
+        assert by_id["missing"]["success"] is False and "Unknown tool" in by_id["missing"]["error"]
+        assert by_id["after"]["error"] == "Dependency 'missing' failed"
+        assert result["success"] is False
+
+        with pytest.raises(ValueError, match="not an earlier call"):
+            await server._execute_batch([{"id": "a", "tool": "double", "depends_on": ["b"]}, {"id": "b", "tool": "double"}])
+    finally:
+        server._execution_pool.shutdown(wait=True)
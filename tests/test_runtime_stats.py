@@ -0,0 +1,37 @@
+import threading
+
+from allbemcp.runtime.stats import SUB_BUCKETS, CallStats, LatencyHistogram
+
+
+def test_histogram_percentiles_stay_within_bucket_error():
+    histogram = LatencyHistogram()
+    samples = [i / 1000.0 for i in range(1, 1001)]  # 1ms .. 1s
+    for value in samples:
+        histogram.record(value)
+
+    for q in (50, 95, 99):
+        expected = samples[int(len(samples) * q / 100) - 1]
+        assert abs(histogram.percentile(q) - expected) <= expected / SUB_BUCKETS
+    assert histogram.max == 1.0
+    assert histogram.summary()["count"] == 1000
+
+
+def test_concurrent_recording_merges_every_sample():
+    stats = CallStats()
+
+    def worker():
+        for _ in range(5000):
+            stats.record("tool", "total", 0.001)
+            stats.increment("tool", "errors")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = stats.snapshot()["tool"]
+    assert snapshot["count"] == 20000
+    assert snapshot["errors"] == 20000
+    assert abs(snapshot["avg_time"] - 0.001) < 1e-9
+    assert set(snapshot["latency"]) == {"total"}
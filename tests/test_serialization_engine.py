@@ -0,0 +1,127 @@
+import json
+import time
+
+import pytest
+
+from allbemcp.serialization.engine import SerializationConfig, SmartSerializer
+
+
+@pytest.fixture
+def serializer():
+    instance = SmartSerializer(SerializationConfig({"max_direct_size": 1024}))
+    yield instance
+    instance.close()
+
+
+def test_nested_containers_report_exact_json_size(serializer):
+    payload = {"rows": [{"id": i, "name": f"row-{i}", "tags": ["a", "é"]} for i in range(5)], 7: None}
+
+    result = serializer.serialize(payload)
+
+    assert result.type == "direct"
+    assert result.data["7"] is None
+    encoded = json.dumps(result.data, ensure_ascii=False, separators=(",", ":"))
+    assert result.metadata["size_bytes"] == len(encoded.encode("utf-8"))
+
+
+def test_oversized_sequence_short_circuits_to_object_ref(serializer, monkeypatch):
+    calls = {"count": 0}
+    original = serializer._serialize_child
+
+    def counting(item, context):
+        calls["count"] += 1
+        return original(item, context)
+
+    monkeypatch.setattr(serializer, "_serialize_child", counting)
+    rows = [{"text": "x" * 100} for _ in range(1000)]
+
+    result = serializer.serialize(rows)
+
+    assert result.type == "object_ref"
+    assert serializer.get_object(result.data["object_id"]) is rows
+    # Only the prefix that fits the byte budget is walked, not all 1000 rows.
+    assert calls["count"] < 20
+
+
+class _Widget:
+    def __init__(self):
+        self.size = 3
+
+    def grow(self, amount: int = 1):
+        return self.size + amount
+
+
+def test_method_descriptors_are_cached_per_type_and_merge_instance_callables(serializer, monkeypatch):
+    first = serializer.serialize(_Widget())
+    assert [m["name"] for m in first.data["available_methods"]] == ["grow"]
+
+    original = serializer._introspect_methods
+
+    def fail_introspection(obj, names, **kwargs):
+        names = list(names)
+        if "grow" in names:
+            raise AssertionError("type-level methods were introspected again")
+        return original(obj, names, **kwargs)
+
+    monkeypatch.setattr(serializer, "_introspect_methods", fail_introspection)
+    second = serializer.serialize(_Widget())
+    assert second.data["available_methods"] == first.data["available_methods"]
+
+    monkeypatch.undo()
+    custom = _Widget()
+    custom.shrink = lambda amount=1: custom.size - amount
+    custom.grow = 5
+    names = [m["name"] for m in serializer.serialize(custom).data["available_methods"]]
+    assert names == ["shrink"]
+
+
+class _Worker:
+    def run(self):
+        return "ran"
+
+    def stop(self):
+        return "stopped"
+
+
+def test_first_instance_shadowing_a_method_does_not_hide_it_for_the_type(serializer):
+    shadowing = _Worker()
+    shadowing.run = 5
+    assert [m["name"] for m in serializer.serialize(shadowing).data["available_methods"]] == ["stop"]
+
+    assert [m["name"] for m in serializer.serialize(_Worker()).data["available_methods"]] == ["run", "stop"]
+
+
+def test_iterator_pages_are_served_lazily_through_a_cursor(serializer):
+    pulled = []
+
+    def naturals():
+        n = 0
+        while True:
+            pulled.append(n)
+            yield n
+            n += 1
+
+    first = serializer.serialize(naturals(), {"max_iterator_items": 5})
+    assert first.data["items"] == [0, 1, 2, 3, 4]
+    assert first.data["has_more"] is True and first.data["page"] == 0
+    # Only the page plus one peeked item was read from the infinite generator.
+    assert len(pulled) == 6
+
+    cursor_id = first.data["cursor_id"]
+    second = serializer.next_page(cursor_id, max_items=3)
+    assert second.data["items"] == [5, 6, 7]
+    assert second.data["page"] == 1 and second.data["cursor_id"] == cursor_id
+
+    serializer.cursors.ttl_seconds = 0
+    time.sleep(0.01)
+    assert serializer.next_page(cursor_id) is None
+
+
+def test_finite_iterator_drops_cursor_when_exhausted(serializer):
+    first = serializer.serialize(iter(range(7)), {"max_iterator_items": 4})
+    rest = serializer.next_page(first.data["cursor_id"], max_items=10)
+
+    assert first.data["items"] + rest.data["items"] == list(range(7))
+    assert rest.data["has_more"] is False and "cursor_id" not in rest.data
+    assert len(serializer.cursors) == 0
+    assert serializer.next_page(first.data["cursor_id"]) is None
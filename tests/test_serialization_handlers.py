@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from allbemcp.serialization.engine import SerializationConfig, SmartSerializer
+from allbemcp.serialization.handlers import ConfigDrivenHandlers
+
+
+class _Box:
+    def __init__(self, width, items):
+        self.width = width
+        self.items = items
+        self.shape = (len(items), width)
+        self.label = "box"
+
+
+_TYPE_NAME = f"{__name__}._Box"
+
+
+def _handlers(max_rows=10):
+    handlers_config = {"handlers": {
+        _TYPE_NAME: {
+            "config_namespace": "test",
+            "config_defaults": {"max_rows": 100},
+            "size_check": {
+                "enabled": True,
+                "dimensions": {"rows": {"getter": "shape[0]", "max_config": "max_rows"}},
+            },
+            "base_fields": {
+                "_type": {"type": "literal", "value": "box"},
+                "rows": {"type": "attribute", "attr": "shape[0]"},
+                "items": {"type": "attribute", "attr": "items", "transform": "list"},
+                "missing": {"type": "attribute", "attr": "nope", "default": "n/a"},
+                "title": {"type": "computed", "expression": "format:{label}-{width}"},
+                "limit": {"type": "config", "key": "max_rows"},
+            },
+            "metadata": {"handler": "box", "size_bytes": {"type": "computed", "expression": "json_size"}},
+        }
+    }}
+    return ConfigDrivenHandlers({"test": {"max_rows": max_rows}}, handlers_config)
+
+
+def test_compiled_handler_extracts_fields_and_enforces_size_check():
+    handlers = _handlers()
+    handler = handlers.create_type_handler(_TYPE_NAME)
+
+    result = handler(_Box(3, (1, 2)), {})
+
+    assert result.data == {
+        "_type": "box",
+        "rows": 2,
+        "items": [1, 2],
+        "missing": "n/a",
+        "title": "box-3",
+        "limit": 10,
+    }
+    assert result.metadata["handler"] == "box"
+    assert result.metadata["size_bytes"] == len(result.encoded.encode("utf-8"))
+    assert json.loads(result.encoded) == result.data
+    assert handler(_Box(3, tuple(range(11))), {}) is None
+    assert handlers.handle(_Box(1, (5,)), {}).data["rows"] == 1
+
+
+def test_handler_config_is_compiled_once():
+    handlers = _handlers()
+    first = handlers.compile_handler(_TYPE_NAME)
+
+    handlers.handlers_config = {}
+    handlers._resolved_configs.clear()
+
+    assert handlers.compile_handler(_TYPE_NAME) is first
+    assert handlers.handle(_Box(2, (1,)), {}).data["title"] == "box-2"
+    assert handlers.compile_handler("unknown.Type") is None
+
+
+def test_dataframe_orients_round_floats_without_copying_the_frame(monkeypatch):
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"a": [1.23456, 2.5], "b": ["x", "y"], "c": [1, 2]})
+    type_name = "pandas.core.frame.DataFrame"
+
+    def fail_copy(*_args, **_kwargs):
+        raise AssertionError("frame copied")
+
+    monkeypatch.setattr(pd.DataFrame, "round", fail_copy)
+    monkeypatch.setattr(pd.DataFrame, "copy", fail_copy)
+
+    def encode(orient):
+        handlers = ConfigDrivenHandlers({"pandas": {"orient": orient, "float_precision": 2}})
+        return handlers.create_type_handler(type_name)(frame, {}).data
+
+    records = encode("records")
+    assert "orient" not in records
+    assert records["data"] == [{"a": 1.23, "b": "x", "c": 1}, {"a": 2.5, "b": "y", "c": 2}]
+
+    assert encode("split")["orient"] == "split"
+    split = encode("split")["data"]
+    assert split == {"columns": ["a", "b", "c"], "index": [0, 1], "data": [[1.23, "x", 1], [2.5, "y", 2]]}
+
+    assert encode("list")["data"] == {"a": [1.23, 2.5], "b": ["x", "y"], "c": [1, 2]}
+
+    # A pandas orient this handler does not implement falls back to records
+    assert encode("columns") == records
+    serializer = SmartSerializer(SerializationConfig({"library_specific": {"pandas": {"orient": "columns"}}}))
+    serializer.close()
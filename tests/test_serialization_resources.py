@@ -0,0 +1,131 @@
+import base64
+import io
+import os
+
+import pytest
+
+from allbemcp.serialization.engine import SerializationConfig, SmartSerializer
+from allbemcp.serialization.resources import ResourceStore
+
+
+def test_large_file_like_result_is_spilled_and_read_in_ranges(tmp_path):
+    serializer = SmartSerializer(SerializationConfig({
+        "resource_spill_threshold": 1024,
+        "resource_spill_dir": str(tmp_path),
+    }))
+    payload = os.urandom(10_000)
+    try:
+        stream = io.BytesIO(payload)
+        result = serializer.serialize(stream)
+
+        assert result.type == "resource"
+        assert result.data["size"] == len(payload)
+        assert result.metadata["spilled"] is True
+        assert stream.tell() == 0
+
+        store = serializer.resources
+        resource_id = result.metadata["resource_id"]
+        assert store.read(resource_id) == payload
+        assert store.read(resource_id, 5000, 100) == payload[5000:5100]
+        # Aligned ranges are sliced from the cached encoding, unaligned ones encoded on the fly.
+        assert store.read_base64(resource_id) == base64.b64encode(payload).decode("ascii")
+        assert store.read_base64(resource_id, 3000, 300) == base64.b64encode(payload[3000:3300]).decode("ascii")
+        assert store.read_base64(resource_id, 7, 11) == base64.b64encode(payload[7:18]).decode("ascii")
+        assert store.read_base64(resource_id, 9999) == base64.b64encode(payload[9999:]).decode("ascii")
+    finally:
+        serializer.close()
+    assert not any(tmp_path.iterdir())
+
+
+def test_store_evicts_least_recently_used_resources_over_budget():
+    store = ResourceStore(max_bytes=250, spill_threshold=0)
+    store.put_bytes("a", b"a" * 100, "application/octet-stream")
+    store.put_bytes("b", b"b" * 100, "application/octet-stream")
+    assert store.get("a") is not None  # touch: "b" is now least recently used
+
+    store.put_bytes("c", b"c" * 100, "application/octet-stream")
+
+    assert "b" not in store
+    assert "a" in store and "c" in store
+    assert store.total_bytes == 200
+    assert store.evictions == 1
+    # The base64 cache counts against the budget and is skipped when it would not fit.
+    assert store.read_base64("a") == base64.b64encode(b"a" * 100).decode("ascii")
+    assert store.total_bytes <= 250
+    store.close()
+
+
+def test_unaligned_reads_skip_the_encoding_cache_and_full_reads_share_it():
+    store = ResourceStore(spill_threshold=0)
+    payload = os.urandom(1000)
+    entry = store.put_bytes("r", payload, "application/octet-stream")
+
+    assert store.read_base64("r", 7, 11) == base64.b64encode(payload[7:18]).decode("ascii")
+    assert entry.base64_size == 0 and store.total_bytes == 1000
+
+    full = store.read_base64("r")
+    assert full == base64.b64encode(payload).decode("ascii")
+    assert store.read_base64("r") is full
+    assert store.read_base64("r", 300, 600) == full[400:1200]
+    assert entry.base64_size == len(full)
+    store.close()
+
+
+def test_oversized_ndarray_is_summarized_and_exported_as_npy(tmp_path):
+    np = pytest.importorskip("numpy")
+    serializer = SmartSerializer(SerializationConfig({
+        "resource_spill_threshold": 1024,
+        "resource_spill_dir": str(tmp_path),
+        "array_sample_size": 5,
+    }))
+    values = np.arange(20_000, dtype=np.float64).reshape(200, 100)
+    values[0, 0] = np.nan
+    try:
+        result = serializer.serialize(values)
+
+        assert result.type == "object_ref"
+        assert serializer.get_object(result.data["object_id"]) is values
+        summary = result.data["summary"]
+        assert summary["shape"] == [200, 100] and summary["nan_count"] == 1
+        assert summary["stats"]["min"] == 1.0 and summary["stats"]["max"] == 19_999.0
+        assert summary["sample_stride"] == 4000 and summary["sample"][1:] == [4000.0, 8000.0, 12000.0, 16000.0]
+        # Percentiles are estimated from a strided sample of PERCENTILE_SAMPLE_SIZE elements
+        assert summary["percentile_sample_stride"] == 2
+        assert abs(summary["stats"]["p50"] - 10_000) < 10
+
+        # The .npy export is only written when it is first read
+        resource_id = result.data["resource"]["uri"].rsplit("/", 1)[-1]
+        assert resource_id not in serializer.resources and not any(tmp_path.iterdir())
+        entry = serializer.get_resource(resource_id)
+        assert entry.size == result.data["resource"]["size"]
+        assert serializer.get_resource(resource_id) is entry
+        exported = np.load(io.BytesIO(serializer.resources.read(resource_id)))
+        np.testing.assert_array_equal(exported, values)
+
+        fortran = np.asfortranarray(values[:, :50])
+        resource = serializer.serialize(fortran).data["resource"]
+        resource_id = resource["uri"].rsplit("/", 1)[-1]
+        assert serializer.get_resource(resource_id).size == resource["size"]
+        exported = np.load(io.BytesIO(serializer.resources.read(resource_id)))
+        np.testing.assert_array_equal(exported, fortran)
+    finally:
+        serializer.close()
+
+
+def test_array_summary_statistics_skip_non_finite_values_of_strided_views():
+    np = pytest.importorskip("numpy")
+    from allbemcp.serialization.arrays import summarize_ndarray
+
+    values = np.arange(400, dtype=np.float32).reshape(20, 20)[:, ::2]
+    values[0, 0] = np.nan
+    values[0, 1] = -np.inf
+    finite = values[np.isfinite(values)]
+
+    summary = summarize_ndarray(values, float_precision=None)
+    assert summary["nan_count"] == 1 and summary["inf_count"] == 1
+    stats = summary["stats"]
+    assert (stats["min"], stats["max"]) == (finite.min(), finite.max())
+    assert stats["mean"] == pytest.approx(finite.mean(dtype=np.float64))
+    assert stats["std"] == pytest.approx(finite.std(dtype=np.float64))
+    assert stats["p50"] == pytest.approx(np.percentile(finite, 50))
+    assert "percentile_sample_stride" not in summary